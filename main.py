@@ -19,6 +19,23 @@ from src.secrets_keyring import configure_keyring
 from src.web_server import create_app, shutdown_event, startup_event
 
 
+def rebuild_analytics_rollups(data_dir: Path) -> None:
+    """Backfill analytics.db usage rollups from turn_usage."""
+    import asyncio
+
+    from src.analytics.database import AnalyticsDB
+
+    async def _rebuild() -> int:
+        db = AnalyticsDB(data_dir / "analytics.db")
+        await db.initialize()
+        try:
+            return await db.rebuild_rollups()
+        finally:
+            await db.close()
+
+    print(f"Rebuilt analytics usage rollups from {asyncio.run(_rebuild())} turns")
+
+
 def main():
     """Main function to start the Claude Code WebUI server."""
 
@@ -62,6 +79,12 @@ def main():
         help='Directory containing named fixture subdirectories (required with --mock-sdk)'
     )
 
+    # Maintenance commands (run and exit without starting the server)
+    parser.add_argument(
+        '--rebuild-analytics-rollups', action='store_true',
+        help='Recompute the hourly/daily analytics usage rollups from recorded turns, then exit'
+    )
+
     # Debug flags (grouped so they appear under their own section)
     debug_group = parser.add_argument_group("Debug Flags")
     debug_group.add_argument('--debug-polling', action='store_true', help='Enable poll transport signal logging (events-returned lines)')
@@ -87,6 +110,10 @@ def main():
 
     args = parser.parse_args()
 
+    if args.rebuild_analytics_rollups:
+        rebuild_analytics_rollups(Path(args.data_dir).resolve())
+        return
+
     # Configure keyring backend early (before ApplicationService init)
     configure_keyring()
 
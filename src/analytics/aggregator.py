@@ -5,10 +5,13 @@ they can be unit-tested with in-memory databases and custom pricing.
 """
 from __future__ import annotations
 
+import math
+from datetime import UTC, datetime
 from typing import Any
 
 from ..config_manager import PricingConfig, compute_cost, compute_cost_breakdown
 from .database import AnalyticsDB
+from .rollups import ROLLUP_WIDTHS, rollup_table
 
 _TOKEN_FIELDS = ("input_tokens", "output_tokens", "cache_write_tokens", "cache_read_tokens")
 
@@ -94,6 +97,43 @@ async def aggregate_by_session(
     return result
 
 
+def _filters(
+    session_ids: list[str] | None, models: list[str] | None
+) -> tuple[str, list[Any]]:
+    """Extra ``AND ...`` conditions shared by the raw and rollup sources."""
+    clause, params = "", []
+    if session_ids:
+        clause += f" AND session_id IN ({','.join('?' * len(session_ids))})"
+        params.extend(session_ids)
+    if models:
+        clause += f" AND model IN ({','.join('?' * len(models))})"
+        params.extend(models)
+    return clause, params
+
+
+def _plan_sources(since: float, until_excl: float, widths: list[int]) -> list[tuple[int | None, float, float]]:
+    """Cover ``[since, until_excl)`` with the coarsest available sources.
+
+    Returns ``(width, lo, hi)`` pieces: whole rollup buckets of ``width`` where
+    they fit entirely inside the range, falling back to finer rollups and
+    finally raw turn_usage rows (``width`` None) for the partial edges.
+    """
+    if since >= until_excl:
+        return []
+    if not widths:
+        return [(None, since, until_excl)]
+    width, finer = widths[0], widths[1:]
+    lo = math.ceil(since / width) * width
+    hi = math.floor(until_excl / width) * width
+    if lo >= hi:
+        return _plan_sources(since, until_excl, finer)
+    return [
+        *_plan_sources(since, lo, finer),
+        (width, lo, hi),
+        *_plan_sources(hi, until_excl, finer),
+    ]
+
+
 async def aggregate_by_time(
     db: AnalyticsDB,
     pricing: PricingConfig,
@@ -107,37 +147,53 @@ async def aggregate_by_time(
 
     group_by must be 'hour' or 'day'.  Both breakdowns are computed in a single
     pass so the caller can toggle between them client-side without re-querying.
+
+    Whole buckets inside the range are read from the rollup tables (daily and
+    hourly, as coarse as the requested bucket allows); only the partial buckets
+    at the range edges touch raw turn_usage rows, via the ts index.
     """
     fmt = _BUCKET_FMT[group_by]
-    wheres = ["ts >= ?", "ts <= ?"]
-    params: list[Any] = [since, until]
+    bucket = ROLLUP_WIDTHS[group_by]
+    widths = sorted((w for w in ROLLUP_WIDTHS.values() if w <= bucket and bucket % w == 0), reverse=True)
+    # Work in half-open ranges; nextafter keeps `until` itself inclusive.
+    until_excl = math.nextafter(until, math.inf)
+    filter_sql, filter_params = _filters(session_ids, models)
 
-    if session_ids:
-        placeholders = ",".join("?" * len(session_ids))
-        wheres.append(f"session_id IN ({placeholders})")
-        params.extend(session_ids)
-    if models:
-        placeholders = ",".join("?" * len(models))
-        wheres.append(f"model IN ({placeholders})")
-        params.extend(models)
+    sums = ", ".join(_TOKEN_FIELDS)
+    selects: list[str] = []
+    params: list[Any] = []
+    for width, lo, hi in _plan_sources(since, until_excl, widths):
+        if width is None:
+            selects.append(f"""
+                SELECT CAST(ts / {bucket} AS INTEGER) * {bucket} AS bucket_ts, model, {sums}
+                FROM turn_usage
+                WHERE ts >= ? AND ts < ?{filter_sql}""")
+        else:
+            group = next(g for g, w in ROLLUP_WIDTHS.items() if w == width)
+            selects.append(f"""
+                SELECT (bucket_ts / {bucket}) * {bucket} AS bucket_ts, NULLIF(model, '') AS model, {sums}
+                FROM {rollup_table(group)}
+                WHERE bucket_ts >= ? AND bucket_ts < ?{filter_sql}""")
+        params.extend([lo, hi, *filter_params])
+    if not selects:
+        return []
 
-    where_clause = " AND ".join(wheres)
     # Group by bucket+model so we can build the per-model breakdown directly.
     sql = f"""
         SELECT
-            strftime('{fmt}', ts, 'unixepoch')                               AS bucket_label,
-            CAST(strftime('%s', strftime('{fmt}', ts, 'unixepoch')) AS INTEGER) AS bucket_ts,
+            bucket_ts,
             model,
             SUM(input_tokens)       AS input_tokens,
             SUM(output_tokens)      AS output_tokens,
             SUM(cache_write_tokens) AS cache_write_tokens,
             SUM(cache_read_tokens)  AS cache_read_tokens
-        FROM turn_usage
-        WHERE {where_clause}
-        GROUP BY bucket_label, model
-        ORDER BY bucket_label, model
+        FROM ({" UNION ALL ".join(selects)})
+        GROUP BY bucket_ts, model
+        ORDER BY bucket_ts, model
     """
     raw = await db.execute_read(sql, params)
+    for row in raw:
+        row["bucket_label"] = datetime.fromtimestamp(row["bucket_ts"], UTC).strftime(fmt)
 
     # Aggregate per bucket
     bucket_map: dict[str, dict[str, Any]] = {}
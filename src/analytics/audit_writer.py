@@ -279,9 +279,13 @@ class AuditWriter:
             timestamp = comm_data.get("timestamp") or time.time()
             comm_type = comm_data.get("comm_type", "")
             from_id = comm_data.get("from_minion_id") or "user"
-            to_id = comm_data.get("to_minion_id") or "user"
+            # Fan-out comms keep their recipients as a list
+            recipients = list(comm_data.get("to_minion_ids") or [])
+            to_id = comm_data.get("to_minion_id") or recipients or "user"
             from_name = comm_data.get("from_minion_name") or from_id
-            to_name = comm_data.get("to_minion_name") or to_id
+            to_name = comm_data.get("to_minion_name") or (
+                ", ".join(to_id) if isinstance(to_id, list) else to_id
+            )
             summary_text = comm_data.get("summary") or comm_data.get("content", "")[:80]
             summary = _truncate(f"[{comm_type}] {from_name} → {to_name}: {summary_text}")
             extra = {
@@ -1,7 +1,7 @@
 """AnalyticsDB: SQLite connection manager for the analytics subsystem.
 
-Owns the audit_events table (issue #1127) and is the designated home for
-#1125 cost-tracking tables when that PR lands.
+Owns the audit_events table (issue #1127), the #1125 cost-tracking tables and
+their hourly/daily rollups (see rollups.py).
 
 Connection model:
 - Single write connection serialized via asyncio.Lock (WAL allows concurrent reads).
@@ -16,6 +16,8 @@ import sqlite3
 from pathlib import Path
 from typing import Any
 
+from . import rollups
+
 logger = logging.getLogger(__name__)
 
 _DDL = """
@@ -63,6 +65,7 @@ CREATE TABLE IF NOT EXISTS turn_usage (
   UNIQUE(session_id, turn_seq)
 );
 CREATE INDEX IF NOT EXISTS idx_turn_session ON turn_usage(session_id);
+CREATE INDEX IF NOT EXISTS idx_turn_ts ON turn_usage(ts);
 
 CREATE TABLE IF NOT EXISTS session_usage (
   session_id          TEXT PRIMARY KEY,
@@ -75,7 +78,7 @@ CREATE TABLE IF NOT EXISTS session_usage (
   sdk_total_cost_usd  REAL,
   last_updated        REAL    NOT NULL
 );
-"""
+""" + rollups.ROLLUP_DDL
 
 
 class AnalyticsDB:
@@ -120,6 +123,9 @@ class AnalyticsDB:
         self._write_conn.execute("PRAGMA busy_timeout=5000")
         self._write_conn.executescript(_DDL)
         self._write_conn.commit()
+        if rollups.needs_backfill(self._write_conn):
+            count = rollups.rebuild(self._write_conn)
+            logger.info("Backfilled usage rollups from %d turns", count)
 
         self._read_conn = sqlite3.connect(str(self._path), check_same_thread=False)
         self._read_conn.row_factory = sqlite3.Row
@@ -176,6 +182,14 @@ class AnalyticsDB:
         self._write_conn.executemany(sql, rows)
         self._write_conn.commit()
 
+    async def rebuild_rollups(self) -> int:
+        """Recompute the usage rollup tables from turn_usage; returns the turn count."""
+        if not self._initialized:
+            raise RuntimeError("AnalyticsDB not initialized")
+        async with self._write_lock:
+            loop = asyncio.get_event_loop()
+            return await loop.run_in_executor(None, rollups.rebuild, self._write_conn)
+
     # ------------------------------------------------------------------
     # Read helpers
     # ------------------------------------------------------------------
@@ -0,0 +1,135 @@
+"""Hourly and daily usage rollups over turn_usage.
+
+``usage_rollup_hour`` and ``usage_rollup_day`` hold one row per
+(bucket_ts, session_id, model) with summed token counts. Project views are
+built from the session rows (the usage endpoint filters by session_ids), so no
+separate per-project table is needed.
+
+Rollups are maintained incrementally by triggers on turn_usage. The INSERT
+OR IGNORE in AnalyticsStore.record_turn folds each new turn into its hour and
+day rows in the same statement. An ignored replay fires nothing, and deleting
+turns subtracts them again. Any other write path stays consistent too.
+
+Buckets are UTC and aligned to the epoch (``bucket_ts = ts // width * width``),
+matching the ``strftime(..., 'unixepoch')`` labels used by the aggregator.
+
+Backfill: AnalyticsDB rebuilds the rollups on startup when turn_usage has rows
+but the rollup tables are empty (first start after upgrading). To rebuild them
+by hand::
+
+    python main.py --data-dir ./data --rebuild-analytics-rollups
+"""
+from __future__ import annotations
+
+import sqlite3
+
+ROLLUP_WIDTHS = {"hour": 3600, "day": 86400}
+
+_COUNT_FIELDS = ("input_tokens", "output_tokens", "cache_write_tokens", "cache_read_tokens")
+
+
+def rollup_table(group_by: str) -> str:
+    return f"usage_rollup_{group_by}"
+
+
+def _table_ddl(table: str) -> str:
+    counts = "\n".join(f"  {f:<19} INTEGER NOT NULL DEFAULT 0," for f in _COUNT_FIELDS)
+    return f"""
+CREATE TABLE IF NOT EXISTS {table} (
+  bucket_ts           INTEGER NOT NULL,
+  session_id          TEXT    NOT NULL,
+  model               TEXT    NOT NULL DEFAULT '',
+  turn_count          INTEGER NOT NULL DEFAULT 0,
+{counts}
+  sdk_total_cost_usd  REAL,
+  last_ts             REAL,
+  PRIMARY KEY (bucket_ts, session_id, model)
+);
+CREATE INDEX IF NOT EXISTS idx_{table}_session ON {table}(session_id, bucket_ts);
+"""
+
+
+def _insert_trigger_body(table: str, width: int) -> str:
+    cols = ", ".join(_COUNT_FIELDS)
+    new_vals = ", ".join(f"NEW.{f}" for f in _COUNT_FIELDS)
+    adds = ",\n      ".join(f"{f} = {f} + excluded.{f}" for f in _COUNT_FIELDS)
+    return f"""
+  INSERT INTO {table}
+    (bucket_ts, session_id, model, turn_count, {cols}, sdk_total_cost_usd, last_ts)
+  VALUES
+    (CAST(NEW.ts / {width} AS INTEGER) * {width}, NEW.session_id, COALESCE(NEW.model, ''),
+     1, {new_vals}, NEW.sdk_total_cost_usd, NEW.ts)
+  ON CONFLICT(bucket_ts, session_id, model) DO UPDATE SET
+      turn_count = turn_count + 1,
+      {adds},
+      sdk_total_cost_usd = CASE
+        WHEN excluded.sdk_total_cost_usd IS NULL THEN sdk_total_cost_usd
+        ELSE COALESCE(sdk_total_cost_usd, 0) + excluded.sdk_total_cost_usd END,
+      last_ts = MAX(COALESCE(last_ts, excluded.last_ts), excluded.last_ts);"""
+
+
+def _delete_trigger_body(table: str, width: int) -> str:
+    subs = ",\n      ".join(f"{f} = {f} - OLD.{f}" for f in _COUNT_FIELDS)
+    key = (
+        f"bucket_ts = CAST(OLD.ts / {width} AS INTEGER) * {width} "
+        "AND session_id = OLD.session_id AND model = COALESCE(OLD.model, '')"
+    )
+    return f"""
+  UPDATE {table} SET
+      turn_count = turn_count - 1,
+      {subs},
+      sdk_total_cost_usd = sdk_total_cost_usd - COALESCE(OLD.sdk_total_cost_usd, 0)
+  WHERE {key};
+  DELETE FROM {table} WHERE {key} AND turn_count <= 0;"""
+
+
+def _rollup_ddl() -> str:
+    parts = [_table_ddl(rollup_table(g)) for g in ROLLUP_WIDTHS]
+    inserts = "".join(_insert_trigger_body(rollup_table(g), w) for g, w in ROLLUP_WIDTHS.items())
+    deletes = "".join(_delete_trigger_body(rollup_table(g), w) for g, w in ROLLUP_WIDTHS.items())
+    parts.append(
+        f"CREATE TRIGGER IF NOT EXISTS trg_turn_usage_rollup_insert\n"
+        f"AFTER INSERT ON turn_usage\nBEGIN{inserts}\nEND;\n"
+    )
+    parts.append(
+        f"CREATE TRIGGER IF NOT EXISTS trg_turn_usage_rollup_delete\n"
+        f"AFTER DELETE ON turn_usage\nBEGIN{deletes}\nEND;\n"
+    )
+    return "".join(parts)
+
+
+ROLLUP_DDL = _rollup_ddl()
+
+
+def needs_backfill(conn: sqlite3.Connection) -> bool:
+    """True when turn_usage has rows but no rollup has been built from them."""
+    has_turns = conn.execute("SELECT EXISTS(SELECT 1 FROM turn_usage)").fetchone()[0]
+    has_rollups = conn.execute(
+        f"SELECT EXISTS(SELECT 1 FROM {rollup_table('day')})"
+    ).fetchone()[0]
+    return bool(has_turns) and not has_rollups
+
+
+def rebuild(conn: sqlite3.Connection) -> int:
+    """Recompute every rollup table from turn_usage in one transaction.
+
+    Returns the number of turn_usage rows folded in.
+    """
+    cols = ", ".join(_COUNT_FIELDS)
+    sums = ", ".join(f"SUM({f})" for f in _COUNT_FIELDS)
+    with conn:
+        for group_by, width in ROLLUP_WIDTHS.items():
+            table = rollup_table(group_by)
+            conn.execute(f"DELETE FROM {table}")
+            conn.execute(
+                f"""
+                INSERT INTO {table}
+                  (bucket_ts, session_id, model, turn_count, {cols}, sdk_total_cost_usd, last_ts)
+                SELECT CAST(ts / {width} AS INTEGER) * {width}, session_id, COALESCE(model, ''),
+                       COUNT(*), {sums}, SUM(sdk_total_cost_usd), MAX(ts)
+                FROM turn_usage
+                GROUP BY 1, 2, 3
+                """
+            )
+        return conn.execute("SELECT COUNT(*) FROM turn_usage").fetchone()[0]
+
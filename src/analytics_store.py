@@ -40,7 +40,11 @@ class AnalyticsStore:
         usage: dict,
         sdk_total_cost_usd: float | None,
     ) -> None:
-        """Insert a turn_usage row (idempotent) and upsert session aggregate."""
+        """Insert a turn_usage row (idempotent) and upsert session aggregate.
+
+        The insert also folds the turn into the hourly/daily usage rollups via
+        the turn_usage triggers (src/analytics/rollups.py); replays do not.
+        """
         input_tokens = int(usage.get("input_tokens") or 0)
         output_tokens = int(usage.get("output_tokens") or 0)
         # SDK uses cache_creation_input_tokens; normalize to cache_write_tokens
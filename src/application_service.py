@@ -126,6 +126,12 @@ class ApplicationService:
         if not project:
             return {"success": False, "error": "not_found"}
         success = await self.coordinator.project_manager.delete_project(project_id)
+        legion_system = getattr(self.coordinator, "legion_system", None)
+        if success and legion_system is not None:
+            # project_id IS the legion_id: release its schedule history store
+            # and timeline index
+            await legion_system.scheduler_service.forget_legion(project_id)
+            legion_system.timeline_store.discard(project_id)
         return {"success": success}
 
     async def toggle_project_expansion(self, project_id: str) -> dict | None:
@@ -262,6 +268,9 @@ class ApplicationService:
         session = await self.coordinator.session_manager.get_session_info(session_id)
         if not session:
             return None
+        storage = await self.coordinator.get_session_storage(session_id)
+        if storage:
+            await storage.flush()
         return str(self.coordinator.data_dir / "sessions" / session_id / "messages.jsonl")
 
     # =========================================================================
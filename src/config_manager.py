@@ -239,7 +239,7 @@ class SecretsConfig:
 
 @dataclass
 class HistoryRetentionConfig:
-    """Retention policy for schedule_history.jsonl rotation."""
+    """Retention policy for schedule execution history (schedule_history.db)."""
 
     max_entries: int = 500
     max_age_days: int = 30
@@ -248,6 +248,33 @@ class HistoryRetentionConfig:
     enabled: bool = True
 
 
+@dataclass
+class SchedulerConfig:
+    """Execution pool limits and lateness threshold for scheduled fires."""
+
+    max_concurrent_fires: int = 8  # across all legions; 0 = unlimited
+    max_concurrent_fires_per_legion: int = 4  # 0 = unlimited
+    max_lateness_seconds: int = 300  # later than this, the schedule's late_policy applies
+
+
+@dataclass
+class MessageLogConfig:
+    """Write-behind policy for per-session messages.jsonl appends."""
+
+    flush_bytes: int = 65536
+    flush_interval_ms: int = 50
+    fsync_on_result: bool = True
+    idle_close_seconds: int = 30
+
+
+@dataclass
+class SessionCatalogConfig:
+    """SQLite session catalog replacing per-session state.json as the source of truth."""
+
+    enabled: bool = False
+    export_interval_seconds: float = 5.0  # state.json compatibility export cadence
+
+
 @dataclass
 class AppConfig:
     networking: NetworkingConfig = field(default_factory=NetworkingConfig)
@@ -259,6 +286,9 @@ class AppConfig:
     secrets: SecretsConfig = field(default_factory=SecretsConfig)
     pricing: PricingConfig = field(default_factory=PricingConfig)
     history_retention: HistoryRetentionConfig = field(default_factory=HistoryRetentionConfig)
+    scheduler: SchedulerConfig = field(default_factory=SchedulerConfig)
+    message_log: MessageLogConfig = field(default_factory=MessageLogConfig)
+    session_catalog: SessionCatalogConfig = field(default_factory=SessionCatalogConfig)
 
     @classmethod
     def from_dict(cls, data: dict) -> "AppConfig":
@@ -338,6 +368,24 @@ class AppConfig:
             rotation_trigger_count=hr_data.get("rotation_trigger_count", 100),
             enabled=hr_data.get("enabled", True),
         )
+        sched_data = data.get("scheduler", {})
+        scheduler = SchedulerConfig(
+            max_concurrent_fires=sched_data.get("max_concurrent_fires", 8),
+            max_concurrent_fires_per_legion=sched_data.get("max_concurrent_fires_per_legion", 4),
+            max_lateness_seconds=sched_data.get("max_lateness_seconds", 300),
+        )
+        ml_data = data.get("message_log", {})
+        message_log = MessageLogConfig(
+            flush_bytes=ml_data.get("flush_bytes", 65536),
+            flush_interval_ms=ml_data.get("flush_interval_ms", 50),
+            fsync_on_result=ml_data.get("fsync_on_result", True),
+            idle_close_seconds=ml_data.get("idle_close_seconds", 30),
+        )
+        sc_data = data.get("session_catalog", {})
+        session_catalog = SessionCatalogConfig(
+            enabled=sc_data.get("enabled", False),
+            export_interval_seconds=sc_data.get("export_interval_seconds", 5.0),
+        )
         # Strip legacy key so next save cleans up old config files (migration handled by ProviderCatalogStore)
         data.pop("provider_catalog", None)
         return cls(
@@ -350,6 +398,9 @@ class AppConfig:
             secrets=secrets,
             pricing=pricing,
             history_retention=history_retention,
+            scheduler=scheduler,
+            message_log=message_log,
+            session_catalog=session_catalog,
         )
 
     def to_dict(self) -> dict:
@@ -421,7 +472,7 @@ class AppConfig:
             "pricing": self.pricing.to_dict(),
             "history_retention": {
                 "_comment": (
-                    "Rotation policy for schedule_history.jsonl. Set enabled=false to disable "
+                    "Retention policy for schedule execution history. Set enabled=false to disable "
                     "rotation (log grows unbounded). Metrics are maintained regardless."
                 ),
                 "max_entries": self.history_retention.max_entries,
@@ -430,6 +481,34 @@ class AppConfig:
                 "rotation_trigger_count": self.history_retention.rotation_trigger_count,
                 "enabled": self.history_retention.enabled,
             },
+            "scheduler": {
+                "_comment": (
+                    "Concurrency caps for scheduled fires (0 = unlimited). Fires that start more "
+                    "than max_lateness_seconds late follow each schedule's late_policy."
+                ),
+                "max_concurrent_fires": self.scheduler.max_concurrent_fires,
+                "max_concurrent_fires_per_legion": self.scheduler.max_concurrent_fires_per_legion,
+                "max_lateness_seconds": self.scheduler.max_lateness_seconds,
+            },
+            "message_log": {
+                "_comment": (
+                    "Write-behind buffering for session messages.jsonl. flush_bytes=0 writes "
+                    "every message immediately. fsync_on_result syncs to disk at each turn end."
+                ),
+                "flush_bytes": self.message_log.flush_bytes,
+                "flush_interval_ms": self.message_log.flush_interval_ms,
+                "fsync_on_result": self.message_log.fsync_on_result,
+                "idle_close_seconds": self.message_log.idle_close_seconds,
+            },
+            "session_catalog": {
+                "_comment": (
+                    "Keep session metadata in data/sessions.db (SQLite) instead of rewriting "
+                    "state.json on every change. state.json files are still exported for "
+                    "compatibility every export_interval_seconds."
+                ),
+                "enabled": self.session_catalog.enabled,
+                "export_interval_seconds": self.session_catalog.export_interval_seconds,
+            },
         }
 
 
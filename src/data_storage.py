@@ -14,6 +14,8 @@ from pathlib import Path
 from typing import Any
 
 from .logging_config import get_logger
+from .message_index import MessageOffsetIndex
+from .message_log_writer import MessageFlushPolicy, MessageLogWriter
 from .timestamp_utils import get_unix_timestamp
 
 # Get specialized logger for storage debugging
@@ -25,9 +27,16 @@ logger = logging.getLogger(__name__)
 class DataStorageManager:
     """Manages persistent storage for session data"""
 
-    def __init__(self, session_directory: Path):
+    def __init__(self, session_directory: Path, flush_policy: MessageFlushPolicy | None = None):
         self.session_dir = Path(session_directory)
         self.messages_file = self.session_dir / "messages.jsonl"
+        # Sidecar line-offset index so paginated reads seek instead of scanning
+        self.messages_index = MessageOffsetIndex(self.messages_file)
+        # Long-lived buffered appender; default policy is write-through
+        self.messages_writer = MessageLogWriter(self.messages_file, self.messages_index, flush_policy)
+        # Bumped whenever messages.jsonl is rewritten rather than appended to,
+        # so derived caches (history projection) know to rebuild.
+        self.generation = 0
         self.state_file = self.session_dir / "state.json"
         # Resource storage paths (issue #404 expansion - supports all file types)
         self.resources_dir = self.session_dir / "resources"
@@ -68,10 +77,9 @@ class DataStorageManager:
             if 'message_id' not in message_data:
                 message_data['message_id'] = str(uuid.uuid4())
 
-            # Append to JSONL file
-            with open(self.messages_file, 'a', encoding='utf-8') as f:
-                json.dump(message_data, f, ensure_ascii=False)
-                f.write('\n')
+            # Append to JSONL file (buffered; ResultMessage closes a turn and is made durable)
+            line = (json.dumps(message_data, ensure_ascii=False) + '\n').encode('utf-8')
+            self.messages_writer.write(line, durable=message_data.get('_type') == 'ResultMessage')
 
             storage_logger.debug(f"Appended message to {self.session_dir.name}")
 
@@ -85,24 +93,47 @@ class DataStorageManager:
             logger.exception("Failed to append message")
             raise
 
+    async def flush(self, fsync: bool = False):
+        """Write any buffered messages to messages.jsonl (before archive/copy/scan)."""
+        try:
+            await self.messages_writer.aflush(fsync=fsync)
+        except Exception:
+            logger.exception("Failed to flush messages")
+
+    async def close(self):
+        """Flush buffered messages and release the long-lived log handle."""
+        try:
+            await self.messages_writer.close()
+        except Exception:
+            logger.exception("Failed to close message log")
+
     async def read_messages(self, limit: int | None = None, offset: int = 0) -> list[dict[str, Any]]:
-        """Read messages from activity log with pagination"""
+        """Read messages from activity log with pagination.
+
+        Negative ``offset`` counts from the end of the log (``offset=-50`` returns
+        the last 50 messages). Uses the sidecar offset index to seek straight to
+        the requested page; falls back to a full scan if the index is unusable.
+        """
         try:
             messages = []
+            self.messages_writer.flush()
 
             if not self.messages_file.exists():
                 return messages
 
-            with open(self.messages_file, encoding='utf-8') as f:
-                lines = f.readlines()
-
-            # Apply offset and limit
-            start_idx = offset
-            end_idx = start_idx + limit if limit else None
-            selected_lines = lines[start_idx:end_idx]
-
-            for line in selected_lines:
-                line = line.strip()
+            try:
+                start, stop = self.messages_index.resolve(offset, limit or None)
+                selected_lines = self.messages_index.read_lines(start, stop)
+            except OSError:
+                logger.exception("Message index unavailable, falling back to full scan")
+                with open(self.messages_file, 'rb') as f:
+                    lines = [line for line in f if line.strip()]
+                start_idx = max(len(lines) + offset, 0) if offset < 0 else offset
+                end_idx = start_idx + limit if limit else None
+                selected_lines = lines[start_idx:end_idx]
+
+            for raw_line in selected_lines:
+                line = raw_line.decode('utf-8').strip()
                 if line:
                     try:
                         message = json.loads(line)
@@ -115,12 +146,50 @@ class DataStorageManager:
             logger.exception("Failed to read messages")
             return []
 
+    async def find_message_line(self, message_id: str, block_size: int = 512) -> int | None:
+        """Return the record number of the newest message whose ``message_id`` matches.
+
+        Scans backwards from the tail ``block_size`` records at a time through the
+        offset index, so ids near the end (the common case for history cursors)
+        resolve without touching the rest of the file. Only lines containing the
+        encoded id are JSON-decoded.
+        """
+        try:
+            self.messages_writer.flush()
+            if not self.messages_file.exists():
+                return None
+            needle = json.dumps(message_id).encode('utf-8')
+            stop = self.messages_index.count()
+            while stop > 0:
+                start = max(stop - block_size, 0)
+                lines = self.messages_index.read_lines(start, stop)
+                base = stop - len(lines)
+                for i in range(len(lines) - 1, -1, -1):
+                    if needle not in lines[i]:
+                        continue
+                    try:
+                        if json.loads(lines[i]).get("message_id") == message_id:
+                            return base + i
+                    except (json.JSONDecodeError, AttributeError):
+                        continue
+                stop = start
+            return None
+        except Exception:
+            logger.exception("Failed to look up message %s", message_id)
+            return None
+
     async def get_message_count(self) -> int:
-        """Get total number of messages in the log"""
+        """Get total number of messages in the log (constant-time via the offset index)"""
         try:
+            self.messages_writer.flush()
             if not self.messages_file.exists():
                 return 0
 
+            try:
+                return self.messages_index.count()
+            except OSError:
+                logger.exception("Message index unavailable, counting by full scan")
+
             count = 0
             with open(self.messages_file, encoding='utf-8') as f:
                 for line in f:
@@ -140,11 +209,16 @@ class DataStorageManager:
         Used when resetting a session.
         """
         try:
+            # Drop buffered writes and the open handle before truncating
+            await self.messages_writer.discard()
+
             # Truncate messages file
             messages_path = self.messages_file
             if messages_path.exists():
                 messages_path.write_text("")  # Truncate to empty
                 storage_logger.info(f"Cleared all messages for session {self.session_dir.name}")
+            self.messages_index.invalidate()
+            self.generation += 1
 
             return True
 
@@ -153,12 +227,15 @@ class DataStorageManager:
             return False
 
     async def clear_queue(self) -> bool:
-        """Truncate queue.jsonl to empty (issue #1244 reset cleanup)."""
+        """Truncate queue.jsonl to empty and drop its compaction snapshot and archive
+        (issue #1244 reset cleanup)."""
         try:
             queue_file = self.session_dir / "queue.jsonl"
             if queue_file.exists():
                 queue_file.write_bytes(b"")
                 storage_logger.info(f"Cleared queue.jsonl for session {self.session_dir.name}")
+            for name in ("queue_snapshot.json", "queue_archive.jsonl"):
+                (self.session_dir / name).unlink(missing_ok=True)
             return True
         except Exception:
             logger.exception("Failed to clear queue")
@@ -180,6 +257,8 @@ class DataStorageManager:
     async def cleanup(self):
         """Cleanup and ensure all file handles and directory references are closed"""
         try:
+            await self.close()
+
             # Force garbage collection to close any lingering file handles
             gc.collect()
 
@@ -196,6 +275,8 @@ class DataStorageManager:
                 # Clear all path references that might hold directory handles
                 self.session_dir = None
                 self.messages_file = None
+                self.messages_index = None
+                self.messages_writer = None
                 self.state_file = None
                 self.resources_dir = None
                 self.resources_metadata_file = None
@@ -13,6 +13,10 @@ Replaces the static credentials.json model with a REST-fetch approach:
   - response(): scrubs raw values from inbound responses (defense-in-depth,
                 all types); writes back captured tokens via session-scoped PATCH.
 
+access.log and socks5.log entries are handed to a background _LogWriter thread
+(batched writes, size-based rotation with an index file) so logging never blocks
+the proxy's event loop.
+
 Typed injection/scrub handlers are inlined (addon.py must be self-contained
 inside the Docker image — it cannot import from the host src/ tree).
 """
@@ -27,7 +31,9 @@ import ipaddress
 import json
 import logging
 import os
+import queue
 import re
+import threading
 import time
 from datetime import UTC, datetime, timedelta
 from pathlib import Path
@@ -46,6 +52,16 @@ LOG_DIR = "/var/log/proxy"
 WEBUI_BASE_URL = os.environ.get("WEBUI_BASE_URL", "http://cc-webui.internal:8000")
 SOCKS5_LOG_FILENAME = "socks5.log"
 
+# access.log / socks5.log rotation: the live file rolls to <name>.1 once it
+# reaches LOG_MAX_BYTES; LOG_BACKUPS rotated segments are kept and described
+# in <name>.index.json (newest first).
+LOG_MAX_BYTES = int(os.environ.get("PROXY_LOG_MAX_BYTES", str(64 * 1024 * 1024)))
+LOG_BACKUPS = int(os.environ.get("PROXY_LOG_BACKUPS", "4"))
+# Entries waiting for the writer thread; beyond this, entries are dropped
+# (and counted in the index file) rather than blocking the proxy.
+LOG_QUEUE_SIZE = 10000
+LOG_BATCH_MAX = 500
+
 _BINARY_CONTENT_TYPES = frozenset({
     "image/", "audio/", "video/",
     "application/octet-stream", "application/zip",
@@ -57,6 +73,138 @@ _BINARY_CONTENT_TYPES = frozenset({
 _TIER_REGEX = re.compile(r"\b(haiku|sonnet|opus)\b", re.IGNORECASE)
 
 
+# ---------------------------------------------------------------------------
+# Background log writer
+# ---------------------------------------------------------------------------
+
+_LOG_STOP = object()
+
+
+def _read_ts(line: bytes) -> str | None:
+    try:
+        return json.loads(line).get("ts")
+    except (ValueError, AttributeError):
+        return None
+
+
+def _segment_stats(path: Path) -> dict:
+    """Index entry for a rotated segment: first/last ts, line count, size."""
+    lines = 0
+    first = b""
+    with open(path, "rb") as f:
+        first = f.readline()
+        f.seek(0)
+        while block := f.read(1024 * 1024):
+            lines += block.count(b"\n")
+        size = f.tell()
+        f.seek(max(0, size - 65536))
+        tail = f.read().rstrip(b"\n").rsplit(b"\n", 1)[-1]
+    return {
+        "name": path.name,
+        "first_ts": _read_ts(first),
+        "last_ts": _read_ts(tail),
+        "lines": lines,
+        "bytes": size,
+    }
+
+
+class _LogWriter:
+    """JSONL log file written from a background thread.
+
+    write() only enqueues the entry dict, so mitmproxy hooks never serialize
+    or touch the disk. The thread drains the queue in batches (one write + flush
+    per batch), rotates the file by size and maintains <name>.index.json.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        max_bytes: int = LOG_MAX_BYTES,
+        backups: int = LOG_BACKUPS,
+        queue_size: int = LOG_QUEUE_SIZE,
+    ):
+        self.path = Path(path)
+        self.index_path = self.path.with_name(self.path.name + ".index.json")
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.dropped = 0
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._thread = threading.Thread(
+            target=self._run, name=f"proxy-log-{self.path.name}", daemon=True
+        )
+        self._thread.start()
+
+    def write(self, entry: dict) -> None:
+        try:
+            self._queue.put_nowait(entry)
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Flush queued entries and stop the thread."""
+        try:
+            self._queue.put(_LOG_STOP, timeout=timeout)
+        except queue.Full:
+            pass
+        self._thread.join(timeout)
+
+    def _run(self) -> None:
+        f = open(self.path, "a", encoding="utf-8")  # noqa: SIM115
+        try:
+            while True:
+                batch = [self._queue.get()]
+                while len(batch) < LOG_BATCH_MAX:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+                stop = any(entry is _LOG_STOP for entry in batch)
+                lines = [json.dumps(entry) + "\n" for entry in batch if entry is not _LOG_STOP]
+                if lines:
+                    f.write("".join(lines))
+                    f.flush()
+                    if f.tell() >= self.max_bytes:
+                        f.close()
+                        self._rotate()
+                        f = open(self.path, "a", encoding="utf-8")  # noqa: SIM115
+                if stop:
+                    return
+        except Exception as exc:
+            logging.getLogger("proxy.addon").error(f"Log writer for {self.path} stopped: {exc}")
+        finally:
+            f.close()
+
+    def _rotate(self) -> None:
+        """Shift <name>.N → <name>.N+1, move the live file to <name>.1, rewrite the index."""
+        def segment(n: int) -> Path:
+            return self.path.with_name(f"{self.path.name}.{n}")
+
+        try:
+            previous = json.loads(self.index_path.read_text()).get("segments", [])
+        except (OSError, ValueError):
+            previous = []
+        by_name = {entry.get("name"): entry for entry in previous}
+
+        segment(self.backups).unlink(missing_ok=True)
+        shifted = []
+        for n in range(self.backups - 1, 0, -1):
+            if segment(n).exists():
+                os.replace(segment(n), segment(n + 1))
+                entry = dict(by_name.get(segment(n).name) or _segment_stats(segment(n + 1)))
+                entry["name"] = segment(n + 1).name
+                shifted.insert(0, entry)
+        os.replace(self.path, segment(1))
+
+        index = {
+            "live": self.path.name,
+            "segments": [_segment_stats(segment(1)), *shifted],
+            "dropped": self.dropped,
+        }
+        tmp = self.index_path.with_name(self.index_path.name + ".tmp")
+        tmp.write_text(json.dumps(index, indent=2))
+        os.replace(tmp, self.index_path)
+
+
 # ---------------------------------------------------------------------------
 # Injection helpers — one function per secret type
 # ---------------------------------------------------------------------------
@@ -308,51 +456,106 @@ def _scrub_everywhere(
 # Streaming chunk-filter helpers (issue #1400)
 # ---------------------------------------------------------------------------
 
-def _make_chunk_filter(pairs: list[tuple[bytes, bytes]]):
+class _SecretMatcher:
+    """All needles of a pair set compiled into one pattern, scanned in a single pass.
+
+    The needles become one ``re`` alternation, longest first, so at each offset
+    the longest needle wins (leftmost-longest, non-overlapping). The regex engine
+    runs the scan in C and skips offsets whose byte cannot start any needle, so
+    cost is one pass over the data regardless of how many secrets are loaded.
+    A pure-Python Aho-Corasick automaton was measured ~100x slower than this on
+    10 MB streams; the alternation plays the same single-scan role. A lone
+    needle uses bytes.replace/find directly, which beats the regex for one secret.
+    """
+
+    __slots__ = ("_pattern", "_single", "_table", "overlap")
+
+    def __init__(self, pairs: tuple[tuple[bytes, bytes], ...]):
+        if not pairs:
+            raise ValueError("pairs must be non-empty")
+        self._table = dict(pairs)
+        needles = sorted(self._table, key=len, reverse=True)
+        self._pattern = re.compile(b"|".join(re.escape(n) for n in needles))
+        self._single = next(iter(self._table.items())) if len(needles) == 1 else None
+        # Bytes a needle can still extend into the next chunk
+        self.overlap = max(0, len(needles[0]) - 1)
+
+    def sub(self, data: bytes) -> bytes:
+        if self._single is not None:
+            return data.replace(*self._single)
+        return self._pattern.sub(self._replace, data)
+
+    def _replace(self, match: re.Match) -> bytes:
+        return self._table[match.group(0)]
+
+    def sub_prefix(self, data: bytes) -> tuple[bytes, bytes]:
+        """Replace every match that starts before the last ``overlap`` bytes.
+
+        Returns (output, carry): carry is the raw unscanned tail (at most
+        ``overlap`` bytes) that a needle split across chunks could still start in.
+        """
+        hold = len(data) - self.overlap
+        if hold <= 0:
+            return b"", data
+        parts = []
+        pos = 0
+        # A match starting before hold is complete: hold leaves room for the longest needle
+        if self._single is not None:
+            needle, replacement = self._single
+            start = data.find(needle, 0, hold + len(needle) - 1)
+            while start != -1:
+                parts.append(data[pos:start])
+                parts.append(replacement)
+                pos = start + len(needle)
+                start = data.find(needle, pos, hold + len(needle) - 1)
+        else:
+            for match in self._pattern.finditer(data):
+                start = match.start()
+                if start >= hold:
+                    break
+                parts.append(data[pos:start])
+                parts.append(self._table[match.group(0)])
+                pos = match.end()
+        if pos < hold:
+            parts.append(data[pos:hold])
+            pos = hold
+        return b"".join(parts), data[pos:]
+
+
+def _make_chunk_filter(pairs: list[tuple[bytes, bytes]], matcher: _SecretMatcher | None = None):
     """Return a stateful per-chunk replacement callable for mitmproxy stream hooks.
 
     The callable accepts bytes chunks from mitmproxy's stream interface.
     The end-of-stream sentinel is b"" (per mitmproxy proxy/layers/http/__init__.py).
-    Pairs are sorted longest-needle-first so greedy bytes.replace doesn't leave
-    prefix remnants when two needles overlap (e.g. b"AB" shadowed by b"ABC").
+    Matching is leftmost-longest, so when two needles overlap (e.g. b"AB" and
+    b"ABC") the longer one wins.
 
-    Performance note: uses N bytes.replace() calls per emit (one per pair).
-    For typical 1-10 secrets this is dominated by network I/O. Aho-Corasick
-    is the deferred optimisation if profiling reveals a hot path.
+    Each chunk is scanned once by a _SecretMatcher for the pair set (``matcher``
+    when the caller holds a compiled one, else built here). Up to
+    max_needle_len - 1 raw bytes are carried into the next call so needles
+    that span a chunk boundary are still replaced.
     """
     if not pairs:
         raise ValueError("pairs must be non-empty")
-    # Longest needle first — prevents prefix-needle from eating bytes that
-    # should match a longer needle.
-    pairs = sorted(pairs, key=lambda p: len(p[0]), reverse=True)
-    max_needle_len = max(len(needle) for needle, _ in pairs)
-    overlap = max(0, max_needle_len - 1)
-    carry = bytearray()
+    matcher = matcher or _SecretMatcher(tuple(pairs))
+    carry = b""
 
     def _filter_chunk(chunk: bytes):
+        nonlocal carry
         if chunk == b"":
             # End-of-stream: flush whatever remains in the carry buffer.
-            result = bytes(carry)
-            carry.clear()
-            for needle, replacement in pairs:
-                result = result.replace(needle, replacement)
+            result = matcher.sub(carry)
+            carry = b""
             return result
-        # Apply replacements to the full buf (carry + chunk) before splitting.
-        # This ensures needles that span the carry/chunk boundary are caught.
-        buf = bytes(carry) + chunk
-        for needle, replacement in pairs:
-            buf = buf.replace(needle, replacement)
-        split_at = len(buf) - overlap
-        if split_at > 0:
-            carry[:] = buf[split_at:]
-            return buf[:split_at]
-        carry[:] = buf
-        return []
+        out, carry = matcher.sub_prefix(carry + chunk if carry else chunk)
+        return out if out else []
 
     return _filter_chunk
 
 
-def _make_unbuffered_chunk_filter(pairs: list[tuple[bytes, bytes]]):
+def _make_unbuffered_chunk_filter(
+    pairs: list[tuple[bytes, bytes]], matcher: _SecretMatcher | None = None
+):
     """Per-chunk replacement with NO carry buffer — for SSE/streamed responses.
 
     Cross-chunk-boundary needle detection is sacrificed for liveness;
@@ -363,19 +566,41 @@ def _make_unbuffered_chunk_filter(pairs: list[tuple[bytes, bytes]]):
     """
     if not pairs:
         raise ValueError("pairs must be non-empty")
-    pairs = sorted(pairs, key=lambda p: len(p[0]), reverse=True)
+    matcher = matcher or _SecretMatcher(tuple(pairs))
 
     def _filter_chunk(chunk: bytes) -> bytes:
         if chunk == b"":
             return b""
-        buf = chunk
-        for needle, replacement in pairs:
-            buf = buf.replace(needle, replacement)
-        return buf
+        return matcher.sub(chunk)
 
     return _filter_chunk
 
 
+def _count_stream_bytes(flow: http.HTTPFlow, stream):
+    """Wrap a response stream (a filter callable, or True for pass-through) so the
+    upstream byte total lands in flow.metadata["stream_bytes"]."""
+    flow.metadata["stream_bytes"] = 0
+
+    def _counting(chunk: bytes):
+        flow.metadata["stream_bytes"] += len(chunk)
+        return stream(chunk) if callable(stream) else chunk
+
+    return _counting
+
+
+def _response_bytes(flow: http.HTTPFlow) -> int:
+    """Response body size for the access log: the streamed total when the body was
+    streamed, else the buffered raw (still-encoded) body length."""
+    if "stream_bytes" in flow.metadata:
+        return flow.metadata["stream_bytes"]
+    if not flow.response:
+        return 0
+    raw = getattr(flow.response, "raw_content", None)
+    if not isinstance(raw, (bytes, bytearray)):
+        raw = flow.response.content
+    return len(raw) if raw else 0
+
+
 def _build_request_pairs(records: dict, host: str) -> list[tuple[bytes, bytes]]:
     """Build (placeholder_bytes, value_bytes) pairs for outbound body injection.
 
@@ -414,6 +639,64 @@ def _build_response_pairs(records: dict, host: str) -> list[tuple[bytes, bytes]]
     return result
 
 
+# ---------------------------------------------------------------------------
+# Per-host routing table
+# ---------------------------------------------------------------------------
+
+# Routes are cached per host; a sidecar seeing more distinct hosts than this
+# (e.g. a crawler hitting denied domains) starts the cache over.
+_ROUTE_CACHE_MAX = 4096
+_TERMINAL = ""  # trie key marking the end of an allowlisted domain (labels are never empty)
+
+
+class _DomainTrie:
+    """Allowlist domains as a trie of reversed labels.
+
+    A host is allowed when it equals a listed domain or is a subdomain of one —
+    the same rule as host == d or host.endswith("." + d) — decided in one walk
+    over the host's labels instead of one endswith per domain. "*" allows all.
+    """
+
+    __slots__ = ("_root", "match_all")
+
+    def __init__(self, domains):
+        self.match_all = "*" in domains
+        self._root: dict = {}
+        for domain in domains:
+            node = self._root
+            for label in reversed(domain.split(".")):
+                node = node.setdefault(label, {})
+            node[_TERMINAL] = True
+
+    def matches(self, host: str) -> bool:
+        if self.match_all:
+            return True
+        node = self._root
+        for label in reversed(host.split(".")):
+            node = node.get(label)
+            if node is None:
+                return False
+            if _TERMINAL in node:
+                return True
+        return False
+
+
+class _HostRoute:
+    """Everything requestheaders/request/responseheaders decide from the host alone."""
+
+    __slots__ = ("allowed", "records", "request_pairs", "response_pairs")
+
+    def __init__(self, host: str, trie: _DomainTrie, records: dict):
+        self.allowed = trie.matches(host)
+        # (placeholder, record) for records whose target_hosts include this host
+        self.records = [
+            (ph, record) for ph, record in records.items()
+            if _host_matches_targets(host, record.get("target_hosts") or [])
+        ]
+        self.request_pairs = _build_request_pairs(records, host)
+        self.response_pairs = _build_response_pairs(records, host)
+
+
 # ---------------------------------------------------------------------------
 # OAuth2 refresh helpers
 # ---------------------------------------------------------------------------
@@ -498,6 +781,8 @@ class ProxyAddon:
     def __init__(self):
         self._session_token: str = ""
         self._session_id: str = ""
+        self._routes: dict[str, _HostRoute] = {}   # host → cached routing decision
+        self._matchers: dict[tuple, _SecretMatcher] = {}  # pair set → compiled matcher
         self._records: dict[str, dict] = {}        # placeholder → full record dict
         self._refresh_locks: dict[str, asyncio.Lock] = {}
         self._routing: dict = {
@@ -507,18 +792,63 @@ class ProxyAddon:
             "default_model": None,
         }
         self.allowed_domains: set[str] = set()
+        self._domain_trie: _DomainTrie | None = None
         self.logger = logging.getLogger("proxy.addon")
         self._log_file = None
         self._socks5_log_file = None
         self._diag_log_file = None
         if Path(LOG_DIR).is_dir():
-            log_path = Path(LOG_DIR) / "access.log"
-            self._log_file = open(log_path, "a", buffering=1)  # line-buffered  # noqa: SIM115
-            socks5_path = Path(LOG_DIR) / SOCKS5_LOG_FILENAME
-            self._socks5_log_file = open(socks5_path, "a", buffering=1)  # noqa: SIM115
+            self._log_file = _LogWriter(Path(LOG_DIR) / "access.log")
+            self._socks5_log_file = _LogWriter(Path(LOG_DIR) / SOCKS5_LOG_FILENAME)
             diag_path = Path(LOG_DIR) / "diag.log"
             self._diag_log_file = open(diag_path, "a", buffering=1)  # noqa: SIM115
 
+    # Assigning records or the allowlist drops every cached route and matcher.
+    # In-place value changes (refresh, capture-back) call _invalidate_routes()
+    # directly, so no compiled matcher outlives the secret values it holds.
+
+    @property
+    def _records(self) -> dict[str, dict]:
+        return self._record_map
+
+    @_records.setter
+    def _records(self, records: dict[str, dict]) -> None:
+        self._record_map = records
+        self._invalidate_routes()
+
+    @property
+    def allowed_domains(self) -> set[str]:
+        return self._allowed_domain_set
+
+    @allowed_domains.setter
+    def allowed_domains(self, domains: set[str]) -> None:
+        self._allowed_domain_set = domains
+        self._domain_trie = None
+        self._invalidate_routes()
+
+    def _invalidate_routes(self) -> None:
+        self._routes = {}
+        self._matchers = {}
+
+    def _matcher(self, pairs: list[tuple[bytes, bytes]]) -> _SecretMatcher:
+        """Compiled matcher for a route's pair set, shared by every host with the same set."""
+        key = tuple(pairs)
+        matcher = self._matchers.get(key)
+        if matcher is None:
+            matcher = self._matchers[key] = _SecretMatcher(key)
+        return matcher
+
+    def _route(self, host: str) -> _HostRoute:
+        """Cached routing decision for host, compiled on first use."""
+        route = self._routes.get(host)
+        if route is None:
+            if self._domain_trie is None:
+                self._domain_trie = _DomainTrie(self.allowed_domains)
+            if len(self._routes) >= _ROUTE_CACHE_MAX:
+                self._routes = {}
+            route = self._routes[host] = _HostRoute(host, self._domain_trie, self._records)
+        return route
+
     def load(self, loader) -> None:
         """Read session config files. Secret fetch happens in running()."""
         try:
@@ -547,6 +877,7 @@ class ProxyAddon:
 
         try:
             self._routing = await self._fetch_routing()
+            self._invalidate_routes()
             if self._routing["hostname_rewrites"]:
                 ctx.log.info(
                     f"[proxy] Routing enabled: {self._routing['hostname_rewrites']}"
@@ -595,7 +926,8 @@ class ProxyAddon:
             flow.client_conn.peername[0] if flow.client_conn.peername else "unknown"
         )
 
-        if not self._is_allowed(host):
+        route = self._route(host)
+        if not route.allowed:
             ctx.log.warn(f"[proxy] DENY {client_ip} -> {host}{flow.request.path}")
             flow.response = http.Response.make(
                 403,
@@ -607,10 +939,7 @@ class ProxyAddon:
             return
 
         credential_used = None
-        for ph, record in self._records.items():
-            target_hosts = record.get("target_hosts") or []
-            if not _host_matches_targets(host, target_hosts):
-                continue
+        for ph, record in route.records:
             # Sentinel guard: when the request was rewritten to LiteLLM, skip
             # secret injection so Anthropic-targeted secrets don't overwrite the
             # virtual key that was just installed by the rewrite block above.
@@ -627,6 +956,7 @@ class ProxyAddon:
                             try:
                                 updates = await _do_refresh(record, self._get_partner_value)
                                 record.update(updates)
+                                self._invalidate_routes()
                                 await self._patch_secret(record["name"], updates)
                                 # Update rotated refresh token record if present
                                 new_rt_name = updates.get("_new_refresh_token_name")
@@ -635,6 +965,7 @@ class ProxyAddon:
                                     for rec2 in self._records.values():
                                         if rec2.get("name") == new_rt_name:
                                             rec2["value"] = new_rt_val
+                                            self._invalidate_routes()
                                             await self._patch_secret(new_rt_name, {"value": new_rt_val})
                                             break
                             except Exception as exc:
@@ -662,18 +993,16 @@ class ProxyAddon:
         # Header-side substitution above already covers headers/query; this covers
         # bodies that mitmproxy streams (flow.request.content will be None in
         # request() under stream_large_bodies).
-        request_pairs = _build_request_pairs(self._records, host)
+        # Re-read the route: an OAuth2 refresh above may have replaced it.
+        request_pairs = self._route(host).request_pairs
         if request_pairs and not _is_encoded_request(flow):
-            flow.request.stream = _make_chunk_filter(request_pairs)
+            flow.request.stream = _make_chunk_filter(request_pairs, self._matcher(request_pairs))
 
     async def request(self, flow: http.HTTPFlow) -> None:
         """Body-only injection phase. Allowlist and OAuth refresh already handled in requestheaders()."""
         if flow.metadata.get("denied"):
             return
-        host = flow.request.pretty_host
-        for ph, record in self._records.items():
-            if not _host_matches_targets(host, record.get("target_hosts") or []):
-                continue
+        for ph, record in self._route(flow.request.pretty_host).records:
             inject_fn = _INJECT_BODY_DISPATCH.get(record.get("type", "generic"))
             if inject_fn is None:
                 continue
@@ -691,23 +1020,35 @@ class ProxyAddon:
           - denied flows (set in requestheaders())
           - binary responses (Content-Type in _BINARY_CONTENT_TYPES)
           - flows with no records targeting this host
+        Streamed responses (ours or mitmproxy's stream_large_bodies) also get a
+        byte counter so the access log never needs the body in memory.
         """
         if flow.metadata.get("denied"):
             return
+        self._install_response_stream(flow)
+        if flow.response.stream:
+            flow.response.stream = _count_stream_bytes(flow, flow.response.stream)
+
+    def _install_response_stream(self, flow: http.HTTPFlow) -> None:
         if _is_binary_response(flow):
             return
         if _is_encoded_response(flow):
             return
-        response_pairs = _build_response_pairs(
-            self._records, flow.request.pretty_host
-        )
+        response_pairs = self._route(flow.request.pretty_host).response_pairs
         if not response_pairs:
             return
         # Issue #1425: SSE responses must not buffer carry bytes — use unbuffered filter.
+        matcher = self._matcher(response_pairs)
         if _is_sse_response(flow):
-            flow.response.stream = _make_unbuffered_chunk_filter(response_pairs)
+            flow.response.stream = _make_unbuffered_chunk_filter(response_pairs, matcher)
         else:
-            flow.response.stream = _make_chunk_filter(response_pairs)
+            flow.response.stream = _make_chunk_filter(response_pairs, matcher)
+
+    def done(self) -> None:
+        """mitmproxy shutdown hook: flush the background log writers."""
+        for writer in (self._log_file, self._socks5_log_file):
+            if writer:
+                writer.close()
 
     def _rewrite_model_in_body(self, flow: http.HTTPFlow) -> None:
         """Rewrite top-level `model` field in JSON body to LiteLLM alias.
@@ -784,6 +1125,7 @@ class ProxyAddon:
             _modified, captured = _scrub_everywhere(flow, record, ph)
             if captured is not None:
                 record["value"] = captured
+                self._invalidate_routes()
                 await self._patch_secret(record["name"], {"value": captured})
 
         self._write_access_log(
@@ -913,12 +1255,7 @@ class ProxyAddon:
             ctx.log.warn(f"[proxy] Failed to emit UI event {event_type}: {exc}")
 
     def _is_allowed(self, host: str) -> bool:
-        if "*" in self.allowed_domains:
-            return True
-        return any(
-            host == domain or host.endswith("." + domain)
-            for domain in self.allowed_domains
-        )
+        return self._route(host).allowed
 
     def _inject_credentials(self, flow: http.HTTPFlow) -> str | None:
         """Compatibility shim for tests — dispatches through both header and body maps."""
@@ -950,13 +1287,13 @@ class ProxyAddon:
             "method": flow.request.method,
             "path": flow.request.path,
             "status": flow.response.status_code if flow.response else 0,
-            "bytes": len(flow.response.content) if flow.response and flow.response.content else 0,
+            "bytes": _response_bytes(flow),
             "allowed": allowed,
             "credential_used": credential_used,
             "routed_via_litellm": flow.metadata.get("routed_via_litellm", False),
             "original_host": flow.metadata.get("original_host", flow.request.pretty_host),
         }
-        self._log_file.write(json.dumps(entry) + "\n")
+        self._log_file.write(entry)
 
     def _write_socks5_log(
         self,
@@ -974,7 +1311,7 @@ class ProxyAddon:
             "reason": reason,
         }
         if self._socks5_log_file:
-            self._socks5_log_file.write(json.dumps(entry) + "\n")
+            self._socks5_log_file.write(entry)
         else:
             # Log to access log if socks5 log not available
             ctx.log.info(f"[proxy:socks5] {json.dumps(entry)}")
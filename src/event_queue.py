@@ -1,54 +1,220 @@
 """
 Bounded in-memory event queue for HTTP long-polling.
+
+Events live in a ring buffer (``collections.deque``) so appends and evictions
+are O(1) and reads from the tail are O(events returned).
+
+Backpressure: a single read returns at most ``MAX_BATCH`` buffered events; a
+lagging client receives a ``next_cursor`` short of the head (the poll endpoints
+flag this as ``has_more``) and catches up over successive polls. When a read is more than ``COALESCE_LAG`` events behind,
+consecutive streaming ``assistant_delta`` events for the same message block are
+merged into one, so a slow tab gets the accumulated text instead of thousands
+of tiny deltas.
+
+Tool call patches: ``events_since(..., patch=True)`` replaces a tool_call event
+with a changed-fields-only patch against the previous buffered event for the
+same ``tool_use_id`` (see ``poll_encoding``) whenever the reader is guaranteed
+to hold that base event. Patches are built on first request and memoized per
+cursor, so ``append`` does no patch work and queues nobody reads with
+``patch=1`` never pay for them.
+
+Waiting: every parked caller registers one ``asyncio.Event`` in the waiter set
+of each queue it watches, and ``append`` sets them all. ``wait_for_any`` parks
+one caller on several queues at once this way, so a client watching N sessions
+costs one parked request and one wake-up per event; ``wait_for_events`` is the
+single-queue case of the same wait.
 """
 
 import asyncio
+from collections import deque
+from collections.abc import Iterable
+from itertools import islice
+
+from .poll_encoding import make_tool_call_patch, payload_stats, tool_call_data
+
+# content_block_delta payload field that carries the incremental text per delta type
+_MERGEABLE_DELTA_FIELDS = {
+    "text_delta": "text",
+    "thinking_delta": "thinking",
+    "input_json_delta": "partial_json",
+}
+
+
+def _delta_merge_key(event: dict) -> tuple | None:
+    """Key identifying assistant_delta envelopes that can be concatenated, or None."""
+    if event.get("type") != "assistant_delta":
+        return None
+    data = event.get("data") or {}
+    sdk_event = data.get("event") or {}
+    if sdk_event.get("type") != "content_block_delta":
+        return None
+    delta = sdk_event.get("delta") or {}
+    if delta.get("type") not in _MERGEABLE_DELTA_FIELDS:
+        return None
+    return (data.get("uuid"), data.get("message_id"), sdk_event.get("index"), delta["type"])
+
+
+def coalesce_deltas(events: list[dict]) -> list[dict]:
+    """Merge runs of consecutive same-block assistant_delta events.
+
+    Merged envelopes are shallow copies; buffered events are never mutated.
+    The merged envelope keeps the first event's metadata and the last one's
+    timestamp.
+    """
+    result: list[dict] = []
+    prev_key = None
+    for event in events:
+        key = _delta_merge_key(event)
+        if key is not None and key == prev_key:
+            field = _MERGEABLE_DELTA_FIELDS[key[3]]
+            prev = result[-1]
+            prev_delta = prev["data"]["event"]["delta"]
+            prev_delta[field] = prev_delta.get(field, "") + event["data"]["event"]["delta"].get(field, "")
+            if "timestamp" in event:
+                prev["timestamp"] = event["timestamp"]
+            continue
+        if key is not None:
+            # Copy down to the delta dict so merging never touches the buffered event
+            data = dict(event["data"])
+            data["event"] = dict(data["event"])
+            data["event"]["delta"] = dict(data["event"]["delta"])
+            event = {**event, "data": data}
+        result.append(event)
+        prev_key = key
+    return result
 
 
 class EventQueue:
     """Bounded in-memory event queue for HTTP long-polling."""
 
     MAX_SIZE = 5000
+    MAX_BATCH = 1000
+    COALESCE_LAG = 100
 
     def __init__(self):
-        self._events: list[dict] = []
+        self._events: deque[dict] = deque()
         self._cursor: int = 0
         self._oldest_cursor: int = 1
-        self._waiters: list[asyncio.Event] = []
+        self._waiters: set[asyncio.Event] = set()
+        # cursor -> (base cursor, patch event, bytes saved), or None without a base
+        self._tool_call_patches: dict[int, tuple[int, dict, int] | None] = {}
 
     def append(self, event: dict) -> int:
         self._cursor += 1
         self._events.append(event)
-        if len(self._events) > self.MAX_SIZE:
-            self._events.pop(0)
-            self._oldest_cursor += 1
+        while len(self._events) > self.MAX_SIZE:
+            self._evict_oldest()
         for waiter in self._waiters:
             waiter.set()
-        self._waiters.clear()
         return self._cursor
 
-    def events_since(self, cursor: int) -> tuple[list[dict], int]:
+    def _evict_oldest(self) -> None:
+        self._events.popleft()
+        if self._tool_call_patches:
+            self._tool_call_patches.pop(self._oldest_cursor, None)
+        self._oldest_cursor += 1
+
+    def events_since(self, cursor: int, patch: bool = False) -> tuple[list[dict], int]:
+        """Return buffered events after ``cursor`` and the cursor to resume from.
+
+        A cursor older than the buffer returns everything still buffered. At
+        most ``MAX_BATCH`` events are returned per call; the returned cursor then
+        points at the last event included rather than the queue head.
+
+        With ``patch=True`` repeated tool_call events are replaced by
+        ``tool_call_patch`` events when their base event was either already
+        delivered (base <= cursor) or is part of this batch.
+        """
         if not self._events:
             return [], self._cursor
-        if cursor < self._oldest_cursor - 1:
-            return list(self._events), self._cursor
-        start_idx = max(0, cursor - self._oldest_cursor + 1)
-        return self._events[start_idx:], self._cursor
+        first = max(cursor + 1, self._oldest_cursor)
+        pending = self._cursor - first + 1
+        if pending <= 0:
+            return [], self._cursor
+
+        if pending <= self.MAX_BATCH:
+            # Common case: the window is at the tail, so walk it from the right.
+            events = list(islice(reversed(self._events), pending))
+            events.reverse()
+            next_cursor = self._cursor
+        else:
+            start_idx = first - self._oldest_cursor
+            events = list(islice(self._events, start_idx, start_idx + self.MAX_BATCH))
+            next_cursor = first + self.MAX_BATCH - 1
+
+        if patch:
+            events = self._apply_patches(events, cursor, first)
+        if len(events) > self.COALESCE_LAG:
+            events = coalesce_deltas(events)
+        return events, next_cursor
+
+    def _apply_patches(self, events: list[dict], cursor: int, first: int) -> list[dict]:
+        patched = list(events)
+        for offset, event in enumerate(events):
+            data = tool_call_data(event)
+            if data is None:
+                continue
+            entry = self._tool_call_patch(first + offset, event, data)
+            if entry is None:
+                continue
+            base_cursor, patch_event, saved = entry
+            if base_cursor <= cursor or base_cursor >= first:
+                patched[offset] = patch_event
+                payload_stats.tool_call_patches_served += 1
+                payload_stats.patch_bytes_saved += saved
+        return patched
+
+    def _tool_call_patch(self, at: int, event: dict, data: dict) -> tuple[int, dict, int] | None:
+        """Patch for the tool_call event at cursor ``at`` against the previous buffered
+        event for its tool_use_id, memoized. None when there is no such event."""
+        if at in self._tool_call_patches:
+            return self._tool_call_patches[at]
+        entry = None
+        tool_use_id = data["tool_use_id"]
+        # Walk back from the event before ``at`` towards the oldest buffered one
+        skip = len(self._events) - (at - self._oldest_cursor)
+        base_cursor = at
+        for base_event in islice(reversed(self._events), skip, None):
+            base_cursor -= 1
+            base_data = tool_call_data(base_event)
+            if base_data is None or base_data.get("tool_use_id") != tool_use_id:
+                continue
+            # The same dict re-broadcast after an in-place update has no diff to send
+            if base_data is not data:
+                patch_event, saved = make_tool_call_patch(event, base_data, data)
+                entry = (base_cursor, patch_event, saved)
+            break
+        self._tool_call_patches[at] = entry
+        return entry
+
+    def add_waiter(self, waiter: asyncio.Event) -> None:
+        """Register an external event that is set on every append."""
+        self._waiters.add(waiter)
+
+    def remove_waiter(self, waiter: asyncio.Event) -> None:
+        self._waiters.discard(waiter)
 
     @property
     def current_cursor(self) -> int:
         return self._cursor
 
     async def wait_for_events(self, cursor: int, timeout: float) -> None:
-        _, current = self.events_since(cursor)
-        if current > cursor:
-            return
-        waiter = asyncio.Event()
-        self._waiters.append(waiter)
-        try:
-            await asyncio.wait_for(waiter.wait(), timeout=timeout)
-        except TimeoutError:
-            pass
-        finally:
-            if waiter in self._waiters:
-                self._waiters.remove(waiter)
+        """Wait until the queue has events past ``cursor``, or timeout."""
+        await wait_for_any([(self, cursor)], timeout)
+
+
+async def wait_for_any(watches: Iterable[tuple[EventQueue, int]], timeout: float) -> None:
+    """Wait until any ``(queue, cursor)`` pair has events past its cursor, or timeout."""
+    watches = list(watches)
+    if any(queue.current_cursor > cursor for queue, cursor in watches):
+        return
+    waiter = asyncio.Event()
+    for queue, _ in watches:
+        queue.add_waiter(waiter)
+    try:
+        await asyncio.wait_for(waiter.wait(), timeout=timeout)
+    except TimeoutError:
+        pass
+    finally:
+        for queue, _ in watches:
+            queue.remove_waiter(waiter)
@@ -0,0 +1,111 @@
+"""
+Incrementally maintained history projection for GET /api/sessions/{id}/messages.
+
+Building a history page converts every stored message to its websocket form
+and replays tool-call lifecycle state (pending → permission → result) across
+the page. That work only depends on the raw lines in the page, and a page's
+lines are append-only until the session is reset, so the result of the fold is
+kept per ``(offset, limit)`` page together with its lifecycle state. A later
+request for the same page folds only the lines stored since, instead of
+reconverting the whole history.
+
+A cached fold is discarded when the session's storage manager is replaced,
+when ``DataStorageManager.generation`` changes (messages.jsonl rewritten, e.g.
+on reset), or when the log is shorter than what the fold already consumed.
+"""
+
+import asyncio
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+from .models.messages import ToolCall
+
+
+@dataclass
+class HistoryFold:
+    """Projection of stored lines ``[start, start + consumed)`` plus open tool state."""
+    start: int
+    consumed: int = 0
+    messages: list[dict[str, Any]] = field(default_factory=list)
+    # tool_use_id -> ToolCall still awaiting a result at the end of the fold
+    active_tools: dict[str, ToolCall] = field(default_factory=dict)
+    # Issue #494: tool_use_ids with stored ToolCallUpdate entries
+    stored_update_ids: set[str] = field(default_factory=set)
+
+
+@dataclass
+class HistoryProjectionStats:
+    hits: int = 0  # served entirely from the cached fold
+    extends: int = 0  # cached fold extended with newly stored lines
+    misses: int = 0  # fold built from scratch
+    invalidations: int = 0  # cached fold discarded as stale
+    lines_folded: int = 0
+
+    def to_dict(self) -> dict[str, int]:
+        return asdict(self)
+
+
+@dataclass
+class _SessionEntry:
+    storage: Any
+    generation: int
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    folds: OrderedDict = field(default_factory=OrderedDict)  # (offset, limit) -> HistoryFold
+
+
+class HistoryProjectionCache:
+    """Per-session cache of history folds, LRU-bounded by session and page."""
+
+    MAX_SESSIONS = 32
+    MAX_PAGES_PER_SESSION = 4
+
+    def __init__(self):
+        self._sessions: OrderedDict[str, _SessionEntry] = OrderedDict()
+        self.stats = HistoryProjectionStats()
+
+    def _entry(self, session_id: str, storage) -> _SessionEntry:
+        entry = self._sessions.get(session_id)
+        if entry is not None and (
+            entry.storage is not storage or entry.generation != storage.generation
+        ):
+            # Keep the lock: a caller may already be waiting on it.
+            if entry.folds:
+                self.stats.invalidations += 1
+            entry.folds.clear()
+            entry.storage = storage
+            entry.generation = storage.generation
+        if entry is None:
+            entry = _SessionEntry(storage=storage, generation=storage.generation)
+            self._sessions[session_id] = entry
+            while len(self._sessions) > self.MAX_SESSIONS:
+                self._sessions.popitem(last=False)
+        self._sessions.move_to_end(session_id)
+        return entry
+
+    def lock(self, session_id: str, storage) -> asyncio.Lock:
+        """Lock serializing fold updates for one session."""
+        return self._entry(session_id, storage).lock
+
+    def get(self, session_id: str, storage, offset: int, limit: int | None) -> HistoryFold | None:
+        entry = self._entry(session_id, storage)
+        fold = entry.folds.get((offset, limit))
+        if fold is not None:
+            entry.folds.move_to_end((offset, limit))
+        return fold
+
+    def put(self, session_id: str, storage, offset: int, limit: int | None, fold: HistoryFold) -> None:
+        entry = self._entry(session_id, storage)
+        entry.folds[(offset, limit)] = fold
+        entry.folds.move_to_end((offset, limit))
+        while len(entry.folds) > self.MAX_PAGES_PER_SESSION:
+            entry.folds.popitem(last=False)
+
+    def discard(self, session_id: str, offset: int, limit: int | None) -> None:
+        entry = self._sessions.get(session_id)
+        if entry is not None and entry.folds.pop((offset, limit), None) is not None:
+            self.stats.invalidations += 1
+
+    def invalidate(self, session_id: str) -> None:
+        if self._sessions.pop(session_id, None) is not None:
+            self.stats.invalidations += 1
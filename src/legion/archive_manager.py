@@ -17,8 +17,10 @@ from pathlib import Path
 from typing import TYPE_CHECKING
 
 from src.history_distiller import distill_session_history
+from src.legion.schedule_history_store import HISTORY_DB
 from src.logging_config import get_logger
 from src.models.archive_models import ArchiveResult, DisposalMetadata
+from src.queue_manager import QueueManager
 from src.task_utils import task_done_log_exception
 
 if TYPE_CHECKING:
@@ -108,6 +110,8 @@ class ArchiveManager:
         self._copy_if_exists(session_dir / "messages.jsonl", archive_dir, archived)
         self._scrub_and_copy_state(session_dir, archive_dir, archived)
         self._copy_if_exists(session_dir / "queue.jsonl", archive_dir, archived)
+        self._copy_if_exists(session_dir / "queue_snapshot.json", archive_dir, archived)
+        self._copy_if_exists(session_dir / "queue_archive.jsonl", archive_dir, archived)
         self._copy_dir_if_exists(session_dir / "resources", archive_dir, archived)
         self._copy_dir_if_exists(session_dir / "attachments", archive_dir, archived)
 
@@ -188,11 +192,12 @@ class ArchiveManager:
         proxy_dst = archive_dir / "proxy"
         any_copied = False
         for name in _PROXY_LOG_NAMES:
-            src = proxy_src / name
-            if src.exists():
-                proxy_dst.mkdir(parents=True, exist_ok=True)
-                shutil.copy2(src, proxy_dst / name)
-                any_copied = True
+            # Live file plus the sidecar's rotated segments (<name>.N) and their index
+            for src in [proxy_src / name, *sorted(proxy_src.glob(f"{name}.*"))]:
+                if src.exists() and not src.name.endswith(".tmp"):
+                    proxy_dst.mkdir(parents=True, exist_ok=True)
+                    shutil.copy2(src, proxy_dst / src.name)
+                    any_copied = True
         if any_copied:
             archived.append("proxy/")
 
@@ -201,7 +206,16 @@ class ArchiveManager:
     ) -> None:
         data_dir = self.system.session_coordinator.session_manager.data_dir
         legion_dir = data_dir / "legions" / legion_id
-        for fname in ("schedules.json", "schedule_history.jsonl", "schedule_metrics.json"):
+        legacy_names = ("schedule_history.jsonl", "schedule_metrics.json")
+        if (legion_dir / HISTORY_DB).exists():
+            # History and rollups live in SQLite; archives keep the jsonl/json format
+            try:
+                store = self.system.scheduler_service.history_store(legion_id)
+                archived.extend(store.export(archive_dir))
+            except Exception as e:
+                archive_logger.error(f"Failed to export schedule history for {legion_id}: {e}")
+            legacy_names = ()
+        for fname in ("schedules.json", *legacy_names):
             src = legion_dir / fname
             if src.exists():
                 shutil.copy2(src, archive_dir / fname)
@@ -585,24 +599,22 @@ class ArchiveManager:
     async def get_archive_queue(
         self, session_id: str, archive_id: str
     ) -> list[dict]:
-        """Read queue.jsonl from an archive, returning parsed records."""
+        """Rebuild the archived queue from queue_snapshot.json plus queue.jsonl.
+
+        Reads the archive the way QueueManager.load_queue reads a live session,
+        so items compacted into the snapshot are included and log entries are
+        folded into item state.
+        """
         archive_dir = self.archives_dir / session_id / archive_id
-        queue_file = archive_dir / "queue.jsonl"
-        if not queue_file.exists():
+        if not archive_dir.is_dir():
             return []
-        records: list[dict] = []
         try:
-            with open(queue_file, encoding="utf-8") as f:
-                for line in f:
-                    line = line.strip()
-                    if line:
-                        try:
-                            records.append(json.loads(line))
-                        except json.JSONDecodeError:
-                            pass
+            # A throwaway reader: the archive must not touch the live queue state
+            items, _ = await asyncio.to_thread(QueueManager().read_queue, session_id, archive_dir)
         except OSError as e:
             archive_logger.error(f"Failed to read archive queue: {e}")
-        return records
+            return []
+        return [item.to_dict() for item in items]
 
     async def get_archive_proxy_logs(
         self, session_id: str, archive_id: str
@@ -0,0 +1,287 @@
+"""
+CapabilityIndex - Inverted index and ranking for capability search.
+
+LegionCoordinator keeps ``capability_registry`` ({capability: [(minion_id,
+score), ...]}) as the record of who registered what. This index mirrors it for
+search. Three fields are indexed per minion:
+
+- ``capability``: one document per registered capability, holding its
+  underscore-separated words and the full keyword (``rest_api`` -> ``rest``,
+  ``api``, ``rest_api``),
+- ``role``: the minion's role description,
+- ``template``: role, description and capabilities of the minion's template.
+
+Query words are matched against the vocabulary exactly, as substrings (so the
+old substring search keeps matching, e.g. ``sql`` -> ``postgresql``) and by
+trigram similarity for typos. A trigram -> term map keeps these lookups off
+the full vocabulary. Matching documents are scored with BM25 per field, the
+fields combined with fixed weights, and the minion's relevance blended with
+its expertise score. Candidates are narrowed to the allowed minions (caller
+visibility, legion) before any scoring.
+"""
+
+import math
+import re
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+# BM25 parameters
+_K1 = 1.2
+_B = 0.75
+
+# Field weights for combining per-field BM25 scores into minion relevance
+FIELD_WEIGHTS = {"capability": 1.0, "role": 0.5, "template": 0.3}
+
+# Query-term expansion weights
+_SUBSTRING_WEIGHT = 0.8
+_FUZZY_WEIGHT = 0.5
+_FUZZY_MIN_SIMILARITY = 0.5
+_FUZZY_MIN_LENGTH = 4
+# Shorter query words (from splitting the query) only match exactly
+_SUBSTRING_MIN_LENGTH = 3
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+# Document id: (minion_id, field, capability or "")
+_DocId = tuple[str, str, str]
+
+
+def _words(text: str) -> list[str]:
+    return _WORD_RE.findall(text.lower())
+
+
+def _trigrams(term: str) -> set[str]:
+    return {term[i:i + 3] for i in range(len(term) - 2)}
+
+
+@dataclass
+class _MinionEntry:
+    project_id: str | None = None
+    default_score: float = 0.5
+
+
+class CapabilityIndex:
+    """Inverted index over minion capabilities, roles and template expertise."""
+
+    def __init__(self):
+        self._postings: dict[str, dict[_DocId, int]] = {}
+        self._doc_terms: dict[_DocId, list[str]] = {}
+        self._field_docs: dict[str, int] = dict.fromkeys(FIELD_WEIGHTS, 0)
+        self._field_length: dict[str, int] = dict.fromkeys(FIELD_WEIGHTS, 0)
+        self._term_trigrams: dict[str, set[str]] = {}
+        self._minions: dict[str, _MinionEntry] = {}
+        # minion_id -> {capability: expertise_score}
+        self._scores: dict[str, dict[str, float]] = {}
+
+    def __len__(self) -> int:
+        return sum(len(caps) for caps in self._scores.values())
+
+    def clear(self) -> None:
+        self.__init__()
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+
+    def _add_doc(self, doc_id: _DocId, terms: list[str]) -> None:
+        self._remove_doc(doc_id)
+        if not terms:
+            return
+        self._doc_terms[doc_id] = terms
+        field_name = doc_id[1]
+        self._field_docs[field_name] += 1
+        self._field_length[field_name] += len(terms)
+        for term in terms:
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = {}
+                for gram in _trigrams(term):
+                    self._term_trigrams.setdefault(gram, set()).add(term)
+            postings[doc_id] = postings.get(doc_id, 0) + 1
+
+    def _remove_doc(self, doc_id: _DocId) -> None:
+        terms = self._doc_terms.pop(doc_id, None)
+        if terms is None:
+            return
+        field_name = doc_id[1]
+        self._field_docs[field_name] -= 1
+        self._field_length[field_name] -= len(terms)
+        for term in set(terms):
+            postings = self._postings[term]
+            postings.pop(doc_id, None)
+            if not postings:
+                del self._postings[term]
+                for gram in _trigrams(term):
+                    grams = self._term_trigrams[gram]
+                    grams.discard(term)
+                    if not grams:
+                        del self._term_trigrams[gram]
+
+    def set_minion(
+        self,
+        minion_id: str,
+        project_id: str | None,
+        role: str | None,
+        template_text: str | None = None,
+        default_score: float | None = None,
+    ) -> None:
+        """Record a minion's legion and (re)index its role and template text."""
+        self._minions[minion_id] = _MinionEntry(
+            project_id=project_id,
+            default_score=default_score if default_score is not None else 0.5,
+        )
+        self._scores.setdefault(minion_id, {})
+        self._add_doc((minion_id, "role", ""), _words(role or ""))
+        self._add_doc((minion_id, "template", ""), _words(template_text or ""))
+
+    def add_capability(self, minion_id: str, capability: str, expertise_score: float) -> None:
+        """Index (or re-score) one registered capability of a minion."""
+        self._minions.setdefault(minion_id, _MinionEntry())
+        scores = self._scores.setdefault(minion_id, {})
+        if capability not in scores:
+            words = _words(capability)
+            terms = words if words == [capability] else [*words, capability]
+            self._add_doc((minion_id, "capability", capability), terms)
+        scores[capability] = expertise_score
+
+    def remove_minion(self, minion_id: str) -> None:
+        for capability in self._scores.pop(minion_id, {}):
+            self._remove_doc((minion_id, "capability", capability))
+        self._remove_doc((minion_id, "role", ""))
+        self._remove_doc((minion_id, "template", ""))
+        self._minions.pop(minion_id, None)
+
+    # ------------------------------------------------------------------
+    # Search
+    # ------------------------------------------------------------------
+
+    def _expand(self, word: str, whole_query: bool = False) -> dict[str, float]:
+        """Vocabulary terms matching a query word, with match-quality weights."""
+        matches: dict[str, float] = {}
+        if word in self._postings:
+            matches[word] = 1.0
+        if not whole_query and len(word) < _SUBSTRING_MIN_LENGTH:
+            return matches
+
+        grams = _trigrams(word)
+        if grams:
+            candidates: set[str] | None = None
+            for gram in grams:
+                terms = self._term_trigrams.get(gram, set())
+                candidates = set(terms) if candidates is None else candidates & terms
+                if not candidates:
+                    break
+        else:
+            candidates = set(self._postings)
+        for term in candidates or ():
+            if term != word and word in term:
+                matches[term] = _SUBSTRING_WEIGHT
+
+        if len(word) >= _FUZZY_MIN_LENGTH:
+            shared: dict[str, int] = {}
+            for gram in grams:
+                for term in self._term_trigrams.get(gram, ()):
+                    shared[term] = shared.get(term, 0) + 1
+            for term, count in shared.items():
+                if term in matches:
+                    continue
+                similarity = 2 * count / (len(grams) + len(_trigrams(term)))
+                if similarity >= _FUZZY_MIN_SIMILARITY:
+                    matches[term] = _FUZZY_WEIGHT * similarity
+        return matches
+
+    def _idf(self, postings: dict[_DocId, int]) -> dict[str, float]:
+        """Per-field inverse document frequency of a term."""
+        document_frequency = dict.fromkeys(FIELD_WEIGHTS, 0)
+        for _, field_name, _ in postings:
+            document_frequency[field_name] += 1
+        return {
+            field_name: math.log(1 + (self._field_docs[field_name] - df + 0.5) / (df + 0.5))
+            for field_name, df in document_frequency.items()
+            if df
+        }
+
+    def _bm25(self, idf: float, tf: int, doc_id: _DocId) -> float:
+        field_name = doc_id[1]
+        avg_length = self._field_length[field_name] / self._field_docs[field_name]
+        length = len(self._doc_terms[doc_id])
+        return idf * tf * (_K1 + 1) / (tf + _K1 * (1 - _B + _B * length / avg_length))
+
+    def search(
+        self,
+        query: str,
+        allowed: Iterable[str] | None = None,
+        project_id: str | None = None,
+        limit: int | None = None,
+    ) -> list[tuple[str, float, str]]:
+        """
+        Rank minions for a free-text capability query.
+
+        Args:
+            query: Search text (case-insensitive)
+            allowed: If given, only these minion ids are considered
+            project_id: If given, only minions of this legion are considered
+            limit: Maximum number of results
+
+        Returns:
+            [(minion_id, expertise_score, matched), ...] best first, one entry
+            per minion. ``matched`` is the best matching capability, or
+            ``"role"`` / ``"template"`` when only those fields matched.
+            Minions whose expertise score is 0.0 are left out.
+        """
+        normalized = query.strip().lower()
+        words = _words(normalized)
+        query_terms = list(dict.fromkeys([normalized, *words]))
+        allowed_set = set(allowed) if allowed is not None else None
+
+        def eligible(minion_id: str) -> bool:
+            if allowed_set is not None and minion_id not in allowed_set:
+                return False
+            if project_id is not None and self._minions[minion_id].project_id != project_id:
+                return False
+            return True
+
+        # doc_id -> accumulated BM25 score
+        doc_scores: dict[_DocId, float] = {}
+        for query_term in query_terms:
+            best_for_term: dict[_DocId, float] = {}
+            expansions = self._expand(query_term, whole_query=query_term == normalized)
+            for term, weight in expansions.items():
+                postings = self._postings[term]
+                idf = self._idf(postings)
+                for doc_id, tf in postings.items():
+                    if not eligible(doc_id[0]):
+                        continue
+                    score = weight * self._bm25(idf[doc_id[1]], tf, doc_id)
+                    if score > best_for_term.get(doc_id, 0.0):
+                        best_for_term[doc_id] = score
+            for doc_id, score in best_for_term.items():
+                doc_scores[doc_id] = doc_scores.get(doc_id, 0.0) + score
+
+        # Per minion: best document per field, fields combined by weight
+        best_docs: dict[str, dict[str, tuple[float, str]]] = {}
+        for (minion_id, field_name, capability), score in doc_scores.items():
+            fields = best_docs.setdefault(minion_id, {})
+            if score > fields.get(field_name, (0.0, ""))[0]:
+                fields[field_name] = (score, capability)
+
+        ranked = []
+        for minion_id, fields in best_docs.items():
+            if "capability" in fields:
+                matched = fields["capability"][1]
+                expertise = self._scores[minion_id][matched]
+            else:
+                matched = "role" if "role" in fields else "template"
+                expertise = self._minions[minion_id].default_score
+            if not expertise:
+                continue
+            relevance = sum(FIELD_WEIGHTS[f] * score for f, (score, _) in fields.items())
+            ranked.append((minion_id, expertise, matched, relevance))
+
+        if not ranked:
+            return []
+        top = max(r[3] for r in ranked)
+        # Relevance scales expertise between 50% (weakest match) and 100% (best match)
+        ranked.sort(key=lambda r: (r[1] * (1 + r[3] / top) / 2, r[1]), reverse=True)
+        results = [(minion_id, expertise, matched) for minion_id, expertise, matched, _ in ranked]
+        return results[:limit] if limit is not None else results
@@ -10,8 +10,12 @@ Responsibilities:
 - Parse #minion-name tags for explicit references
 """
 
-import json
+import asyncio
+import dataclasses
+import os
 import re
+import shutil
+import time
 import uuid
 from pathlib import Path
 from typing import TYPE_CHECKING
@@ -35,6 +39,9 @@ legion_logger = get_logger('legion', 'COMM_ROUTER')
 class CommRouter:
     """Routes direct communications between minions and user."""
 
+    # Concurrent per-recipient deliveries for a fan-out comm
+    FANOUT_CONCURRENCY = 8
+
     def __init__(self, system: 'LegionSystem'):
         """
         Initialize CommRouter with LegionSystem.
@@ -64,43 +71,8 @@ class CommRouter:
         Returns:
             List of visible minion session IDs
         """
-        session_manager = self.system.session_coordinator.session_manager
-        caller = await session_manager.get_session_info(caller_id)
-        if not caller:
-            return []
-
-        visible = set()
-        visible.add(caller_id)
-
-        async def add_ancestors(sid: str, visited: set):
-            if sid in visited:
-                return
-            visited.add(sid)
-            s = await session_manager.get_session_info(sid)
-            if s and s.parent_overseer_id:
-                visible.add(s.parent_overseer_id)
-                await add_ancestors(s.parent_overseer_id, visited)
-
-        async def add_descendants(sid: str, visited: set):
-            if sid in visited:
-                return
-            visited.add(sid)
-            s = await session_manager.get_session_info(sid)
-            if s and s.child_minion_ids:
-                for child_id in s.child_minion_ids:
-                    visible.add(child_id)
-                    await add_descendants(child_id, visited)
-
-        await add_ancestors(caller_id, set())
-        await add_descendants(caller_id, set())
-
-        # Siblings (children of direct parent)
-        if caller.parent_overseer_id:
-            parent = await session_manager.get_session_info(caller.parent_overseer_id)
-            if parent and parent.child_minion_ids:
-                visible.update(parent.child_minion_ids)
-
-        return list(visible)
+        hierarchy = self.system.session_coordinator.session_manager.hierarchy
+        return list(hierarchy.visible_from(caller_id))
 
     async def validate_comm_target(self, sender_id: str, recipient_id: str) -> bool:
         """
@@ -166,6 +138,10 @@ class CommRouter:
         # Validate comm has proper routing
         comm.validate()
 
+        if comm.to_minion_ids:
+            deliveries = await self.fan_out_comm(comm, attachment_data)
+            return all(d["delivered"] for d in deliveries.values())
+
         # Deliver attachments before persisting (issue #1730) so timeline.jsonl
         # captures the resolved resource_id from the start, instead of null
         # placeholders mutated in place afterward.
@@ -189,6 +165,189 @@ class CommRouter:
         legion_logger.warning(f"Comm {comm.comm_id} has no valid destination")
         return False
 
+    async def fan_out_comm(
+        self,
+        comm: Comm,
+        attachment_data: dict[str, bytes] | None = None,
+    ) -> dict[str, dict]:
+        """
+        Deliver one Comm to every minion in ``comm.to_minion_ids``.
+
+        Targets are resolved once, each attachment is written once and
+        hard-linked into the other recipients' sessions, and the comm is
+        persisted as a single timeline record carrying the recipient list.
+        Per-recipient delivery then runs concurrently, at most
+        FANOUT_CONCURRENCY at a time.
+
+        Args:
+            comm: Comm with to_minion_ids set
+            attachment_data: Optional dict mapping filename -> bytes for file attachments
+
+        Returns:
+            Dict of recipient id -> {"delivered": bool, "latency_ms": float | None}
+
+        Raises:
+            ValueError: If comm validation fails or it has no recipient list
+        """
+        comm.validate()
+        if not comm.to_minion_ids:
+            raise ValueError("Fan-out comm needs to_minion_ids")
+
+        session_manager = self.system.session_coordinator.session_manager
+        targets = {}
+        missing = []
+        for minion_id in dict.fromkeys(comm.to_minion_ids):
+            minion = await session_manager.get_session_info(minion_id)
+            if minion:
+                targets[minion_id] = minion
+            else:
+                missing.append(minion_id)
+        if missing:
+            legion_logger.error(f"Fan-out comm {comm.comm_id}: target minions not found: {missing}")
+            if comm.from_minion_id:
+                await self._send_system_error_comm(
+                    to_minion_id=comm.from_minion_id,
+                    error_message=f"Failed to deliver message to {len(missing)} recipient(s): Target minion not found",
+                    original_comm_id=comm.comm_id
+                )
+
+        deliveries: dict[str, dict] = {
+            minion_id: {"delivered": False, "latency_ms": None} for minion_id in missing
+        }
+        if not targets:
+            return deliveries
+
+        # The timeline record; the caller's comm is left as it was passed in
+        record = dataclasses.replace(
+            comm,
+            to_minion_ids=list(targets),
+            to_minion_name=comm.to_minion_name
+            or ", ".join(m.name or m_id[:8] for m_id, m in targets.items()),
+            attachments=[dict(att) for att in comm.attachments],
+        )
+
+        semaphore = asyncio.Semaphore(self.FANOUT_CONCURRENCY)
+        recipient_attachments = await self._deliver_fanout_attachments(
+            record, list(targets), attachment_data, semaphore
+        )
+
+        # One timeline/audit record for the whole fan-out. A minion's comm goes
+        # to the sender's legion; a user's comm to each legion it reaches.
+        if record.from_minion_id:
+            await self._persist_comm(record)
+        else:
+            by_legion: dict[str, list[str]] = {}
+            for minion_id, minion in targets.items():
+                by_legion.setdefault(minion.project_id, []).append(minion_id)
+            for legion_id, minion_ids in by_legion.items():
+                legion_record = record
+                if len(by_legion) > 1:
+                    legion_record = dataclasses.replace(
+                        record,
+                        to_minion_ids=minion_ids,
+                        to_minion_name=", ".join(targets[m].name or m[:8] for m in minion_ids),
+                    )
+                await self._persist_comm(legion_record, legion_id=legion_id)
+
+        async def deliver(minion_id: str) -> None:
+            recipient_comm = dataclasses.replace(
+                record,
+                to_minion_id=minion_id,
+                to_minion_name=targets[minion_id].name,
+                to_minion_ids=[],
+                attachments=recipient_attachments.get(minion_id, []),
+            )
+            async with semaphore:
+                started = time.perf_counter()
+                delivered = await self._send_to_minion(recipient_comm)
+            deliveries[minion_id] = {
+                "delivered": delivered,
+                "latency_ms": round((time.perf_counter() - started) * 1000, 1),
+            }
+
+        fanout_started = time.perf_counter()
+        await asyncio.gather(*(deliver(minion_id) for minion_id in targets))
+
+        delivered_count = sum(1 for minion_id in targets if deliveries[minion_id]["delivered"])
+        latencies = [deliveries[minion_id]["latency_ms"] for minion_id in targets]
+        legion_logger.info(
+            f"Fan-out comm {comm.comm_id} delivered to {delivered_count}/{len(targets)} minions "
+            f"in {(time.perf_counter() - fanout_started) * 1000:.0f}ms (slowest {max(latencies):.0f}ms)"
+        )
+        return deliveries
+
+    async def _deliver_fanout_attachments(
+        self,
+        comm: Comm,
+        recipient_ids: list[str],
+        attachment_data: dict[str, bytes] | None,
+        semaphore: asyncio.Semaphore,
+    ) -> dict[str, list[dict]]:
+        """
+        Write each attachment once and link it into every recipient's session.
+
+        ``comm.attachments`` (the timeline record) gets the first recipient's
+        resource info so the timeline can render the files.
+
+        Returns:
+            Dict of recipient id -> that recipient's attachment dicts
+        """
+        if not comm.attachments:
+            return {}
+
+        attachment_data = attachment_data or {}
+        from_name = await self._get_sender_name(comm)
+        per_recipient: dict[str, list[dict]] = {minion_id: [] for minion_id in recipient_ids}
+
+        for att in comm.attachments:
+            file_bytes = self._attachment_bytes(att, attachment_data)
+            if not file_bytes:
+                legion_logger.error(f"Failed to deliver attachment {att['name']}: no data or source found")
+                for minion_id in recipient_ids:
+                    per_recipient[minion_id].append(dict(att))
+                continue
+
+            async def place(
+                minion_id: str,
+                link_from: Path | None,
+                att: dict = att,
+                file_bytes: bytes = file_bytes,
+            ) -> dict:
+                recipient_att = dict(att)
+                try:
+                    async with semaphore:
+                        dest_path = self._write_attachment(
+                            minion_id, att["name"], file_bytes=file_bytes, link_from=link_from
+                        )
+                        resource_result = await self._register_attachment(
+                            minion_id, dest_path, att["name"], from_name
+                        )
+                    if resource_result:
+                        recipient_att["resource_id"] = resource_result.get("resource_id")
+                        recipient_att["session_id"] = minion_id
+                        recipient_att["stored_path"] = str(dest_path)
+                except Exception as e:
+                    legion_logger.error(f"Failed to deliver attachment {att['name']} to {minion_id}: {e}")
+                return recipient_att
+
+            # Write the first copy, then link it into the other sessions
+            placed = [await place(recipient_ids[0], link_from=None)]
+            first_path = placed[0].get("stored_path")
+            placed += await asyncio.gather(*(
+                place(minion_id, link_from=Path(first_path) if first_path else None)
+                for minion_id in recipient_ids[1:]
+            ))
+            for minion_id, recipient_att in zip(recipient_ids, placed, strict=True):
+                per_recipient[minion_id].append(recipient_att)
+            if placed[0].get("stored_path"):
+                att.update(
+                    resource_id=placed[0]["resource_id"],
+                    session_id=placed[0]["session_id"],
+                    stored_path=placed[0]["stored_path"],
+                )
+
+        return per_recipient
+
     async def _deliver_attachments(
         self,
         comm: Comm,
@@ -227,47 +386,18 @@ class CommRouter:
             return
 
         attachment_data = attachment_data or {}
-        data_dir = self.system.session_coordinator.data_dir
-        attachments_dir = data_dir / "sessions" / comm.to_minion_id / "attachments"
-        attachments_dir.mkdir(parents=True, exist_ok=True)
-
-        # Sender name for the registered resource's description only
-        from_name = "Minion #user"
-        if comm.from_minion_id:
-            from_minion = await self.system.legion_coordinator.get_minion_info(comm.from_minion_id)
-            if from_minion and from_minion.name:
-                from_name = f"Minion #{from_minion.name}"
+        from_name = await self._get_sender_name(comm)
 
         for att in comm.attachments:
-            file_bytes = attachment_data.get(att["name"])
-            if not file_bytes:
-                # Fallback: try reading from source path
-                source = Path(att.get("source_path", ""))
-                if source.exists():
-                    file_bytes = source.read_bytes()
+            file_bytes = self._attachment_bytes(att, attachment_data)
             if not file_bytes:
                 legion_logger.error(f"Failed to deliver attachment {att['name']}: no data or source found")
                 continue
 
             try:
-                dest_path = attachments_dir / att["name"]
-                # Avoid name collisions
-                if dest_path.exists():
-                    dest_path = attachments_dir / f"{dest_path.stem}_{uuid.uuid4().hex[:8]}{dest_path.suffix}"
-                dest_path.write_bytes(file_bytes)
-
-                # Register as resource in recipient session (for UI gallery)
-                resource_result = await self.system.session_coordinator.register_uploaded_resource(
-                    session_id=comm.to_minion_id,
-                    file_path=str(dest_path),
-                    title=att["name"],
-                    description=f"File attachment from {from_name}"
-                )
-
-                # Register for auto-approve Read
-                await self.system.session_coordinator.register_uploaded_file(
-                    session_id=comm.to_minion_id,
-                    file_path=str(dest_path)
+                dest_path = self._write_attachment(comm.to_minion_id, att["name"], file_bytes=file_bytes)
+                resource_result = await self._register_attachment(
+                    comm.to_minion_id, dest_path, att["name"], from_name
                 )
 
                 # Update attachment metadata with resource info
@@ -278,6 +408,77 @@ class CommRouter:
             except Exception as e:
                 legion_logger.error(f"Failed to deliver attachment {att['name']}: {e}")
 
+    async def _get_sender_name(self, comm: Comm) -> str:
+        """Display name of a Comm's sender ("Minion #user" for the user)."""
+        # Use "Minion #user" to signal that replies should use send_comm MCP tool
+        from_name = "Minion #user"
+        if comm.from_minion_id:
+            from_minion = await self.system.legion_coordinator.get_minion_info(comm.from_minion_id)
+            if from_minion and from_minion.name:
+                from_name = f"Minion #{from_minion.name}"
+        return from_name
+
+    @staticmethod
+    def _attachment_bytes(att: dict, attachment_data: dict[str, bytes]) -> bytes | None:
+        """Attachment content from the provided data, falling back to its source path."""
+        file_bytes = attachment_data.get(att["name"])
+        if not file_bytes:
+            source = Path(att.get("source_path", ""))
+            if source.exists():
+                file_bytes = source.read_bytes()
+        return file_bytes
+
+    def _write_attachment(
+        self,
+        session_id: str,
+        name: str,
+        file_bytes: bytes | None = None,
+        link_from: Path | None = None,
+    ) -> Path:
+        """
+        Place an attachment in a session's attachments/ dir.
+
+        Writes ``file_bytes``, or hard-links ``link_from`` (an already written
+        copy) and falls back to copying it when linking is not possible.
+        """
+        attachments_dir = self.system.session_coordinator.data_dir / "sessions" / session_id / "attachments"
+        attachments_dir.mkdir(parents=True, exist_ok=True)
+        dest_path = attachments_dir / name
+        # Avoid name collisions
+        if dest_path.exists():
+            dest_path = attachments_dir / f"{dest_path.stem}_{uuid.uuid4().hex[:8]}{dest_path.suffix}"
+        if link_from is None:
+            dest_path.write_bytes(file_bytes)
+        else:
+            try:
+                os.link(link_from, dest_path)
+            except OSError:
+                shutil.copyfile(link_from, dest_path)
+        return dest_path
+
+    async def _register_attachment(
+        self,
+        session_id: str,
+        dest_path: Path,
+        name: str,
+        from_name: str,
+    ) -> dict | None:
+        """Register a delivered attachment as a resource and for auto-approved Read."""
+        # Register as resource in recipient session (for UI gallery)
+        resource_result = await self.system.session_coordinator.register_uploaded_resource(
+            session_id=session_id,
+            file_path=str(dest_path),
+            title=name,
+            description=f"File attachment from {from_name}"
+        )
+
+        # Register for auto-approve Read
+        await self.system.session_coordinator.register_uploaded_file(
+            session_id=session_id,
+            file_path=str(dest_path)
+        )
+        return resource_result
+
     async def _send_to_minion(
         self,
         comm: Comm,
@@ -383,13 +584,7 @@ class CommRouter:
                 legion_logger.info(f"Minion {comm.to_minion_id} is now ready")
 
             # Get sender name for formatting
-            # Use "Minion #user" to signal that replies should use send_comm MCP tool
-            from_name = "Minion #user"
-
-            if comm.from_minion_id:
-                from_minion = await self.system.legion_coordinator.get_minion_info(comm.from_minion_id)
-                if from_minion and from_minion.name:
-                    from_name = f"Minion #{from_minion.name}"
+            from_name = await self._get_sender_name(comm)
 
             # Format message for recipient minion
             comm_type_prefix = {
@@ -580,7 +775,7 @@ class CommRouter:
         except Exception as e:
             legion_logger.error(f"Failed to send system error comm to {to_minion_id}: {e}")
 
-    async def _persist_comm(self, comm: Comm) -> None:
+    async def _persist_comm(self, comm: Comm, legion_id: str | None = None) -> None:
         """
         Persist Comm to appropriate locations.
 
@@ -589,9 +784,11 @@ class CommRouter:
 
         Args:
             comm: Comm to persist
+            legion_id: Legion to persist to; resolved from the sender or
+                recipient when omitted
         """
         # Get legion_id from source or destination
-        legion_id = None
+        explicit_legion_id = legion_id
         from_minion_name = None
         to_minion_name = None
 
@@ -609,6 +806,9 @@ class CommRouter:
                 legion_id = minion.project_id  # project_id IS the legion_id
                 to_minion_name = minion.name
 
+        if comm.to_minion_ids:
+            to_minion_name = comm.to_minion_name
+
         # If legion_id still not found and this is from user, need to get it from to_minion
         if not legion_id and comm.from_user:
             if comm.to_minion_id:
@@ -618,6 +818,9 @@ class CommRouter:
                     if not to_minion_name:
                         to_minion_name = minion.name
 
+        if explicit_legion_id:
+            legion_id = explicit_legion_id
+
         # ALWAYS persist to main legion timeline (this was missing!)
         if legion_id:
             await self._append_to_timeline(legion_id, comm)
@@ -648,6 +851,7 @@ class CommRouter:
                     "comm_type": comm.comm_type.value if hasattr(comm.comm_type, "value") else str(comm.comm_type),
                     "from_minion_id": comm.from_minion_id,
                     "to_minion_id": comm.to_minion_id,
+                    "to_minion_ids": comm.to_minion_ids,
                     "from_minion_name": from_minion_name,
                     "to_minion_name": to_minion_name,
                     "summary": comm.summary,
@@ -671,21 +875,11 @@ class CommRouter:
             legion_id: Legion ID
             comm: Comm to append
         """
-        # Get data_dir from SessionCoordinator
-        data_dir = self.system.session_coordinator.data_dir
-
-        # Construct path: {data_dir}/legions/{legion_id}/timeline.jsonl
-        legion_dir = data_dir / "legions" / legion_id
-        legion_dir.mkdir(parents=True, exist_ok=True)
-
-        timeline_file = legion_dir / "timeline.jsonl"
-
-        # Append comm as JSON line
-        with open(timeline_file, "a", encoding="utf-8") as f:
-            json.dump(comm.to_dict(), f)
-            f.write("\n")
+        # {data_dir}/legions/{legion_id}/timeline.jsonl, indexed by TimelineStore
+        self.system.timeline_store.append(legion_id, comm.to_dict())
+        self.system.comm_summaries.record(legion_id)
 
-        legion_logger.debug(f"Appended comm {comm.comm_id} to timeline {timeline_file}")
+        legion_logger.debug(f"Appended comm {comm.comm_id} to timeline of legion {legion_id}")
 
     @staticmethod
     def _slugify(name: str) -> str:
@@ -0,0 +1,266 @@
+"""
+CommSummaryStore - Per-minion comm summaries for a legion.
+
+The hierarchy view shows every minion's most recent outgoing comm. Finding it
+used to mean reading the whole timeline.jsonl once per minion. This store keeps
+one summary per participant (minion id, or ``"user"``) and legion:
+
+- last outbound / last inbound comm (full comm dict),
+- comm counts by comm_type, sent and received,
+- last activity timestamp.
+
+Summaries are folded forward from timeline.jsonl as CommRouter appends to it
+(only the newly written bytes are read). On shutdown they are saved to
+``legions/{legion_id}/comm_summaries.json`` together with the timeline size
+they cover; a cold start resumes from that snapshot. Without a usable snapshot
+the summaries are rebuilt with one block-wise reverse pass over the timeline,
+so the "last" comms are found near the end of the file first.
+"""
+
+import json
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from src.logging_config import get_logger
+from src.storage_utils import iter_lines_reversed
+from src.timestamp_utils import normalize_timestamp
+
+if TYPE_CHECKING:
+    from src.legion_system import LegionSystem
+
+legion_logger = get_logger('legion', category='LEGION')
+
+USER_PARTICIPANT = "user"
+
+
+@dataclass
+class MinionCommSummary:
+    """Comm activity of one participant (minion or user) in a legion."""
+    last_outbound: dict[str, Any] | None = None
+    last_inbound: dict[str, Any] | None = None
+    sent_by_type: dict[str, int] = field(default_factory=dict)
+    received_by_type: dict[str, int] = field(default_factory=dict)
+    last_activity: float | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "last_outbound": self.last_outbound,
+            "last_inbound": self.last_inbound,
+            "sent_by_type": self.sent_by_type,
+            "received_by_type": self.received_by_type,
+            "last_activity": self.last_activity,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> 'MinionCommSummary':
+        return cls(
+            last_outbound=data.get("last_outbound"),
+            last_inbound=data.get("last_inbound"),
+            sent_by_type=dict(data.get("sent_by_type") or {}),
+            received_by_type=dict(data.get("received_by_type") or {}),
+            last_activity=data.get("last_activity"),
+        )
+
+
+def _participants(comm: dict) -> tuple[str | None, list[str]]:
+    sender = USER_PARTICIPANT if comm.get("from_user") else comm.get("from_minion_id")
+    if comm.get("to_user"):
+        recipients = [USER_PARTICIPANT]
+    elif comm.get("to_minion_ids"):
+        recipients = list(comm["to_minion_ids"])  # fan-out comm
+    else:
+        recipients = [comm["to_minion_id"]] if comm.get("to_minion_id") else []
+    return sender, recipients
+
+
+def _activity_timestamp(comm: dict) -> float | None:
+    try:
+        return normalize_timestamp(comm["timestamp"])
+    except (KeyError, ValueError, TypeError):
+        return None
+
+
+@dataclass
+class _LegionSummaries:
+    timeline: Path
+    timeline_bytes: int = 0
+    inode: int | None = None
+    loaded: bool = False
+    summaries: dict[str, MinionCommSummary] = field(default_factory=dict)
+
+    def _summary(self, participant: str) -> MinionCommSummary:
+        summary = self.summaries.get(participant)
+        if summary is None:
+            summary = self.summaries[participant] = MinionCommSummary()
+        return summary
+
+    def fold(self, comm: dict, newest: bool) -> None:
+        """Count ``comm``; ``newest`` says whether it is later than all comms seen so far."""
+        sender, recipients = _participants(comm)
+        comm_type = comm.get("comm_type") or "unknown"
+        ts = _activity_timestamp(comm)
+        for participant, outbound in [(sender, True), *((r, False) for r in recipients)]:
+            if participant is None:
+                continue
+            summary = self._summary(participant)
+            counts = summary.sent_by_type if outbound else summary.received_by_type
+            counts[comm_type] = counts.get(comm_type, 0) + 1
+            if outbound and (newest or summary.last_outbound is None):
+                summary.last_outbound = comm
+            if not outbound and (newest or summary.last_inbound is None):
+                summary.last_inbound = comm
+            if ts is not None and (summary.last_activity is None or ts > summary.last_activity):
+                summary.last_activity = ts
+
+    def rebuild(self, size: int) -> None:
+        """Recompute from scratch, reading the timeline backwards up to ``size`` bytes."""
+        self.summaries.clear()
+        for line in iter_lines_reversed(self.timeline, end=size):
+            comm = _parse(line)
+            if comm is not None:
+                # Newest first: the first comm seen per participant is its last
+                self.fold(comm, newest=False)
+        self.timeline_bytes = size
+
+    def fold_tail(self, size: int) -> None:
+        """Fold complete lines appended since ``timeline_bytes`` (oldest first)."""
+        with open(self.timeline, 'rb') as f:
+            f.seek(self.timeline_bytes)
+            data = f.read(size - self.timeline_bytes)
+        complete = data.rfind(b'\n') + 1  # keep a partial trailing line for later
+        for line in data[:complete].split(b'\n'):
+            comm = _parse(line)
+            if comm is not None:
+                self.fold(comm, newest=True)
+        self.timeline_bytes += complete
+
+
+def _parse(line: bytes) -> dict | None:
+    if not line.strip():
+        return None
+    try:
+        comm = json.loads(line)
+    except json.JSONDecodeError:
+        return None
+    return comm if isinstance(comm, dict) else None
+
+
+def _complete_prefix(path: Path, size: int) -> int:
+    """Length of ``path`` up to and including its last newline within ``size`` bytes."""
+    if size == 0:
+        return 0
+    with open(path, 'rb') as f:
+        f.seek(size - 1)
+        if f.read(1) == b'\n':
+            return size
+    for line in iter_lines_reversed(path, end=size):
+        return size - len(line)
+    return 0
+
+
+class CommSummaryStore:
+    """Per-legion, per-participant comm summaries backed by timeline.jsonl."""
+
+    FILENAME = "comm_summaries.json"
+
+    def __init__(self, system: 'LegionSystem'):
+        """
+        Initialize CommSummaryStore with LegionSystem.
+
+        Args:
+            system: LegionSystem instance for accessing other components
+        """
+        self.system = system
+        self._legions: dict[str, _LegionSummaries] = {}
+        # Cold-start rebuilds run in worker threads
+        self._lock = threading.Lock()
+
+    def _legion_dir(self, legion_id: str) -> Path:
+        return self.system.session_coordinator.data_dir / "legions" / legion_id
+
+    def _sync(self, legion_id: str) -> _LegionSummaries:
+        entry = self._legions.get(legion_id)
+        if entry is None:
+            entry = _LegionSummaries(self._legion_dir(legion_id) / "timeline.jsonl")
+            self._legions[legion_id] = entry
+        try:
+            stat = entry.timeline.stat()
+        except FileNotFoundError:
+            entry.summaries.clear()
+            entry.timeline_bytes = 0
+            entry.inode = None
+            entry.loaded = True
+            return entry
+
+        if not entry.loaded:
+            self._load_snapshot(legion_id, entry)
+            entry.loaded = True
+        if entry.inode != stat.st_ino or stat.st_size < entry.timeline_bytes:
+            entry.inode = stat.st_ino
+            entry.rebuild(_complete_prefix(entry.timeline, stat.st_size))
+        elif stat.st_size > entry.timeline_bytes:
+            entry.fold_tail(stat.st_size)
+        return entry
+
+    def _load_snapshot(self, legion_id: str, entry: _LegionSummaries) -> None:
+        path = self._legion_dir(legion_id) / self.FILENAME
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+            entry.summaries = {
+                participant: MinionCommSummary.from_dict(summary)
+                for participant, summary in data["summaries"].items()
+            }
+            entry.timeline_bytes = int(data["timeline_bytes"])
+            entry.inode = data.get("inode")
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            legion_logger.warning(f"Ignoring unreadable comm summary snapshot {path}: {e}")
+            entry.summaries = {}
+            entry.timeline_bytes = 0
+            entry.inode = None
+
+    def record(self, legion_id: str) -> None:
+        """Fold comms just appended to the legion's timeline (called by CommRouter).
+
+        Never waits for a rebuild running in a worker thread; the next read
+        catches up from the timeline instead.
+        """
+        if legion_id not in self._legions or not self._lock.acquire(blocking=False):
+            return
+        try:
+            self._sync(legion_id)
+        except Exception as e:
+            legion_logger.error(f"Failed to update comm summaries for legion {legion_id}: {e}")
+        finally:
+            self._lock.release()
+
+    def summaries(self, legion_id: str) -> dict[str, MinionCommSummary]:
+        """All participant summaries for a legion, current with its timeline."""
+        with self._lock:
+            return dict(self._sync(legion_id).summaries)
+
+    def get(self, legion_id: str, participant: str) -> MinionCommSummary | None:
+        with self._lock:
+            return self._sync(legion_id).summaries.get(participant)
+
+    def save_all(self) -> None:
+        """Persist loaded summaries so the next start resumes instead of rebuilding."""
+        with self._lock:
+            for legion_id, entry in self._legions.items():
+                if not entry.loaded or entry.inode is None:
+                    continue
+                path = self._legion_dir(legion_id) / self.FILENAME
+                payload = {
+                    "timeline_bytes": entry.timeline_bytes,
+                    "inode": entry.inode,
+                    "summaries": {p: s.to_dict() for p, s in entry.summaries.items()},
+                }
+                try:
+                    tmp = path.with_suffix(".tmp")
+                    tmp.write_text(json.dumps(payload), encoding="utf-8")
+                    tmp.replace(path)
+                except OSError as e:
+                    legion_logger.error(f"Failed to save comm summaries for legion {legion_id}: {e}")
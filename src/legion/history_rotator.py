@@ -1,23 +1,20 @@
 """
-HistoryRotator — background service that prunes schedule_history.jsonl to a
-configurable retention window while preserving aggregate metrics.
+HistoryRotator — background service that prunes each legion's schedule history
+(schedule_history.db) to a configurable retention window. Rollups live in the
+same database and are never pruned.
 
 Rotation is triggered by:
   1. Periodic timer (rotation_interval_seconds, default 300s).
   2. Append-count threshold (rotation_trigger_count, default 100 appends).
 
-File I/O runs in asyncio.to_thread so the event loop is never blocked.
-Atomicity is guaranteed by write-to-tmp + os.replace.
-
-Per-legion asyncio.Lock is shared with SchedulerService._append_execution so
-appends cannot interleave with a rotation that is mid-rewrite.
+Pruning is one range delete on the execution table's primary key. It runs in
+asyncio.to_thread so the event loop is never blocked; the store serializes it
+with appends.
 """
 
 from __future__ import annotations
 
 import asyncio
-import json
-import os
 import time
 from datetime import UTC, datetime
 from typing import TYPE_CHECKING
@@ -26,13 +23,14 @@ from src.logging_config import get_logger
 
 if TYPE_CHECKING:
     from src.config_manager import HistoryRetentionConfig
+    from src.legion.schedule_history_store import ScheduleHistoryStore
     from src.legion_system import LegionSystem
 
 legion_logger = get_logger('legion', 'HISTORY_ROTATOR')
 
 
 class HistoryRotator:
-    """Background service for pruning schedule_history.jsonl per legion."""
+    """Background service that range-deletes expired rows from each legion's schedule_history.db."""
 
     def __init__(self, system: LegionSystem, config: HistoryRetentionConfig):
         self.system = system
@@ -41,17 +39,10 @@ class HistoryRotator:
         self._running = False
         self._queue: asyncio.Queue[str] = asyncio.Queue()
         self._pending: set[str] = set()  # legion IDs queued but not yet processed
-        self._locks: dict[str, asyncio.Lock] = {}  # per-legion lock
         self._last_rotation: dict[str, float] = {}  # legion_id -> monotonic time
 
     # ── Public API ──
 
-    def appender_lock(self, legion_id: str) -> asyncio.Lock:
-        """Return (creating if needed) the per-legion lock shared with the appender."""
-        if legion_id not in self._locks:
-            self._locks[legion_id] = asyncio.Lock()
-        return self._locks[legion_id]
-
     async def start(self) -> None:
         if not self.config.enabled:
             legion_logger.info("HistoryRotator disabled by config — rotation skipped")
@@ -119,117 +110,36 @@ class HistoryRotator:
     # ── Rotation ──
 
     async def rotate_legion(self, legion_id: str) -> None:
-        """Rotate schedule_history.jsonl for one legion under the per-legion lock."""
-        lock = self.appender_lock(legion_id)
-        async with lock:
-            started = time.monotonic()
-            pruned = await asyncio.to_thread(self._rotate_sync, legion_id)
-            if pruned > 0:
-                elapsed_ms = int((time.monotonic() - started) * 1000)
-                legion_logger.info(
-                    "HistoryRotator: legion=%s pruned=%d duration_ms=%d",
-                    legion_id,
-                    pruned,
-                    elapsed_ms,
-                )
-
-    def _rotate_sync(self, legion_id: str) -> int:
-        """Synchronous rotation work (runs inside asyncio.to_thread).
-
-        Returns the number of pruned entries (0 = no-op).
-        """
-        from src.models.schedule_models import ScheduleExecution
-
-        data_dir = self.system.session_coordinator.data_dir
-        legion_dir = data_dir / "legions" / legion_id
-        history_file = legion_dir / "schedule_history.jsonl"
-
-        if not history_file.exists():
-            return 0
-
-        # Read all entries
-        entries: list[ScheduleExecution] = []
+        """Prune one legion's execution history to the retention window."""
         try:
-            with open(history_file) as fh:
-                for line in fh:
-                    line = line.strip()
-                    if not line:
-                        continue
-                    try:
-                        entries.append(ScheduleExecution.from_dict(json.loads(line)))
-                    except Exception:
-                        legion_logger.warning(
-                            "HistoryRotator: skipping malformed line in %s", history_file
-                        )
+            store = await self.system.scheduler_service.open_history_store(
+                legion_id, create=False
+            )
         except Exception as e:
-            legion_logger.error("HistoryRotator: failed to read %s: %s", history_file, e)
-            return 0
-
-        before = len(entries)
-        if before == 0:
-            return 0
+            legion_logger.error("HistoryRotator: cannot open history for %s: %s", legion_id, e)
+            return
+        if store is None:
+            return
+        started = time.monotonic()
+        pruned = await asyncio.to_thread(self._rotate_sync, store)
+        if pruned > 0:
+            elapsed_ms = int((time.monotonic() - started) * 1000)
+            legion_logger.info(
+                "HistoryRotator: legion=%s pruned=%d duration_ms=%d",
+                legion_id,
+                pruned,
+                elapsed_ms,
+            )
+
+    def _rotate_sync(self, store: ScheduleHistoryStore) -> int:
+        """Synchronous rotation work (runs inside asyncio.to_thread).
 
-        # Retention window: keep entries satisfying EITHER condition
+        Keeps entries satisfying EITHER condition: among the newest max_entries,
+        or newer than max_age_days. Returns the number of pruned entries (0 = no-op).
+        """
         cutoff = datetime.now(UTC).timestamp() - self.config.max_age_days * 86400
-        by_age = {e.execution_id for e in entries if e.actual_time >= cutoff}
-        by_count = {e.execution_id for e in entries[-self.config.max_entries :]}
-        keep_ids = by_age | by_count
-
-        retained = [e for e in entries if e.execution_id in keep_ids]
-        after = len(retained)
-        pruned = before - after
-
-        if pruned == 0:
-            return 0
-
-        # Atomically rewrite history file
-        tmp_history = history_file.with_suffix(".tmp")
         try:
-            with open(tmp_history, "w") as fh:
-                for e in retained:
-                    fh.write(json.dumps(e.to_dict()) + "\n")
-            os.replace(tmp_history, history_file)
+            return store.prune(self.config.max_entries, cutoff)
         except Exception as e:
-            legion_logger.error("HistoryRotator: failed to rewrite %s: %s", history_file, e)
-            tmp_history.unlink(missing_ok=True)
+            legion_logger.error("HistoryRotator: failed to prune %s: %s", store.path, e)
             return 0
-
-        # Seed metrics file if absent (migration path for pre-existing histories)
-        metrics_file = legion_dir / "schedule_metrics.json"
-        if not metrics_file.exists():
-            self._seed_metrics_sync(legion_id, entries, metrics_file)
-
-        return pruned
-
-    def _seed_metrics_sync(self, legion_id: str, entries, metrics_file) -> None:
-        """Build a metrics snapshot from raw entries and write it atomically."""
-        from src.models.schedule_models import ScheduleMetrics, is_error_status
-
-        cache: dict[str, ScheduleMetrics] = {}
-        for ex in entries:
-            if ex.status == "retry":
-                continue
-            sid = ex.schedule_id
-            if sid not in cache:
-                cache[sid] = ScheduleMetrics(schedule_id=sid)
-            m = cache[sid]
-            m.last_run = ex.actual_time
-            m.last_status = ex.status
-            if is_error_status(ex.status):
-                m.total_runs += 1
-                m.total_errors += 1
-                m.consecutive_errors += 1
-                m.last_error_time = ex.actual_time
-                m.last_error_message = ex.error_message
-            else:
-                m.total_runs += 1
-                m.consecutive_errors = 0
-                m.last_success_time = ex.actual_time
-
-        tmp = metrics_file.with_suffix(".tmp")
-        try:
-            tmp.write_text(json.dumps({sid: m.to_dict() for sid, m in cache.items()}, indent=2))
-            os.replace(tmp, metrics_file)
-        except Exception as e:
-            legion_logger.error("HistoryRotator: failed to seed metrics for %s: %s", legion_id, e)
-            tmp.unlink(missing_ok=True)
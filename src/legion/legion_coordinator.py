@@ -9,15 +9,18 @@ Responsibilities:
 """
 
 import asyncio
-import json
 from typing import TYPE_CHECKING, Optional
 
+from src.legion.capability_index import CapabilityIndex
+from src.legion.comm_summary import USER_PARTICIPANT
 from src.logging_config import get_logger
+from src.models.minion_template import MinionTemplate
 from src.session_manager import SessionState
 
 legion_logger = get_logger('legion', 'LEGION_COORDINATOR')
 
 if TYPE_CHECKING:
+    from src.legion.comm_summary import MinionCommSummary
     from src.legion_system import LegionSystem
     from src.project_manager import ProjectInfo
     from src.session_manager import SessionInfo
@@ -39,6 +42,8 @@ class LegionCoordinator:
         # Format: {capability_keyword: [(minion_id, expertise_score), ...]}
         # Example: {"python": [("minion-123", 0.9), ("minion-456", 0.6)]}
         self.capability_registry: dict[str, list[tuple]] = {}
+        # Search index mirroring the registry plus minion roles and template text
+        self.capability_index = CapabilityIndex()
 
     @property
     def project_manager(self):
@@ -194,8 +199,13 @@ class LegionCoordinator:
         all_sessions = await self.session_manager.list_sessions()
         project_sessions = [s for s in all_sessions if s.project_id == legion_id]
 
+        # Per-participant comm summaries, computed once for the whole hierarchy
+        comm_summaries = await asyncio.to_thread(
+            self.system.comm_summaries.summaries, legion_id
+        )
+
         # Get user's last outgoing comm
-        user_last_comm = await self._get_last_outgoing_comm(legion_id, from_user=True)
+        user_last_comm = self._last_outgoing_preview(comm_summaries.get(USER_PARTICIPANT))
 
         # Issue #349: All sessions are minions - build full hierarchy
         session_map = {}
@@ -210,7 +220,7 @@ class LegionCoordinator:
                 "state": session.state.value if hasattr(session.state, 'value') else str(session.state),
                 "is_overseer": session.is_overseer or False,
                 "is_processing": session.is_processing or False,
-                "last_comm": await self._get_last_outgoing_comm(legion_id, from_minion_id=session.session_id),
+                "last_comm": self._last_outgoing_preview(comm_summaries.get(session.session_id)),
                 # Latest message tracking (issue #291)
                 "latest_message": session.latest_message,
                 "latest_message_type": session.latest_message_type,
@@ -256,8 +266,8 @@ class LegionCoordinator:
         """
         Get last outgoing comm from user or specific minion.
 
-        Reads timeline.jsonl in reverse to find most recent comm where
-        from_user matches or from_minion_id matches.
+        Served from the legion's per-participant comm summaries
+        (CommSummaryStore) instead of scanning timeline.jsonl.
 
         Args:
             legion_id: Legion UUID
@@ -265,50 +275,25 @@ class LegionCoordinator:
             from_minion_id: If provided, find comm from this minion
 
         Returns:
-            Dict with comm data or None if no comms found:
-            {
-                "to_user": bool,
-                "to_minion_name": str or None,
-                "content": str (truncated to 150 chars),
-                "comm_type": str,
-                "timestamp": str (ISO format)
-            }
+            Full comm dict (see _format_comm_preview) or None if no comms found
         """
-        # Path to timeline file
-        timeline_path = self.system.session_coordinator.data_dir / "legions" / legion_id / "timeline.jsonl"
-
-        if not timeline_path.exists():
+        participant = USER_PARTICIPANT if from_user else from_minion_id
+        if participant is None:
             return None
-
-        # Read timeline in reverse to find most recent match
         try:
-            with open(timeline_path, encoding='utf-8') as f:
-                lines = f.readlines()
-
-            # Process lines in reverse (most recent first)
-            for line in reversed(lines):
-                if not line.strip():
-                    continue
-
-                try:
-                    comm = json.loads(line)
-
-                    # Check if this comm matches our criteria
-                    if from_user and comm.get('from_user'):
-                        # Found user's outgoing comm
-                        return self._format_comm_preview(comm)
-                    elif from_minion_id and comm.get('from_minion_id') == from_minion_id:
-                        # Found minion's outgoing comm
-                        return self._format_comm_preview(comm)
-
-                except json.JSONDecodeError:
-                    continue
-
+            summary = await asyncio.to_thread(
+                self.system.comm_summaries.get, legion_id, participant
+            )
         except Exception as e:
             # Log error but don't fail - just return None
-            print(f"Error reading timeline for last comm: {e}")
+            legion_logger.error(f"Error reading comm summary for last comm: {e}")
+            return None
+        return self._last_outgoing_preview(summary)
 
-        return None
+    def _last_outgoing_preview(self, summary: 'MinionCommSummary | None') -> dict | None:
+        if summary is None or summary.last_outbound is None:
+            return None
+        return self._format_comm_preview(dict(summary.last_outbound))
 
     def _format_comm_preview(self, comm: dict) -> dict:
         """
@@ -384,6 +369,9 @@ class LegionCoordinator:
                 is_update = True
                 break
 
+        self._index_minion(minion)
+        self.capability_index.add_capability(minion_id, normalized_capability, expertise_score)
+
         if not is_update:
             # Add new entry to registry
             self.capability_registry[normalized_capability].append((minion_id, expertise_score))
@@ -402,6 +390,8 @@ class LegionCoordinator:
         Args:
             minion_id: ID of the minion being deleted
         """
+        self.capability_index.remove_minion(minion_id)
+
         # Iterate through all capabilities and remove entries for this minion
         for capability, entries in list(self.capability_registry.items()):
             # Filter out entries for this minion
@@ -421,19 +411,20 @@ class LegionCoordinator:
         """
         # Clear existing registry
         self.capability_registry.clear()
+        self.capability_index.clear()
 
         # Get all sessions
         all_sessions = await self.session_manager.list_sessions()
 
-        # Filter to minions with capabilities
-        # Issue #349: All sessions are minions - just check for capabilities
-        minions_with_capabilities = [
-            session for session in all_sessions
-            if session.capabilities
-        ]
+        # Issue #349: All sessions are minions. Every one is indexed for role and
+        # template search; only those with capabilities populate the registry.
+        minions_with_capabilities = 0
+        for minion in all_sessions:
+            self._index_minion(minion)
+            if not minion.capabilities:
+                continue
+            minions_with_capabilities += 1
 
-        # Rebuild registry from persisted capabilities
-        for minion in minions_with_capabilities:
             for capability in minion.capabilities:
                 # Use minion's default expertise_score (0.5) for capabilities without explicit scores
                 # In the future, we could store per-capability scores in SessionInfo
@@ -446,6 +437,7 @@ class LegionCoordinator:
                 # Add entry if not already present
                 if not any(mid == minion.session_id for mid, _ in self.capability_registry[capability]):
                     self.capability_registry[capability].append((minion.session_id, expertise_score))
+                    self.capability_index.add_capability(minion.session_id, capability, expertise_score)
 
         # Log rebuild summary
         total_capabilities = len(self.capability_registry)
@@ -453,28 +445,51 @@ class LegionCoordinator:
         if total_capabilities > 0:
             legion_logger.info(
                 f"Rebuilt capability registry: {total_capabilities} capabilities, "
-                f"{total_entries} total entries from {len(minions_with_capabilities)} minions"
+                f"{total_entries} total entries from {minions_with_capabilities} minions"
+            )
+
+    def _index_minion(self, minion: 'SessionInfo') -> None:
+        """(Re)index a minion's legion, role and template expertise for search."""
+        template_text = None
+        template = self.system.template_manager.templates.get(minion.template_id)
+        if isinstance(template, MinionTemplate):
+            template_text = " ".join(
+                [template.role or "", template.description or "", *template.capabilities]
             )
+        self.capability_index.set_minion(
+            minion.session_id,
+            project_id=minion.project_id,
+            role=minion.role,
+            template_text=template_text,
+            default_score=minion.expertise_score,
+        )
 
     async def search_capability_registry(
         self,
         keyword: str,
-        legion_id: str | None = None
+        legion_id: str | None = None,
+        visible_ids: set[str] | None = None,
+        limit: int | None = None,
     ) -> list[tuple]:
         """
         Search capability registry for minions with matching capabilities.
 
-        Performs case-insensitive substring matching. Returns ranked results by
-        expertise score (highest first). Minions with 0.0 or None expertise scores
-        are excluded from results.
+        Matching is case-insensitive and covers registered capabilities (whole
+        keyword, words, substrings and near misses), minion roles and template
+        expertise. Each minion appears once, ranked by expertise score weighted
+        by match relevance. Minions with 0.0 expertise scores are excluded.
 
         Args:
-            keyword: Search keyword (case-insensitive substring match)
+            keyword: Search text (case-insensitive)
             legion_id: Optional legion filter (only return minions from this legion)
+            visible_ids: Optional set of minion ids the caller may see; others are
+                dropped before ranking
+            limit: Optional maximum number of results
 
         Returns:
             List of tuples: [(minion_id, expertise_score, capability_matched), ...]
-            Sorted by expertise_score descending
+            Best match first. capability_matched is "role" or "template" when
+            only those matched.
 
         Raises:
             ValueError: If keyword is empty or only whitespace
@@ -484,31 +499,9 @@ class LegionCoordinator:
         if not keyword_trimmed:
             raise ValueError("Search keyword cannot be empty or only whitespace")
 
-        # Normalize keyword to lowercase for case-insensitive search
-        search_term = keyword_trimmed.lower()
-
-        # Find all capabilities that contain the search term (substring match)
-        matching_results = []
-        for capability, entries in self.capability_registry.items():
-            if search_term in capability:
-                # This capability matches - add all minions with non-zero scores
-                for minion_id, expertise_score in entries:
-                    # Skip minions with zero or None expertise
-                    if expertise_score is None or expertise_score == 0.0:
-                        continue
-
-                    # If legion filter is specified, only include minions from that legion
-                    if legion_id:
-                        minion = await self.get_minion_info(minion_id)
-                        if not minion or minion.project_id != legion_id:
-                            continue
-
-                    matching_results.append((minion_id, expertise_score, capability))
-
-        # Sort by expertise_score descending (highest first)
-        matching_results.sort(key=lambda x: x[1], reverse=True)
-
-        return matching_results
+        return self.capability_index.search(
+            keyword_trimmed, allowed=visible_ids, project_id=legion_id, limit=limit
+        )
 
     async def emergency_halt_all(self, legion_id: str) -> dict:
         """
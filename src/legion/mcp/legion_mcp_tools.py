@@ -1303,7 +1303,7 @@ class LegionMCPTools:
         Handle search_capability tool call.
 
         Searches the central capability registry for minions with matching capabilities.
-        Results are filtered to the caller's immediate hierarchy group.
+        Only minions in the caller's immediate hierarchy group are considered.
 
         Args:
             args: Tool arguments with 'capability' keyword and '_from_minion_id'
@@ -1318,24 +1318,21 @@ class LegionMCPTools:
             if not keyword:
                 return self._err("❌ Error: capability parameter is required and cannot be empty")
 
+            # Restrict the search to the caller's immediate hierarchy group
+            from_minion_id = args.get("_from_minion_id")
+            visible_ids = None
+            if from_minion_id:
+                visible_ids = set(await self.system.comm_router.get_visible_minions(from_minion_id))
+
             # Search the capability registry
             try:
                 results = await self.system.legion_coordinator.search_capability_registry(
-                    keyword=keyword
+                    keyword=keyword,
+                    visible_ids=visible_ids
                 )
             except ValueError as e:
                 return self._err(f"❌ Search error: {str(e)}")
 
-            # Filter results to caller's immediate hierarchy group
-            from_minion_id = args.get("_from_minion_id")
-            if from_minion_id:
-                visible_ids = await self.system.comm_router.get_visible_minions(from_minion_id)
-                visible_set = set(visible_ids)
-                results = [
-                    (mid, score, cap) for mid, score, cap in results
-                    if mid in visible_set
-                ]
-
             # Handle empty results
             if not results:
                 return {
@@ -1347,7 +1344,7 @@ class LegionMCPTools:
                 }
 
             # Format results as text list
-            result_lines = [f"**Minions with capability '{keyword}'** (ranked by expertise):\n"]
+            result_lines = [f"**Minions with capability '{keyword}'** (ranked by relevance and expertise):\n"]
 
             for minion_id, expertise_score, capability_matched in results:
                 # Get minion details
@@ -1996,6 +1993,20 @@ class LegionMCPTools:
                     f"  - Next run: {next_run_str}\n"
                     f"  - Executions: {s.execution_count} (failures: {s.failure_count})"
                 )
+                # Outcome stats come from the schedule's rollup, not raw history
+                metrics = await self.system.scheduler_service.get_schedule_metrics(
+                    s.legion_id, s.schedule_id
+                )
+                if metrics and metrics.total_runs:
+                    lines.append(
+                        f"\n  - Success rate: {metrics.success_rate:.0%} of {metrics.total_runs} runs"
+                        f" (recent: {', '.join(metrics.recent_outcomes) or 'n/a'})"
+                    )
+                    if metrics.p50_duration_ms is not None:
+                        lines.append(
+                            f"\n  - Duration: p50 {metrics.p50_duration_ms} ms,"
+                            f" p95 {metrics.p95_duration_ms} ms"
+                        )
 
             return {
                 "content": [{"type": "text", "text": "".join(lines)}],
@@ -388,9 +388,7 @@ class OverseerController:
                 )
 
             # 7b. Deregister from capability registry
-            for _capability, minion_ids in self.system.legion_coordinator.capability_registry.items():
-                if child_minion_id in minion_ids:
-                    minion_ids.remove(child_minion_id)
+            self.system.legion_coordinator.unregister_minion_capabilities(child_minion_id)
 
             # 7c. Delete the session completely (delete_session handles archival)
             try:
@@ -404,9 +402,7 @@ class OverseerController:
         else:
             # Soft dispose: keep relationships intact, minion can be restarted.
             # Only deregister from capability registry (capabilities are session-specific).
-            for _capability, minion_ids in self.system.legion_coordinator.capability_registry.items():
-                if child_minion_id in minion_ids:
-                    minion_ids.remove(child_minion_id)
+            self.system.legion_coordinator.unregister_minion_capabilities(child_minion_id)
 
         # 8. Send DISPOSE notification to user
         action_word = "deleted" if deleted else "disposed"
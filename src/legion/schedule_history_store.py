@@ -0,0 +1,267 @@
+"""
+ScheduleHistoryStore - per-legion SQLite store for schedule executions and rollups.
+
+``data/legions/<legion_id>/schedule_history.db`` holds two tables:
+
+- ``executions``: one row per ScheduleExecution, one column per field, in
+  append order (the integer primary key). History pages are index range scans
+  and retention is a single range delete instead of a file rewrite.
+- ``rollups``: one ScheduleMetrics row per schedule, updated in the same
+  transaction as the execution it folds in. List views read only this table.
+
+Legions written before the store existed are migrated on first open:
+``schedule_history.jsonl`` rows are imported and rollups come from
+``schedule_metrics.json``, with the recent-outcome and duration windows
+(which that file predates) replayed from the imported rows. Schedules missing
+from it are rebuilt from their rows. A ``legacy_migrated`` row in ``meta`` is
+written in the same transaction as the import, so a crash before both files
+are renamed with a ``.migrated`` suffix cannot import them twice.
+
+Connection model mirrors SessionCatalog: one connection, WAL journal,
+busy_timeout=5000 ms, statements serialized by a threading.Lock. Every caller
+(open with its legacy import, appends, reads and retention) runs in a worker
+thread, so waiting on that lock never blocks the event loop.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+from datetime import UTC, datetime
+from pathlib import Path
+
+from src.logging_config import get_logger
+from src.models.schedule_models import ScheduleExecution, ScheduleMetrics
+
+legion_logger = get_logger("legion", "SCHEDULE_HISTORY")
+
+HISTORY_DB = "schedule_history.db"
+LEGACY_HISTORY = "schedule_history.jsonl"
+LEGACY_METRICS = "schedule_metrics.json"
+
+_COLUMNS = (
+    "execution_id", "schedule_id", "scheduled_time", "actual_time", "status",
+    "minion_state", "error_message", "retry_number", "queue_id", "trigger",
+    "schedule_type", "exit_code", "stdout", "stderr", "duration_ms",
+    "lateness_seconds", "late_action",
+)
+
+_DDL = """
+CREATE TABLE IF NOT EXISTS executions (
+    id                INTEGER PRIMARY KEY,
+    execution_id      TEXT NOT NULL,
+    schedule_id       TEXT NOT NULL,
+    scheduled_time    REAL NOT NULL,
+    actual_time       REAL NOT NULL,
+    status            TEXT NOT NULL,
+    minion_state      TEXT,
+    error_message     TEXT,
+    retry_number      INTEGER NOT NULL DEFAULT 0,
+    queue_id          TEXT,
+    trigger           TEXT,
+    schedule_type     TEXT,
+    exit_code         INTEGER,
+    stdout            TEXT,
+    stderr            TEXT,
+    duration_ms       INTEGER,
+    lateness_seconds  REAL,
+    late_action       TEXT
+);
+
+CREATE INDEX IF NOT EXISTS idx_executions_schedule
+    ON executions(schedule_id, id);
+
+CREATE TABLE IF NOT EXISTS rollups (
+    schedule_id  TEXT PRIMARY KEY,
+    data         TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS meta (
+    key    TEXT PRIMARY KEY,
+    value  TEXT NOT NULL
+);
+"""
+
+_LEGACY_MIGRATED = "legacy_migrated"
+
+_INSERT = (
+    f"INSERT INTO executions ({', '.join(_COLUMNS)}) "
+    f"VALUES ({', '.join('?' * len(_COLUMNS))})"
+)
+_UPSERT_ROLLUP = """
+INSERT INTO rollups (schedule_id, data) VALUES (?, ?)
+ON CONFLICT(schedule_id) DO UPDATE SET data = excluded.data
+"""
+
+
+def _row(execution: ScheduleExecution) -> tuple:
+    data = execution.to_dict()
+    return tuple(data[column] for column in _COLUMNS)
+
+
+def _rollup_row(metrics: ScheduleMetrics) -> tuple:
+    return (metrics.schedule_id, json.dumps(metrics.to_dict()))
+
+
+def _read_legacy_history(path: Path) -> list[ScheduleExecution]:
+    executions = []
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                executions.append(ScheduleExecution.from_dict(json.loads(line)))
+            except Exception:
+                legion_logger.warning(f"Skipping malformed line in {path}")
+    return executions
+
+
+class ScheduleHistoryStore:
+    """Execution history and rollups for one legion's schedules."""
+
+    def __init__(self, legion_dir: Path):
+        self.legion_dir = Path(legion_dir)
+        self.path = self.legion_dir / HISTORY_DB
+        self._conn: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def exists_for(legion_dir: Path) -> bool:
+        """True when the legion has a history database or legacy files to migrate."""
+        return any((Path(legion_dir) / name).exists() for name in (HISTORY_DB, LEGACY_HISTORY))
+
+    def open(self) -> None:
+        self.legion_dir.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA busy_timeout=5000")
+        conn.executescript(_DDL)
+        conn.commit()
+        self._conn = conn
+        self._migrate_legacy_files()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                try:
+                    self._conn.close()
+                except Exception:
+                    pass
+                self._conn = None
+
+    def _migrate_legacy_files(self) -> None:
+        history_file = self.legion_dir / LEGACY_HISTORY
+        metrics_file = self.legion_dir / LEGACY_METRICS
+        if not history_file.exists() and not metrics_file.exists():
+            return
+
+        with self._lock:
+            migrated = self._conn.execute(
+                "SELECT 1 FROM meta WHERE key = ?", (_LEGACY_MIGRATED,)
+            ).fetchone()
+        if migrated is None:
+            self._import_legacy_files(history_file, metrics_file)
+        for legacy in (history_file, metrics_file):
+            if legacy.exists():
+                os.replace(legacy, legacy.with_name(legacy.name + ".migrated"))
+
+    def _import_legacy_files(self, history_file: Path, metrics_file: Path) -> None:
+        executions = _read_legacy_history(history_file) if history_file.exists() else []
+        rollups: dict[str, ScheduleMetrics] = {}
+        if metrics_file.exists():
+            try:
+                raw = json.loads(metrics_file.read_text())
+                rollups = {sid: ScheduleMetrics.from_dict(entry) for sid, entry in raw.items()}
+            except Exception as e:
+                legion_logger.warning(f"Ignoring unreadable {metrics_file}: {e}")
+
+        loaded = set(rollups)
+        needs_window = {sid for sid, m in rollups.items() if not m.recent_outcomes}
+        for execution in executions:
+            if execution.status == "retry":
+                continue
+            schedule_id = execution.schedule_id
+            if schedule_id not in loaded:
+                metrics = rollups.setdefault(schedule_id, ScheduleMetrics(schedule_id=schedule_id))
+                metrics.record(execution)
+            elif schedule_id in needs_window and execution.status != "skipped":
+                rollups[schedule_id].record_window(execution)
+
+        with self._lock:
+            self._conn.executemany(_INSERT, [_row(e) for e in executions])
+            self._conn.executemany(_UPSERT_ROLLUP, [_rollup_row(m) for m in rollups.values()])
+            self._conn.execute(
+                "INSERT INTO meta (key, value) VALUES (?, ?)",
+                (_LEGACY_MIGRATED, datetime.now(UTC).isoformat()),
+            )
+            self._conn.commit()
+        legion_logger.info(
+            f"Migrated {len(executions)} executions and {len(rollups)} rollups "
+            f"into {self.path}"
+        )
+
+    # ── Writes ──
+
+    def append(self, execution: ScheduleExecution, rollup: ScheduleMetrics | None = None) -> None:
+        """Insert one execution and, when given, its schedule's updated rollup."""
+        with self._lock:
+            self._conn.execute(_INSERT, _row(execution))
+            if rollup is not None:
+                self._conn.execute(_UPSERT_ROLLUP, _rollup_row(rollup))
+            self._conn.commit()
+
+    def prune(self, max_entries: int, cutoff: float) -> int:
+        """Delete executions that are both older than ``cutoff`` and outside the newest
+        ``max_entries``. Rollups are untouched. Returns the number of rows deleted."""
+        with self._lock:
+            boundary = self._conn.execute(
+                "SELECT id FROM executions ORDER BY id DESC LIMIT 1 OFFSET ?", (max_entries,)
+            ).fetchone()
+            if boundary is None:
+                return 0
+            deleted = self._conn.execute(
+                "DELETE FROM executions WHERE id <= ? AND actual_time < ?", (boundary[0], cutoff)
+            ).rowcount
+            self._conn.commit()
+        return deleted
+
+    # ── Reads ──
+
+    def history(
+        self, schedule_id: str | None = None, limit: int = 50, offset: int = 0
+    ) -> list[ScheduleExecution]:
+        """Executions newest first, optionally for one schedule."""
+        where, params = ("WHERE schedule_id = ?", [schedule_id]) if schedule_id else ("", [])
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {', '.join(_COLUMNS)} FROM executions {where} "
+                "ORDER BY id DESC LIMIT ? OFFSET ?",
+                [*params, limit, offset],
+            ).fetchall()
+        return [ScheduleExecution(**dict(zip(_COLUMNS, row, strict=True))) for row in rows]
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM executions").fetchone()[0]
+
+    def rollups(self) -> dict[str, ScheduleMetrics]:
+        with self._lock:
+            rows = self._conn.execute("SELECT data FROM rollups").fetchall()
+        metrics = (ScheduleMetrics.from_dict(json.loads(row[0])) for row in rows)
+        return {m.schedule_id: m for m in metrics}
+
+    def export(self, dest_dir: Path) -> list[str]:
+        """Write the history and rollups as schedule_history.jsonl / schedule_metrics.json
+        (the archive format). Returns the file names written."""
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {', '.join(_COLUMNS)} FROM executions ORDER BY id"
+            ).fetchall()
+        with open(dest_dir / LEGACY_HISTORY, "w") as f:
+            for row in rows:
+                f.write(json.dumps(dict(zip(_COLUMNS, row, strict=True))) + "\n")
+        rollups = {sid: m.to_dict() for sid, m in self.rollups().items()}
+        (dest_dir / LEGACY_METRICS).write_text(json.dumps(rollups, indent=2))
+        return [LEGACY_HISTORY, LEGACY_METRICS]
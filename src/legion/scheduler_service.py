@@ -1,19 +1,42 @@
 """
 SchedulerService - Background asyncio service for cron-based schedule execution.
 
-Ticks every 30 seconds, evaluates cron expressions via croniter, and delivers
-due prompts to owning minions through SessionCoordinator.enqueue_message().
+Active schedules sit in a min-heap keyed by next_run. The loop sleeps until the
+earliest one is due (or until woken because a schedule was created, changed,
+paused or resumed), and hands everything due to the execution pool. Heap
+entries are refreshed whenever a legion's schedules are persisted; stale
+entries are skipped when popped. A full rescan every RESYNC_INTERVAL catches
+any next_run change that was not persisted.
+
+The execution pool bounds how many fires run at once, globally and per legion
+(SchedulerConfig). Queued fires start by priority, then scheduled time, with
+legions taking turns so one busy legion cannot starve the others. A schedule
+has at most one fire outstanding; it is re-queued in the heap when that fire
+finishes. A fire that starts more than max_lateness_seconds late follows the
+schedule's late_policy (skip / coalesce / run_late), recorded on its
+ScheduleExecution. Ephemeral fires keep their slot until the agent's run is
+archived, so the caps also bound concurrently running agent containers. After
+the schedule's timeout_seconds the slot is released; the agent keeps running
+and its monitor still archives it once idle. stop() cancels and awaits
+in-flight fires and monitors.
+Prompts are delivered to owning minions through
+SessionCoordinator.enqueue_message().
 """
 
 import asyncio
+import heapq
+import itertools
 import json
-import os
 import shlex
+import threading
 import time
 import uuid
+from collections import deque
+from dataclasses import dataclass
 from datetime import UTC, datetime
 from typing import TYPE_CHECKING
 
+from src.config_manager import SchedulerConfig
 from src.config_resolution import resolve_effective_config
 from src.docker_utils import (
     find_session_container,
@@ -21,15 +44,16 @@ from src.docker_utils import (
     run_command_in_container,
     run_command_on_host,
 )
+from src.legion.schedule_history_store import ScheduleHistoryStore
 from src.logging_config import get_logger
 from src.models.schedule_models import (
+    LATE_POLICIES,
     Schedule,
     ScheduleExecution,
     ScheduleMetrics,
     ScheduleStatus,
     cap_stream,
     get_next_run,
-    is_error_status,
     validate_cron_expression,
 )
 from src.session_manager import SessionState
@@ -48,23 +72,67 @@ class _ScheduleAutoDeletedError(Exception):
         super().__init__("schedule auto-deleted")
         self.schedule = schedule
 
-TICK_INTERVAL = 30  # seconds between scheduler evaluations
+RESYNC_INTERVAL = 300  # seconds between full rescans of all schedules
+
+
+@dataclass(eq=False)
+class _QueuedFire:
+    """A due cron fire waiting for, or holding, an execution pool slot."""
+
+    schedule_id: str
+    legion_id: str
+    scheduled_time: float
+    queued_at: float
+    priority: int
+    seq: int
+    started_at: float | None = None
+    late_action: str | None = None
+
+    def to_dict(self, name: str | None, now: float) -> dict:
+        return {
+            "schedule_id": self.schedule_id,
+            "name": name,
+            "priority": self.priority,
+            "scheduled_time": self.scheduled_time,
+            "queued_at": self.queued_at,
+            "started_at": self.started_at,
+            "lateness_seconds": round(max(0.0, (self.started_at or now) - self.scheduled_time), 3),
+            "late_action": self.late_action,
+        }
 
 
 class SchedulerService:
     """Background service that evaluates cron schedules and fires due prompts."""
 
-    def __init__(self, system: "LegionSystem"):
+    def __init__(self, system: "LegionSystem", config: SchedulerConfig | None = None):
         self.system = system
+        self.config = config or SchedulerConfig()
         self._schedules: dict[str, Schedule] = {}  # schedule_id -> Schedule
         self._task: asyncio.Task | None = None
         self._running = False
         self._schedule_broadcast_callback = None
         # Per-session inflight script tracking (issue #1356)
         self._inflight_scripts_by_session: dict[str, set[str]] = {}  # session_id -> {schedule_id}
-        # Issue #1372: Per-legion metrics cache and rotation trigger counter
+        # Issue #1372: Per-legion history stores, rollup cache and rotation trigger counter
+        self._history_stores: dict[str, ScheduleHistoryStore] = {}
+        self._history_stores_lock = threading.Lock()  # history_store() also runs in worker threads
         self._metrics_cache: dict[str, dict[str, ScheduleMetrics]] = {}  # legion_id -> {schedule_id -> ScheduleMetrics}
         self._appends_since_rotation: dict[str, int] = {}  # legion_id -> count
+        # Due-time heap of (next_run, schedule_id); _queued holds each schedule's live entry
+        self._heap: list[tuple[float, str]] = []
+        self._queued: dict[str, float] = {}
+        self._wakeup = asyncio.Event()
+        self._last_resync = 0.0
+        # Execution pool: each schedule's outstanding cron fire, per-legion heaps of
+        # (-priority, scheduled_time, seq, fire) waiting for a slot, and slot holders
+        self._fires: dict[str, _QueuedFire] = {}
+        self._pending: dict[str, list[tuple[int, float, int, _QueuedFire]]] = {}
+        self._legion_turns: deque[str] = deque()  # round-robin order of legions with pending fires
+        self._slots: set[_QueuedFire] = set()
+        self._fire_tasks: set[asyncio.Task] = set()
+        self._fire_seq = itertools.count()
+        self._ephemeral_monitors: dict[str, asyncio.Task] = {}  # schedule_id -> monitor task
+        self._monitor_tasks: set[asyncio.Task] = set()  # every running monitor, for stop()
 
     def set_schedule_broadcast_callback(self, callback):
         """Set callback for broadcasting schedule events to WebSocket clients.
@@ -83,7 +151,11 @@ class SchedulerService:
         legion_logger.info("SchedulerService started")
 
     async def stop(self):
-        """Stop the scheduler background loop gracefully."""
+        """Stop the scheduler background loop gracefully.
+
+        Queued fires are dropped (their schedules are re-queued on the next
+        start); running fires and ephemeral monitors are cancelled and awaited.
+        """
         self._running = False
         if self._task and not self._task.done():
             self._task.cancel()
@@ -92,46 +164,298 @@ class SchedulerService:
             except asyncio.CancelledError:
                 pass
         self._task = None
+
+        # Nothing left for a cancelled fire's _pump() to start
+        for pending in self._pending.values():
+            for entry in pending:
+                self._fires.pop(entry[3].schedule_id, None)
+        self._pending.clear()
+        self._legion_turns.clear()
+        tasks = [*self._fire_tasks, *self._monitor_tasks]
+        for t in tasks:
+            t.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._ephemeral_monitors.clear()
+
+        with self._history_stores_lock:
+            stores = list(self._history_stores.values())
+            self._history_stores.clear()
+        for store in stores:
+            await asyncio.to_thread(store.close)
         legion_logger.info("SchedulerService stopped")
 
+    async def forget_legion(self, legion_id: str):
+        """Close a deleted legion's history store and drop its cached rollups."""
+        with self._history_stores_lock:
+            store = self._history_stores.pop(legion_id, None)
+        if store is not None:
+            await asyncio.to_thread(store.close)
+        self._metrics_cache.pop(legion_id, None)
+        self._appends_since_rotation.pop(legion_id, None)
+
     async def _scheduler_loop(self):
-        """Main loop: tick every TICK_INTERVAL seconds, fire due schedules."""
+        """Main loop: sleep until the earliest schedule is due, fire due schedules."""
         while self._running:
             try:
-                await self._tick()
+                if time.monotonic() - self._last_resync >= RESYNC_INTERVAL:
+                    await self._tick()
+                else:
+                    await self._fire_due(datetime.now(UTC).timestamp())
             except Exception as e:
                 legion_logger.error(f"Scheduler tick error: {e}")
+            self._wakeup.clear()
             try:
-                await asyncio.sleep(TICK_INTERVAL)
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self._sleep_seconds())
+            except TimeoutError:
+                pass
             except asyncio.CancelledError:
                 break
 
+    def _sleep_seconds(self) -> float:
+        """Time until the earliest queued schedule is due (capped by the resync interval)."""
+        until_resync = RESYNC_INTERVAL - (time.monotonic() - self._last_resync)
+        if not self._heap:
+            return max(until_resync, 0.0)
+        until_due = self._heap[0][0] - datetime.now(UTC).timestamp()
+        return max(min(until_due, until_resync), 0.0)
+
+    def _queue_schedule(self, schedule: Schedule) -> None:
+        """Make the heap reflect a schedule's current status and next_run."""
+        schedule_id = schedule.schedule_id
+        if schedule.status != ScheduleStatus.ACTIVE or schedule.next_run is None:
+            self._queued.pop(schedule_id, None)  # heap entry is dropped when popped
+            return
+        if schedule_id in self._fires:
+            return  # re-queued when the outstanding fire finishes
+        if self._queued.get(schedule_id) == schedule.next_run:
+            return
+        self._queued[schedule_id] = schedule.next_run
+        heapq.heappush(self._heap, (schedule.next_run, schedule_id))
+        if self._heap[0][1] == schedule_id:
+            self._wakeup.set()  # new earliest deadline
+
+    def _queue_legion(self, legion_id: str) -> None:
+        for schedule in self._schedules.values():
+            if schedule.legion_id == legion_id:
+                self._queue_schedule(schedule)
+        # Deleted schedules leave stale entries; forget them here
+        for schedule_id in [sid for sid in self._queued if sid not in self._schedules]:
+            del self._queued[schedule_id]
+
+    def _rebuild_queue(self) -> None:
+        self._queued = {
+            s.schedule_id: s.next_run
+            for s in self._schedules.values()
+            if s.status == ScheduleStatus.ACTIVE
+            and s.next_run is not None
+            and s.schedule_id not in self._fires
+        }
+        self._heap = [(next_run, schedule_id) for schedule_id, next_run in self._queued.items()]
+        heapq.heapify(self._heap)
+        self._last_resync = time.monotonic()
+
     async def _tick(self):
-        """Evaluate all active schedules and fire any that are due."""
-        now = datetime.now(UTC).timestamp()
-        for schedule in list(self._schedules.values()):
-            if schedule.status != ScheduleStatus.ACTIVE:
+        """Rescan all schedules into the heap, then fire any that are due."""
+        self._rebuild_queue()
+        await self._fire_due(datetime.now(UTC).timestamp())
+
+    async def _fire_due(self, now: float):
+        """Pop every queued schedule whose next_run has passed and submit it to the pool."""
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            next_run, schedule_id = heapq.heappop(self._heap)
+            if self._queued.get(schedule_id) != next_run:
+                continue  # superseded or removed
+            del self._queued[schedule_id]
+            schedule = self._schedules.get(schedule_id)
+            if schedule is None or schedule.status != ScheduleStatus.ACTIVE:
                 continue
-            if schedule.next_run is None:
+            if schedule.next_run != next_run:
+                self._queue_schedule(schedule)  # changed without a persist
                 continue
-            if now < schedule.next_run:
+            due.append((next_run, schedule))
+
+        for next_run, schedule in due:
+            self._dispatch(schedule)
+            if schedule.next_run != next_run:
+                self._queue_schedule(schedule)  # skipped; otherwise re-queued when the fire ends
+
+    def _dispatch(self, schedule: Schedule):
+        """Submit one due schedule to the execution pool."""
+        if schedule.schedule_type == "script":
+            target_id = schedule.minion_id or schedule.ephemeral_agent_id
+            # Same-schedule overlap guard: skip if previous fire still in-flight
+            if schedule.schedule_id in self._inflight_scripts_by_session.get(target_id, set()):
+                legion_logger.info(
+                    f"Skipping script schedule {schedule.schedule_id} — "
+                    "previous run still in progress"
+                )
+                schedule.next_run = get_next_run(schedule.cron_expression)
+                return
+        fire = _QueuedFire(
+            schedule_id=schedule.schedule_id,
+            legion_id=schedule.legion_id,
+            scheduled_time=schedule.next_run,
+            queued_at=datetime.now(UTC).timestamp(),
+            priority=schedule.priority,
+            seq=next(self._fire_seq),
+        )
+        self._fires[schedule.schedule_id] = fire
+        pending = self._pending.setdefault(schedule.legion_id, [])
+        if not pending and schedule.legion_id not in self._legion_turns:
+            self._legion_turns.append(schedule.legion_id)
+        heapq.heappush(pending, (-fire.priority, fire.scheduled_time, fire.seq, fire))
+        self._pump()
+
+    # ── Execution Pool ──
+
+    def _running_in(self, legion_id: str) -> int:
+        return sum(1 for fire in self._slots if fire.legion_id == legion_id)
+
+    def _pump(self):
+        """Start queued fires while slots are free, taking legions in turn."""
+        global_cap = self.config.max_concurrent_fires
+        legion_cap = self.config.max_concurrent_fires_per_legion
+        blocked = 0  # consecutive legions skipped for being at their cap
+        while self._legion_turns and blocked < len(self._legion_turns):
+            if global_cap and len(self._slots) >= global_cap:
+                return
+            legion_id = self._legion_turns.popleft()
+            pending = self._pending.get(legion_id)
+            if not pending:
+                self._pending.pop(legion_id, None)
                 continue
+            if legion_cap and self._running_in(legion_id) >= legion_cap:
+                self._legion_turns.append(legion_id)
+                blocked += 1
+                continue
+            fire = heapq.heappop(pending)[3]
+            if pending:
+                self._legion_turns.append(legion_id)
+            else:
+                del self._pending[legion_id]
+            blocked = 0
+            fire.started_at = datetime.now(UTC).timestamp()
+            self._slots.add(fire)
+            t = asyncio.create_task(self._run_fire(fire))
+            self._fire_tasks.add(t)
+            t.add_done_callback(self._fire_tasks.discard)
+            t.add_done_callback(task_done_log_exception)
 
-            if schedule.schedule_type == "script":
-                target_id = schedule.minion_id or schedule.ephemeral_agent_id
-                # Same-schedule overlap guard: skip if previous fire still in-flight
-                if schedule.schedule_id in self._inflight_scripts_by_session.get(target_id, set()):
-                    legion_logger.info(
-                        f"Skipping script schedule {schedule.schedule_id} — "
-                        "previous run still in progress"
+    async def _run_fire(self, fire: _QueuedFire):
+        """Run one pool fire and hand its slot to the next queued fire."""
+        try:
+            try:
+                await self._start_fire(fire)
+            finally:
+                del self._fires[fire.schedule_id]
+                schedule = self._schedules.get(fire.schedule_id)
+                if schedule is not None:
+                    if schedule.status == ScheduleStatus.ACTIVE and schedule.next_run == fire.scheduled_time:
+                        # Fire bailed out without rescheduling; wait for the next window
+                        schedule.next_run = get_next_run(schedule.cron_expression)
+                    self._queue_schedule(schedule)
+            # An ephemeral agent keeps the slot until its run is archived, or
+            # until timeout_seconds passes — the monitor carries on either way
+            monitor = self._ephemeral_monitors.pop(fire.schedule_id, None)
+            if monitor is not None:
+                timeout = schedule.timeout_seconds if schedule is not None else None
+                done, _ = await asyncio.wait({monitor}, timeout=timeout)
+                if not done:
+                    legion_logger.warning(
+                        f"Ephemeral run for schedule {fire.schedule_id} still going after "
+                        f"{timeout}s — releasing its pool slot"
                     )
-                    schedule.next_run = get_next_run(schedule.cron_expression)
-                    continue
-                self._inflight_scripts_by_session.setdefault(target_id, set()).add(schedule.schedule_id)
-                t = asyncio.create_task(self._fire_script_with_cleanup(schedule, target_id, now))
-                t.add_done_callback(task_done_log_exception)
-            else:
-                await self._fire_schedule(schedule, now)
+        finally:
+            self._slots.discard(fire)
+            self._pump()
+
+    async def _start_fire(self, fire: _QueuedFire):
+        """Apply the schedule's late policy, then fire it."""
+        schedule = self._schedules.get(fire.schedule_id)
+        if schedule is None or schedule.status != ScheduleStatus.ACTIVE:
+            return  # deleted or paused while queued
+
+        now = fire.started_at
+        if now - fire.scheduled_time > self.config.max_lateness_seconds:
+            fire.late_action = schedule.late_policy
+            legion_logger.info(
+                f"Schedule {schedule.schedule_id} is {now - fire.scheduled_time:.0f}s late "
+                f"— applying late policy '{schedule.late_policy}'"
+            )
+            if schedule.late_policy == "skip":
+                await self._skip_late_fire(schedule, fire)
+                return
+
+        if schedule.schedule_type == "script":
+            target_id = schedule.minion_id or schedule.ephemeral_agent_id
+            self._inflight_scripts_by_session.setdefault(target_id, set()).add(schedule.schedule_id)
+            await self._fire_script_with_cleanup(
+                schedule, target_id, now, scheduled_time=fire.scheduled_time
+            )
+        else:
+            await self._fire_schedule(schedule, now, scheduled_time=fire.scheduled_time)
+
+        if (
+            fire.late_action == "run_late"
+            and schedule.schedule_id in self._schedules
+            and schedule.status == ScheduleStatus.ACTIVE
+            and schedule.failure_count == 0
+        ):
+            # Catch up: the next window after this fire's slot, even if already past
+            catch_up = get_next_run(schedule.cron_expression, base_time=fire.scheduled_time)
+            if schedule.next_run is None or catch_up < schedule.next_run:
+                schedule.next_run = catch_up
+                await self._persist_schedules(schedule.legion_id)
+
+    async def _skip_late_fire(self, schedule: Schedule, fire: _QueuedFire):
+        """Drop a late fire (late_policy "skip") and wait for the next window."""
+        execution = ScheduleExecution(
+            execution_id=str(uuid.uuid4()),
+            schedule_id=schedule.schedule_id,
+            scheduled_time=fire.scheduled_time,
+            actual_time=fire.started_at,
+            status="skipped",
+            minion_state="unknown",
+            error_message=(
+                f"Started {fire.started_at - fire.scheduled_time:.0f}s late "
+                f"(limit {self.config.max_lateness_seconds}s)"
+            ),
+            schedule_type=schedule.schedule_type,
+        )
+        schedule.last_status = "skipped"
+        schedule.next_run = get_next_run(schedule.cron_expression)
+        schedule.updated_at = datetime.now(UTC).timestamp()
+        await self._persist_schedules(schedule.legion_id)
+        await self._record_execution(schedule, execution)
+        await self._broadcast_execution_event(schedule.legion_id, execution)
+        await self._broadcast_schedule_event(schedule.legion_id, schedule)
+
+    def queued_fires(self, legion_id: str) -> dict:
+        """Snapshot of a legion's running and queued fires, in start order."""
+        now = datetime.now(UTC).timestamp()
+
+        def name(fire: _QueuedFire) -> str | None:
+            schedule = self._schedules.get(fire.schedule_id)
+            return schedule.name if schedule else None
+
+        running = sorted(
+            (f for f in self._slots if f.legion_id == legion_id), key=lambda f: f.started_at
+        )
+        queued = [entry[3] for entry in sorted(self._pending.get(legion_id, []))]
+        return {
+            "running": [
+                {**f.to_dict(name(f), now), "waiting_on_agent": self._fires.get(f.schedule_id) is not f}
+                for f in running
+            ],
+            "queued": [f.to_dict(name(f), now) for f in queued],
+            "running_total": len(self._slots),
+            "limits": {
+                "max_concurrent_fires": self.config.max_concurrent_fires,
+                "max_concurrent_fires_per_legion": self.config.max_concurrent_fires_per_legion,
+                "max_lateness_seconds": self.config.max_lateness_seconds,
+            },
+        }
 
     # ── CRUD Operations ──
 
@@ -152,6 +476,8 @@ class SchedulerService:
         script_command: str | None = None,
         script_timeout_seconds: int = 60,
         repeat_count: int | None = None,
+        priority: int = 0,
+        late_policy: str = "coalesce",
     ) -> Schedule:
         """Create a new schedule.
 
@@ -167,6 +493,9 @@ class SchedulerService:
         if not minion_id and not session_config:
             raise ValueError("Either minion_id (permanent) or session_config (ephemeral) is required")
 
+        if late_policy not in LATE_POLICIES:
+            raise ValueError(f"Invalid late_policy: {late_policy}. Use one of {', '.join(LATE_POLICIES)}")
+
         schedule = Schedule(
             schedule_id=str(uuid.uuid4()),
             legion_id=legion_id,
@@ -186,6 +515,8 @@ class SchedulerService:
             script_command=script_command,
             script_timeout_seconds=script_timeout_seconds,
             repeat_count=repeat_count,
+            priority=priority,
+            late_policy=late_policy,
         )
 
         self._schedules[schedule.schedule_id] = schedule
@@ -235,10 +566,15 @@ class SchedulerService:
         if "cron_expression" in fields:
             if not validate_cron_expression(fields["cron_expression"]):
                 raise ValueError(f"Invalid cron expression: {fields['cron_expression']}")
+        if "late_policy" in fields and fields["late_policy"] not in LATE_POLICIES:
+            raise ValueError(
+                f"Invalid late_policy: {fields['late_policy']}. Use one of {', '.join(LATE_POLICIES)}"
+            )
 
         allowed = {
             "name", "cron_expression", "prompt", "max_retries", "timeout_seconds",
             "session_config", "script_command", "script_timeout_seconds", "repeat_count",
+            "priority", "late_policy",
         }
         for key, value in fields.items():
             if key in allowed:
@@ -351,31 +687,16 @@ class SchedulerService:
         limit: int = 50,
         offset: int = 0,
     ) -> list[ScheduleExecution]:
-        """Read execution history from schedule_history.jsonl."""
-        data_dir = self.system.session_coordinator.data_dir
-        history_file = data_dir / "legions" / legion_id / "schedule_history.jsonl"
-        if not history_file.exists():
-            return []
-
-        executions = []
+        """Read execution history (newest first) from the legion's history store."""
         try:
-            with open(history_file) as f:
-                for line in f:
-                    line = line.strip()
-                    if not line:
-                        continue
-                    data = json.loads(line)
-                    if schedule_id and data.get("schedule_id") != schedule_id:
-                        continue
-                    executions.append(ScheduleExecution.from_dict(data))
+            store = await self.open_history_store(legion_id, create=False)
+            if store is None:
+                return []
+            return await asyncio.to_thread(store.history, schedule_id, limit, offset)
         except Exception as e:
             legion_logger.error(f"Error reading schedule history for legion {legion_id}: {e}")
             return []
 
-        # Return newest first, with pagination
-        executions.reverse()
-        return executions[offset : offset + limit]
-
     # ── Manual Trigger ──
 
     async def run_now(self, schedule_id: str) -> dict:
@@ -429,15 +750,37 @@ class SchedulerService:
 
     # ── Execution ──
 
-    async def _fire_schedule(self, schedule: Schedule, now: float, trigger: str = "cron"):
-        """Fire a due schedule — delegates to permanent or ephemeral path."""
+    async def _fire_schedule(
+        self,
+        schedule: Schedule,
+        now: float,
+        trigger: str = "cron",
+        scheduled_time: float | None = None,
+    ):
+        """Fire a due schedule — delegates to permanent or ephemeral path.
+
+        scheduled_time is the window being fired, captured when it was dispatched;
+        it defaults to the schedule's current next_run.
+        """
         if schedule.session_config is not None:
-            await self._fire_ephemeral_schedule(schedule, now, trigger=trigger)
+            await self._fire_ephemeral_schedule(
+                schedule, now, trigger=trigger, scheduled_time=scheduled_time
+            )
         else:
-            await self._fire_permanent_schedule(schedule, now, trigger=trigger)
+            await self._fire_permanent_schedule(
+                schedule, now, trigger=trigger, scheduled_time=scheduled_time
+            )
 
-    async def _fire_permanent_schedule(self, schedule: Schedule, now: float, trigger: str = "cron"):
+    async def _fire_permanent_schedule(
+        self,
+        schedule: Schedule,
+        now: float,
+        trigger: str = "cron",
+        scheduled_time: float | None = None,
+    ):
         """Fire a permanent schedule by enqueuing the prompt to an existing minion."""
+        if scheduled_time is None:
+            scheduled_time = schedule.next_run or now
         legion_logger.info(
             f"Firing schedule {schedule.schedule_id} '{schedule.name}' "
             f"for minion {schedule.minion_id}"
@@ -468,7 +811,7 @@ class SchedulerService:
         execution = ScheduleExecution(
             execution_id=str(uuid.uuid4()),
             schedule_id=schedule.schedule_id,
-            scheduled_time=schedule.next_run or now,
+            scheduled_time=scheduled_time,
             actual_time=now,
             status="queued",
             minion_state=minion_state,
@@ -535,7 +878,13 @@ class SchedulerService:
             except ValueError:
                 pass  # already deleted
 
-    async def _fire_ephemeral_schedule(self, schedule: Schedule, now: float, trigger: str = "cron"):
+    async def _fire_ephemeral_schedule(
+        self,
+        schedule: Schedule,
+        now: float,
+        trigger: str = "cron",
+        scheduled_time: float | None = None,
+    ):
         """Fire an ephemeral schedule using its static agent session.
 
         The agent is created once at schedule creation. On each fire:
@@ -543,6 +892,8 @@ class SchedulerService:
         2. Enqueue the prompt
         3. Monitor for completion — archive + clear + terminate on idle
         """
+        if scheduled_time is None:
+            scheduled_time = schedule.next_run or now
         agent_id = schedule.ephemeral_agent_id
 
         # Migration: old-format schedule without agent_id — create one now
@@ -603,7 +954,7 @@ class SchedulerService:
         execution = ScheduleExecution(
             execution_id=str(uuid.uuid4()),
             schedule_id=schedule.schedule_id,
-            scheduled_time=schedule.next_run or now,
+            scheduled_time=scheduled_time,
             actual_time=now,
             status="queued",
             minion_state=session_info.state.value if session_info else "unknown",
@@ -641,11 +992,14 @@ class SchedulerService:
             schedule.execution_count += 1
             schedule.failure_count = 0
 
-            # Launch monitoring task
+            # Launch monitoring task (the pool holds this fire's slot until it ends)
             t = asyncio.create_task(
                 self._monitor_ephemeral_session(schedule.schedule_id, agent_id, schedule.legion_id)
             )
             t.add_done_callback(task_done_log_exception)
+            self._ephemeral_monitors[schedule.schedule_id] = t
+            self._monitor_tasks.add(t)
+            t.add_done_callback(self._monitor_tasks.discard)
 
             legion_logger.info(
                 f"Ephemeral schedule {schedule.schedule_id} fired — agent {agent_id} started"
@@ -913,17 +1267,28 @@ class SchedulerService:
         target_id: str,
         now: float,
         trigger: str = "cron",
+        scheduled_time: float | None = None,
     ):
         """Wrapper that fires a script schedule and always removes from inflight set."""
         try:
-            await self._fire_script_schedule(schedule, now, trigger=trigger)
+            await self._fire_script_schedule(
+                schedule, now, trigger=trigger, scheduled_time=scheduled_time
+            )
         finally:
             session_set = self._inflight_scripts_by_session.get(target_id, set())
             session_set.discard(schedule.schedule_id)
             if not session_set:
                 self._inflight_scripts_by_session.pop(target_id, None)
+                # Wake the session's queue processor out of its idle wait
+                self.system.session_coordinator.queue_processor.notify(target_id)
 
-    async def _fire_script_schedule(self, schedule: "Schedule", now: float, trigger: str = "cron"):
+    async def _fire_script_schedule(
+        self,
+        schedule: "Schedule",
+        now: float,
+        trigger: str = "cron",
+        scheduled_time: float | None = None,
+    ):
         """Fire a script schedule: auto-start session, run command, route outcome.
 
         **Security:** For Docker sessions, vault secrets are passed as proxy placeholders
@@ -933,6 +1298,8 @@ class SchedulerService:
         """
         target_id = schedule.minion_id or schedule.ephemeral_agent_id
         started_clock = time.monotonic()
+        if scheduled_time is None:
+            scheduled_time = schedule.next_run or now
 
         # Increment fire_count before work so crashes still consume the count (issue #1538)
         schedule.fire_count += 1
@@ -941,7 +1308,7 @@ class SchedulerService:
         execution = ScheduleExecution(
             execution_id=str(uuid.uuid4()),
             schedule_id=schedule.schedule_id,
-            scheduled_time=schedule.next_run or now,
+            scheduled_time=scheduled_time,
             actual_time=now,
             status="error",
             minion_state="unknown",
@@ -1119,128 +1486,61 @@ class SchedulerService:
             f"in {backoff}s"
         )
 
-    # ── Metrics (issue #1372) ──
+    # ── History and Metrics (issue #1372) ──
 
-    def _metrics_file(self, legion_id: str):
-        data_dir = self.system.session_coordinator.data_dir
-        return data_dir / "legions" / legion_id / "schedule_metrics.json"
+    def history_store(self, legion_id: str, create: bool = True) -> ScheduleHistoryStore | None:
+        """Return the legion's open history store, opening (and migrating) it on first use.
+
+        With create=False, returns None for a legion that has no history yet.
+        Blocking; coroutines use open_history_store().
+        """
+        with self._history_stores_lock:
+            store = self._history_stores.get(legion_id)
+            if store is None:
+                legion_dir = self.system.session_coordinator.data_dir / "legions" / legion_id
+                if not create and not ScheduleHistoryStore.exists_for(legion_dir):
+                    return None
+                store = ScheduleHistoryStore(legion_dir)
+                store.open()
+                self._history_stores[legion_id] = store
+            return store
+
+    async def open_history_store(
+        self, legion_id: str, create: bool = True
+    ) -> ScheduleHistoryStore | None:
+        """history_store() in a worker thread, since the first open may import legacy files."""
+        return await asyncio.to_thread(self.history_store, legion_id, create)
 
     async def _load_metrics(self, legion_id: str) -> dict[str, ScheduleMetrics]:
-        """Load (or return cached) metrics for a legion. Creates empty cache on miss."""
+        """Load (or return cached) rollups for a legion. Creates empty cache on miss."""
         if legion_id in self._metrics_cache:
             return self._metrics_cache[legion_id]
 
-        metrics_file = self._metrics_file(legion_id)
         cache: dict[str, ScheduleMetrics] = {}
-        if metrics_file.exists():
-            try:
-                raw = json.loads(metrics_file.read_text())
-                for sid, entry in raw.items():
-                    cache[sid] = ScheduleMetrics.from_dict(entry)
-            except Exception as e:
-                legion_logger.warning(f"Failed to read metrics for legion {legion_id}: {e}")
-        self._metrics_cache[legion_id] = cache
-        return cache
-
-    async def _persist_metrics(self, legion_id: str):
-        """Write metrics cache for a legion atomically (tmp + os.replace)."""
-        cache = self._metrics_cache.get(legion_id, {})
-        metrics_file = self._metrics_file(legion_id)
-        metrics_file.parent.mkdir(parents=True, exist_ok=True)
-        tmp_file = metrics_file.with_suffix(".tmp")
         try:
-            payload = {sid: m.to_dict() for sid, m in cache.items()}
-            tmp_file.write_text(json.dumps(payload, indent=2))
-            os.replace(tmp_file, metrics_file)
+            store = await self.open_history_store(legion_id, create=False)
+            if store is not None:
+                cache = await asyncio.to_thread(store.rollups)
         except Exception as e:
-            legion_logger.error(f"Failed to persist metrics for legion {legion_id}: {e}")
-            tmp_file.unlink(missing_ok=True)
+            legion_logger.warning(f"Failed to read metrics for legion {legion_id}: {e}")
+        self._metrics_cache[legion_id] = cache
+        return cache
 
-    async def _update_metrics(self, legion_id: str, execution: ScheduleExecution):
-        """Update in-memory ScheduleMetrics for one execution and persist."""
+    async def _update_metrics(
+        self, legion_id: str, execution: ScheduleExecution
+    ) -> ScheduleMetrics | None:
+        """Fold one execution into the in-memory rollup; returns it (None for retries)."""
         if execution.status == "retry":
-            return  # intermediate state — the retried fire generates its own record
+            return None  # intermediate state — the retried fire generates its own record
 
         cache = await self._load_metrics(legion_id)
         schedule_id = execution.schedule_id
         if schedule_id not in cache:
             cache[schedule_id] = ScheduleMetrics(schedule_id=schedule_id)
         m = cache[schedule_id]
-
-        now_ts = execution.actual_time
-        m.last_run = now_ts
-        m.last_status = execution.status
+        m.record(execution)
         m.updated_at = datetime.now(UTC).timestamp()
-
-        if is_error_status(execution.status):
-            m.total_runs += 1
-            m.total_errors += 1
-            m.consecutive_errors += 1
-            m.last_error_time = now_ts
-            m.last_error_message = execution.error_message
-        else:
-            m.total_runs += 1
-            m.consecutive_errors = 0
-            m.last_success_time = now_ts
-
-        await self._persist_metrics(legion_id)
-
-    async def _seed_metrics_from_history(self, legion_id: str):
-        """Seed schedule_metrics.json from schedule_history.jsonl if metrics file is absent."""
-        metrics_file = self._metrics_file(legion_id)
-        if metrics_file.exists():
-            await self._load_metrics(legion_id)
-            return
-
-        data_dir = self.system.session_coordinator.data_dir
-        history_file = data_dir / "legions" / legion_id / "schedule_history.jsonl"
-        if not history_file.exists():
-            self._metrics_cache.setdefault(legion_id, {})
-            return
-
-        cache: dict[str, ScheduleMetrics] = {}
-        try:
-            with open(history_file) as f:
-                for line in f:
-                    line = line.strip()
-                    if not line:
-                        continue
-                    try:
-                        data = json.loads(line)
-                        ex = ScheduleExecution.from_dict(data)
-                    except Exception:
-                        continue
-                    if ex.status == "retry":
-                        continue
-                    sid = ex.schedule_id
-                    if sid not in cache:
-                        cache[sid] = ScheduleMetrics(schedule_id=sid)
-                    m = cache[sid]
-                    m.last_run = ex.actual_time
-                    m.last_status = ex.status
-                    if is_error_status(ex.status):
-                        m.total_runs += 1
-                        m.total_errors += 1
-                        m.consecutive_errors += 1
-                        m.last_error_time = ex.actual_time
-                        m.last_error_message = ex.error_message
-                    else:
-                        m.total_runs += 1
-                        m.consecutive_errors = 0
-                        m.last_success_time = ex.actual_time
-        except Exception as e:
-            legion_logger.error(f"Failed to seed metrics from history for legion {legion_id}: {e}")
-
-        self._metrics_cache[legion_id] = cache
-        await self._persist_metrics(legion_id)
-        legion_logger.info(
-            f"Seeded metrics for {len(cache)} schedules from history for legion {legion_id}"
-        )
-
-        # Queue an immediate rotation to prune the file to the retention window
-        rotator = getattr(self.system, "history_rotator", None)
-        if rotator is not None:
-            asyncio.ensure_future(rotator.request_rotation(legion_id))
+        return m
 
     async def get_schedule_metrics(self, legion_id: str, schedule_id: str) -> ScheduleMetrics | None:
         """Return cached ScheduleMetrics for one schedule (or None if never fired)."""
@@ -1266,9 +1566,15 @@ class SchedulerService:
             asyncio.ensure_future(rotator.request_rotation(legion_id))
 
     async def _record_execution(self, schedule: Schedule, execution: ScheduleExecution):
-        """Update metrics, append execution record, and trigger rotation if needed."""
-        await self._update_metrics(schedule.legion_id, execution)
-        await self._append_execution(schedule.legion_id, execution)
+        """Update the rollup, store execution + rollup together, and trigger rotation if needed."""
+        fire = self._fires.get(execution.schedule_id)
+        if fire is not None and fire.started_at is not None and execution.trigger == "cron":
+            execution.lateness_seconds = round(
+                max(0.0, execution.actual_time - execution.scheduled_time), 3
+            )
+            execution.late_action = fire.late_action
+        rollup = await self._update_metrics(schedule.legion_id, execution)
+        await self._append_execution(schedule.legion_id, execution, rollup)
         self._maybe_trigger_rotation(schedule.legion_id)
 
     # ── Persistence ──
@@ -1290,6 +1596,9 @@ class SchedulerService:
         except Exception as e:
             legion_logger.error(f"Failed to persist schedules for legion {legion_id}: {e}")
 
+        # Every schedule change is persisted, so keep the due-time heap in step here
+        self._queue_legion(legion_id)
+
     async def _load_schedules(self, legion_id: str):
         """Load schedules for a specific legion from disk."""
         data_dir = self.system.session_coordinator.data_dir
@@ -1345,9 +1654,9 @@ class SchedulerService:
         )
         legion_logger.info(f"Loaded {total} schedules ({active} active) from all legions")
 
-        # Issue #1372: Seed metrics from history for legions that don't have metrics yet
+        # Issue #1372: Load rollups (migrating legacy history files on first open)
         for legion_id in legion_ids:
-            await self._seed_metrics_from_history(legion_id)
+            await self._load_metrics(legion_id)
 
         # Issue #578: Recover orphaned ephemeral sessions on startup
         await self._recover_orphaned_ephemeral_sessions()
@@ -1406,29 +1715,13 @@ class SchedulerService:
                 await self._persist_schedules(legion_id)
             legion_logger.info(f"Recovered {recovered} orphaned ephemeral agents")
 
-    async def _append_execution(self, legion_id: str, execution: ScheduleExecution):
-        """Append execution record to schedule_history.jsonl.
-
-        Acquires the per-legion HistoryRotator lock to prevent write-during-rotation races.
-        """
-        data_dir = self.system.session_coordinator.data_dir
-        legion_dir = data_dir / "legions" / legion_id
-        legion_dir.mkdir(parents=True, exist_ok=True)
-        history_file = legion_dir / "schedule_history.jsonl"
-
-        from src.legion.history_rotator import HistoryRotator
-
-        rotator = getattr(self.system, "history_rotator", None)
-        lock = rotator.appender_lock(legion_id) if isinstance(rotator, HistoryRotator) else None
-
+    async def _append_execution(
+        self, legion_id: str, execution: ScheduleExecution, rollup: ScheduleMetrics | None = None
+    ):
+        """Store an execution record, with its schedule's updated rollup in the same transaction."""
         try:
-            if lock is not None:
-                async with lock:
-                    with open(history_file, "a") as f:
-                        f.write(json.dumps(execution.to_dict()) + "\n")
-            else:
-                with open(history_file, "a") as f:
-                    f.write(json.dumps(execution.to_dict()) + "\n")
+            store = await self.open_history_store(legion_id)
+            await asyncio.to_thread(store.append, execution, rollup)
         except Exception as e:
             legion_logger.error(f"Failed to append execution history: {e}")
 
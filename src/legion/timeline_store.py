@@ -0,0 +1,305 @@
+"""
+TimelineStore - Indexed, paged access to legion timeline.jsonl files.
+
+timeline.jsonl stays the append-only source of truth (CommRouter appends one
+Comm per line). For each legion the store keeps an in-memory index of the
+file built once and extended incrementally as lines are appended:
+
+- newest-first order by normalized timestamp (ties keep file order),
+- uniqueness by comm_id (the copy with the newest timestamp wins, matching
+  the previous sort-then-dedup behaviour),
+- secondary keys per minion (sender or any recipient) and per comm_type.
+
+The index holds byte offsets, not comm bodies, so a page reads and parses only
+the lines it returns. Appends made outside the store are picked up from the
+file's growth; a truncated or replaced file triggers a rebuild.
+
+Cursors: every indexed line gets a sequence number in append order. A page
+reports ``cursor`` (highest sequence seen); passing it back as
+``since_cursor`` returns only comms appended after it.
+"""
+
+import bisect
+import json
+import threading
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from src.logging_config import get_logger
+from src.timestamp_utils import normalize_timestamp
+
+if TYPE_CHECKING:
+    from src.legion_system import LegionSystem
+
+legion_logger = get_logger('legion', category='LEGION')
+
+# Sort key: (timestamp, -seq). Ascending lists of keys read newest-first
+# from the end, with equal timestamps in file order.
+_Key = tuple[float, int]
+
+
+@dataclass
+class _Entry:
+    seq: int
+    timestamp: float
+    offset: int
+    length: int
+    comm_id: str
+    minion_ids: frozenset[str]  # sender and recipient(s)
+    comm_type: str | None
+
+    @property
+    def key(self) -> _Key:
+        return (self.timestamp, -self.seq)
+
+
+def _timeline_timestamp(comm: dict) -> float:
+    """Normalized timestamp used for ordering (0.0 when the comm has none)."""
+    if 'timestamp' not in comm:
+        return 0.0
+    try:
+        return normalize_timestamp(comm['timestamp'])
+    except (ValueError, TypeError) as e:
+        legion_logger.warning(
+            f"Invalid timestamp in comm {comm.get('comm_id', 'unknown')}: {e}, using current time"
+        )
+        return datetime.now(UTC).timestamp()
+
+
+@dataclass
+class _LegionIndex:
+    path: Path
+    inode: int | None = None
+    indexed_bytes: int = 0
+    next_seq: int = 0
+    ordered: list[_Key] = field(default_factory=list)
+    entries: dict[int, _Entry] = field(default_factory=dict)  # seq -> entry (append order)
+    by_comm_id: dict[str, int] = field(default_factory=dict)  # comm_id -> seq
+    by_minion: dict[str, list[_Key]] = field(default_factory=dict)
+    by_type: dict[str, list[_Key]] = field(default_factory=dict)
+
+    def reset(self) -> None:
+        self.inode = None
+        self.indexed_bytes = 0
+        self.next_seq = 0
+        self.ordered.clear()
+        self.entries.clear()
+        self.by_comm_id.clear()
+        self.by_minion.clear()
+        self.by_type.clear()
+
+    def _secondary_lists(self, entry: _Entry) -> list[list[_Key]]:
+        lists = []
+        for minion_id in entry.minion_ids:
+            lists.append(self.by_minion.setdefault(minion_id, []))
+        if entry.comm_type:
+            lists.append(self.by_type.setdefault(entry.comm_type, []))
+        return lists
+
+    def add(self, entry: _Entry) -> None:
+        existing_seq = self.by_comm_id.get(entry.comm_id)
+        if existing_seq is not None:
+            existing = self.entries[existing_seq]
+            if entry.timestamp <= existing.timestamp:
+                return  # duplicate line; the indexed copy sorts first
+            self._remove(existing)
+        self.entries[entry.seq] = entry
+        self.by_comm_id[entry.comm_id] = entry.seq
+        key = entry.key
+        for keys in [self.ordered, *self._secondary_lists(entry)]:
+            if not keys or key > keys[-1]:
+                keys.append(key)  # common case: appended comms are the newest
+            else:
+                bisect.insort(keys, key)
+
+    def _remove(self, entry: _Entry) -> None:
+        del self.entries[entry.seq]
+        key = entry.key
+        for keys in [self.ordered, *self._secondary_lists(entry)]:
+            i = bisect.bisect_left(keys, key)
+            if i < len(keys) and keys[i] == key:
+                del keys[i]
+
+    def scan(self) -> None:
+        """Bring the index up to date with the file on disk."""
+        try:
+            stat = self.path.stat()
+        except FileNotFoundError:
+            self.reset()
+            return
+        if self.inode is not None and (stat.st_ino != self.inode or stat.st_size < self.indexed_bytes):
+            legion_logger.info(f"Timeline {self.path} was rewritten; rebuilding index")
+            self.reset()
+        self.inode = stat.st_ino
+        if stat.st_size == self.indexed_bytes:
+            return
+
+        with open(self.path, 'rb') as f:
+            f.seek(self.indexed_bytes)
+            data = f.read(stat.st_size - self.indexed_bytes)
+        offset = self.indexed_bytes
+        start = 0
+        while True:
+            end = data.find(b'\n', start)
+            if end < 0:
+                break  # partial trailing line: wait for its newline
+            line = data[start:end]
+            self._index_line(line, offset + start, end - start)
+            start = end + 1
+        self.indexed_bytes = offset + start
+
+    def _index_line(self, line: bytes, offset: int, length: int) -> None:
+        if not line.strip():
+            return
+        try:
+            comm = json.loads(line)
+        except json.JSONDecodeError:
+            return
+        seq = self.next_seq
+        self.next_seq += 1
+        comm_id = comm.get('comm_id') if isinstance(comm, dict) else None
+        if not comm_id:
+            return
+        self.add(_Entry(
+            seq=seq,
+            timestamp=_timeline_timestamp(comm),
+            offset=offset,
+            length=length,
+            comm_id=comm_id,
+            minion_ids=frozenset(
+                [comm.get('from_minion_id'), comm.get('to_minion_id'), *(comm.get('to_minion_ids') or [])]
+            ) - {None},
+            comm_type=comm.get('comm_type'),
+        ))
+
+    def read(self, entries: list[_Entry]) -> list[dict[str, Any]]:
+        comms = []
+        if not entries:
+            return comms
+        with open(self.path, 'rb') as f:
+            for entry in entries:
+                f.seek(entry.offset)
+                comm = json.loads(f.read(entry.length))
+                if 'timestamp' in comm:
+                    comm['timestamp'] = entry.timestamp
+                comms.append(comm)
+        return comms
+
+
+class TimelineStore:
+    """Per-legion timeline indexes over ``{data_dir}/legions/{legion_id}/timeline.jsonl``."""
+
+    def __init__(self, system: 'LegionSystem'):
+        """
+        Initialize TimelineStore with LegionSystem.
+
+        Args:
+            system: LegionSystem instance for accessing other components
+        """
+        self.system = system
+        self._indexes: dict[str, _LegionIndex] = {}
+        # Index updates happen in worker threads; one at a time per store
+        self._lock = threading.Lock()
+
+    def timeline_path(self, legion_id: str) -> Path:
+        return self.system.session_coordinator.data_dir / "legions" / legion_id / "timeline.jsonl"
+
+    def _index(self, legion_id: str) -> _LegionIndex:
+        index = self._indexes.get(legion_id)
+        if index is None:
+            index = _LegionIndex(self.timeline_path(legion_id))
+            self._indexes[legion_id] = index
+        index.scan()
+        return index
+
+    def append(self, legion_id: str, comm_data: dict) -> None:
+        """Append one comm to timeline.jsonl and index it."""
+        path = self.timeline_path(legion_id)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "a", encoding="utf-8") as f:
+            json.dump(comm_data, f)
+            f.write("\n")
+        # Called on the event loop: never wait behind an index build running in
+        # a worker thread. A skipped scan is caught up by the next query.
+        if legion_id in self._indexes and self._lock.acquire(blocking=False):
+            try:
+                self._indexes[legion_id].scan()
+            finally:
+                self._lock.release()
+
+    def query(
+        self,
+        legion_id: str,
+        limit: int = 100,
+        offset: int = 0,
+        minion_id: str | None = None,
+        comm_type: str | None = None,
+        since_cursor: int | None = None,
+    ) -> dict[str, Any]:
+        """Newest-first page of unique comms, optionally filtered.
+
+        ``minion_id`` matches comms sent from or to that minion. With
+        ``since_cursor`` only comms appended after that cursor are considered.
+        Returns ``{"comms", "total", "limit", "offset", "cursor"}``.
+        """
+        with self._lock:
+            index = self._index(legion_id)
+            if minion_id is not None and comm_type is not None:
+                # Walk the shorter secondary list, check the other key per entry
+                by_minion = index.by_minion.get(minion_id, [])
+                by_type = index.by_type.get(comm_type, [])
+                keys = [
+                    k for k in (by_minion if len(by_minion) <= len(by_type) else by_type)
+                    if self._matches(index.entries[-k[1]], minion_id, comm_type)
+                ]
+            elif minion_id is not None:
+                keys = index.by_minion.get(minion_id, [])
+            elif comm_type is not None:
+                keys = index.by_type.get(comm_type, [])
+            else:
+                keys = index.ordered
+
+            if since_cursor is not None:
+                new_entries = [
+                    index.entries[seq] for seq in range(since_cursor + 1, index.next_seq)
+                    if seq in index.entries
+                ]
+                candidates = sorted(
+                    (e.key for e in new_entries if self._matches(e, minion_id, comm_type)),
+                    reverse=True,
+                )
+            else:
+                candidates = None
+
+            if candidates is not None:
+                total = len(candidates)
+                page_keys = candidates[offset:offset + limit]
+            else:
+                total = len(keys)
+                stop = max(total - offset, 0)
+                page_keys = keys[max(stop - limit, 0):stop][::-1]
+
+            page = [index.entries[-key[1]] for key in page_keys]
+            comms = index.read(page)
+            cursor = index.next_seq - 1
+
+        return {
+            "comms": comms,
+            "total": total,
+            "limit": limit,
+            "offset": offset,
+            "cursor": cursor,
+        }
+
+    @staticmethod
+    def _matches(entry: _Entry, minion_id: str | None, comm_type: str | None) -> bool:
+        if minion_id is not None and minion_id not in entry.minion_ids:
+            return False
+        return comm_type is None or entry.comm_type == comm_type
+
+    def discard(self, legion_id: str) -> None:
+        """Drop a legion's index (e.g. after its directory is removed)."""
+        with self._lock:
+            self._indexes.pop(legion_id, None)
@@ -16,16 +16,18 @@ from dataclasses import dataclass, field
 from typing import TYPE_CHECKING, Any
 
 if TYPE_CHECKING:
-    from src.config_manager import HistoryRetentionConfig
+    from src.config_manager import HistoryRetentionConfig, SchedulerConfig
     from src.data_storage import DataStorageManager
     from src.legion.archive_manager import ArchiveManager
     from src.legion.comm_router import CommRouter
+    from src.legion.comm_summary import CommSummaryStore
     from src.legion.history_rotator import HistoryRotator
     from src.legion.legion_coordinator import LegionCoordinator
     from src.legion.mcp.legion_mcp_tools import LegionMCPTools
     from src.legion.memory_manager import MemoryManager
     from src.legion.overseer_controller import OverseerController
     from src.legion.scheduler_service import SchedulerService
+    from src.legion.timeline_store import TimelineStore
     from src.session_coordinator import SessionCoordinator
     from src.template_manager import TemplateManager
 
@@ -56,6 +58,7 @@ class LegionSystem:
     ui_queue: Any | None = None  # EventQueue (optional, for broadcasting project updates to poll clients)
     default_max_minions: int = 20  # Global default max concurrent minions (from app config)
     history_retention: 'HistoryRetentionConfig | None' = None  # Retention config for HistoryRotator
+    scheduler: 'SchedulerConfig | None' = None  # Execution pool limits for SchedulerService
 
     # Permission callback factory (injected after creation by web_server via session_coordinator)
     # Allows legion components to create permission callbacks for spawned minions
@@ -73,6 +76,8 @@ class LegionSystem:
     archive_manager: 'ArchiveManager' = field(init=False)
     scheduler_service: 'SchedulerService' = field(init=False)
     history_rotator: 'HistoryRotator' = field(init=False)
+    timeline_store: 'TimelineStore' = field(init=False)
+    comm_summaries: 'CommSummaryStore' = field(init=False)
     mcp_tools: 'LegionMCPTools' = field(init=False)
 
     def broadcast_ui_event(self, event: dict) -> None:
@@ -96,22 +101,28 @@ class LegionSystem:
         Order matters: components with fewer dependencies first.
         """
         # Import here to avoid circular imports at module level
-        from src.config_manager import HistoryRetentionConfig
+        from src.config_manager import HistoryRetentionConfig, SchedulerConfig
         from src.legion.archive_manager import ArchiveManager
         from src.legion.comm_router import CommRouter
+        from src.legion.comm_summary import CommSummaryStore
         from src.legion.history_rotator import HistoryRotator
         from src.legion.legion_coordinator import LegionCoordinator
         from src.legion.mcp.legion_mcp_tools import LegionMCPTools
         from src.legion.memory_manager import MemoryManager
         from src.legion.overseer_controller import OverseerController
         from src.legion.scheduler_service import SchedulerService
+        from src.legion.timeline_store import TimelineStore
 
         # Initialize components in dependency order
         # Lower-level components first (fewer dependencies)
+        self.timeline_store = TimelineStore(self)
+        self.comm_summaries = CommSummaryStore(self)
         self.comm_router = CommRouter(self)
         self.memory_manager = MemoryManager(self)
         self.archive_manager = ArchiveManager(self)
-        self.scheduler_service = SchedulerService(self)
+        self.scheduler_service = SchedulerService(
+            self, self.scheduler if self.scheduler is not None else SchedulerConfig()
+        )
         retention = self.history_retention if self.history_retention is not None else HistoryRetentionConfig()
         self.history_rotator = HistoryRotator(self, retention)
         self.overseer_controller = OverseerController(self)
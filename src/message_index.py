@@ -0,0 +1,215 @@
+"""
+Sidecar line-offset index for append-only JSONL logs.
+
+Keeps a ``<name>.idx`` file next to a JSONL log holding one fixed-width
+little-endian uint64 per record: the byte offset just past that record's
+trailing newline. Record ``i`` therefore spans ``[end[i-1], end[i])`` (with
+``end[-1] == 0``), which lets paginated reads seek straight to the requested
+window and makes the record count a constant-time ``stat`` of the index.
+
+Blank lines are folded into the span of the record that follows them, so the
+indexed record count matches the number of non-empty lines. A trailing partial
+line (no newline yet) is never indexed.
+
+The index is derived data: if it is missing, truncated, or no longer matches
+the log (e.g. the log was truncated or rewritten), it is rebuilt lazily from a
+single binary scan of the log. If the log merely grew past the indexed region
+(written by something that bypassed the index), only the new tail is scanned.
+"""
+
+import logging
+import os
+import struct
+from pathlib import Path
+
+from .logging_config import get_logger
+
+storage_logger = get_logger('storage', category='STORAGE')
+logger = logging.getLogger(__name__)
+
+ENTRY_SIZE = 8
+_ENTRY = struct.Struct("<Q")
+
+
+class MessageOffsetIndex:
+    """Line-offset index over a JSONL log (see module docstring)."""
+
+    def __init__(self, log_file: Path, index_file: Path | None = None):
+        self.log_file = Path(log_file)
+        self.index_file = Path(index_file) if index_file else self.log_file.with_suffix(".idx")
+        # Cached view of the index; None until first validated against disk.
+        self._count: int | None = None
+        self._covered: int = 0
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def count(self) -> int:
+        """Number of complete records in the log."""
+        self._ensure_fresh()
+        return self._count or 0
+
+    def covered_bytes(self) -> int:
+        """Byte length of the log prefix covered by the index."""
+        self._ensure_fresh()
+        return self._covered
+
+    def record_appended(self, spans: list[tuple[int, int]]) -> None:
+        """Record complete lines just appended to the log.
+
+        ``spans`` are ``(start, end)`` byte offsets of each appended line, in
+        file order. If the first span does not start where the index ends (the
+        index is not loaded yet, or something else wrote to the log) the gap is
+        caught up by scanning instead, which also picks up these records.
+        """
+        if not spans:
+            return
+        if self._count is None or spans[0][0] != self._covered:
+            self._ensure_fresh()
+            return
+        ends = [end for _, end in spans]
+        self._write_entries(ends, append=True)
+        self._count += len(ends)
+        self._covered = ends[-1]
+
+    def resolve(self, offset: int, limit: int | None) -> tuple[int, int]:
+        """Resolve ``offset``/``limit`` into a ``[start, stop)`` record range.
+
+        Negative ``offset`` counts from the tail (``-50`` is the last 50
+        records), mirroring Python slice semantics.
+        """
+        total = self.count()
+        start = total + offset if offset < 0 else offset
+        start = min(max(start, 0), total)
+        stop = total if limit is None else min(start + max(limit, 0), total)
+        return start, stop
+
+    def read_lines(self, start: int, stop: int) -> list[bytes]:
+        """Return raw lines for records ``[start, stop)`` (blank lines dropped)."""
+        if stop <= start:
+            return []
+        byte_start, byte_stop = self._byte_range(start, stop)
+        with open(self.log_file, 'rb') as f:
+            f.seek(byte_start)
+            chunk = f.read(byte_stop - byte_start)
+        return [line for line in chunk.split(b"\n") if line.strip()]
+
+    def invalidate(self) -> None:
+        """Drop the index; it is rebuilt on next access."""
+        self._count = None
+        self._covered = 0
+        try:
+            self.index_file.unlink(missing_ok=True)
+        except OSError:
+            logger.exception(f"Failed to remove index {self.index_file}")
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _byte_range(self, start: int, stop: int) -> tuple[int, int]:
+        """Byte span covering records ``[start, stop)``."""
+        first = start - 1 if start > 0 else 0
+        with open(self.index_file, 'rb') as f:
+            f.seek(first * ENTRY_SIZE)
+            raw = f.read((stop - first) * ENTRY_SIZE)
+        ends = [e for (e,) in _ENTRY.iter_unpack(raw)]
+        byte_start = ends[0] if start > 0 else 0
+        return byte_start, ends[-1]
+
+    def _log_size(self) -> int:
+        try:
+            return os.stat(self.log_file).st_size
+        except FileNotFoundError:
+            return 0
+
+    def _ensure_fresh(self) -> None:
+        """Validate the cached/persisted index against the log, repairing it."""
+        log_size = self._log_size()
+
+        if self._count is None:
+            self._load()
+            if self._covered > log_size or not self._boundary_ok():
+                self._rebuild()
+                return
+
+        if self._covered > log_size:
+            self._rebuild()
+        elif log_size > self._covered:
+            if self._boundary_ok():
+                self._catch_up()
+            else:
+                self._rebuild()
+
+    def _load(self) -> None:
+        """Load count/covered from the persisted index, or rebuild it."""
+        try:
+            idx_size = os.stat(self.index_file).st_size
+        except FileNotFoundError:
+            self._rebuild()
+            return
+
+        if idx_size % ENTRY_SIZE:
+            self._rebuild()
+            return
+
+        self._count = idx_size // ENTRY_SIZE
+        self._covered = 0
+        if self._count:
+            with open(self.index_file, 'rb') as f:
+                f.seek(idx_size - ENTRY_SIZE)
+                (self._covered,) = _ENTRY.unpack(f.read(ENTRY_SIZE))
+
+    def _boundary_ok(self) -> bool:
+        """True when the last indexed byte of the log is still a newline."""
+        if not self._covered:
+            return True
+        try:
+            with open(self.log_file, 'rb') as f:
+                f.seek(self._covered - 1)
+                return f.read(1) == b"\n"
+        except OSError:
+            return False
+
+    def _rebuild(self) -> None:
+        storage_logger.debug(f"Rebuilding message index for {self.log_file.parent.name}")
+        self._count = 0
+        self._covered = 0
+        ends = self._scan_from(0)
+        self._write_entries(ends, append=False)
+        self._count = len(ends)
+        self._covered = ends[-1] if ends else 0
+
+    def _catch_up(self) -> None:
+        ends = self._scan_from(self._covered)
+        if ends:
+            self._write_entries(ends, append=True)
+            self._count += len(ends)
+            self._covered = ends[-1]
+
+    def _scan_from(self, pos: int) -> list[int]:
+        """Scan the log from ``pos`` and return end offsets of new records."""
+        ends: list[int] = []
+        if not self.log_file.exists():
+            return ends
+        with open(self.log_file, 'rb') as f:
+            f.seek(pos)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # partial trailing line; not yet a record
+                pos += len(line)
+                if line.strip():
+                    ends.append(pos)
+        return ends
+
+    def _write_entries(self, ends: list[int], append: bool) -> None:
+        payload = b"".join(_ENTRY.pack(e) for e in ends)
+        try:
+            with open(self.index_file, 'ab' if append else 'wb') as f:
+                f.write(payload)
+        except OSError:
+            # Leave the cache unloaded so the next access re-validates from disk.
+            self._count = None
+            self._covered = 0
+            raise
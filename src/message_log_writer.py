@@ -0,0 +1,303 @@
+"""
+Buffered append writer for per-session messages.jsonl logs.
+
+Keeps one long-lived append handle per session and a small write-behind buffer
+so streaming bursts cost one ``write`` per flush instead of one open/write/close
+per SDK message. Flushes are ordered (records reach the file in exactly the
+order ``write`` was called) and update the sidecar offset index as they land.
+
+Flush policy (see :class:`MessageFlushPolicy`; defaults come from
+``MessageLogConfig`` in config_manager):
+
+- ``flush_bytes``: flush as soon as this many bytes are buffered. ``0`` means
+  write-through — every record is written before ``write`` returns, which is
+  what ad-hoc ``DataStorageManager`` instances get
+  (:meth:`MessageFlushPolicy.write_through`).
+- ``flush_interval_ms``: flush buffered records at most this long after the
+  first one was buffered.
+- ``fsync_on_result``: records marked durable (turn-completing
+  ``ResultMessage`` entries) flush immediately and ``fsync`` the file in a
+  worker thread, so a completed turn survives an OS crash or power loss.
+- ``idle_close_seconds``: close the handle after this long without writes so
+  thousands of dormant sessions don't pin file descriptors. ``0`` closes it
+  after every flush (write-through).
+
+Crash semantics:
+
+- Process crash: records still in the buffer (at most ``flush_bytes`` bytes or
+  ``flush_interval_ms`` worth of stream) are lost. Everything flushed is in
+  the OS page cache and survives.
+- OS crash / power loss: only data up to the last ``fsync`` (i.e. the last
+  durable record) is guaranteed. A torn trailing line is possible; it is
+  never indexed and ``read_messages`` skips unparseable lines.
+- Readers inside this process never observe the buffer gap:
+  ``DataStorageManager`` flushes before every read, count, archive or reset.
+
+All file I/O except ``fsync`` runs inline on the event loop: buffered writes
+land in the page cache and are bounded by ``flush_bytes``.
+"""
+
+import asyncio
+import logging
+import os
+from dataclasses import dataclass
+from pathlib import Path
+
+from .config_manager import MessageLogConfig
+from .logging_config import get_logger
+from .message_index import MessageOffsetIndex
+
+storage_logger = get_logger('storage', category='STORAGE')
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class MessageFlushPolicy:
+    """When buffered message-log records are written and synced."""
+
+    flush_bytes: int = MessageLogConfig.flush_bytes
+    flush_interval_ms: int = MessageLogConfig.flush_interval_ms
+    fsync_on_result: bool = MessageLogConfig.fsync_on_result
+    idle_close_seconds: int = MessageLogConfig.idle_close_seconds
+
+    @classmethod
+    def from_config(cls, config: MessageLogConfig) -> "MessageFlushPolicy":
+        return cls(
+            flush_bytes=config.flush_bytes,
+            flush_interval_ms=config.flush_interval_ms,
+            fsync_on_result=config.fsync_on_result,
+            idle_close_seconds=config.idle_close_seconds,
+        )
+
+    @classmethod
+    def write_through(cls) -> "MessageFlushPolicy":
+        """Write every record before ``write`` returns and close the handle after it."""
+        return cls(flush_bytes=0, fsync_on_result=False, idle_close_seconds=0)
+
+
+def _fsync_path(path: Path) -> None:
+    """fsync a file by path (syncs the inode, independent of our append handle)."""
+    fd = os.open(path, os.O_WRONLY | os.O_APPEND)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class MessageLogWriter:
+    """Ordered, buffered appender for a single JSONL log (see module docstring)."""
+
+    def __init__(
+        self,
+        log_file: Path,
+        index: MessageOffsetIndex | None = None,
+        policy: MessageFlushPolicy | None = None,
+    ):
+        self.log_file = Path(log_file)
+        self.index = index
+        self.policy = policy or MessageFlushPolicy.write_through()
+        self._handle = None
+        self._pending: list[bytes] = []
+        self._pending_bytes = 0
+        self._flush_timer: asyncio.TimerHandle | None = None
+        self._idle_timer: asyncio.TimerHandle | None = None
+        self._fsync_task: asyncio.Task | None = None
+        self._fsync_requested = False
+
+    @property
+    def pending_count(self) -> int:
+        """Number of records buffered but not yet written."""
+        return len(self._pending)
+
+    def write(self, line: bytes, durable: bool = False) -> None:
+        """Queue one newline-terminated record; flushes per the policy."""
+        self._pending.append(line)
+        self._pending_bytes += len(line)
+
+        if durable or self._pending_bytes >= self.policy.flush_bytes:
+            self.flush()
+            if durable and self.policy.fsync_on_result:
+                self._schedule_fsync()
+        elif self._flush_timer is None:
+            self._flush_timer = self._call_later(
+                self.policy.flush_interval_ms / 1000, self._on_flush_timer
+            )
+
+    def flush(self) -> None:
+        """Write all buffered records to the log, in order, and index them.
+
+        Records leave the buffer only once all of their bytes are written. If a
+        write fails part-way, the file is cut back to the last whole record and
+        the error propagates with the unwritten records still queued.
+        """
+        self._cancel_flush_timer()
+        if not self._pending:
+            return
+
+        lines = list(self._pending)
+        data = memoryview(b"".join(lines))
+        handle = self._open()
+        start = handle.tell()
+        written = 0
+        try:
+            # FileIO.write may write fewer bytes than asked
+            while written < len(data):
+                written += handle.write(data[written:])
+        except OSError:
+            done = self._complete_records(lines, written)
+            self._drop_written(start, lines[:done])
+            self._truncate_partial(start + sum(len(line) for line in lines[:done]))
+            raise
+
+        self._drop_written(start, lines)
+        self._arm_idle_close()
+
+    async def aflush(self, fsync: bool = False) -> None:
+        """Flush the buffer and optionally wait for the data to reach disk."""
+        self.flush()
+        await self._wait_fsync()
+        if fsync and self.log_file.exists():
+            await asyncio.to_thread(_fsync_path, self.log_file)
+
+    async def close(self) -> None:
+        """Flush everything and release the file handle."""
+        await self.aflush()
+        self._cancel_idle_timer()
+        self._close_handle()
+
+    async def discard(self) -> None:
+        """Drop buffered records and release the handle (log is being truncated)."""
+        await self._wait_fsync()
+        self._cancel_flush_timer()
+        self._cancel_idle_timer()
+        self._pending = []
+        self._pending_bytes = 0
+        self._close_handle()
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _open(self):
+        if self._handle is None:
+            # Unbuffered: our own list is the buffer, so a flush is one write()
+            # (repeated only on a short write).
+            self._handle = open(self.log_file, 'ab', buffering=0)
+        return self._handle
+
+    @staticmethod
+    def _complete_records(lines: list[bytes], written: int) -> int:
+        """How many leading records fit entirely in the first ``written`` bytes."""
+        done = 0
+        for line in lines:
+            if len(line) > written:
+                break
+            written -= len(line)
+            done += 1
+        return done
+
+    def _drop_written(self, start: int, lines: list[bytes]) -> None:
+        """Remove records that reached the file from the buffer and index them."""
+        del self._pending[:len(lines)]
+        self._pending_bytes = sum(len(line) for line in self._pending)
+        if self.index is None or not lines:
+            return
+        spans = []
+        pos = start
+        for line in lines:
+            spans.append((pos, pos + len(line)))
+            pos += len(line)
+        try:
+            self.index.record_appended(spans)
+        except OSError:
+            logger.exception("Failed to update message index (non-fatal)")
+
+    def _truncate_partial(self, size: int) -> None:
+        """Cut a torn record off the log so the retried flush starts on a line boundary."""
+        try:
+            if self._handle is not None:
+                self._handle.truncate(size)
+        except OSError:
+            logger.exception(f"Failed to truncate partial write in {self.log_file}")
+        self._close_handle()
+
+    def _close_handle(self) -> None:
+        if self._handle is not None:
+            try:
+                self._handle.close()
+            except OSError:
+                logger.exception(f"Failed to close {self.log_file}")
+            self._handle = None
+
+    def _on_flush_timer(self) -> None:
+        self._flush_timer = None
+        try:
+            self.flush()
+        except Exception:
+            logger.exception(f"Deferred flush failed for {self.log_file}")
+            # Records are still buffered; try again after another interval
+            if self._pending and self._flush_timer is None:
+                self._flush_timer = self._call_later(
+                    self.policy.flush_interval_ms / 1000, self._on_flush_timer
+                )
+
+    def _schedule_fsync(self) -> None:
+        if self._fsync_task and not self._fsync_task.done():
+            # Writes may have landed after the in-flight fsync started; sync again after it.
+            self._fsync_requested = True
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            _fsync_path(self.log_file)
+            return
+        self._fsync_task = loop.create_task(asyncio.to_thread(_fsync_path, self.log_file))
+        self._fsync_task.add_done_callback(self._on_fsync_done)
+
+    async def _wait_fsync(self) -> None:
+        while self._fsync_task is not None and not self._fsync_task.done():
+            try:
+                await asyncio.shield(self._fsync_task)
+            except OSError:
+                pass  # already logged by _on_fsync_done
+            await asyncio.sleep(0)  # let the done-callback chain a follow-up fsync
+
+    def _on_fsync_done(self, task: asyncio.Task) -> None:
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"fsync failed for {self.log_file}: {task.exception()}")
+        if self._fsync_requested:
+            self._fsync_requested = False
+            self._schedule_fsync()
+
+    def _arm_idle_close(self) -> None:
+        self._cancel_idle_timer()
+        if self.policy.idle_close_seconds > 0:
+            self._idle_timer = self._call_later(self.policy.idle_close_seconds, self._on_idle)
+        else:
+            self._close_handle()
+
+    def _on_idle(self) -> None:
+        self._idle_timer = None
+        if self._pending:
+            self._arm_idle_close()
+            return
+        storage_logger.debug(f"Closing idle message log handle for {self.log_file.parent.name}")
+        self._close_handle()
+
+    def _call_later(self, delay: float, callback) -> asyncio.TimerHandle | None:
+        try:
+            return asyncio.get_running_loop().call_later(delay, callback)
+        except RuntimeError:
+            # No loop (sync callers/tests): nothing to defer onto, flush now.
+            callback()
+            return None
+
+    def _cancel_flush_timer(self) -> None:
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+
+    def _cancel_idle_timer(self) -> None:
+        if self._idle_timer is not None:
+            self._idle_timer.cancel()
+            self._idle_timer = None
@@ -74,6 +74,7 @@ class Comm:
     to_minion_id: str | None = None    # Direct to minion
     to_user: bool = False
     to_minion_name: str | None = None  # Captured name (for historical display)
+    to_minion_ids: list[str] = field(default_factory=list)  # Fan-out: one comm, many minions
 
     # Content
     summary: str = ""  # Brief one-line description (~50 chars, shown collapsed)
@@ -101,10 +102,11 @@ class Comm:
         """Ensure Comm has valid routing."""
         destinations = sum([
             self.to_minion_id is not None,
-            self.to_user
+            self.to_user,
+            bool(self.to_minion_ids)
         ])
         if destinations != 1:
-            raise ValueError("Comm must have exactly one destination (minion or user)")
+            raise ValueError("Comm must have exactly one destination (minion, minion list or user)")
 
         sources = sum([
             self.from_minion_id is not None,
@@ -125,6 +127,7 @@ class Comm:
             "to_minion_id": self.to_minion_id,
             "to_user": self.to_user,
             "to_minion_name": self.to_minion_name,
+            "to_minion_ids": self.to_minion_ids,
             "summary": self.summary,
             "content": self.content,
             "comm_type": self.comm_type.value,
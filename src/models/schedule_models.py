@@ -5,6 +5,7 @@ Defines Schedule, ScheduleStatus, and ScheduleExecution for
 recurring task delivery to minion agents.
 """
 
+import math
 from dataclasses import dataclass, field
 from datetime import UTC, datetime
 from enum import Enum
@@ -13,9 +14,16 @@ from typing import Any
 from croniter import croniter
 
 # Maximum bytes of stdout/stderr persisted per run. Larger streams are truncated
-# with a "[truncated: N bytes]" marker. Bounds schedules.json + schedule_history.jsonl.
+# with a "[truncated: N bytes]" marker. Bounds schedules.json + schedule_history.db.
 MAX_STREAM_BYTES = 64 * 1024
 
+# What to do with a cron fire that starts more than max_lateness_seconds after
+# its scheduled time (host asleep, execution pool saturated, ...):
+#   skip      - drop it and wait for the next window
+#   coalesce  - run it once; windows missed meanwhile are merged into this run
+#   run_late  - run it, then catch up on missed windows one by one
+LATE_POLICIES = ("skip", "coalesce", "run_late")
+
 
 def cap_stream(s: str) -> str:
     """Cap a stdout/stderr string to MAX_STREAM_BYTES, appending a truncation marker."""
@@ -70,6 +78,9 @@ class Schedule:
     # Disposable schedule support (issue #1538)
     repeat_count: int | None = None  # None = unlimited; positive int = max fires before auto-delete
     fire_count: int = 0              # increments once per fire dispatch regardless of outcome
+    # Execution pool: higher priority starts first within a legion; late_policy is one of LATE_POLICIES
+    priority: int = 0
+    late_policy: str = "coalesce"
 
     def to_dict(self, metrics: "ScheduleMetrics | None" = None) -> dict[str, Any]:
         """Convert to dictionary for serialization.
@@ -105,6 +116,8 @@ class Schedule:
             "last_exit_code": self.last_exit_code,
             "repeat_count": self.repeat_count,
             "fire_count": self.fire_count,
+            "priority": self.priority,
+            "late_policy": self.late_policy,
         }
         # Ephemeral fields (issue #578) - only include when set
         if self.session_config is not None:
@@ -121,6 +134,14 @@ class Schedule:
                 "last_error_message": metrics.last_error_message,
                 "last_status": metrics.last_status,
                 "last_run": metrics.last_run,
+                "last_fire_delay": metrics.last_fire_delay,
+                "avg_fire_delay": metrics.avg_fire_delay,
+                "max_fire_delay": metrics.max_fire_delay,
+                "skipped_fires": metrics.skipped_fires,
+                "success_rate": metrics.success_rate,
+                "recent_outcomes": metrics.recent_outcomes,
+                "p50_duration_ms": metrics.p50_duration_ms,
+                "p95_duration_ms": metrics.p95_duration_ms,
             }
         return data
 
@@ -146,6 +167,8 @@ class Schedule:
         # Disposable schedule fields (issue #1538) - backwards-compatible defaults
         data.setdefault("repeat_count", None)
         data.setdefault("fire_count", 0)
+        data.setdefault("priority", 0)
+        data.setdefault("late_policy", "coalesce")
         # Discard legacy field from old data
         data.pop("current_ephemeral_session_id", None)
         return cls(**data)
@@ -155,13 +178,13 @@ class Schedule:
 class ScheduleExecution:
     """
     Record of a single schedule execution attempt.
-    Appended to schedule_history.jsonl.
+    Appended to the legion's schedule_history.db.
     """
     execution_id: str
     schedule_id: str
     scheduled_time: float
     actual_time: float
-    status: str  # "queued" | "failed" | "timeout" | "retry" | "delivered" | "discarded" | "error"
+    status: str  # "queued" | "failed" | "timeout" | "retry" | "delivered" | "discarded" | "error" | "skipped"
     minion_state: str
     error_message: str | None = None
     retry_number: int = 0
@@ -173,6 +196,9 @@ class ScheduleExecution:
     stdout: str | None = None     # capped
     stderr: str | None = None     # capped
     duration_ms: int | None = None
+    # Start time minus scheduled time (cron fires), and the late policy applied when over the limit
+    lateness_seconds: float | None = None
+    late_action: str | None = None
 
     def to_dict(self) -> dict[str, Any]:
         """Convert to dictionary for serialization."""
@@ -192,6 +218,8 @@ class ScheduleExecution:
             "stdout": self.stdout,
             "stderr": self.stderr,
             "duration_ms": self.duration_ms,
+            "lateness_seconds": self.lateness_seconds,
+            "late_action": self.late_action,
         }
 
     @classmethod
@@ -211,6 +239,8 @@ class ScheduleExecution:
         data.setdefault("stdout", None)
         data.setdefault("stderr", None)
         data.setdefault("duration_ms", None)
+        data.setdefault("lateness_seconds", None)
+        data.setdefault("late_action", None)
         return cls(**data)
 
 
@@ -219,16 +249,30 @@ def is_error_status(status: str) -> bool:
 
     Error: failed, timeout, error
     Success: queued, delivered, discarded
-    Ignored: retry (intermediate — the retried fire generates its own record)
+    Ignored: retry (intermediate — the retried fire generates its own record),
+    skipped (late fire dropped by its late policy; counted in skipped_fires)
     """
     return status in {"failed", "timeout", "error"}
 
 
+# Rollup windows: outcomes listed per schedule, and durations behind p50/p95
+RECENT_OUTCOMES = 10
+DURATION_WINDOW = 100
+
+
+def _percentile(sorted_values: list[int], fraction: float) -> int:
+    """Nearest-rank percentile of an already sorted, non-empty list."""
+    rank = max(1, math.ceil(fraction * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
 @dataclass
 class ScheduleMetrics:
-    """Aggregate lifetime metrics for one schedule, stored in schedule_metrics.json.
+    """Aggregate lifetime metrics (rollup) for one schedule.
 
-    Retained indefinitely; never pruned with schedule_history.jsonl.
+    Updated incrementally with every execution and stored next to the raw
+    history in schedule_history.db. Retained indefinitely; never pruned with
+    the history, so list views answer from here without reading raw history.
     """
 
     schedule_id: str
@@ -240,8 +284,66 @@ class ScheduleMetrics:
     last_error_message: str | None = None
     last_status: str | None = None
     last_run: float | None = None
+    # Cron fire delay (actual - scheduled time, seconds)
+    cron_fires: int = 0
+    last_fire_delay: float | None = None
+    avg_fire_delay: float | None = None
+    max_fire_delay: float | None = None
+    skipped_fires: int = 0
+    # Newest last; durations (ms) only for executions that report one (script runs)
+    recent_outcomes: list[str] = field(default_factory=list)
+    recent_durations_ms: list[int] = field(default_factory=list)
+    p50_duration_ms: int | None = None
+    p95_duration_ms: int | None = None
     updated_at: float = field(default_factory=lambda: datetime.now(UTC).timestamp())
 
+    @property
+    def success_rate(self) -> float | None:
+        if not self.total_runs:
+            return None
+        return (self.total_runs - self.total_errors) / self.total_runs
+
+    def record(self, execution: "ScheduleExecution") -> None:
+        """Fold one (non-retry) execution into the rollup."""
+        self.last_status = execution.status
+        if execution.status == "skipped":
+            self.skipped_fires += 1
+            return
+        self.last_run = execution.actual_time
+        self.total_runs += 1
+        if is_error_status(execution.status):
+            self.total_errors += 1
+            self.consecutive_errors += 1
+            self.last_error_time = execution.actual_time
+            self.last_error_message = execution.error_message
+        else:
+            self.consecutive_errors = 0
+            self.last_success_time = execution.actual_time
+        self.record_fire_delay(execution)
+        self.record_window(execution)
+
+    def record_window(self, execution: "ScheduleExecution") -> None:
+        """Push a run's outcome and duration into the recent windows and percentiles."""
+        self.recent_outcomes = [*self.recent_outcomes, execution.status][-RECENT_OUTCOMES:]
+        if execution.duration_ms is not None:
+            self.recent_durations_ms = [
+                *self.recent_durations_ms, execution.duration_ms
+            ][-DURATION_WINDOW:]
+            ordered = sorted(self.recent_durations_ms)
+            self.p50_duration_ms = _percentile(ordered, 0.5)
+            self.p95_duration_ms = _percentile(ordered, 0.95)
+
+    def record_fire_delay(self, execution: "ScheduleExecution") -> None:
+        """Fold a cron-triggered execution's scheduled-vs-actual delay into the stats."""
+        if execution.trigger != "cron":
+            return
+        delay = max(0.0, execution.actual_time - execution.scheduled_time)
+        self.cron_fires += 1
+        self.last_fire_delay = delay
+        previous = self.avg_fire_delay or 0.0
+        self.avg_fire_delay = previous + (delay - previous) / self.cron_fires
+        self.max_fire_delay = max(self.max_fire_delay or 0.0, delay)
+
     def to_dict(self) -> dict[str, Any]:
         return {
             "schedule_id": self.schedule_id,
@@ -253,6 +355,15 @@ class ScheduleMetrics:
             "last_error_message": self.last_error_message,
             "last_status": self.last_status,
             "last_run": self.last_run,
+            "cron_fires": self.cron_fires,
+            "last_fire_delay": self.last_fire_delay,
+            "avg_fire_delay": self.avg_fire_delay,
+            "max_fire_delay": self.max_fire_delay,
+            "skipped_fires": self.skipped_fires,
+            "recent_outcomes": self.recent_outcomes,
+            "recent_durations_ms": self.recent_durations_ms,
+            "p50_duration_ms": self.p50_duration_ms,
+            "p95_duration_ms": self.p95_duration_ms,
             "updated_at": self.updated_at,
         }
 
@@ -268,6 +379,15 @@ class ScheduleMetrics:
             last_error_message=data.get("last_error_message"),
             last_status=data.get("last_status"),
             last_run=data.get("last_run"),
+            cron_fires=data.get("cron_fires", 0),
+            last_fire_delay=data.get("last_fire_delay"),
+            avg_fire_delay=data.get("avg_fire_delay"),
+            max_fire_delay=data.get("max_fire_delay"),
+            skipped_fires=data.get("skipped_fires", 0),
+            recent_outcomes=data.get("recent_outcomes", []),
+            recent_durations_ms=data.get("recent_durations_ms", []),
+            p50_duration_ms=data.get("p50_duration_ms"),
+            p95_duration_ms=data.get("p95_duration_ms"),
             updated_at=data.get("updated_at", datetime.now(UTC).timestamp()),
         )
 
@@ -0,0 +1,140 @@
+"""
+Compact encodings for poll payloads.
+
+tool_call patches: every ToolCall lifecycle transition is broadcast as the full
+``ToolCall.to_dict()``, so a large ``input``/``result`` is re-sent for each of
+pending → awaiting_permission → running → completed. Clients that opt in
+(``?patch=1``) instead receive a ``tool_call_patch`` carrying only the fields
+that changed since the previous event for the same ``tool_use_id``, whenever
+they are guaranteed to hold that base state. ``EventQueue`` builds patches when
+such a read first asks for them, never on append.
+
+Patch event shape::
+
+    {"type": "tool_call_patch", "session_id": ..., "timestamp": ...,
+     "data": {"tool_use_id": ..., "set": {changed fields}, "unset": [removed keys]}}
+
+Response compression: poll responses above ``GZIP_MIN_BYTES`` are gzipped when
+the client's ``Accept-Encoding`` lists ``gzip`` (or ``*``) with a q-value above
+zero.
+"""
+
+import gzip
+import json
+from dataclasses import asdict, dataclass
+
+from fastapi import Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import Response
+
+GZIP_MIN_BYTES = 1024
+GZIP_LEVEL = 5
+
+
+@dataclass
+class PollPayloadStats:
+    """Process-wide counters for poll payload savings (served via /api/poll/stats)."""
+    tool_call_patches_served: int = 0
+    patch_bytes_saved: int = 0
+    gzip_responses: int = 0
+    gzip_bytes_in: int = 0
+    gzip_bytes_out: int = 0
+
+    def to_dict(self) -> dict:
+        data = asdict(self)
+        data["gzip_bytes_saved"] = self.gzip_bytes_in - self.gzip_bytes_out
+        return data
+
+
+payload_stats = PollPayloadStats()
+
+
+def tool_call_data(event: dict) -> dict | None:
+    """Return the ToolCall dict carried by a poll event, or None.
+
+    Tool calls arrive in two envelopes: ``{"type": "tool_call", "data": ...}``
+    from coordinator broadcasts and ``{"type": "message", "data": {"type":
+    "tool_call", ...}}`` from message-stream lifecycle updates.
+    """
+    data = event.get("data")
+    if not isinstance(data, dict) or not data.get("tool_use_id"):
+        return None
+    if event.get("type") == "tool_call" or data.get("type") == "tool_call":
+        return data
+    return None
+
+
+def _encoded_size(value) -> int:
+    return len(json.dumps(value, default=str))
+
+
+def make_tool_call_patch(event: dict, previous: dict, current: dict) -> tuple[dict, int]:
+    """Build the patch event for ``current`` against ``previous``.
+
+    Returns ``(patch_event, bytes_saved)`` where bytes_saved is the JSON size
+    difference between the full event and the patch.
+    """
+    changed = {}
+    for key, value in current.items():
+        if key not in previous:
+            changed[key] = value
+        else:
+            old = previous[key]
+            if old is not value and old != value:
+                changed[key] = value
+    removed = [key for key in previous if key not in current]
+
+    patch = {
+        "type": "tool_call_patch",
+        "session_id": event.get("session_id"),
+        "data": {"tool_use_id": current["tool_use_id"], "set": changed, "unset": removed},
+    }
+    if "timestamp" in event:
+        patch["timestamp"] = event["timestamp"]
+    return patch, _encoded_size(event) - _encoded_size(patch)
+
+
+def accepts_gzip(accept_encoding: str) -> bool:
+    """Whether an Accept-Encoding header allows gzip.
+
+    An explicit ``gzip`` entry decides on its own q-value; otherwise ``*``
+    does. Entries with a malformed q-value are ignored.
+    """
+    qualities: dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        coding, *params = (part.strip() for part in item.split(";"))
+        if not coding:
+            continue
+        q: float | None = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = None
+                break
+        if q is not None:
+            qualities[coding.lower()] = q
+    return qualities.get("gzip", qualities.get("*", 0.0)) > 0
+
+
+def poll_response(request: Request, body: dict) -> dict | Response:
+    """Poll body as-is, or a gzipped response when the client accepts it and it pays off."""
+    if not accepts_gzip(request.headers.get("accept-encoding", "")):
+        return body
+    # Same serialization FastAPI applies to a returned dict
+    raw = json.dumps(
+        jsonable_encoder(body), ensure_ascii=False, allow_nan=False, separators=(",", ":")
+    ).encode("utf-8")
+    if len(raw) < GZIP_MIN_BYTES:
+        return Response(raw, media_type="application/json")
+    compressed = gzip.compress(raw, compresslevel=GZIP_LEVEL)
+    payload_stats.gzip_responses += 1
+    payload_stats.gzip_bytes_in += len(raw)
+    payload_stats.gzip_bytes_out += len(compressed)
+    return Response(
+        compressed,
+        media_type="application/json",
+        headers={"Content-Encoding": "gzip", "Vary": "Accept-Encoding"},
+    )
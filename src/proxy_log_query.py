@@ -0,0 +1,456 @@
+"""
+Newest-first query engine for a session's proxy sidecar logs.
+
+access.log (HTTP), socks5.log (SOCKS5) and dns.log (CoreDNS) are append-only,
+and the first two rotate into ``<name>.1`` .. ``<name>.N`` segments (newest
+first). A query walks the live file and then each segment backwards:
+
+- Every file is summarized into ~``BLOCK_BYTES`` blocks of whole lines. A
+  block records its byte range, line count and the hosts, status codes,
+  credential names, denied flag and first/last timestamp seen in it. The
+  summary is built with byte-level regexes, so indexing never JSON-decodes a
+  line. Only the tail a file has grown by since the last query is scanned.
+- Blocks whose summary cannot satisfy the filter are skipped without being
+  read; only candidate blocks are read and their lines decoded, newest first.
+- ``since`` stops the walk at the first block that ends before it, because
+  lines are appended in time order.
+
+Summaries live in memory, keyed by (device, inode) rather than path. Rotation
+renames a file, so its index keeps serving it as ``<name>.1``. For the same
+reason the page cursor is ``"<inode>:<offset>"``: the next page continues where
+the previous one stopped even if the proxy rotated its logs in between.
+"""
+
+import json
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from pathlib import Path
+
+from .logging_config import get_logger
+
+coord_logger = get_logger('coordinator', category='COORDINATOR')
+
+LOG_FILES = {"http": "access.log", "dns": "dns.log", "socks5": "socks5.log"}
+BLOCK_BYTES = 256 * 1024
+MAX_PAGE = 1000
+INDEX_CACHE_FILES = 64
+_HEAD_BYTES = 256
+
+# CoreDNS log format:
+# [INFO] 10.0.0.2:54312 - 12345 "A IN api.github.com. udp 128 false 4096" NOERROR qr,rd,ra 73 0.023s
+DNS_PATTERN = re.compile(r'\[INFO\].*?"(\w+) IN (\S+?)\. \w+ \d+ \w+ \d+"\s+(\w+)')
+_DNS_BYTES = re.compile(DNS_PATTERN.pattern.encode())
+
+_TS = re.compile(rb'"ts":\s*(?:"([^"]*)"|(-?[\d.]+))')
+# Matches both "host" and "original_host"; a literal prefix keeps the scan fast
+_HTTP_HOST = re.compile(rb'host":\s*"([^"]*)"')
+_HOST = re.compile(rb'"host":\s*"([^"]*)"')
+_STATUS = re.compile(rb'"status":\s*(\d+)')
+_REASON = re.compile(rb'"reason":\s*"([^"]*)"')
+_CREDENTIAL = re.compile(rb'"credential_used":\s*"([^"]*)"')
+_DENIED = re.compile(rb'"allowed":\s*false')
+
+
+def parse_log_ts(value) -> float | None:
+    """Epoch seconds for a log/query timestamp: a number, a numeric string,
+    the addon's ``%Y-%m-%dT%H:%M:%S%z`` format or any ISO 8601 string (naive
+    values are taken as UTC). Returns None when the value is not a timestamp."""
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, int | float):
+        return float(value)
+    text = str(value).strip()
+    try:
+        return float(text)
+    except ValueError:
+        pass
+    try:
+        return datetime.strptime(text, "%Y-%m-%dT%H:%M:%S%z").timestamp()
+    except ValueError:
+        pass
+    try:
+        parsed = datetime.fromisoformat(text)
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=UTC)
+    return parsed.timestamp()
+
+
+def _decode_set(values) -> frozenset[str]:
+    return frozenset(v.decode("utf-8", "replace").lower() for v in set(values))
+
+
+def _status_matches(pattern: str, value) -> bool:
+    """``pattern`` is an exact code/reason (case-insensitive) or a class like ``4xx``."""
+    text = str(value).lower()
+    if len(pattern) == 3 and pattern.endswith("xx") and pattern[0].isdigit():
+        return len(text) == 3 and text[0] == pattern[0]
+    return text == pattern
+
+
+# ---------------------------------------------------------------------------
+# Filters
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class ProxyLogFilter:
+    """Entry filter shared by all three log types.
+
+    ``host`` is a case-insensitive substring of the host (HTTP also matches
+    ``original_host``, DNS the queried name). ``status`` is the outcome column:
+    the HTTP status code (or a class such as ``4xx``), the DNS result code
+    (``NXDOMAIN``) or the SOCKS5 reason (``not_allowlisted``). ``denied_only``
+    keeps blocked HTTP/SOCKS5 connections and REFUSED DNS queries.
+    ``credential`` applies to HTTP only. DNS lines carry no timestamp, so
+    ``since``/``until`` (epoch seconds, inclusive) do not exclude them.
+    """
+
+    host: str | None = None
+    status: str | None = None
+    denied_only: bool = False
+    credential: str | None = None
+    since: float | None = None
+    until: float | None = None
+
+    def __post_init__(self):
+        self.host = self.host.lower() if self.host else None
+        self.status = self.status.lower() if self.status else None
+
+    def block_may_match(self, block: "_Block") -> bool:
+        if self.host and not any(self.host in host for host in block.hosts):
+            return False
+        if self.status and not any(_status_matches(self.status, s) for s in block.statuses):
+            return False
+        if self.denied_only and not block.denied:
+            return False
+        if self.credential and self.credential.lower() not in block.credentials:
+            return False
+        if self.until is not None and block.first_ts is not None and block.first_ts > self.until:
+            return False
+        return True
+
+    def matches(self, log_type: str, entry: dict) -> bool:
+        if log_type == "http":
+            hosts = (entry.get("host"), entry.get("original_host"))
+            status = entry.get("status")
+            denied = entry.get("allowed") is False
+        elif log_type == "socks5":
+            hosts = (entry.get("host"),)
+            status = entry.get("reason")
+            denied = entry.get("allowed") is False
+        else:
+            hosts = (entry.get("hostname"),)
+            status = entry.get("result")
+            denied = entry.get("result") == "REFUSED"
+
+        if self.host and not any(h and self.host in str(h).lower() for h in hosts):
+            return False
+        if self.status and (status is None or not _status_matches(self.status, status)):
+            return False
+        if self.denied_only and not denied:
+            return False
+        if self.credential and entry.get("credential_used") != self.credential:
+            return False
+        if self.since is not None or self.until is not None:
+            ts = parse_log_ts(entry.get("ts"))
+            if ts is not None:
+                if self.since is not None and ts < self.since:
+                    return False
+                if self.until is not None and ts > self.until:
+                    return False
+        return True
+
+
+# ---------------------------------------------------------------------------
+# Block index
+# ---------------------------------------------------------------------------
+
+
+@dataclass(slots=True)
+class _Block:
+    """Summary of the whole lines in ``[start, end)`` of one log file."""
+
+    start: int
+    end: int
+    lines: int
+    hosts: frozenset[str]
+    statuses: frozenset[str]
+    credentials: frozenset[str]
+    denied: bool
+    first_ts: float | None
+    last_ts: float | None
+
+    def merge(self, newer: "_Block") -> None:
+        """Absorb the block that directly follows this one."""
+        self.end = newer.end
+        self.lines += newer.lines
+        self.hosts |= newer.hosts
+        self.statuses |= newer.statuses
+        self.credentials |= newer.credentials
+        self.denied = self.denied or newer.denied
+        if self.first_ts is None:
+            self.first_ts = newer.first_ts
+        if newer.last_ts is not None:
+            self.last_ts = newer.last_ts
+
+
+def _line_ts(line: bytes) -> float | None:
+    m = _TS.search(line)
+    if not m:
+        return None
+    return parse_log_ts(m.group(1).decode() if m.group(1) is not None else m.group(2).decode())
+
+
+def _summarize(log_type: str, start: int, data: bytes) -> _Block:
+    """Summarize ``data`` (whole lines, newline-terminated) read at ``start``."""
+    if log_type == "http":
+        hosts = _decode_set(_HTTP_HOST.findall(data))
+        statuses = _decode_set(_STATUS.findall(data))
+        credentials = _decode_set(_CREDENTIAL.findall(data))
+        denied = _DENIED.search(data) is not None
+    elif log_type == "socks5":
+        hosts = _decode_set(_HOST.findall(data))
+        statuses = _decode_set(_REASON.findall(data))
+        credentials = frozenset()
+        denied = _DENIED.search(data) is not None
+    else:
+        queries = _DNS_BYTES.findall(data)
+        hosts = _decode_set(q[1] for q in queries)
+        statuses = _decode_set(q[2] for q in queries)
+        credentials = frozenset()
+        denied = "refused" in statuses
+
+    first_nl = data.find(b"\n")
+    last_start = data.rfind(b"\n", 0, len(data) - 1) + 1
+    return _Block(
+        start=start,
+        end=start + len(data),
+        lines=data.count(b"\n"),
+        hosts=hosts,
+        statuses=statuses,
+        credentials=credentials,
+        denied=denied,
+        first_ts=_line_ts(data[:first_nl]),
+        last_ts=_line_ts(data[last_start:]),
+    )
+
+
+class _FileIndex:
+    """Block summaries for one log file, extended as the file grows."""
+
+    def __init__(self, log_type: str):
+        self.log_type = log_type
+        self.blocks: list[_Block] = []
+        self.indexed = 0
+        self.lines = 0
+        self.head = b""
+        self.lock = threading.Lock()
+
+    def refresh(self, path: Path, size: int) -> None:
+        with open(path, "rb") as f:
+            head = f.read(_HEAD_BYTES)
+            if size < self.indexed or head[:len(self.head)] != self.head:
+                # Truncated, or the inode was reused for a different file
+                self.blocks, self.indexed, self.lines = [], 0, 0
+            self.head = head
+            if size <= self.indexed:
+                return
+
+            f.seek(self.indexed)
+            pending = b""
+            while chunk := f.read(BLOCK_BYTES):
+                data = pending + chunk
+                cut = data.rfind(b"\n") + 1
+                if not cut:
+                    pending = data
+                    continue
+                pending = data[cut:]
+                self._append(_summarize(self.log_type, self.indexed, data[:cut]))
+            # `pending` is a partial line still being written; picked up next time
+
+    def _append(self, block: _Block) -> None:
+        last = self.blocks[-1] if self.blocks else None
+        if last is not None and last.end - last.start < BLOCK_BYTES:
+            last.merge(block)
+        else:
+            self.blocks.append(block)
+        self.indexed = block.end
+        self.lines += block.lines
+
+
+class ProxyLogIndex:
+    """LRU of per-file block indexes, keyed by (device, inode)."""
+
+    def __init__(self, max_files: int = INDEX_CACHE_FILES):
+        self.max_files = max_files
+        self._files: OrderedDict[tuple[int, int], _FileIndex] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, path: Path, log_type: str) -> tuple[_FileIndex, int] | None:
+        """Up-to-date index for ``path`` and its inode, or None if it is gone."""
+        try:
+            st = path.stat()
+        except OSError:
+            return None
+        key = (st.st_dev, st.st_ino)
+        with self._lock:
+            file_index = self._files.get(key)
+            if file_index is None or file_index.log_type != log_type:
+                file_index = _FileIndex(log_type)
+                self._files[key] = file_index
+            self._files.move_to_end(key)
+            while len(self._files) > self.max_files:
+                self._files.popitem(last=False)
+        with file_index.lock:
+            try:
+                file_index.refresh(path, st.st_size)
+            except OSError:
+                return None
+        return file_index, st.st_ino
+
+
+proxy_log_index = ProxyLogIndex()
+
+
+# ---------------------------------------------------------------------------
+# Queries
+# ---------------------------------------------------------------------------
+
+
+def parse_entry(log_type: str, line: bytes) -> dict | None:
+    """API shape of one log line, or None if it is blank or malformed."""
+    text = line.decode("utf-8", "replace").strip()
+    if not text:
+        return None
+    if log_type not in ("http", "socks5"):
+        m = DNS_PATTERN.search(text)
+        if not m:
+            return None
+        return {"query_type": m.group(1), "hostname": m.group(2), "result": m.group(3)}
+    try:
+        raw = json.loads(text)
+    except ValueError:
+        return None
+    if not isinstance(raw, dict):
+        return None
+    if log_type == "socks5":
+        return {
+            "ts": raw.get("ts"),
+            "host": raw.get("host"),
+            "port": raw.get("port"),
+            "allowed": raw.get("allowed"),
+            "reason": raw.get("reason"),
+        }
+    return {
+        "ts": raw.get("ts"),
+        "host": raw.get("host"),
+        "method": raw.get("method"),
+        "path": raw.get("path"),
+        "status": raw.get("status"),
+        "allowed": raw.get("allowed"),
+        "credential_used": raw.get("credential_used"),
+        "scheme": raw.get("scheme"),
+        "port": raw.get("port"),
+        "bytes": raw.get("bytes"),
+        "routed_via_litellm": raw.get("routed_via_litellm", False),
+        "original_host": raw.get("original_host", raw.get("host")),
+    }
+
+
+def _log_files(proxy_dir: Path, name: str) -> list[Path]:
+    """Live file then rotated segments, newest first."""
+    segments = []
+    for path in proxy_dir.glob(f"{name}.*"):
+        suffix = path.name[len(name) + 1:]
+        if suffix.isdigit():
+            segments.append((int(suffix), path))
+    live = proxy_dir / name
+    return ([live] if live.exists() else []) + [path for _, path in sorted(segments)]
+
+
+def _parse_cursor(cursor: str) -> tuple[int, int]:
+    try:
+        inode, offset = cursor.split(":")
+        return int(inode), int(offset)
+    except ValueError:
+        raise ValueError(f"Invalid proxy log cursor: {cursor!r}") from None
+
+
+def query_proxy_log(
+    proxy_dir: Path,
+    log_type: str,
+    limit: int = 200,
+    filters: ProxyLogFilter | None = None,
+    cursor: str | None = None,
+    index: ProxyLogIndex = proxy_log_index,
+) -> dict:
+    """Return up to ``limit`` matching entries, newest page first.
+
+    Entries within a page are in file (chronological) order. ``next_cursor``
+    resumes with the next older page and is None once the oldest retained
+    segment has been read. ``total_lines`` counts lines across the live file
+    and all retained segments, regardless of the filter.
+    """
+    filters = filters or ProxyLogFilter()
+    limit = max(1, min(limit, MAX_PAGE))
+    resume = _parse_cursor(cursor) if cursor else None
+
+    indexed = []
+    for path in _log_files(Path(proxy_dir), LOG_FILES.get(log_type, LOG_FILES["dns"])):
+        found = index.get(path, log_type)
+        if found is not None:
+            indexed.append((path, *found))
+    total_lines = sum(file_index.lines for _, file_index, _ in indexed)
+
+    found_cursor = resume is None
+    matched: list[dict] = []
+    malformed = 0
+    for path, file_index, inode in indexed:
+        end = file_index.indexed
+        if not found_cursor:
+            if inode != resume[0]:
+                continue
+            found_cursor = True
+            end = min(resume[1], end)
+
+        with open(path, "rb") as f:
+            for block in reversed(file_index.blocks):
+                if block.start >= end:
+                    continue
+                if filters.since is not None and block.last_ts is not None and block.last_ts < filters.since:
+                    return _page(log_type, matched, total_lines, None, malformed)
+                if not filters.block_may_match(block):
+                    continue
+                stop = min(block.end, end)
+                f.seek(block.start)
+                lines = f.read(stop - block.start).split(b"\n")[:-1]
+                offset = stop
+                for line in reversed(lines):
+                    offset -= len(line) + 1
+                    entry = parse_entry(log_type, line)
+                    if entry is None:
+                        malformed += bool(line.strip())
+                        continue
+                    if not filters.matches(log_type, entry):
+                        continue
+                    matched.append(entry)
+                    if len(matched) == limit:
+                        return _page(log_type, matched, total_lines, f"{inode}:{offset}", malformed)
+
+    return _page(log_type, matched, total_lines, None, malformed)
+
+
+def _page(log_type: str, newest_first: list[dict], total_lines: int, next_cursor, malformed: int) -> dict:
+    if malformed:
+        coord_logger.warning(f"Skipped {malformed} malformed {log_type} proxy log line(s)")
+    return {
+        "entries": newest_first[::-1],
+        "total_lines": total_lines,
+        "log_type": log_type,
+        "next_cursor": next_cursor,
+    }
@@ -7,6 +7,7 @@ Queue items are delivered sequentially by QueueProcessor.
 
 import json
 import logging
+import os
 import uuid
 from dataclasses import asdict, dataclass
 from pathlib import Path
@@ -20,6 +21,16 @@ logger = logging.getLogger(__name__)
 
 _TERMINAL_STATUSES: frozenset[str] = frozenset({"sent", "failed", "cancelled"})
 
+QUEUE_LOG_FILE = "queue.jsonl"
+QUEUE_SNAPSHOT_FILE = "queue_snapshot.json"
+QUEUE_ARCHIVE_FILE = "queue_archive.jsonl"
+
+# Compact once a session's tail log reaches this many entries
+DEFAULT_COMPACT_AFTER_ENTRIES = 500
+# Terminal items kept in the snapshot (and in memory) for the queue history view;
+# older ones are moved to queue_archive.jsonl
+DEFAULT_KEEP_HISTORY = 200
+
 
 @dataclass
 class QueueItem:
@@ -47,20 +58,38 @@ class QueueManager:
     """
     Manages per-session message queues with JSONL persistence.
 
-    Storage format (queue.jsonl):
-      {"type":"enqueue","queue_id":"...","content":"...","reset_session":true,...}
-      {"type":"status","queue_id":"...","status":"sent","sent_at":...}
-      {"type":"status","queue_id":"...","status":"cancelled"}
-
-    State is rebuilt by replaying the log on startup.
+    Storage format:
+      queue_snapshot.json — {"log_id":"...","compacted_at":...,"items":[QueueItem, ...]}
+      queue.jsonl — tail log of changes since the snapshot:
+        {"type":"log_start","log_id":"..."}
+        {"type":"enqueue","queue_id":"...","content":"...","reset_session":true,...}
+        {"type":"status","queue_id":"...","status":"sent","sent_at":...}
+        {"type":"status","queue_id":"...","status":"cancelled"}
+      queue_archive.jsonl — terminal items compacted out of the snapshot
+
+    State is rebuilt on startup from the snapshot plus the tail log. Once the
+    tail log reaches compact_after_entries, the current state is written as a
+    new snapshot, terminal items beyond keep_history are archived, and the log
+    is restarted. The log's log_start entry ties it to its snapshot: a log whose
+    log_id does not match (a crash between the two writes) is already covered
+    by the snapshot and is skipped. A log without a snapshot (pre-compaction
+    sessions) is replayed in full.
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        compact_after_entries: int = DEFAULT_COMPACT_AFTER_ENTRIES,
+        keep_history: int = DEFAULT_KEEP_HISTORY,
+    ):
         # session_id -> list of QueueItem (ordered by position)
         self._queues: dict[str, list[QueueItem]] = {}
+        # session_id -> entries in queue.jsonl since the last snapshot
+        self._log_entries: dict[str, int] = {}
+        self._compact_after_entries = compact_after_entries
+        self._keep_history = keep_history
 
     def _get_queue_file(self, session_dir: Path) -> Path:
-        return session_dir / "queue.jsonl"
+        return session_dir / QUEUE_LOG_FILE
 
     # =========================================================================
     # Persistence
@@ -77,21 +106,89 @@ class QueueManager:
             logger.error(f"Failed to append queue entry: {e}")
             raise
 
-    async def load_queue(self, session_id: str, session_dir: Path) -> list[QueueItem]:
+    def _read_snapshot(self, session_dir: Path) -> dict | None:
+        snapshot_file = session_dir / QUEUE_SNAPSHOT_FILE
+        if not snapshot_file.exists():
+            return None
+        try:
+            with open(snapshot_file, encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            logger.error(f"Failed to read queue snapshot {snapshot_file}: {e}")
+            return None
+
+    def _maybe_compact(self, session_id: str, session_dir: Path) -> None:
+        self._log_entries[session_id] = self._log_entries.get(session_id, 0) + 1
+        if self._log_entries[session_id] >= self._compact_after_entries:
+            self.compact(session_id, session_dir)
+
+    def compact(self, session_id: str, session_dir: Path) -> int:
         """
-        Replay queue.jsonl to rebuild in-memory state for a session.
+        Write the session's current queue state as a snapshot and restart the tail log.
 
-        Returns list of all items (including terminal states for history).
-        Terminal items whose created_at <= cleared_at_max (from history_cleared markers) are dropped.
+        Terminal items beyond the newest keep_history are appended to
+        queue_archive.jsonl and dropped from memory. Returns the number archived.
         """
+        queue = self._queues.get(session_id, [])
+        terminal = sorted(
+            (i for i in queue if i.status in _TERMINAL_STATUSES),
+            key=lambda i: i.sent_at or i.created_at,
+        )
+        archived = terminal[:max(0, len(terminal) - self._keep_history)]
+        archived_ids = {i.queue_id for i in archived}
+        live = [i for i in queue if i.queue_id not in archived_ids]
+
         queue_file = self._get_queue_file(session_dir)
-        items_by_id: dict[str, QueueItem] = {}
-        cleared_at_max: float = 0.0
+        snapshot_file = session_dir / QUEUE_SNAPSHOT_FILE
+        log_id = uuid.uuid4().hex
+        try:
+            if archived:
+                with open(session_dir / QUEUE_ARCHIVE_FILE, 'a', encoding='utf-8') as f:
+                    for item in archived:
+                        json.dump(item.to_dict(), f, ensure_ascii=False)
+                        f.write('\n')
+
+            tmp_log = queue_file.with_name(queue_file.name + ".tmp")
+            with open(tmp_log, 'w', encoding='utf-8') as f:
+                json.dump({"type": "log_start", "log_id": log_id}, f)
+                f.write('\n')
+
+            tmp_snapshot = snapshot_file.with_name(snapshot_file.name + ".tmp")
+            with open(tmp_snapshot, 'w', encoding='utf-8') as f:
+                json.dump({
+                    "log_id": log_id,
+                    "compacted_at": get_unix_timestamp(),
+                    "items": [i.to_dict() for i in live],
+                }, f, ensure_ascii=False)
+            # Snapshot first: until the log is swapped, the old log no longer
+            # matches the snapshot's log_id and is skipped on load.
+            os.replace(tmp_snapshot, snapshot_file)
+            os.replace(tmp_log, queue_file)
+        except Exception as e:
+            logger.error(f"Failed to compact queue for session {session_id}: {e}")
+            return 0
+
+        self._queues[session_id] = live
+        self._log_entries[session_id] = 0
+        queue_logger.info(
+            f"Compacted queue for session {session_id}: {len(live)} items kept, {len(archived)} archived"
+        )
+        return len(archived)
 
-        if not queue_file.exists():
-            self._queues[session_id] = []
-            return []
+    def _replay_log(
+        self,
+        session_id: str,
+        queue_file: Path,
+        items_by_id: dict[str, QueueItem],
+        snapshot_log_id: str | None,
+    ) -> tuple[int, float]:
+        """
+        Apply queue.jsonl entries to items_by_id. Returns (entries replayed, cleared_at_max).
 
+        With a snapshot, only a log that starts with the snapshot's log_id is replayed.
+        """
+        replayed = 0
+        cleared_at_max: float = 0.0
         try:
             with open(queue_file, encoding='utf-8') as f:
                 for line in f:
@@ -107,6 +204,12 @@ class QueueManager:
                     entry_type = entry.get("type")
                     queue_id = entry.get("queue_id")
 
+                    if replayed == 0 and snapshot_log_id is not None:
+                        if entry_type != "log_start" or entry.get("log_id") != snapshot_log_id:
+                            # Log predates the snapshot (compaction interrupted) — already covered
+                            break
+                    replayed += 1
+
                     if entry_type == "history_cleared":
                         ts = entry.get("cleared_at", 0.0)
                         if ts > cleared_at_max:
@@ -132,21 +235,63 @@ class QueueManager:
                             item.sent_at = entry["sent_at"]
                         if "error" in entry:
                             item.error = entry["error"]
+                        if "position" in entry:
+                            item.position = entry["position"]
 
         except Exception as e:
             logger.error(f"Failed to load queue for session {session_id}: {e}")
+        return replayed, cleared_at_max
+
+    def read_queue(self, session_id: str, session_dir: Path) -> tuple[list[QueueItem], int]:
+        """
+        Rebuild a session's items from queue_snapshot.json plus the queue.jsonl tail.
+
+        Pure read: in-memory state is left alone, so archived copies of the queue
+        files read the same way. Returns (items sorted by position, entries replayed).
+        Terminal items whose created_at <= cleared_at_max (from history_cleared markers) are dropped.
+        """
+        queue_file = self._get_queue_file(session_dir)
+        items_by_id: dict[str, QueueItem] = {}
+        cleared_at_max: float = 0.0
+        replayed = 0
+
+        snapshot = self._read_snapshot(session_dir)
+        if snapshot is not None:
+            for data in snapshot.get("items", []):
+                item = QueueItem.from_dict(data)
+                item.session_id = session_id
+                items_by_id[item.queue_id] = item
+
+        if queue_file.exists():
+            replayed, cleared_at_max = self._replay_log(
+                session_id, queue_file, items_by_id, snapshot.get("log_id", "") if snapshot else None
+            )
 
         all_items = [
             i for i in items_by_id.values()
             if not (i.status in _TERMINAL_STATUSES and cleared_at_max > 0 and i.created_at <= cleared_at_max)
         ]
         all_items.sort(key=lambda x: x.position)
+        return all_items, replayed
+
+    async def load_queue(self, session_id: str, session_dir: Path) -> list[QueueItem]:
+        """
+        Rebuild in-memory state for a session from queue_snapshot.json plus the queue.jsonl tail.
+
+        Returns list of all items (including terminal states for history), as read_queue() does.
+        Sessions whose tail log has grown past compact_after_entries are compacted after loading.
+        """
+        all_items, replayed = self.read_queue(session_id, session_dir)
         self._queues[session_id] = all_items
+        self._log_entries[session_id] = replayed
 
         pending_count = sum(1 for i in all_items if i.status == "pending")
         if pending_count:
             queue_logger.info(f"Loaded queue for session {session_id}: {pending_count} pending, {len(all_items)} total")
 
+        if replayed >= self._compact_after_entries:
+            self.compact(session_id, session_dir)
+            return self._queues[session_id]
         return all_items
 
     # =========================================================================
@@ -195,6 +340,7 @@ class QueueManager:
             "position": item.position,
             "created_at": item.created_at,
         })
+        self._maybe_compact(session_id, session_dir)
 
         queue_logger.info(f"Enqueued {item.queue_id} for session {session_id} at position {next_pos}")
         return item
@@ -211,6 +357,7 @@ class QueueManager:
             "queue_id": queue_id,
             "status": "cancelled",
         })
+        self._maybe_compact(session_id, session_dir)
 
         queue_logger.info(f"Cancelled queue item {queue_id} for session {session_id}")
         return item
@@ -229,6 +376,7 @@ class QueueManager:
             "status": "sent",
             "sent_at": item.sent_at,
         })
+        self._maybe_compact(session_id, session_dir)
 
         queue_logger.info(f"Marked queue item {queue_id} as sent for session {session_id}")
         return item
@@ -249,6 +397,7 @@ class QueueManager:
             "status": "failed",
             "error": error,
         })
+        self._maybe_compact(session_id, session_dir)
 
         queue_logger.info(f"Marked queue item {queue_id} as failed for session {session_id}: {error}")
         return item
@@ -287,6 +436,7 @@ class QueueManager:
             "status": "pending",
             "position": front_pos,
         })
+        self._maybe_compact(session_id, session_dir)
 
         queue_logger.info(
             f"Re-queued {original.queue_id} as {new_item.queue_id} at front for session {session_id}"
@@ -305,6 +455,7 @@ class QueueManager:
                     "queue_id": item.queue_id,
                     "status": "cancelled",
                 })
+                self._maybe_compact(session_id, session_dir)
                 count += 1
 
         if count:
@@ -331,6 +482,7 @@ class QueueManager:
         })
 
         self._queues[session_id] = [i for i in queue if i.status not in _TERMINAL_STATUSES]
+        self._maybe_compact(session_id, session_dir)
         count = len(terminal_items)
         queue_logger.info(f"Cleared history ({count} terminal items) for session {session_id}")
         return count
@@ -371,3 +523,4 @@ class QueueManager:
     def remove_session(self, session_id: str) -> None:
         """Remove in-memory queue state for a session."""
         self._queues.pop(session_id, None)
+        self._log_entries.pop(session_id, None)
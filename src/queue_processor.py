@@ -22,6 +22,9 @@ logger = logging.getLogger(__name__)
 # Default timing configuration
 DEFAULT_MIN_WAIT_SECONDS = 10
 DEFAULT_MIN_IDLE_SECONDS = 10
+# Waits are woken by state-change notifications; this is only a safety net
+# that re-reads session state if a notification was ever missed.
+RESYNC_SECONDS = 30
 
 
 class QueueProcessor:
@@ -37,14 +40,21 @@ class QueueProcessor:
       6. If reset_session → coordinator.reset_session()
       7. Wait min_wait_seconds after session active
       8. Send message via coordinator.send_message()
-      9. Poll is_processing (no timeout, supports indefinite waits)
+      9. Wait for is_processing to clear (no timeout, supports indefinite waits)
       10. After idle for min_idle_seconds → mark sent, next item
+
+    Waits do not poll: each running session has a wakeup event that is set by
+    session state-change callbacks (on_session_state_change), scheduler
+    script completions and ensure_running(). The idle debounce is a timed
+    wait on that event, so any change inside the window cancels it.
     """
 
     def __init__(self, coordinator: "SessionCoordinator"):
         self._coordinator = coordinator
         # session_id -> asyncio.Task
         self._tasks: dict[str, asyncio.Task] = {}
+        # session_id -> wakeup event for the running processor
+        self._wakeups: dict[str, asyncio.Event] = {}
         # Callback for broadcasting queue updates via WebSocket
         self._broadcast_callback: Callable[[str, str, dict], Any] | None = None
 
@@ -67,7 +77,8 @@ class QueueProcessor:
         """Start the processor for a session if it's not already running."""
         task = self._tasks.get(session_id)
         if task and not task.done():
-            return  # Already running
+            self.notify(session_id)  # Already running — re-check pause/queue state
+            return
 
         queue_proc_logger.info(f"Starting queue processor for session {session_id}")
         self._tasks[session_id] = asyncio.create_task(
@@ -86,6 +97,37 @@ class QueueProcessor:
         task = self._tasks.get(session_id)
         return task is not None and not task.done()
 
+    # =========================================================================
+    # Wakeups
+    # =========================================================================
+
+    def notify(self, session_id: str) -> None:
+        """Wake the session's processor so it re-reads session state."""
+        event = self._wakeups.get(session_id)
+        if event is not None:
+            event.set()
+
+    async def on_session_state_change(
+        self, session_id: str, new_state: SessionState, is_processing: bool, project_id: str | None = None
+    ) -> None:
+        """SessionManager state-change callback (state and is_processing updates)."""
+        self.notify(session_id)
+
+    async def _wait_for_change(self, session_id: str, timeout: float | None = RESYNC_SECONDS) -> bool:
+        """Wait until notify() is called or ``timeout`` elapses. Returns True when notified.
+
+        The event is cleared on return, so callers clear-then-check-then-wait:
+        a notification that arrives while state is being read wakes the next wait.
+        """
+        event = self._wakeups.setdefault(session_id, asyncio.Event())
+        try:
+            await asyncio.wait_for(event.wait(), timeout)
+            return True
+        except TimeoutError:
+            return False
+        finally:
+            event.clear()
+
     # =========================================================================
     # Callback wiring
     # =========================================================================
@@ -112,6 +154,7 @@ class QueueProcessor:
     async def _process_loop(self, session_id: str) -> None:
         """Main processing loop for a session's queue."""
         queue_proc_logger.info(f"Queue processor started for session {session_id}")
+        self._wakeups[session_id] = asyncio.Event()
 
         try:
             while True:
@@ -130,7 +173,8 @@ class QueueProcessor:
                 queue_paused = getattr(session_info, 'queue_paused', False)
 
                 if queue_paused:
-                    await asyncio.sleep(1)
+                    # Resume goes through ensure_running(), which wakes us
+                    await self._wait_for_change(session_id)
                     continue
 
                 # Check session state
@@ -250,6 +294,7 @@ class QueueProcessor:
             logger.error(f"Queue processor error for session {session_id}: {e}", exc_info=True)
         finally:
             self._tasks.pop(session_id, None)
+            self._wakeups.pop(session_id, None)
             queue_proc_logger.info(f"Queue processor exited for session {session_id}")
 
     # =========================================================================
@@ -258,8 +303,10 @@ class QueueProcessor:
 
     async def _wait_for_active(self, session_id: str, timeout: float = 120) -> bool:
         """Wait for a session to reach ACTIVE state. Returns False on error/timeout."""
-        elapsed = 0.0
-        while elapsed < timeout:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while True:
+            self._wakeups.setdefault(session_id, asyncio.Event()).clear()
             info = await self._coordinator.session_manager.get_session_info(session_id)
             if not info:
                 return False
@@ -267,9 +314,10 @@ class QueueProcessor:
                 return True
             if info.state == SessionState.ERROR:
                 return False
-            await asyncio.sleep(1)
-            elapsed += 1
-        return False
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return False
+            await self._wait_for_change(session_id, min(remaining, RESYNC_SECONDS))
 
     async def _wait_for_idle(
         self, session_id: str, queue_id: str, min_idle_seconds: float
@@ -279,10 +327,14 @@ class QueueProcessor:
 
         Returns True if idle reached, False if session errored.
         No timeout — supports indefinite waits (e.g., overnight permission waits).
+        While busy this sleeps until the next notification; once idle, the
+        debounce is a timed wait that a notification interrupts for a re-check.
         """
+        loop = asyncio.get_running_loop()
         idle_start: float | None = None
 
         while True:
+            self._wakeups.setdefault(session_id, asyncio.Event()).clear()
             info = await self._coordinator.session_manager.get_session_info(session_id)
             if not info:
                 return False
@@ -308,7 +360,8 @@ class QueueProcessor:
             # Treat in-flight script schedules the same as is_processing: do not
             # advance to the next queue item while a script that may be about to
             # enqueue is still running. Reaches into legion_system.scheduler_service
-            # (the only back-pointer from coordinator → scheduler).
+            # (the only back-pointer from coordinator → scheduler); the scheduler
+            # calls notify() when a script finishes.
             scheduler = (
                 self._coordinator.legion_system.scheduler_service
                 if self._coordinator.legion_system is not None
@@ -319,18 +372,18 @@ class QueueProcessor:
             )
 
             if info.is_processing or scripts_inflight:
-                # Still busy — reset idle timer.
+                # Still busy — reset idle timer and sleep until something changes.
                 idle_start = None
-            else:
-                # Not processing — start/continue idle timer
-                if idle_start is None:
-                    idle_start = asyncio.get_event_loop().time()
-
-                elapsed_idle = asyncio.get_event_loop().time() - idle_start
-                if elapsed_idle >= min_idle_seconds:
-                    return True
-
-            await asyncio.sleep(1)
+                await self._wait_for_change(session_id)
+                continue
+
+            # Not processing — start/continue idle timer
+            if idle_start is None:
+                idle_start = loop.time()
+            remaining = min_idle_seconds - (loop.time() - idle_start)
+            if remaining <= 0:
+                return True
+            await self._wait_for_change(session_id, min(remaining, RESYNC_SECONDS))
 
     async def _broadcast(self, action: str, session_id: str, item: Any) -> None:
         """Broadcast a queue update if callback is set."""
@@ -173,6 +173,7 @@ class McpReconnectRequest(BaseModel):
 
 class CommSendRequest(BaseModel):
     to_minion_id: str | None = None
+    to_minion_ids: list[str] | None = None  # Fan-out to several minions
     to_user: bool = False
     content: str
     comm_type: str = "task"
@@ -208,6 +209,9 @@ class ScheduleCreateRequest(BaseModel):
     script_timeout_seconds: int = 60
     # Disposable schedule fields (issue #1538): default 1 = one-shot
     repeat_count: int | None = 1
+    # Execution pool: start order within the legion, and what to do with a late fire
+    priority: int = 0
+    late_policy: str = "coalesce"  # "skip" | "coalesce" | "run_late"
 
     @field_validator("repeat_count", mode="before")
     @classmethod
@@ -238,6 +242,8 @@ class ScheduleUpdateRequest(BaseModel):
     # Disposable schedule fields (issue #1538): None means "not set" unless repeat_count_set is True
     repeat_count: int | None = None
     repeat_count_set: bool = False  # True when caller explicitly wants to set/clear repeat_count
+    priority: int | None = None
+    late_policy: str | None = None  # "skip" | "coalesce" | "run_late"
 
     @field_validator("repeat_count", mode="before")
     @classmethod
@@ -491,6 +497,14 @@ class ProviderCatalogEntryRequest(BaseModel):
         extra = "allow"  # forward-compat for new provider-specific fields
 
 
+class MultiPollRequest(BaseModel):
+    """Multiplexed long-poll over the UI queue and several session queues."""
+    ui: int | None = None  # UI queue cursor; None = don't watch UI events
+    sessions: dict[str, int] = Field(default_factory=dict)  # session_id -> cursor
+    timeout: int = 30
+    patch: bool = False  # opt into tool_call_patch events
+
+
 def _validate_additional_directories(dirs: list[str] | None, working_directory: str | None) -> list[str] | None:
     """Validate additional directories: absolute paths, no duplicates, not same as working_dir.
     Returns None (not []) when there are no valid entries so callers can distinguish
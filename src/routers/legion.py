@@ -1,13 +1,11 @@
 """Legion endpoints: timeline, hierarchy, comms, minions"""
 
-import json
+import asyncio
 import uuid
-from datetime import UTC, datetime
 
 from fastapi import APIRouter, HTTPException
 
 from ..exception_handlers import handle_exceptions
-from ..timestamp_utils import normalize_timestamp
 from ._models import CommSendRequest, MinionCreateRequest, ReparentRequest
 
 
@@ -16,67 +14,41 @@ def build_router(webui) -> APIRouter:
 
     @router.get("/api/legions/{legion_id}/timeline")
     @handle_exceptions("get legion timeline")
-    async def get_legion_timeline(legion_id: str, limit: int = 100, offset: int = 0):
-        """Get Comms for legion timeline (all communications in the legion)"""
-        # Read all comms from the main legion timeline
+    async def get_legion_timeline(
+        legion_id: str,
+        limit: int = 100,
+        offset: int = 0,
+        minion_id: str | None = None,
+        comm_type: str | None = None,
+        since_cursor: int | None = None,
+    ):
+        """Get Comms for legion timeline (all communications in the legion)
+
+        Newest first, unique by comm_id. ``minion_id`` keeps comms sent from or
+        to that minion; ``since_cursor`` (the ``cursor`` of a previous response)
+        keeps only comms appended since.
+        """
         legion_dir = webui.coordinator.data_dir / "legions" / legion_id
         if not legion_dir.exists():
             return {
                 "comms": [],
                 "total": 0,
                 "limit": limit,
-                "offset": offset
+                "offset": offset,
+                "cursor": -1,
             }
 
-        all_comms = []
-
-        # Read from main timeline.jsonl (contains ALL comms)
-        timeline_file = legion_dir / "timeline.jsonl"
-        if timeline_file.exists():
-            with open(timeline_file, encoding='utf-8') as f:
-                for line in f:
-                    line = line.strip()
-                    if line:
-                        try:
-                            comm_data = json.loads(line)
-                            all_comms.append(comm_data)
-                        except json.JSONDecodeError:
-                            continue
-
-        # Normalize timestamps to handle mixed string/float formats (backwards compatibility)
-        for comm in all_comms:
-            if 'timestamp' in comm:
-                try:
-                    comm['timestamp'] = normalize_timestamp(comm['timestamp'])
-                except (ValueError, TypeError) as e:
-                    import logging
-                    logging.getLogger(__name__).warning(
-                        f"Invalid timestamp in comm {comm.get('comm_id', 'unknown')}: {e}, using current time"
-                    )
-                    comm['timestamp'] = datetime.now(UTC).timestamp()
-
-        # Sort by timestamp (newest first) and deduplicate
-        all_comms.sort(key=lambda x: x.get('timestamp', 0.0), reverse=True)
-
-        # Deduplicate by comm_id (since comms appear in both sender and receiver logs)
-        seen_ids = set()
-        unique_comms = []
-        for comm in all_comms:
-            comm_id = comm.get('comm_id')
-            if comm_id and comm_id not in seen_ids:
-                seen_ids.add(comm_id)
-                unique_comms.append(comm)
-
-        # Paginate
-        total = len(unique_comms)
-        paginated_comms = unique_comms[offset:offset + limit]
-
-        return {
-            "comms": paginated_comms,
-            "total": total,
-            "limit": limit,
-            "offset": offset
-        }
+        timeline_store = webui.coordinator.legion_system.timeline_store
+        # First request for a legion builds its index from timeline.jsonl
+        return await asyncio.to_thread(
+            timeline_store.query,
+            legion_id,
+            limit=limit,
+            offset=offset,
+            minion_id=minion_id,
+            comm_type=comm_type,
+            since_cursor=since_cursor,
+        )
 
     @router.get("/api/legions/{legion_id}/hierarchy")
     @handle_exceptions("get legion hierarchy")
@@ -116,12 +88,23 @@ def build_router(webui) -> APIRouter:
             comm_id=str(uuid.uuid4()),
             from_user=True,
             to_minion_id=request.to_minion_id,
+            to_minion_ids=request.to_minion_ids or [],
             to_user=request.to_user,
             to_minion_name=to_minion_name,
             content=request.content,
             comm_type=CommType(request.comm_type)
         )
 
+        # Fan-out: one timeline record, per-recipient delivery report
+        if comm.to_minion_ids:
+            comm_router = webui.coordinator.legion_system.comm_router
+            deliveries = await comm_router.fan_out_comm(comm)
+            return {
+                "comm": comm.to_dict(),
+                "success": all(d["delivered"] for d in deliveries.values()),
+                "deliveries": deliveries,
+            }
+
         # Route the comm
         success = await webui.coordinator.legion_system.comm_router.route_comm(comm)
 
@@ -1,30 +1,178 @@
-"""Long-poll endpoints: /api/poll/*"""
+"""Long-poll endpoints: /api/poll/*, plus SSE/WebSocket push streams: /api/stream/*, /ws/*"""
 
-from fastapi import APIRouter, HTTPException
+import json
+from collections.abc import AsyncIterator, Awaitable, Callable
 
-from ..event_queue import EventQueue
+from fastapi import APIRouter, HTTPException, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+
+from ..event_queue import EventQueue, wait_for_any
 from ..exception_handlers import handle_exceptions
 from ..logging_config import get_logger
+from ..poll_encoding import payload_stats, poll_response
+from ._models import MultiPollRequest
 
 _polling_logger = get_logger('polling', category='POLL')
 
+# Idle interval between SSE keepalive comments / WebSocket pings
+STREAM_HEARTBEAT_SECONDS = 15.0
+
+
+async def _stream_batches(
+    queue: EventQueue,
+    since: int,
+    is_disconnected: Callable[[], Awaitable[bool]],
+    before_wait: Callable[[], Awaitable[None]] | None = None,
+    patch: bool = False,
+) -> AsyncIterator[tuple[list[dict], int] | None]:
+    """Yield (events, next_cursor) batches from ``queue`` starting after ``since``.
+
+    Yields ``None`` after each idle heartbeat interval so transports can emit a
+    keepalive. Batches use the same ``events_since`` semantics (and therefore
+    the same backpressure and delta coalescing) as the long-poll endpoints.
+    """
+    cursor = since
+    while not await is_disconnected():
+        if before_wait is not None:
+            await before_wait()
+        await queue.wait_for_events(cursor, timeout=STREAM_HEARTBEAT_SECONDS)
+        events, next_cursor = queue.events_since(cursor, patch=patch)
+        if not events and next_cursor == cursor:
+            yield None
+            continue
+        cursor = next_cursor
+        yield events, next_cursor
+
+
+def _poll_body(queue: EventQueue, events: list[dict], next_cursor: int) -> dict:
+    """Long-poll body for one queue.
+
+    ``has_more`` is set when backpressure cut the batch short of the queue head,
+    telling the client to poll again right away rather than park.
+    """
+    return {
+        "events": events,
+        "next_cursor": next_cursor,
+        "has_more": next_cursor < queue.current_cursor,
+    }
+
+
+def _sse_frame(events: list[dict], next_cursor: int) -> str:
+    """One SSE message per batch; id is the resume cursor for Last-Event-ID."""
+    payload = json.dumps({"events": events, "next_cursor": next_cursor}, default=str)
+    return f"id: {next_cursor}\nevent: events\ndata: {payload}\n\n"
+
+
+def _resume_cursor(request: Request, since: int) -> int:
+    """EventSource reconnects send Last-Event-ID; it wins over the initial ?since=."""
+    last_event_id = request.headers.get("last-event-id")
+    if last_event_id:
+        try:
+            return int(last_event_id)
+        except ValueError:
+            pass
+    return since
+
 
 def build_router(webui) -> APIRouter:
     router = APIRouter()
 
+    async def _get_or_create_session_queue(session_id: str) -> EventQueue:
+        if session_id not in webui.session_queues:
+            if not await webui.service.get_session_exists(session_id):
+                raise HTTPException(status_code=404, detail="Session not found")
+            webui.session_queues[session_id] = EventQueue()
+        return webui.session_queues[session_id]
+
+    def _mark_viewed_hook(session_id: str) -> Callable[[], Awaitable[None]]:
+        # Issue #1598 semantics: mark viewed before each wait, exactly as a poll start does.
+        async def _hook() -> None:
+            try:
+                await webui.coordinator.session_manager.mark_viewed(session_id)
+            except Exception:
+                _polling_logger.exception("mark_viewed failed for session %s", session_id)
+        return _hook
+
+    def _sse_response(
+        request: Request,
+        queue: EventQueue,
+        since: int,
+        label: str,
+        before_wait: Callable[[], Awaitable[None]] | None = None,
+        patch: bool = False,
+    ) -> StreamingResponse:
+        cursor = _resume_cursor(request, since)
+
+        async def _body() -> AsyncIterator[str]:
+            _polling_logger.info("stream %s opened since=%d", label, cursor)
+            # Tell EventSource how long to back off before reconnecting.
+            yield "retry: 2000\n\n"
+            try:
+                async for batch in _stream_batches(
+                    queue, cursor, request.is_disconnected, before_wait, patch
+                ):
+                    if batch is None:
+                        yield ": keepalive\n\n"
+                    else:
+                        yield _sse_frame(*batch)
+            finally:
+                _polling_logger.info("stream %s closed", label)
+
+        return StreamingResponse(
+            _body(),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+
+    async def _serve_websocket(
+        websocket: WebSocket,
+        queue: EventQueue,
+        since: int,
+        label: str,
+        before_wait: Callable[[], Awaitable[None]] | None = None,
+    ) -> None:
+        async def _never_disconnected() -> bool:
+            # A closed socket surfaces as WebSocketDisconnect on the next send
+            # (at the latest the next heartbeat ping).
+            return False
+
+        _polling_logger.info("ws %s opened since=%d", label, since)
+        try:
+            async for batch in _stream_batches(queue, since, _never_disconnected, before_wait):
+                if batch is None:
+                    await websocket.send_json({"type": "ping"})
+                else:
+                    events, next_cursor = batch
+                    await websocket.send_text(
+                        json.dumps({"events": events, "next_cursor": next_cursor}, default=str)
+                    )
+        except WebSocketDisconnect:
+            pass
+        finally:
+            _polling_logger.info("ws %s closed", label)
+
+    async def _accept_websocket(websocket: WebSocket) -> bool:
+        # AuthMiddleware only sees HTTP requests; WebSockets authenticate here via ?token=.
+        if getattr(webui, "auth_enabled", False) and webui.auth_token:
+            if websocket.query_params.get("token") != webui.auth_token:
+                await websocket.close(code=4401)
+                return False
+        await websocket.accept()
+        return True
+
     @router.get("/api/poll/ui")
     @handle_exceptions("poll ui")
-    async def poll_ui(since: int = 0, timeout: int = 30):
+    async def poll_ui(request: Request, since: int = 0, timeout: int = 30, patch: bool = False):
         """HTTP long-poll endpoint for global UI events."""
         effective_timeout = min(float(timeout), 30.0)
         await webui.ui_queue.wait_for_events(since, timeout=effective_timeout)
-        events, next_cursor = webui.ui_queue.events_since(since)
+        events, next_cursor = webui.ui_queue.events_since(since, patch=patch)
         if events:
             _polling_logger.info(
                 "poll ui returned %d event(s) since=%d next_cursor=%d",
                 len(events), since, next_cursor
             )
-        return {"events": events, "next_cursor": next_cursor}
+        return poll_response(request, _poll_body(webui.ui_queue, events, next_cursor))
 
     @router.get("/api/poll/cursor")
     @handle_exceptions("poll cursor")
@@ -44,13 +192,14 @@ def build_router(webui) -> APIRouter:
 
     @router.get("/api/poll/session/{session_id}")
     @handle_exceptions("poll session")
-    async def poll_session(session_id: str, since: int = 0, timeout: int = 30):
-        """HTTP long-poll endpoint for session-specific events."""
-        if session_id not in webui.session_queues:
-            if not await webui.service.get_session_exists(session_id):
-                raise HTTPException(status_code=404, detail="Session not found")
-            webui.session_queues[session_id] = EventQueue()
-        queue = webui.session_queues[session_id]
+    async def poll_session(
+        request: Request, session_id: str, since: int = 0, timeout: int = 30, patch: bool = False
+    ):
+        """HTTP long-poll endpoint for session-specific events.
+
+        ``patch=1`` opts into ``tool_call_patch`` events (see poll_encoding).
+        """
+        queue = await _get_or_create_session_queue(session_id)
 
         # Issue #1598: Mark session viewed at poll START, not poll END.
         # Recording the timestamp here ensures any completion event arriving
@@ -63,13 +212,108 @@ def build_router(webui) -> APIRouter:
 
         effective_timeout = min(float(timeout), 30.0)
         await queue.wait_for_events(since, timeout=effective_timeout)
-        events, next_cursor = queue.events_since(since)
+        events, next_cursor = queue.events_since(since, patch=patch)
 
         if events:
             _polling_logger.info(
                 "poll session %s returned %d event(s) since=%d next_cursor=%d",
                 session_id, len(events), since, next_cursor
             )
-        return {"events": events, "next_cursor": next_cursor}
+        return poll_response(request, _poll_body(queue, events, next_cursor))
+
+    @router.post("/api/poll/multi")
+    @handle_exceptions("poll multi")
+    async def poll_multi(request: Request, body: MultiPollRequest):
+        """Single long-poll for the UI queue plus any number of sessions.
+
+        Returns as soon as any watched queue has events past its cursor. Every
+        requested session gets an entry with its next cursor (events may be
+        empty); unknown session ids are listed under ``missing``.
+        """
+        watches: list[tuple[EventQueue, int]] = []
+        if body.ui is not None:
+            watches.append((webui.ui_queue, body.ui))
+
+        session_queues: dict[str, EventQueue] = {}
+        missing: list[str] = []
+        for session_id, cursor in body.sessions.items():
+            try:
+                queue = await _get_or_create_session_queue(session_id)
+            except HTTPException:
+                missing.append(session_id)
+                continue
+            session_queues[session_id] = queue
+            watches.append((queue, cursor))
+            # Issue #1598: same mark-viewed-at-poll-start semantics as poll_session.
+            await _mark_viewed_hook(session_id)()
+
+        effective_timeout = min(float(body.timeout), 30.0)
+        await wait_for_any(watches, timeout=effective_timeout)
+
+        response: dict = {"ui": None, "sessions": {}, "missing": missing}
+        total = 0
+        if body.ui is not None:
+            events, next_cursor = webui.ui_queue.events_since(body.ui, patch=body.patch)
+            response["ui"] = _poll_body(webui.ui_queue, events, next_cursor)
+            total += len(events)
+        for session_id, queue in session_queues.items():
+            events, next_cursor = queue.events_since(body.sessions[session_id], patch=body.patch)
+            response["sessions"][session_id] = _poll_body(queue, events, next_cursor)
+            total += len(events)
+
+        if total:
+            _polling_logger.info(
+                "poll multi returned %d event(s) across %d queue(s)", total, len(watches)
+            )
+        return poll_response(request, response)
+
+    @router.get("/api/poll/stats")
+    @handle_exceptions("poll stats")
+    async def get_poll_stats():
+        """Bytes saved by tool_call patches and gzip poll responses since startup."""
+        return payload_stats.to_dict()
+
+    @router.get("/api/stream/ui")
+    @handle_exceptions("stream ui")
+    async def stream_ui(request: Request, since: int = 0, patch: bool = False):
+        """Server-Sent Events stream of global UI events (long-poll remains the fallback).
+
+        Each SSE message carries the same ``{events, next_cursor}`` body as
+        ``/api/poll/ui`` with ``id: next_cursor``, so a reconnecting EventSource
+        resumes from ``Last-Event-ID`` without gaps.
+        """
+        return _sse_response(request, webui.ui_queue, since, "ui", patch=patch)
+
+    @router.get("/api/stream/session/{session_id}")
+    @handle_exceptions("stream session")
+    async def stream_session(
+        request: Request, session_id: str, since: int = 0, patch: bool = False
+    ):
+        """Server-Sent Events stream of session events (long-poll remains the fallback)."""
+        queue = await _get_or_create_session_queue(session_id)
+        return _sse_response(
+            request, queue, since, f"session {session_id}", _mark_viewed_hook(session_id),
+            patch=patch,
+        )
+
+    @router.websocket("/ws/ui")
+    async def ws_ui(websocket: WebSocket, since: int = 0):
+        """WebSocket variant of /api/stream/ui; clients resume by reconnecting with ?since=."""
+        if await _accept_websocket(websocket):
+            await _serve_websocket(websocket, webui.ui_queue, since, "ui")
+
+    @router.websocket("/ws/session/{session_id}")
+    async def ws_session(websocket: WebSocket, session_id: str, since: int = 0):
+        """WebSocket variant of /api/stream/session/{session_id}."""
+        if session_id not in webui.session_queues:
+            if not await webui.service.get_session_exists(session_id):
+                await websocket.close(code=4404)
+                return
+            webui.session_queues[session_id] = EventQueue()
+        if await _accept_websocket(websocket):
+            await _serve_websocket(
+                websocket, webui.session_queues[session_id], since,
+                f"session {session_id}", _mark_viewed_hook(session_id),
+            )
 
     return router
@@ -111,9 +111,19 @@ def build_router(webui) -> APIRouter:
             script_command=request.script_command,
             script_timeout_seconds=request.script_timeout_seconds,
             repeat_count=request.repeat_count,
+            priority=request.priority,
+            late_policy=request.late_policy,
         )
         return {"schedule": await svc.schedule_to_api_dict(schedule)}
 
+    @router.get("/api/legions/{legion_id}/schedule-queue")
+    @handle_exceptions("get schedule queue")
+    async def get_schedule_queue(legion_id: str):
+        """Running and queued scheduled fires for a legion, with pool limits."""
+        if not await webui.service.validate_project_exists(legion_id):
+            raise HTTPException(status_code=404, detail="Project not found")
+        return webui.coordinator.legion_system.scheduler_service.queued_fires(legion_id)
+
     @router.get("/api/legions/{legion_id}/schedules/{schedule_id}")
     @handle_exceptions("get schedule")
     async def get_schedule(legion_id: str, schedule_id: str):
@@ -4,6 +4,7 @@ from fastapi import APIRouter, HTTPException
 
 from ..exception_handlers import handle_exceptions
 from ..models.permission_mode import PermissionMode
+from ..proxy_log_query import ProxyLogFilter, parse_log_ts
 from ..session_manager import VALID_MODELS
 from ._models import (
     AddDirectoryRequest,
@@ -20,18 +21,40 @@ def build_router(webui) -> APIRouter:
     # ==================== PROXY LOG ENDPOINTS (Issue #1102) ====================
 
     @router.get("/api/sessions/{session_id}/proxy-logs")
-    @handle_exceptions("get proxy logs")
+    @handle_exceptions("get proxy logs", value_error_status=400)
     async def get_proxy_logs(
         session_id: str,
         log_type: str = "http",
         limit: int = 200,
+        host: str | None = None,
+        status: str | None = None,
+        denied_only: bool = False,
+        credential: str | None = None,
+        since: str | None = None,
+        until: str | None = None,
+        cursor: str | None = None,
     ):
-        """Get proxy log entries for a session (HTTP access log, DNS query log, or SOCKS5 connection log)"""
+        """Get proxy log entries for a session (HTTP access log, DNS query log, or SOCKS5 connection log).
+
+        Newest page first; pass the returned next_cursor to page back through older
+        entries. since/until accept epoch seconds or ISO 8601 timestamps.
+        """
         if log_type not in ("http", "dns", "socks5"):
             raise HTTPException(status_code=400, detail="log_type must be 'http', 'dns', or 'socks5'")
+        bounds = {}
+        for name, value in (("since", since), ("until", until)):
+            if value is not None:
+                bounds[name] = parse_log_ts(value)
+                if bounds[name] is None:
+                    raise HTTPException(status_code=400, detail=f"Invalid {name} timestamp: {value}")
         if not await webui.service.get_session_exists(session_id):
             raise HTTPException(status_code=404, detail="Session not found")
-        return await webui.coordinator.get_proxy_logs(session_id, log_type=log_type, limit=limit)
+        filters = ProxyLogFilter(
+            host=host, status=status, denied_only=denied_only, credential=credential, **bounds
+        )
+        return await webui.coordinator.get_proxy_logs(
+            session_id, log_type=log_type, limit=limit, filters=filters, cursor=cursor
+        )
 
     # ==================== PERMISSION MODE ENDPOINT ====================
 
@@ -1,10 +1,12 @@
 """Session CRUD and messaging endpoints: /api/sessions*"""
 
+import json
 import logging
 import uuid
 from datetime import datetime
 
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 
 from ..event_queue import EventQueue
 from ..exception_handlers import handle_exceptions
@@ -419,6 +421,37 @@ def build_router(webui) -> APIRouter:
             result["event_cursor"] = queue.current_cursor
         return result
 
+    @router.get("/api/sessions/{session_id}/messages/stream")
+    @handle_exceptions("stream messages", value_error_status=400)
+    async def stream_messages(
+        session_id: str, before: str | None = None, after: str | None = None, limit: int = 50
+    ):
+        """Cursor-paginated history as NDJSON, newest page first.
+
+        The first line is page metadata (``type: "page"``) carrying the
+        ``before``/``after`` cursors for the adjacent pages; each following line
+        is one message in the same format as GET /messages. With no cursor the
+        newest ``limit`` stored lines are returned, in constant time regardless
+        of history length.
+        """
+        if not await webui.service.get_session_exists(session_id):
+            raise HTTPException(status_code=404, detail="Session not found")
+        limit = max(1, min(limit, 10000))
+        meta, messages = await webui.coordinator.get_session_messages_page(
+            session_id, before=before, after=after, limit=limit
+        )
+        # Issue #1000: event queue cursor so polling resumes where the history ends
+        queue = webui.session_queues.get(session_id)
+        if queue:
+            meta["event_cursor"] = queue.current_cursor
+
+        async def _ndjson():
+            yield json.dumps(meta) + "\n"
+            for message in messages:
+                yield json.dumps(message, default=str) + "\n"
+
+        return StreamingResponse(_ndjson(), media_type="application/x-ndjson")
+
     @router.get("/api/sessions/{session_id}/background_agents")
     @handle_exceptions("get background agents")
     async def get_background_agents(session_id: str):
@@ -139,6 +139,25 @@ def build_router(webui) -> APIRouter:
         status = await check_docker_available()
         return status
 
+    @router.get("/api/system/history-projection-stats")
+    @handle_exceptions("get history projection stats")
+    async def get_history_projection_stats():
+        """Hit/miss counters for the cached session history projection."""
+        return webui.coordinator.get_history_projection_stats()
+
+    @router.get("/api/system/startup-timing")
+    @handle_exceptions("get startup timing")
+    async def get_startup_timing():
+        """Per-phase wall-clock breakdown of the last startup."""
+        return webui.coordinator.startup_timings.to_dict()
+
+    @router.get("/api/system/hierarchy-check")
+    @handle_exceptions("check session hierarchy")
+    async def check_session_hierarchy():
+        """Compare the in-memory minion hierarchy graph with persisted state.json."""
+        problems = await webui.coordinator.session_manager.check_hierarchy_consistency()
+        return {"consistent": not any(problems.values()), **problems}
+
     @router.get("/api/system/git-status")
     @handle_exceptions("get git status")
     async def get_git_status():
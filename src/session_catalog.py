@@ -0,0 +1,148 @@
+"""
+SQLite session catalog: one row per session in data/sessions.db.
+
+With ``session_catalog.enabled`` the catalog is SessionManager's persistence
+layer. A state change is a single-row upsert instead of a full rewrite of
+``sessions/<id>/state.json``, and startup reads one table instead of opening
+every state.json. The project, parent, state and ordering columns are stored
+alongside the full ``SessionInfo.to_dict()`` payload so the table can be
+inspected with plain SQL. They are deliberately not indexed, and list,
+filter and sort queries are not served from SQL: SessionManager already holds
+every session in memory and filters there, reading the table only at startup,
+so indexes would only add write cost to each upsert.
+
+state.json files are still exported (see SessionManager.export_state_json)
+for the archive manager, mock SDK recordings and anything else that reads
+session directories directly. The export runs on an interval and on
+shutdown, so after a crash state.json can trail the catalog by one interval;
+the catalog stays authoritative, and disabling it writes its rows back to
+state.json before the database is removed.
+
+Connection model mirrors AnalyticsDB: WAL journal, busy_timeout=5000 ms. All
+calls are synchronous and cheap (single-row statements); SessionManager
+invokes them on the event loop just as it previously wrote state.json.
+"""
+
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any
+
+from .logging_config import get_logger
+
+logger = get_logger('session_manager', category='SESSION_CATALOG')
+
+_DDL = """
+CREATE TABLE IF NOT EXISTS sessions (
+    session_id          TEXT PRIMARY KEY,
+    project_id          TEXT,
+    parent_overseer_id  TEXT,
+    state               TEXT NOT NULL,
+    last_completion_at  TEXT,
+    sort_order          INTEGER,
+    created_at          TEXT NOT NULL,
+    updated_at          TEXT NOT NULL,
+    data                TEXT NOT NULL
+);
+"""
+
+_UPSERT = """
+INSERT INTO sessions (
+    session_id, project_id, parent_overseer_id, state, last_completion_at,
+    sort_order, created_at, updated_at, data
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(session_id) DO UPDATE SET
+    project_id = excluded.project_id,
+    parent_overseer_id = excluded.parent_overseer_id,
+    state = excluded.state,
+    last_completion_at = excluded.last_completion_at,
+    sort_order = excluded.sort_order,
+    created_at = excluded.created_at,
+    updated_at = excluded.updated_at,
+    data = excluded.data
+"""
+
+# Same ordering as SessionManager.list_sessions(): order (missing last), then created_at
+_ORDER_BY = "COALESCE(sort_order, 999999), created_at"
+
+
+def _row_params(data: dict[str, Any]) -> tuple:
+    return (
+        data["session_id"],
+        data.get("project_id"),
+        data.get("parent_overseer_id"),
+        data["state"],
+        data.get("last_completion_at"),
+        data.get("order"),
+        data["created_at"],
+        data["updated_at"],
+        json.dumps(data, ensure_ascii=False, sort_keys=True),
+    )
+
+
+class SessionCatalog:
+    """Single-connection SQLite store of serialized SessionInfo rows."""
+
+    FILENAME = "sessions.db"
+
+    def __init__(self, db_path: Path):
+        self.path = Path(db_path)
+        self._conn: sqlite3.Connection | None = None
+        # Upserts may come from worker threads (startup import) and the loop
+        self._lock = threading.Lock()
+
+    def open(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA busy_timeout=5000")
+        conn.executescript(_DDL)
+        conn.commit()
+        self._conn = conn
+
+    def close(self) -> None:
+        if self._conn is not None:
+            try:
+                self._conn.close()
+            except Exception:
+                pass
+            self._conn = None
+
+    @property
+    def is_open(self) -> bool:
+        return self._conn is not None
+
+    def upsert(self, data: dict[str, Any]) -> None:
+        """Insert or replace one session row from ``SessionInfo.to_dict()`` output."""
+        with self._lock:
+            self._conn.execute(_UPSERT, _row_params(data))
+            self._conn.commit()
+
+    def upsert_many(self, rows: list[dict[str, Any]]) -> None:
+        with self._lock:
+            self._conn.executemany(_UPSERT, [_row_params(data) for data in rows])
+            self._conn.commit()
+
+    def delete(self, session_id: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+            self._conn.commit()
+
+    def delete_many(self, session_ids: list[str]) -> None:
+        with self._lock:
+            self._conn.executemany(
+                "DELETE FROM sessions WHERE session_id = ?", [(sid,) for sid in session_ids]
+            )
+            self._conn.commit()
+
+    def load_all(self) -> list[dict[str, Any]]:
+        """Return every stored session dict, in list_sessions() order."""
+        with self._lock:
+            rows = self._conn.execute(f"SELECT data FROM sessions ORDER BY {_ORDER_BY}").fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def session_ids(self) -> set[str]:
+        with self._lock:
+            return {row[0] for row in self._conn.execute("SELECT session_id FROM sessions")}
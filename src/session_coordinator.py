@@ -14,6 +14,7 @@ import re
 import secrets
 import shutil
 from collections.abc import Callable
+from dataclasses import replace
 from datetime import UTC, datetime
 from pathlib import Path
 from typing import Any
@@ -25,10 +26,12 @@ from src.legion.minion_system_prompts import get_legion_guide_only
 from .claude_sdk import ClaudeSDK
 from .config_resolution import resolve_effective_config
 from .data_storage import DataStorageManager
+from .history_projection import HistoryFold, HistoryProjectionCache
 from .hooks.pretooluse_handler import InternalPermissionHandler
 from .litellm_proxy_manager import make_model_alias
 from .logging_config import get_logger
 from .mcp_config_manager import McpServerType
+from .message_log_writer import MessageFlushPolicy
 from .message_parser import MessageParser, MessageProcessor
 from .models.messages import (
     DisplayProjection,
@@ -42,10 +45,12 @@ from .models.messages import (
 from .models.permission_mode import PermissionMode
 from .oauth_refresh_manager import OAuthRefreshManager
 from .project_manager import ProjectInfo, ProjectManager
+from .proxy_log_query import ProxyLogFilter, query_proxy_log
 from .queue_manager import QueueManager
 from .queue_processor import QueueProcessor
 from .session_config import SessionConfig
 from .session_manager import STOPPED_STATES, VALID_MODELS, SessionManager, SessionState
+from .startup_timing import StartupTimings
 from .task_registry import TASK_LIFECYCLE_SUBTYPES, TaskLegRegistry
 from .task_utils import task_done_log_exception
 from .timestamp_injection import maybe_inject_timestamp
@@ -212,26 +217,6 @@ def _normalize_result_usage(
     return agg, (cost if has_cost else None)
 
 
-def _tail_read_lines(path: "Path", limit: int) -> list[str]:
-    """Read the last `limit` lines from a file efficiently using a deque."""
-    from collections import deque
-
-    try:
-        with open(path, encoding="utf-8", errors="replace") as f:
-            return list(deque(f, maxlen=limit))
-    except OSError:
-        return []
-
-
-def _count_file_lines(path: "Path") -> int:
-    """Count total lines in a file efficiently."""
-    try:
-        with open(path, encoding="utf-8", errors="replace") as f:
-            return sum(1 for _ in f)
-    except OSError:
-        return 0
-
-
 def _render_inject_file(placeholder: str, fmt: str, key_path: str | None) -> str:
     """Render placeholder into an inject_file's content.
 
@@ -342,7 +327,13 @@ class SessionCoordinator:
         # to bind on the same host, and by McpConfigManager's custom-callback conflict checks.
         self.host = host
         self.port = port
-        self.session_manager = SessionManager(self.data_dir)
+        from src.config_manager import load_config
+        _app_config = load_config()
+        self.session_manager = SessionManager(
+            self.data_dir,
+            catalog_enabled=_app_config.session_catalog.enabled,
+            export_interval_seconds=_app_config.session_catalog.export_interval_seconds,
+        )
         self.project_manager = ProjectManager(self.data_dir)
         self.message_parser = MessageParser()
         self.message_processor = MessageProcessor(self.message_parser)
@@ -419,6 +410,9 @@ class SessionCoordinator:
         # Display projections per session (Issue #310)
         # Tracks tool lifecycle state and computes display metadata for frontend
         self._display_projections: dict[str, DisplayProjection] = {}
+        # Cached get_session_messages folds, extended as new lines are stored
+        self._history_projection = HistoryProjectionCache()
+        self.startup_timings = StartupTimings()
 
         # Audit writer (set after construction via set_audit_writer; optional)
         self._audit_writer = None
@@ -468,17 +462,18 @@ class SessionCoordinator:
         self._message_callback_registrar: Callable[[str], None] | None = None
 
         # Initialize Legion multi-agent system
-        from src.config_manager import load_config
         from src.legion_system import LegionSystem
         # Create a dummy storage manager for now (legion will create its own per-legion storage)
         dummy_storage = DataStorageManager(self.data_dir / "legion_temp")
-        _app_config = load_config()
+        # Write-behind policy for the long-lived per-session message log writers
+        self._message_flush_policy = MessageFlushPolicy.from_config(_app_config.message_log)
         self.legion_system = LegionSystem(
             session_coordinator=self,
             data_storage_manager=dummy_storage,
             template_manager=self.template_manager,
             default_max_minions=_app_config.legion.max_concurrent_minions,
             history_retention=_app_config.history_retention,
+            scheduler=_app_config.scheduler,
         )
 
         # Issue #500: Message queue system
@@ -700,52 +695,66 @@ class SessionCoordinator:
 
     async def initialize(self):
         """Initialize the session coordinator"""
+        timings = self.startup_timings
         try:
-            await self.session_manager.initialize()
-            await self.project_manager.initialize()
-
-            # Load templates from disk
-            await self.template_manager.load_templates()
-            # Create default templates if none exist
-            await self.template_manager.create_default_templates()
-            coord_logger.info("Loaded minion templates")
-
-            # Load configuration profiles from disk (issue #1062).
-            # Pass template_manager so the isolation->features field migration
-            # (issue #1707) can scan already-loaded templates for references.
-            await self.profile_manager.load_profiles(template_manager=self.template_manager)
-            coord_logger.info("Loaded configuration profiles")
-            await self._migrate_stale_mcp_snapshots()  # issue #1660
-
-            # Load global MCP server configs (issue #676)
-            await self.mcp_config_manager.load_configs()
-            coord_logger.info("Loaded global MCP server configs")
-
-            # Load provider catalog from data/providers.json (issue #1465)
-            await self.provider_catalog_store.load()
-            coord_logger.info("Loaded provider catalog")
+            # Sessions and projects load independently; project/session
+            # cross-validation happens further down.
+            with timings.phase("sessions_and_projects"):
+                await asyncio.gather(
+                    self.session_manager.initialize(),
+                    self.project_manager.initialize(),
+                )
+
+            with timings.phase("templates"):
+                # Load templates from disk
+                await self.template_manager.load_templates()
+                # Create default templates if none exist
+                await self.template_manager.create_default_templates()
+                coord_logger.info("Loaded minion templates")
+
+                # Load configuration profiles from disk (issue #1062).
+                # Pass template_manager so the isolation->features field migration
+                # (issue #1707) can scan already-loaded templates for references.
+                await self.profile_manager.load_profiles(template_manager=self.template_manager)
+                coord_logger.info("Loaded configuration profiles")
+                await self._migrate_stale_mcp_snapshots()  # issue #1660
+
+            with timings.phase("mcp_and_providers"):
+                # Load global MCP server configs (issue #676) and the provider
+                # catalog from data/providers.json (issue #1465)
+                await asyncio.gather(
+                    self.mcp_config_manager.load_configs(),
+                    self.provider_catalog_store.load(),
+                )
+                coord_logger.info("Loaded global MCP server configs")
+                coord_logger.info("Loaded provider catalog")
 
             # Rebuild capability registry from persisted session data (if LegionSystem is initialized)
             if hasattr(self, 'legion_system') and self.legion_system is not None:
-                await self.legion_system.legion_coordinator.rebuild_capability_registry()
+                with timings.phase("capabilities"):
+                    await self.legion_system.legion_coordinator.rebuild_capability_registry()
 
             # Register callback to receive session manager state changes
             self.session_manager.add_state_change_callback(self._on_session_manager_state_change)
+            # Queue processors wait on state changes instead of polling session info
+            self.session_manager.add_state_change_callback(self.queue_processor.on_session_state_change)
 
-            # Initialize storage managers for all existing sessions
-            await self._initialize_existing_session_storage()
+            with timings.phase("session_storage"):
+                # Initialize storage managers for all existing sessions
+                await self._initialize_existing_session_storage()
 
-            # Issue #500: Load message queues for all existing sessions
-            await self._initialize_queues()
+                # Issue #500: Load message queues for all existing sessions
+                await self._initialize_queues()
 
-            # Validate and cleanup orphaned project/session references (issue #63)
-            await self._validate_and_cleanup_projects()
+                # Validate and cleanup orphaned project/session references (issue #63)
+                await self._validate_and_cleanup_projects()
 
             # Load and start scheduler service (issue #495)
             if hasattr(self, 'legion_system') and self.legion_system is not None:
-                await self.legion_system.scheduler_service.load_all_schedules()
-                await self.legion_system.scheduler_service.start()
-                await self.legion_system.history_rotator.start()
+                with timings.phase("schedules"):
+                    await self.legion_system.scheduler_service.load_all_schedules()
+                    await self.legion_system.scheduler_service.start()
+                    await self.legion_system.history_rotator.start()
 
             coord_logger.info("Session coordinator initialized successfully")
         except Exception:
@@ -764,7 +773,7 @@ class SessionCoordinator:
                 if session_id not in self._storage_managers:
                     # Create storage manager for this session
                     session_dir = await self.session_manager.get_session_directory(session_id)
-                    storage_manager = DataStorageManager(session_dir)
+                    storage_manager = DataStorageManager(session_dir, self._message_flush_policy)
                     await storage_manager.initialize()
                     self._storage_managers[session_id] = storage_manager
                     self._apply_audit_writer(storage_manager, session_id)
@@ -975,7 +984,7 @@ class SessionCoordinator:
 
             # Initialize storage manager for this session
             session_dir = await self.session_manager.get_session_directory(session_id)
-            storage_manager = DataStorageManager(session_dir)
+            storage_manager = DataStorageManager(session_dir, self._message_flush_policy)
             await storage_manager.initialize()
             self._storage_managers[session_id] = storage_manager
             self._apply_audit_writer(storage_manager, session_id)
@@ -1100,96 +1109,41 @@ class SessionCoordinator:
 
         return None
 
-    async def get_proxy_logs(self, session_id: str, log_type: str = "http", limit: int = 200) -> dict:
+    async def get_proxy_logs(
+        self,
+        session_id: str,
+        log_type: str = "http",
+        limit: int = 200,
+        filters: ProxyLogFilter | None = None,
+        cursor: str | None = None,
+    ) -> dict:
         """
         Get proxy log entries for a session.
 
         Issue #1102: Reads access.log (HTTP) or dns.log (DNS) from the proxy sidecar
-        data directory and returns the last `limit` parsed entries.
+        data directory and returns the newest `limit` parsed entries.
         Issue #1214: Also supports socks5.log for SOCKS5 connection entries.
 
+        Queries run in a worker thread against the block index in
+        src/proxy_log_query.py, which also covers rotated segments.
+
         Args:
             session_id: Session ID
             log_type: "http", "dns", or "socks5"
-            limit: Maximum number of entries to return (tail-read)
+            limit: Maximum number of entries to return
+            filters: Optional host/status/denied/credential/time filter
+            cursor: next_cursor from a previous page, to fetch older entries
 
         Returns:
-            dict with entries, total_lines, and log_type
-        """
-        session_dir = self.data_dir / "sessions" / session_id
-        if log_type == "http":
-            log_path = session_dir / "docker_claude_data" / "proxy" / "access.log"
-        elif log_type == "socks5":
-            log_path = session_dir / "docker_claude_data" / "proxy" / "socks5.log"
-        else:
-            log_path = session_dir / "docker_claude_data" / "proxy" / "dns.log"
-
-        if not log_path.exists():
-            return {"entries": [], "total_lines": 0, "log_type": log_type}
-
-        # Tail-read: read last `limit` lines efficiently
-        lines = _tail_read_lines(log_path, limit)
-        total_lines = _count_file_lines(log_path)
-
-        entries = []
-        if log_type == "http":
-            for line in lines:
-                line = line.strip()
-                if not line:
-                    continue
-                try:
-                    raw = json.loads(line)
-                    entries.append({
-                        "ts": raw.get("ts"),
-                        "host": raw.get("host"),
-                        "method": raw.get("method"),
-                        "path": raw.get("path"),
-                        "status": raw.get("status"),
-                        "allowed": raw.get("allowed"),
-                        "credential_used": raw.get("credential_used"),
-                        "scheme": raw.get("scheme"),
-                        "port": raw.get("port"),
-                        "bytes": raw.get("bytes"),
-                        "routed_via_litellm": raw.get("routed_via_litellm", False),
-                        "original_host": raw.get("original_host", raw.get("host")),
-                    })
-                except (json.JSONDecodeError, ValueError):
-                    self.logger.warning(f"Skipping malformed HTTP proxy log line in session {session_id}")
-        elif log_type == "socks5":
-            for line in lines:
-                line = line.strip()
-                if not line:
-                    continue
-                try:
-                    raw = json.loads(line)
-                    entries.append({
-                        "ts": raw.get("ts"),
-                        "host": raw.get("host"),
-                        "port": raw.get("port"),
-                        "allowed": raw.get("allowed"),
-                        "reason": raw.get("reason"),
-                    })
-                except (json.JSONDecodeError, ValueError):
-                    self.logger.warning(f"Skipping malformed SOCKS5 proxy log line in session {session_id}")
-        else:
-            # CoreDNS log format:
-            # [INFO] 10.0.0.2:54312 - 12345 "A IN api.github.com. udp 128 false 4096" NOERROR qr,rd,ra 73 0.023s
-            dns_pattern = re.compile(
-                r'\[INFO\].*?"(\w+) IN (\S+?)\. \w+ \d+ \w+ \d+"\s+(\w+)'
-            )
-            for line in lines:
-                line = line.strip()
-                if not line:
-                    continue
-                m = dns_pattern.search(line)
-                if m:
-                    entries.append({
-                        "query_type": m.group(1),
-                        "hostname": m.group(2),
-                        "result": m.group(3),
-                    })
+            dict with entries, total_lines, log_type and next_cursor
 
-        return {"entries": entries, "total_lines": total_lines, "log_type": log_type}
+        Raises:
+            ValueError: If cursor is malformed
+        """
+        proxy_dir = self.data_dir / "sessions" / session_id / "docker_claude_data" / "proxy"
+        return await asyncio.to_thread(
+            query_proxy_log, proxy_dir, log_type, limit, filters, cursor
+        )
 
     async def remove_session_resource(self, session_id: str, resource_id: str) -> bool:
         """
@@ -1371,9 +1325,12 @@ class SessionCoordinator:
                 session_info.secret_fetch_token = secrets.token_urlsafe(32)
                 await self.session_manager._persist_session_state(session_id)
 
-            # Create storage manager
+            # Create storage manager (flush + release the previous one's log writer first)
+            previous_storage = self._storage_managers.get(session_id)
+            if previous_storage:
+                await previous_storage.close()
             session_dir = await self.session_manager.get_session_directory(session_id)
-            storage_manager = DataStorageManager(session_dir)
+            storage_manager = DataStorageManager(session_dir, self._message_flush_policy)
             await storage_manager.initialize()
             self._storage_managers[session_id] = storage_manager
             # Issue #1172: re-apply audit hook each time start_session creates a new storage
@@ -2016,9 +1973,10 @@ class SessionCoordinator:
             # Issue #820: Clean up session /tmp directory on session end
             cleanup_session_tmp(session_id, self.session_manager.sessions_dir)
 
-            # Cleanup storage and callbacks
-            if session_id in self._storage_managers:
-                del self._storage_managers[session_id]
+            # Cleanup storage and callbacks (flush buffered messages before dropping)
+            storage = self._storage_managers.pop(session_id, None)
+            if storage:
+                await storage.close()
             if session_id in self._message_callbacks:
                 del self._message_callbacks[session_id]
             if session_id in self._error_callbacks:
@@ -2026,6 +1984,7 @@ class SessionCoordinator:
             # Issue #310: Cleanup display projection
             if session_id in self._display_projections:
                 del self._display_projections[session_id]
+            self._history_projection.invalidate(session_id)
             # Issue #858: Cleanup per-session tool-call event
             self._tool_call_events.pop(session_id, None)
             # Issue #1694: Cleanup per-session message-emitted barrier state
@@ -2144,7 +2103,7 @@ class SessionCoordinator:
             storage = self._storage_managers.get(session_id)
             if not storage:
                 session_dir = await self.session_manager.get_session_directory(session_id)
-                storage = DataStorageManager(session_dir)
+                storage = DataStorageManager(session_dir, self._message_flush_policy)
                 await storage.initialize()
                 self._storage_managers[session_id] = storage
 
@@ -2293,6 +2252,11 @@ class SessionCoordinator:
             # Step 1.7: Archive session before deletion (Issue #236)
             # Archive any session in a project before deletion
             if session_info and project and self.legion_system:
+                storage = self._storage_managers.get(session_id)
+                if storage:
+                    await storage.flush()
+                # Archive copies state.json; bring it up to date with the catalog
+                await self.session_manager.export_state_json(session_id)
                 try:
                     # Get parent info for archive metadata
                     parent_name = None
@@ -2414,18 +2378,9 @@ class SessionCoordinator:
         if the session has no children or doesn't exist.
         """
         descendants = []
-
-        session_info = await self.session_manager.get_session_info(session_id)
-        if not session_info:
-            return descendants
-
-        # Check if session has any children - any session with child_minion_ids
-        # can have descendants, regardless of is_minion/is_overseer flags
-        if not session_info.child_minion_ids:
-            return descendants
-
-        # Process each child
-        for child_id in session_info.child_minion_ids:
+        hierarchy = self.session_manager.hierarchy
+        # Pre-order ids from the in-memory hierarchy graph; no recursive lookups
+        for child_id in hierarchy.descendants(session_id):
             child_info = await self.session_manager.get_session_info(child_id)
             if child_info:
                 descendants.append({
@@ -2433,11 +2388,8 @@ class SessionCoordinator:
                     "name": child_info.name,
                     "role": child_info.role,
                     "state": child_info.state.value if hasattr(child_info.state, 'value') else str(child_info.state),
-                    "parent_id": session_id
+                    "parent_id": hierarchy.parent(child_id)
                 })
-                # Recursively get grandchildren
-                grandchildren = await self._get_all_descendants(child_id)
-                descendants.extend(grandchildren)
 
         return descendants
 
@@ -2464,8 +2416,7 @@ class SessionCoordinator:
 
         Returns count of all descendant sessions.
         """
-        descendants = await self._get_all_descendants(session_id)
-        return len(descendants)
+        return self.session_manager.hierarchy.subtree_size(session_id)
 
     async def wait_for_session_ready(self, session_id: str, timeout: float = 60.0) -> bool:
         """Wait until session's SDK is ready to accept messages."""
@@ -2915,7 +2866,7 @@ class SessionCoordinator:
                 # Create storage manager on-demand for inactive sessions
                 coord_logger.debug(f"Creating storage manager for inactive session {session_id}")
                 session_dir = await self.session_manager.get_session_directory(session_id)
-                storage = DataStorageManager(session_dir)
+                storage = DataStorageManager(session_dir, self._message_flush_policy)
                 await storage.initialize()
                 self._storage_managers[session_id] = storage
 
@@ -2992,6 +2943,11 @@ class SessionCoordinator:
             from src.legion.archive_manager import SnapshotContext
             from src.models.archive_models import DisposalMetadata
 
+            # Buffered messages must land before messages.jsonl is copied
+            storage = self._storage_managers.get(session_id)
+            if storage:
+                await storage.flush()
+
             session_info = await self.session_manager.get_session_info(session_id)
             session_dir = self.session_manager.sessions_dir / session_id
             # Use microsecond-precision timestamp for cross-path consistency
@@ -3023,6 +2979,7 @@ class SessionCoordinator:
             )
 
             # Delegate to unified artifact snapshot
+            await self.session_manager.export_state_json(session_id)
             archive_manager = self.legion_system.archive_manager
             await archive_manager.snapshot_artifacts(session_dir, archive_dir, ctx)
 
@@ -3074,7 +3031,8 @@ class SessionCoordinator:
         """Truncate proxy log files to empty after archiving (issue #1244, decision #11).
 
         Truncate rather than unlink so the file descriptor stays valid if the
-        proxy container is mid-write at reset time.
+        proxy container is mid-write at reset time. Rotated segments
+        (<name>.N, <name>.index.json) are removed.
         """
         proxy_dir = self.session_manager.sessions_dir / session_id / "docker_claude_data" / "proxy"
         if not proxy_dir.is_dir():
@@ -3087,6 +3045,12 @@ class SessionCoordinator:
                     coord_logger.debug(f"Truncated proxy log {name} for {session_id}")
                 except OSError:
                     logger.exception(f"Failed to truncate proxy log {name} for {session_id}")
+            # Rotated segments and their index are not held open by the sidecar
+            for rotated in proxy_dir.glob(f"{name}.*"):
+                try:
+                    rotated.unlink()
+                except OSError:
+                    logger.exception(f"Failed to remove rotated proxy log {rotated.name} for {session_id}")
 
     async def _clear_docker_claude_data(
         self, session_id: str, keep_subdirs: set[str] | None = None
@@ -3753,6 +3717,9 @@ class SessionCoordinator:
         Issue #491: Generates interleaved tool_call messages alongside regular messages.
         The frontend processes all tool_call messages through handleToolCall() regardless
         of whether they arrived via WebSocket or REST history endpoint.
+
+        Pages with a non-negative offset are served from the history projection
+        cache and only fold lines stored since the previous request.
         """
         try:
             storage = self._storage_managers.get(session_id)
@@ -3766,266 +3733,22 @@ class SessionCoordinator:
                     "has_more": False
                 }
 
-            # Get messages and total count
-            raw_messages = await storage.read_messages(limit=limit, offset=offset)
             total_count = await storage.get_message_count()
+            if offset >= 0:
+                fold = await self._get_history_fold(session_id, storage, offset, limit or None, total_count)
+            else:
+                # Tail reads shift as the log grows; fold them uncached
+                fold = HistoryFold(start=offset)
+                raw_messages, lines = await self._read_history_lines(storage, offset, limit)
+                self._fold_history_messages(session_id, fold, raw_messages, lines)
 
-            # Convert stored messages to WebSocket format and generate tool_call messages
-            parsed_messages = []
-
-            # Issue #491: Track tool lifecycle state for generating tool_call messages
-            # Maps tool_use_id -> ToolCall being reconstructed from history
-            active_history_tools: dict[str, ToolCall] = {}
-
-            # Issue #494: Track tool_use_ids that have stored ToolCallUpdate entries.
-            # Synthetic reconstruction is skipped for these IDs.
-            stored_tool_update_ids: set[str] = set()
-
-            for raw_message in raw_messages:
-                try:
-                    websocket_data = None
-
-                    # Issue #310: Handle new StoredMessage format with _type discriminator
-                    if raw_message.get("_type"):
-                        # Issue #494: ToolCallUpdate entries are converted to tool_call messages
-                        # directly and should NOT go through synthetic reconstruction
-                        if raw_message["_type"] == "ToolCallUpdate":
-                            tool_call_msg = self._convert_stored_message_to_websocket(raw_message)
-                            if tool_call_msg:
-                                parsed_messages.append(tool_call_msg)
-                                tc_id = tool_call_msg.get("tool_use_id")
-                                if tc_id:
-                                    stored_tool_update_ids.add(tc_id)
-                            continue
-
-                        websocket_data = self._convert_stored_message_to_websocket(raw_message)
-                    # Check if message is already fully processed (has metadata)
-                    elif isinstance(raw_message.get("metadata"), dict) and raw_message.get("type") and raw_message.get("content") is not None:
-                        # Message is already processed, prepare for WebSocket
-                        metadata = raw_message["metadata"].copy()
-
-                        websocket_data = {
-                            "type": raw_message["type"],
-                            "content": raw_message["content"],
-                            "timestamp": raw_message.get("timestamp"),
-                            "metadata": metadata,
-                            "session_id": raw_message.get("session_id"),
-                            "message_id": raw_message.get("message_id"),  # Issue #1000
-                        }
-                        # Maintain backward compatibility with subtype at root level
-                        if metadata.get('subtype'):
-                            websocket_data["subtype"] = metadata['subtype']
-                    else:
-                        # Message needs processing - run through MessageProcessor
-                        processed_message = self.message_processor.process_message(raw_message, source="storage")
-                        websocket_data = self.message_processor.prepare_for_websocket(processed_message)
-                        # Issue #1000: Propagate message_id from storage for frontend dedup
-                        if raw_message.get("message_id"):
-                            websocket_data["message_id"] = raw_message["message_id"]
-
-                    if not websocket_data:
-                        continue
-
-                    # Add the regular message to the response
-                    parsed_messages.append(websocket_data)
-
-                    # Issue #491: Generate interleaved tool_call messages from message metadata
-                    # Issue #494: Skip synthetic reconstruction for tool_use_ids with stored updates
-                    msg_type = websocket_data.get("type", "")
-                    metadata = websocket_data.get("metadata", {})
-                    msg_timestamp = websocket_data.get("timestamp")
-
-                    # AssistantMessage with tool_uses → create pending ToolCall messages
-                    if metadata.get("has_tool_uses") and metadata.get("tool_uses"):
-                        # Issue #195: Propagate parent_tool_use_id to child tool_calls
-                        parent_tool_use_id = metadata.get("parent_tool_use_id")
-                        for tool_use in metadata["tool_uses"]:
-                            tool_use_id = tool_use.get("id")
-                            if not tool_use_id:
-                                continue
-                            # Issue #494: Skip if this tool has stored ToolCallUpdate entries
-                            if tool_use_id in stored_tool_update_ids:
-                                continue
-                            tool_call = ToolCall(
-                                tool_use_id=tool_use_id,
-                                session_id=session_id,
-                                name=tool_use.get("name", ""),
-                                input=tool_use.get("input", {}),
-                                status=ToolState.PENDING,
-                                created_at=msg_timestamp if isinstance(msg_timestamp, (int, float)) else 0.0,
-                                parent_tool_use_id=parent_tool_use_id,
-                                display=ToolDisplayInfo(
-                                    state=ToolState.PENDING,
-                                    visible=True,
-                                    collapsed=False,
-                                    style="default",
-                                ),
-                            )
-                            active_history_tools[tool_use_id] = tool_call
-                            tc_data = tool_call.to_dict()
-                            tc_data["type"] = "tool_call"
-                            parsed_messages.append(tc_data)
-
-                    # PermissionRequestMessage → update matching ToolCall to awaiting_permission
-                    if msg_type == "permission_request" or metadata.get("has_permission_requests"):
-                        perm_tool_name = metadata.get("tool_name", "")
-                        perm_request_id = metadata.get("request_id", "")
-                        perm_suggestions = metadata.get("suggestions", [])
-
-                        # Find matching tool by name+input signature
-                        matched_tool = None
-                        for tc in active_history_tools.values():
-                            if tc.name == perm_tool_name and tc.status == ToolState.PENDING:
-                                matched_tool = tc
-                                break
-                        # Fallback: match by tool name alone if unique pending
-                        if not matched_tool:
-                            candidates = [
-                                tc for tc in active_history_tools.values()
-                                if tc.name == perm_tool_name and tc.status in (
-                                    ToolState.PENDING, ToolState.AWAITING_PERMISSION
-                                )
-                            ]
-                            if len(candidates) == 1:
-                                matched_tool = candidates[0]
-
-                        if matched_tool:
-                            matched_tool.status = ToolState.AWAITING_PERMISSION
-                            matched_tool.requires_permission = True
-                            matched_tool.permission = PermissionInfo(
-                                message=websocket_data.get("content", ""),
-                                suggestions=perm_suggestions,
-                            )
-                            if matched_tool.display:
-                                matched_tool.display.state = ToolState.AWAITING_PERMISSION
-                                matched_tool.display.style = "warning"
-                            tc_data = matched_tool.to_dict()
-                            tc_data["type"] = "tool_call"
-                            tc_data["request_id"] = perm_request_id
-                            parsed_messages.append(tc_data)
-
-                    # PermissionResponseMessage → update matching ToolCall with decision
-                    if msg_type == "permission_response":
-                        perm_decision = metadata.get("decision", "")
-                        perm_request_id = metadata.get("request_id", "")
-                        perm_tool_name = metadata.get("tool_name", "")
-                        updated_input = metadata.get("updated_input")
-                        applied_updates = metadata.get("applied_updates", [])
-
-                        # Find matching tool awaiting permission
-                        matched_tool = None
-                        for tc in active_history_tools.values():
-                            if tc.name == perm_tool_name and tc.status == ToolState.AWAITING_PERMISSION:
-                                matched_tool = tc
-                                break
-
-                        if matched_tool:
-                            granted = perm_decision == "allow"
-                            matched_tool.permission_granted = granted
-                            if granted:
-                                matched_tool.status = ToolState.RUNNING
-                                if matched_tool.display:
-                                    matched_tool.display.state = ToolState.RUNNING
-                                    matched_tool.display.style = "default"
-                            else:
-                                matched_tool.status = ToolState.DENIED
-                                if matched_tool.display:
-                                    matched_tool.display.state = ToolState.DENIED
-                                    matched_tool.display.style = "error"
-
-                            tc_data = matched_tool.to_dict()
-                            tc_data["type"] = "tool_call"
-                            tc_data["request_id"] = perm_request_id
-                            if updated_input:
-                                tc_data["updated_input"] = updated_input
-                            if applied_updates:
-                                tc_data["applied_updates"] = applied_updates
-                            parsed_messages.append(tc_data)
-
-                            # Remove denied tools from tracking
-                            if not granted:
-                                active_history_tools.pop(matched_tool.tool_use_id, None)
-
-                    # UserMessage with tool_results → update matching ToolCall to completed/failed
-                    if metadata.get("has_tool_results") and metadata.get("tool_results"):
-                        for tool_result in metadata["tool_results"]:
-                            tool_use_id = tool_result.get("tool_use_id")
-                            if not tool_use_id:
-                                continue
-                            matched_tool = active_history_tools.pop(tool_use_id, None)
-                            if matched_tool:
-                                is_error = tool_result.get("is_error", False)
-                                result_content = tool_result.get("content", "")
-                                if is_error:
-                                    matched_tool.status = ToolState.FAILED
-                                    matched_tool.error = str(result_content) if result_content else "Tool execution failed"
-                                    if matched_tool.display:
-                                        matched_tool.display.state = ToolState.FAILED
-                                        matched_tool.display.style = "error"
-                                else:
-                                    matched_tool.status = ToolState.COMPLETED
-                                    matched_tool.result = result_content
-                                    if matched_tool.display:
-                                        matched_tool.display.state = ToolState.COMPLETED
-                                        matched_tool.display.style = "success"
-                                    # Issue #1593/#1730: resolve sender attachment resource IDs
-                                    if matched_tool.name == "mcp__legion__send_comm":
-                                        matched_tool.sender_attachments = (
-                                            self._parse_send_comm_sender_attachments(result_content)
-                                        )
-                                tc_data = matched_tool.to_dict()
-                                tc_data["type"] = "tool_call"
-                                parsed_messages.append(tc_data)
-
-                    # SystemMessage client_launched or interrupt → mark unresolved tools as interrupted
-                    if msg_type == "system":
-                        subtype = metadata.get("subtype", "")
-                        if subtype in ("client_launched", "interrupt"):
-                            for tool_use_id in list(active_history_tools.keys()):
-                                tc = active_history_tools.pop(tool_use_id)
-                                tc.status = ToolState.INTERRUPTED
-                                if tc.display:
-                                    tc.display.state = ToolState.INTERRUPTED
-                                    tc.display.style = "orphaned"
-                                tc_data = tc.to_dict()
-                                tc_data["type"] = "tool_call"
-                                parsed_messages.append(tc_data)
+            parsed_messages = list(fold.messages)
 
-                except Exception as e:
-                    logger.warning(f"Failed to prepare historical message for WebSocket: {e}")
-                    # Fallback to basic format if we have enough info
-                    try:
-                        msg_type = raw_message.get("type", raw_message.get("_type", "system"))
-                        fallback_data = {
-                            "type": msg_type,
-                            "content": raw_message.get("content", ""),
-                            "timestamp": raw_message.get("timestamp")
-                        }
-                        if raw_message.get("session_id"):
-                            fallback_data["session_id"] = raw_message["session_id"]
-                        parsed_messages.append(fallback_data)
-                    except Exception:
-                        pass
-
-            # Issue #491: Mark any remaining unresolved tools as interrupted
-            # (session may have been terminated without explicit interrupt/restart message)
-            session_info = await self.session_manager.get_session_info(session_id)
-            if session_info and session_info.state not in (
-                SessionState.ACTIVE, SessionState.PAUSED, SessionState.STARTING
-            ):
-                for tool_use_id in list(active_history_tools.keys()):
-                    tc = active_history_tools.pop(tool_use_id)
-                    tc.status = ToolState.INTERRUPTED
-                    if tc.display:
-                        tc.display.state = ToolState.INTERRUPTED
-                        tc.display.style = "orphaned"
-                    tc_data = tc.to_dict()
-                    tc_data["type"] = "tool_call"
-                    parsed_messages.append(tc_data)
+            parsed_messages.extend(await self._interrupted_history_tools(session_id, fold))
 
             # Calculate pagination metadata
             actual_limit = limit or 50
-            has_more = (offset + len(raw_messages)) < total_count
+            has_more = (offset + fold.consumed) < total_count
 
             return {
                 "messages": parsed_messages,
@@ -4045,6 +3768,394 @@ class SessionCoordinator:
                 "has_more": False
             }
 
+    async def _get_history_fold(
+        self, session_id: str, storage: DataStorageManager, offset: int, limit: int | None, total_count: int
+    ) -> HistoryFold:
+        """Return the history fold for a page, extending the cached one with new lines."""
+        cache = self._history_projection
+        page_end = total_count if limit is None else min(offset + limit, total_count)
+        async with cache.lock(session_id, storage):
+            fold = cache.get(session_id, storage, offset, limit)
+            if fold is not None and offset + fold.consumed > page_end:
+                # Log shrank underneath the fold without a generation bump
+                cache.discard(session_id, offset, limit)
+                fold = None
+
+            if fold is None:
+                fold = HistoryFold(start=offset)
+                cache.stats.misses += 1
+            elif offset + fold.consumed < page_end:
+                cache.stats.extends += 1
+            else:
+                cache.stats.hits += 1
+
+            pending = page_end - (offset + fold.consumed)
+            if fold.consumed == 0:
+                raw_messages, lines = await self._read_history_lines(storage, offset, limit)
+            elif pending > 0:
+                raw_messages, lines = await self._read_history_lines(storage, offset + fold.consumed, pending)
+            else:
+                raw_messages, lines = [], 0
+            self._fold_history_messages(session_id, fold, raw_messages, lines)
+            cache.stats.lines_folded += len(raw_messages)
+            cache.put(session_id, storage, offset, limit, fold)
+            return fold
+
+    @staticmethod
+    async def _read_history_lines(
+        storage: DataStorageManager, offset: int, limit: int | None
+    ) -> tuple[list[dict[str, Any]], int]:
+        """read_messages plus the number of stored lines the read covered.
+
+        read_messages drops lines it cannot parse (e.g. a torn write), so the line
+        count is derived from the range rather than the result. The count is taken
+        right after the read, with no await in between that could yield to an append.
+        """
+        raw_messages = await storage.read_messages(limit=limit, offset=offset)
+        count = await storage.get_message_count()
+        start = max(count + offset, 0) if offset < 0 else offset
+        stop = count if not limit else min(start + limit, count)
+        return raw_messages, max(stop - start, 0)
+
+    async def _interrupted_history_tools(self, session_id: str, fold: HistoryFold) -> list[dict[str, Any]]:
+        """Issue #491: tool_call messages marking a fold's unresolved tools as interrupted.
+
+        Only emitted when the session is no longer running (it may have been terminated
+        without an explicit interrupt/restart message). Built from copies so a cached
+        fold keeps the tools open in case the session resumes.
+        """
+        session_info = await self.session_manager.get_session_info(session_id)
+        if not session_info or session_info.state in (
+            SessionState.ACTIVE, SessionState.PAUSED, SessionState.STARTING
+        ):
+            return []
+        interrupted = []
+        for tc in fold.active_tools.values():
+            display = None
+            if tc.display:
+                display = replace(tc.display, state=ToolState.INTERRUPTED, style="orphaned")
+            tc_data = replace(tc, status=ToolState.INTERRUPTED, display=display).to_dict()
+            tc_data["type"] = "tool_call"
+            interrupted.append(tc_data)
+        return interrupted
+
+    async def get_session_messages_page(
+        self,
+        session_id: str,
+        before: str | None = None,
+        after: str | None = None,
+        limit: int = 50,
+    ) -> tuple[dict[str, Any], list[dict[str, Any]]]:
+        """Cursor-paginated history page, anchored at the tail by default.
+
+        ``before``/``after`` are cursors returned by a previous page: a stored
+        ``message_id``, or ``@<line>`` for lines without one. With neither, the
+        newest ``limit`` lines are returned. Returns ``(page_meta, messages)``
+        with messages in chronological order. Raises ValueError for an unknown
+        cursor or when both cursors are given.
+        """
+        if before is not None and after is not None:
+            raise ValueError("Pass at most one of before/after")
+        storage = self._storage_managers.get(session_id)
+        if not storage:
+            # Same as get_session_messages: no loaded storage (e.g. after terminate) is an empty page
+            logger.error(f"No storage manager found for session {session_id}")
+            return {
+                "type": "page",
+                "start": 0,
+                "end": 0,
+                "total_count": 0,
+                "has_more_before": False,
+                "has_more_after": False,
+                "before": None,
+                "after": None,
+            }, []
+
+        total_count = await storage.get_message_count()
+        if after is not None:
+            start = min(await self._resolve_history_cursor(storage, after) + 1, total_count)
+            stop = min(start + limit, total_count)
+        else:
+            stop = total_count if before is None else await self._resolve_history_cursor(storage, before)
+            stop = min(stop, total_count)
+            start = max(stop - limit, 0)
+
+        fold = HistoryFold(start=start)
+        raw_messages = []
+        if stop > start:
+            raw_messages, lines = await self._read_history_lines(storage, start, stop - start)
+            self._fold_history_messages(session_id, fold, raw_messages, lines)
+        messages = fold.messages + await self._interrupted_history_tools(session_id, fold)
+
+        # The page covers stored lines [start, stop) even if read_messages skipped an
+        # unparseable one, so the edge messages may not sit on the edge lines. Only
+        # use their message_id as a cursor when nothing was skipped.
+        end = stop
+        complete = len(raw_messages) == stop - start
+
+        def _cursor(raw: dict[str, Any], line: int) -> str:
+            return (complete and raw.get("message_id")) or f"@{line}"
+
+        meta = {
+            "type": "page",
+            "start": start,
+            "end": end,
+            "total_count": total_count,
+            "has_more_before": start > 0,
+            "has_more_after": end < total_count,
+            "before": _cursor(raw_messages[0], start) if raw_messages else None,
+            "after": _cursor(raw_messages[-1], end - 1) if raw_messages else None,
+        }
+        return meta, messages
+
+    async def _resolve_history_cursor(self, storage: DataStorageManager, cursor: str) -> int:
+        if cursor.startswith("@") and cursor[1:].isdigit():
+            return int(cursor[1:])
+        line = await storage.find_message_line(cursor)
+        if line is None:
+            raise ValueError(f"Unknown history cursor: {cursor}")
+        return line
+
+    def get_history_projection_stats(self) -> dict[str, int]:
+        """Hit/miss counters for the history projection cache."""
+        return self._history_projection.stats.to_dict()
+
+    def _fold_history_messages(
+        self, session_id: str, fold: HistoryFold, raw_messages: list[dict[str, Any]], lines: int
+    ) -> None:
+        """Convert stored lines to websocket form and replay tool lifecycle state into ``fold``.
+
+        ``lines`` is the number of stored lines ``raw_messages`` was read from; it can
+        exceed ``len(raw_messages)`` when read_messages skipped unparseable lines, and
+        is what ``fold.consumed`` advances by so later reads resume at the right line.
+        """
+        fold.consumed += lines
+        for raw_message in raw_messages:
+            try:
+                websocket_data = None
+
+                # Issue #310: Handle new StoredMessage format with _type discriminator
+                if raw_message.get("_type"):
+                    # Issue #494: ToolCallUpdate entries are converted to tool_call messages
+                    # directly and should NOT go through synthetic reconstruction
+                    if raw_message["_type"] == "ToolCallUpdate":
+                        tool_call_msg = self._convert_stored_message_to_websocket(raw_message)
+                        if tool_call_msg:
+                            fold.messages.append(tool_call_msg)
+                            tc_id = tool_call_msg.get("tool_use_id")
+                            if tc_id:
+                                fold.stored_update_ids.add(tc_id)
+                        continue
+
+                    websocket_data = self._convert_stored_message_to_websocket(raw_message)
+                # Check if message is already fully processed (has metadata)
+                elif isinstance(raw_message.get("metadata"), dict) and raw_message.get("type") and raw_message.get("content") is not None:
+                    # Message is already processed, prepare for WebSocket
+                    metadata = raw_message["metadata"].copy()
+
+                    websocket_data = {
+                        "type": raw_message["type"],
+                        "content": raw_message["content"],
+                        "timestamp": raw_message.get("timestamp"),
+                        "metadata": metadata,
+                        "session_id": raw_message.get("session_id"),
+                        "message_id": raw_message.get("message_id"),  # Issue #1000
+                    }
+                    # Maintain backward compatibility with subtype at root level
+                    if metadata.get('subtype'):
+                        websocket_data["subtype"] = metadata['subtype']
+                else:
+                    # Message needs processing - run through MessageProcessor
+                    processed_message = self.message_processor.process_message(raw_message, source="storage")
+                    websocket_data = self.message_processor.prepare_for_websocket(processed_message)
+                    # Issue #1000: Propagate message_id from storage for frontend dedup
+                    if raw_message.get("message_id"):
+                        websocket_data["message_id"] = raw_message["message_id"]
+
+                if not websocket_data:
+                    continue
+
+                # Add the regular message to the response
+                fold.messages.append(websocket_data)
+
+                # Issue #491: Generate interleaved tool_call messages from message metadata
+                # Issue #494: Skip synthetic reconstruction for tool_use_ids with stored updates
+                msg_type = websocket_data.get("type", "")
+                metadata = websocket_data.get("metadata", {})
+                msg_timestamp = websocket_data.get("timestamp")
+
+                # AssistantMessage with tool_uses → create pending ToolCall messages
+                if metadata.get("has_tool_uses") and metadata.get("tool_uses"):
+                    # Issue #195: Propagate parent_tool_use_id to child tool_calls
+                    parent_tool_use_id = metadata.get("parent_tool_use_id")
+                    for tool_use in metadata["tool_uses"]:
+                        tool_use_id = tool_use.get("id")
+                        if not tool_use_id:
+                            continue
+                        # Issue #494: Skip if this tool has stored ToolCallUpdate entries
+                        if tool_use_id in fold.stored_update_ids:
+                            continue
+                        tool_call = ToolCall(
+                            tool_use_id=tool_use_id,
+                            session_id=session_id,
+                            name=tool_use.get("name", ""),
+                            input=tool_use.get("input", {}),
+                            status=ToolState.PENDING,
+                            created_at=msg_timestamp if isinstance(msg_timestamp, (int, float)) else 0.0,
+                            parent_tool_use_id=parent_tool_use_id,
+                            display=ToolDisplayInfo(
+                                state=ToolState.PENDING,
+                                visible=True,
+                                collapsed=False,
+                                style="default",
+                            ),
+                        )
+                        fold.active_tools[tool_use_id] = tool_call
+                        tc_data = tool_call.to_dict()
+                        tc_data["type"] = "tool_call"
+                        fold.messages.append(tc_data)
+
+                # PermissionRequestMessage → update matching ToolCall to awaiting_permission
+                if msg_type == "permission_request" or metadata.get("has_permission_requests"):
+                    perm_tool_name = metadata.get("tool_name", "")
+                    perm_request_id = metadata.get("request_id", "")
+                    perm_suggestions = metadata.get("suggestions", [])
+
+                    # Find matching tool by name+input signature
+                    matched_tool = None
+                    for tc in fold.active_tools.values():
+                        if tc.name == perm_tool_name and tc.status == ToolState.PENDING:
+                            matched_tool = tc
+                            break
+                    # Fallback: match by tool name alone if unique pending
+                    if not matched_tool:
+                        candidates = [
+                            tc for tc in fold.active_tools.values()
+                            if tc.name == perm_tool_name and tc.status in (
+                                ToolState.PENDING, ToolState.AWAITING_PERMISSION
+                            )
+                        ]
+                        if len(candidates) == 1:
+                            matched_tool = candidates[0]
+
+                    if matched_tool:
+                        matched_tool.status = ToolState.AWAITING_PERMISSION
+                        matched_tool.requires_permission = True
+                        matched_tool.permission = PermissionInfo(
+                            message=websocket_data.get("content", ""),
+                            suggestions=perm_suggestions,
+                        )
+                        if matched_tool.display:
+                            matched_tool.display.state = ToolState.AWAITING_PERMISSION
+                            matched_tool.display.style = "warning"
+                        tc_data = matched_tool.to_dict()
+                        tc_data["type"] = "tool_call"
+                        tc_data["request_id"] = perm_request_id
+                        fold.messages.append(tc_data)
+
+                # PermissionResponseMessage → update matching ToolCall with decision
+                if msg_type == "permission_response":
+                    perm_decision = metadata.get("decision", "")
+                    perm_request_id = metadata.get("request_id", "")
+                    perm_tool_name = metadata.get("tool_name", "")
+                    updated_input = metadata.get("updated_input")
+                    applied_updates = metadata.get("applied_updates", [])
+
+                    # Find matching tool awaiting permission
+                    matched_tool = None
+                    for tc in fold.active_tools.values():
+                        if tc.name == perm_tool_name and tc.status == ToolState.AWAITING_PERMISSION:
+                            matched_tool = tc
+                            break
+
+                    if matched_tool:
+                        granted = perm_decision == "allow"
+                        matched_tool.permission_granted = granted
+                        if granted:
+                            matched_tool.status = ToolState.RUNNING
+                            if matched_tool.display:
+                                matched_tool.display.state = ToolState.RUNNING
+                                matched_tool.display.style = "default"
+                        else:
+                            matched_tool.status = ToolState.DENIED
+                            if matched_tool.display:
+                                matched_tool.display.state = ToolState.DENIED
+                                matched_tool.display.style = "error"
+
+                        tc_data = matched_tool.to_dict()
+                        tc_data["type"] = "tool_call"
+                        tc_data["request_id"] = perm_request_id
+                        if updated_input:
+                            tc_data["updated_input"] = updated_input
+                        if applied_updates:
+                            tc_data["applied_updates"] = applied_updates
+                        fold.messages.append(tc_data)
+
+                        # Remove denied tools from tracking
+                        if not granted:
+                            fold.active_tools.pop(matched_tool.tool_use_id, None)
+
+                # UserMessage with tool_results → update matching ToolCall to completed/failed
+                if metadata.get("has_tool_results") and metadata.get("tool_results"):
+                    for tool_result in metadata["tool_results"]:
+                        tool_use_id = tool_result.get("tool_use_id")
+                        if not tool_use_id:
+                            continue
+                        matched_tool = fold.active_tools.pop(tool_use_id, None)
+                        if matched_tool:
+                            is_error = tool_result.get("is_error", False)
+                            result_content = tool_result.get("content", "")
+                            if is_error:
+                                matched_tool.status = ToolState.FAILED
+                                matched_tool.error = str(result_content) if result_content else "Tool execution failed"
+                                if matched_tool.display:
+                                    matched_tool.display.state = ToolState.FAILED
+                                    matched_tool.display.style = "error"
+                            else:
+                                matched_tool.status = ToolState.COMPLETED
+                                matched_tool.result = result_content
+                                if matched_tool.display:
+                                    matched_tool.display.state = ToolState.COMPLETED
+                                    matched_tool.display.style = "success"
+                                # Issue #1593/#1730: resolve sender attachment resource IDs
+                                if matched_tool.name == "mcp__legion__send_comm":
+                                    matched_tool.sender_attachments = (
+                                        self._parse_send_comm_sender_attachments(result_content)
+                                    )
+                            tc_data = matched_tool.to_dict()
+                            tc_data["type"] = "tool_call"
+                            fold.messages.append(tc_data)
+
+                # SystemMessage client_launched or interrupt → mark unresolved tools as interrupted
+                if msg_type == "system":
+                    subtype = metadata.get("subtype", "")
+                    if subtype in ("client_launched", "interrupt"):
+                        for tool_use_id in list(fold.active_tools.keys()):
+                            tc = fold.active_tools.pop(tool_use_id)
+                            tc.status = ToolState.INTERRUPTED
+                            if tc.display:
+                                tc.display.state = ToolState.INTERRUPTED
+                                tc.display.style = "orphaned"
+                            tc_data = tc.to_dict()
+                            tc_data["type"] = "tool_call"
+                            fold.messages.append(tc_data)
+
+            except Exception as e:
+                logger.warning(f"Failed to prepare historical message for WebSocket: {e}")
+                # Fallback to basic format if we have enough info
+                try:
+                    msg_type = raw_message.get("type", raw_message.get("_type", "system"))
+                    fallback_data = {
+                        "type": msg_type,
+                        "content": raw_message.get("content", ""),
+                        "timestamp": raw_message.get("timestamp")
+                    }
+                    if raw_message.get("session_id"):
+                        fallback_data["session_id"] = raw_message["session_id"]
+                    fold.messages.append(fallback_data)
+                except Exception:
+                    pass
+
     def add_message_callback(self, session_id: str, callback: Callable):
         """Add callback for session messages"""
         if session_id not in self._message_callbacks:
@@ -5502,6 +5613,10 @@ class SessionCoordinator:
         session_dir = self.session_manager.sessions_dir / session_id
         messages_file = session_dir / "messages.jsonl"
 
+        storage = self._storage_managers.get(session_id)
+        if storage:
+            await storage.flush()
+
         if not messages_file.exists():
             return
 
@@ -5699,6 +5814,9 @@ class SessionCoordinator:
             if hasattr(self, 'legion_system') and self.legion_system is not None:
                 await self.legion_system.history_rotator.stop()
                 await self.legion_system.scheduler_service.stop()
+                self.legion_system.comm_summaries.save_all()
+
+            await self.session_manager.cancel_background_tasks()
 
             # Terminate all active sessions
             session_ids = list(self._active_sdks.keys())
@@ -5711,6 +5829,10 @@ class SessionCoordinator:
             except Exception:
                 logger.exception("Error shutting down shared MCP manager")
 
+            # Flush buffered message logs for sessions that were not active
+            for storage in list(self._storage_managers.values()):
+                await storage.close()
+
             coord_logger.info("Session coordinator cleanup completed")
 
         except Exception:
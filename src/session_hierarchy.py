@@ -0,0 +1,185 @@
+"""
+In-memory minion hierarchy graph.
+
+The parent/child structure of sessions lives in two SessionInfo fields,
+``parent_overseer_id`` and ``child_minion_ids``. Comm visibility checks and
+descendant queries used to walk those fields recursively with an awaited
+``get_session_info`` per node. SessionManager keeps this graph in step with
+them instead: every session is synced on load and whenever its state is
+persisted (spawn, dispose, reparent and orphan cleanup all persist), and
+removed on delete.
+
+Derived data (ancestor chains, descendant lists, subtree sizes) is computed on
+first use and cached. A structural change updates the edge maps in place and
+drops only the cached entries it affects: a new parent invalidates the
+ancestor chains through that session, a changed child list invalidates the
+descendant lists that reach it.
+"""
+
+from collections.abc import Iterable
+from typing import Any
+
+
+class HierarchyGraph:
+    """Parent pointers and ordered child lists for all known sessions."""
+
+    def __init__(self):
+        self._parent: dict[str, str | None] = {}
+        self._children: dict[str, list[str]] = {}
+        self._ancestors: dict[str, tuple[str, ...]] = {}
+        self._descendants: dict[str, tuple[str, ...]] = {}
+
+    def __contains__(self, session_id: str) -> bool:
+        return session_id in self._parent
+
+    def __len__(self) -> int:
+        return len(self._parent)
+
+    def _listers(self, session_id: str) -> set[str]:
+        """Sessions whose child list names ``session_id`` (other than itself)."""
+        return {
+            node for node, children in self._children.items()
+            if node != session_id and session_id in children
+        }
+
+    def _drop_ancestors_through(self, session_id: str) -> None:
+        """Forget cached ancestor chains that start at or pass through ``session_id``."""
+        stale = [
+            node for node, chain in self._ancestors.items()
+            if node == session_id or session_id in chain
+        ]
+        for node in stale:
+            del self._ancestors[node]
+
+    def _drop_descendants_reaching(self, session_ids: set[str]) -> None:
+        """Forget cached descendant lists rooted at or containing any of ``session_ids``."""
+        stale = [
+            node for node, found in self._descendants.items()
+            if node in session_ids or not session_ids.isdisjoint(found)
+        ]
+        for node in stale:
+            del self._descendants[node]
+
+    def sync(self, session: Any) -> None:
+        """Record ``session``'s current parent and children (no-op when unchanged)."""
+        session_id = session.session_id
+        parent = session.parent_overseer_id
+        children = list(session.child_minion_ids or [])
+        is_new = session_id not in self._parent
+        parent_changed = is_new or self._parent[session_id] != parent
+        children_changed = is_new or self._children[session_id] != children
+        if not (parent_changed or children_changed):
+            return
+        # A newly known session now counts in the descendants of whoever lists it
+        reaching = {session_id, *self._listers(session_id)} if is_new else {session_id}
+        self._parent[session_id] = parent
+        self._children[session_id] = children
+        if parent_changed:
+            self._drop_ancestors_through(session_id)
+        if children_changed:
+            self._drop_descendants_reaching(reaching)
+
+    def remove(self, session_id: str) -> None:
+        if session_id in self._parent:
+            del self._parent[session_id]
+            del self._children[session_id]
+            self._drop_ancestors_through(session_id)
+            self._drop_descendants_reaching({session_id, *self._listers(session_id)})
+
+    def parent(self, session_id: str) -> str | None:
+        return self._parent.get(session_id)
+
+    def children(self, session_id: str) -> list[str]:
+        return list(self._children.get(session_id, ()))
+
+    def ancestors(self, session_id: str) -> tuple[str, ...]:
+        """Parent, grandparent, ... up to the root (cycle-safe)."""
+        chain = self._ancestors.get(session_id)
+        if chain is None:
+            walk: list[str] = []
+            seen = {session_id}
+            parent = self._parent.get(session_id)
+            while parent and parent not in seen:
+                walk.append(parent)
+                seen.add(parent)
+                parent = self._parent.get(parent)
+            chain = self._ancestors[session_id] = tuple(walk)
+        return chain
+
+    def descendants(self, session_id: str) -> tuple[str, ...]:
+        """Existing descendants in depth-first pre-order of child_minion_ids."""
+        result = self._descendants.get(session_id)
+        if result is None:
+            ordered: list[str] = []
+            seen = {session_id}
+            stack = list(reversed(self._children.get(session_id, ())))
+            while stack:
+                child = stack.pop()
+                if child in seen or child not in self._parent:
+                    continue
+                seen.add(child)
+                ordered.append(child)
+                stack.extend(reversed(self._children.get(child, ())))
+            result = self._descendants[session_id] = tuple(ordered)
+        return result
+
+    def subtree_size(self, session_id: str) -> int:
+        """Number of existing descendants of ``session_id``."""
+        return len(self.descendants(session_id))
+
+    def visible_from(self, session_id: str) -> set[str]:
+        """Ids a minion may comm: itself, ancestors, descendants and siblings.
+
+        Child ids are included as listed even when that session no longer
+        exists, matching the previous recursive walk.
+        """
+        if session_id not in self._parent:
+            return set()
+        visible = {session_id, *self.ancestors(session_id)}
+        seen = {session_id}
+        stack = [session_id]
+        while stack:
+            node = stack.pop()
+            for child in self._children.get(node, ()):
+                visible.add(child)
+                if child not in seen and child in self._parent:
+                    seen.add(child)
+                    stack.append(child)
+        parent = self._parent.get(session_id)
+        if parent in self._parent:
+            visible.update(self._children[parent])
+        return visible
+
+    def diff(self, sessions: Iterable[Any]) -> list[str]:
+        """Differences between this graph and the given sessions' hierarchy fields."""
+        expected = HierarchyGraph()
+        for session in sessions:
+            expected.sync(session)
+        problems = []
+        for session_id in sorted(set(self._parent) | set(expected._parent)):
+            if session_id not in expected._parent:
+                problems.append(f"{session_id}: in graph but not in session state")
+            elif session_id not in self._parent:
+                problems.append(f"{session_id}: missing from graph")
+            else:
+                if self._parent[session_id] != expected._parent[session_id]:
+                    problems.append(
+                        f"{session_id}: parent {self._parent[session_id]!r} in graph, "
+                        f"{expected._parent[session_id]!r} in session state"
+                    )
+                if self._children[session_id] != expected._children[session_id]:
+                    problems.append(f"{session_id}: child list differs from session state")
+        return problems
+
+    def structural_problems(self) -> list[str]:
+        """Parent/child links that do not point back at each other."""
+        problems = []
+        for session_id, parent in sorted(self._parent.items(), key=lambda item: item[0]):
+            if parent and parent in self._parent and session_id not in self._children[parent]:
+                problems.append(f"{session_id}: parent {parent} does not list it as a child")
+            for child in self._children[session_id]:
+                if child in self._parent and self._parent[child] != session_id:
+                    problems.append(
+                        f"{session_id}: lists child {child} whose parent is {self._parent[child]!r}"
+                    )
+        return problems
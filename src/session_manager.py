@@ -22,8 +22,11 @@ from typing import Any
 
 from .logging_config import get_logger
 from .models.permission_mode import PermissionMode
+from .session_catalog import SessionCatalog
 from .session_config import CONFIG_FIELDS, DEFAULTS, SessionConfig
+from .session_hierarchy import HierarchyGraph
 from .slug_utils import slugify_name
+from .storage_utils import iter_lines_reversed
 from .template_manager import TemplateManager
 
 # Get specialized logger for session manager actions
@@ -352,98 +355,313 @@ def _migrate_session_to_config_dict(raw: dict) -> tuple[dict, bool]:
 class SessionManager:
     """Manages Claude Code session lifecycle and persistence"""
 
-    def __init__(self, data_dir: Path = None):
+    def __init__(
+        self,
+        data_dir: Path = None,
+        catalog_enabled: bool = False,
+        export_interval_seconds: float = 5.0,
+    ):
         self.data_dir = data_dir or Path("data")
         self.sessions_dir = self.data_dir / "sessions"
         self._active_sessions: dict[str, SessionInfo] = {}
         self._session_locks: dict[str, asyncio.Lock] = {}
         self._state_change_callbacks: list[Callable] = []
+        self._completion_heal_task: asyncio.Task | None = None
+        # SQLite session catalog (session_catalog.enabled): state changes become
+        # single-row upserts; state.json is exported on an interval for compatibility.
+        self._catalog: SessionCatalog | None = (
+            SessionCatalog(self.data_dir / SessionCatalog.FILENAME) if catalog_enabled else None
+        )
+        self._export_interval_seconds = export_interval_seconds
+        self._export_dirty: set[str] = set()
+        self._export_task: asyncio.Task | None = None
+        # Parent/child graph mirrored from parent_overseer_id / child_minion_ids
+        self.hierarchy = HierarchyGraph()
 
     async def initialize(self):
         """Initialize session manager and load existing sessions"""
         try:
             self.data_dir.mkdir(exist_ok=True)
             self.sessions_dir.mkdir(exist_ok=True)
+            if self._catalog is not None:
+                self._catalog.open()
+            else:
+                # A catalog left behind by an earlier run with the catalog enabled
+                # would be stale once state.json is written directly again.
+                await self._retire_catalog()
             await self._load_existing_sessions()
+            if self._catalog is not None:
+                self._export_task = asyncio.create_task(self._export_loop())
             session_logger.info(f"SessionManager initialized with {len(self._active_sessions)} existing sessions")
         except Exception as e:
             logger.error(f"Failed to initialize SessionManager: {e}")
             raise
 
     async def _load_existing_sessions(self):
-        """Load existing session state from filesystem"""
+        """Load existing session state from filesystem.
+
+        state.json files are read, migrated and parsed in worker threads. The
+        legacy last_completion_at self-heal (issue #1513), which has to scan
+        messages.jsonl, runs afterwards as a background task so it never
+        delays startup.
+        """
         try:
-            from .storage_utils import backup_legacy_sessions_once, write_alphabetized_json
+            from .storage_utils import backup_legacy_sessions_once
             backup_legacy_sessions_once(self.sessions_dir)
 
-            for session_dir in self.sessions_dir.iterdir():
-                if session_dir.is_dir():
-                    state_file = session_dir / "state.json"
-                    if state_file.exists():
-                        try:
-                            with open(state_file) as f:
-                                data = json.load(f)
-
-                            # Issue #1230: promote flat CONFIG_FIELDS → config dict
-                            data, _changed = _migrate_session_to_config_dict(data)
-                            if _changed:
-                                write_alphabetized_json(state_file, data)
-
-                            session_info = SessionInfo.from_dict(data)
-
-                            # Reset active/starting sessions to created state on startup
-                            # since there are no SDK instances running for them
-                            original_state = session_info.state
-                            original_processing = session_info.is_processing
-                            state_changed = False
-
-                            # Issue #1513: Self-heal last_completion_at from messages.jsonl
-                            # for legacy sessions that lack the field.
-                            if session_info.last_completion_at is None:
-                                messages_file = session_dir / "messages.jsonl"
-                                if messages_file.exists():
-                                    derived = _derive_last_completion_from_jsonl(messages_file)
-                                    if derived is not None:
-                                        session_info.last_completion_at = derived
-                                        state_changed = True
-                                        session_logger.info(
-                                            f"Derived last_completion_at for session "
-                                            f"{session_info.session_id}: {derived}"
-                                        )
-
-                            if session_info.state in RUNNABLE_STATES:
-                                session_info.state = SessionState.CREATED
-                                session_info.updated_at = datetime.now(UTC)
-                                state_changed = True
-                                session_logger.info(f"Reset session {session_info.session_id} from {original_state.value} to {session_info.state.value} on startup")
-
-                            # Reset PAUSED sessions to TERMINATED (orphaned permission requests)
-                            # PAUSED state means session was waiting for permission response
-                            if session_info.state == SessionState.PAUSED:
-                                session_info.state = SessionState.TERMINATED
-                                session_info.updated_at = datetime.now(UTC)
-                                state_changed = True
-                                session_logger.info(f"Reset session {session_info.session_id} from PAUSED to TERMINATED on startup (orphaned permission request)")
-
-                            # Reset processing state since no SDKs are running on startup
-                            if session_info.is_processing:
-                                session_info.is_processing = False
-                                session_info.updated_at = datetime.now(UTC)
-                                state_changed = True
-                                session_logger.info(f"Reset processing state for session {session_info.session_id} from {original_processing} to False on startup")
-
-                            self._active_sessions[session_info.session_id] = session_info
-
-                            # Save the updated state if it was modified
-                            if state_changed:
-                                await self._persist_session_state(session_info.session_id)
-                            self._session_locks[session_info.session_id] = asyncio.Lock()
-                            session_logger.debug(f"Loaded session {session_info.session_id} with state {session_info.state}")
-                        except Exception as e:
-                            logger.error(f"Failed to load session from {session_dir}: {e}")
+            catalog_ids = self._catalog.session_ids() if self._catalog is not None else set()
+            if catalog_ids:
+                session_dirs, loaded, to_import = await self._read_catalog_sessions(catalog_ids)
+            else:
+                session_dirs = [
+                    d for d in self.sessions_dir.iterdir()
+                    if d.is_dir() and (d / "state.json").exists()
+                ]
+                loaded = await asyncio.gather(
+                    *(asyncio.to_thread(_read_session_state, d) for d in session_dirs)
+                )
+                to_import = {d.name for d in session_dirs}
+
+            needs_completion_heal: list[str] = []
+            for session_dir, data in zip(session_dirs, loaded, strict=True):
+                if data is None:
+                    continue
+                try:
+                    session_info = SessionInfo.from_dict(data)
+
+                    # Reset active/starting sessions to created state on startup
+                    # since there are no SDK instances running for them
+                    original_state = session_info.state
+                    original_processing = session_info.is_processing
+                    state_changed = False
+
+                    # Issue #1513: legacy sessions lacking last_completion_at are healed
+                    # from messages.jsonl by _heal_last_completions after startup.
+                    if session_info.last_completion_at is None and (session_dir / "messages.jsonl").exists():
+                        needs_completion_heal.append(session_info.session_id)
+
+                    if session_info.state in RUNNABLE_STATES:
+                        session_info.state = SessionState.CREATED
+                        session_info.updated_at = datetime.now(UTC)
+                        state_changed = True
+                        session_logger.info(f"Reset session {session_info.session_id} from {original_state.value} to {session_info.state.value} on startup")
+
+                    # Reset PAUSED sessions to TERMINATED (orphaned permission requests)
+                    # PAUSED state means session was waiting for permission response
+                    if session_info.state == SessionState.PAUSED:
+                        session_info.state = SessionState.TERMINATED
+                        session_info.updated_at = datetime.now(UTC)
+                        state_changed = True
+                        session_logger.info(f"Reset session {session_info.session_id} from PAUSED to TERMINATED on startup (orphaned permission request)")
+
+                    # Reset processing state since no SDKs are running on startup
+                    if session_info.is_processing:
+                        session_info.is_processing = False
+                        session_info.updated_at = datetime.now(UTC)
+                        state_changed = True
+                        session_logger.info(f"Reset processing state for session {session_info.session_id} from {original_processing} to False on startup")
+
+                    self._active_sessions[session_info.session_id] = session_info
+                    self.hierarchy.sync(session_info)
+
+                    # Save the updated state if it was modified
+                    if state_changed:
+                        await self._persist_session_state(session_info.session_id)
+                    self._session_locks[session_info.session_id] = asyncio.Lock()
+                    session_logger.debug(f"Loaded session {session_info.session_id} with state {session_info.state}")
+                except Exception as e:
+                    logger.error(f"Failed to load session from {session_dir}: {e}")
+
+            if self._catalog is not None and to_import:
+                imported = [
+                    self._active_sessions[sid].to_dict()
+                    for sid in to_import if sid in self._active_sessions
+                ]
+                self._catalog.upsert_many(imported)
+                session_logger.info(f"Imported {len(imported)} sessions into the session catalog")
+
+            if needs_completion_heal:
+                self._completion_heal_task = asyncio.create_task(
+                    self._heal_last_completions(needs_completion_heal)
+                )
         except Exception as e:
             logger.error(f"Error loading existing sessions: {e}")
 
+    async def _read_catalog_sessions(
+        self, catalog_ids: set[str]
+    ) -> tuple[list[Path], list[dict | None], set[str]]:
+        """Load sessions from the catalog, reconciling it with the sessions directory.
+
+        Rows whose directory is gone are dropped; directories with a state.json
+        but no row (e.g. restored from an archive) are read and queued for import.
+        """
+        dir_names = {d.name for d in self.sessions_dir.iterdir() if d.is_dir()}
+        stale = catalog_ids - dir_names
+        if stale:
+            self._catalog.delete_many(sorted(stale))
+
+        session_dirs: list[Path] = []
+        loaded: list[dict | None] = []
+        for data in await asyncio.to_thread(self._catalog.load_all):
+            if data["session_id"] in dir_names:
+                session_dirs.append(self.sessions_dir / data["session_id"])
+                loaded.append(data)
+
+        new_dirs = [
+            self.sessions_dir / name for name in sorted(dir_names - catalog_ids)
+            if (self.sessions_dir / name / "state.json").exists()
+        ]
+        new_data = await asyncio.gather(
+            *(asyncio.to_thread(_read_session_state, d) for d in new_dirs)
+        )
+        return session_dirs + new_dirs, loaded + list(new_data), {d.name for d in new_dirs}
+
+    async def cancel_background_tasks(self) -> None:
+        """Stop background tasks; with the catalog, export pending state.json files and close it."""
+        for task in (self._completion_heal_task, self._export_task):
+            if task is not None and not task.done():
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        if self._catalog is not None and self._catalog.is_open:
+            await self.export_state_json()
+            self._catalog.close()
+
+    async def _retire_catalog(self) -> None:
+        """Write a leftover catalog's rows back to state.json, then delete it.
+
+        state.json is only exported on an interval while the catalog is enabled,
+        so after a crash the catalog can hold changes the files are missing.
+        """
+        db_path = self.data_dir / SessionCatalog.FILENAME
+        if db_path.exists():
+            catalog = SessionCatalog(db_path)
+            try:
+                catalog.open()
+                for data in await asyncio.to_thread(catalog.load_all):
+                    await asyncio.to_thread(self._write_state_file, data["session_id"], data)
+            except Exception as e:
+                logger.warning(f"Failed to export session catalog {db_path} before removal: {e}")
+            finally:
+                catalog.close()
+        _remove_catalog_files(db_path)
+
+    async def _export_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self._export_interval_seconds)
+            try:
+                await self.export_state_json()
+            except Exception:
+                logger.exception("Session catalog state.json export failed")
+
+    async def export_state_json(self, session_id: str | None = None) -> int:
+        """Write state.json for sessions changed since the last export (catalog mode).
+
+        With ``session_id``, export just that session if it is pending. Callers
+        that read a session directory directly (e.g. archiving) call this
+        first. A no-op when the catalog is disabled, since state.json is then
+        written on every change. Returns the number of files written.
+        """
+        if self._catalog is None:
+            return 0
+        if session_id is not None:
+            pending = [session_id] if session_id in self._export_dirty else []
+        else:
+            pending = list(self._export_dirty)
+        written = 0
+        for sid in pending:
+            self._export_dirty.discard(sid)
+            session = self._active_sessions.get(sid)
+            if session is None:
+                continue
+            try:
+                await asyncio.to_thread(self._write_state_file, sid, session.to_dict())
+                written += 1
+            except Exception as e:
+                self._export_dirty.add(sid)
+                logger.error(f"Failed to export state.json for {sid}: {e}")
+        return written
+
+    async def check_hierarchy_consistency(self) -> dict[str, list[str]]:
+        """Compare the in-memory hierarchy graph with the persisted session state.
+
+        Read-only: compares against the catalog rows when the catalog is enabled,
+        otherwise against state.json files, which are not rewritten.
+
+        Returns ``{"state_json": [...], "structure": [...]}``: differences
+        between the graph and parent_overseer_id / child_minion_ids on disk,
+        and parent/child links that do not point back at each other.
+        """
+        if self._catalog is not None and self._catalog.is_open:
+            # The catalog, not the interval-exported state.json, is what gets loaded
+            loaded = await asyncio.to_thread(self._catalog.load_all)
+        else:
+            session_dirs = [
+                self.sessions_dir / sid for sid in self._active_sessions
+                if (self.sessions_dir / sid / "state.json").exists()
+            ]
+            loaded = await asyncio.gather(
+                *(asyncio.to_thread(_read_session_state, d, False) for d in session_dirs)
+            )
+        persisted = [SessionInfo.from_dict(data) for data in loaded if data is not None]
+        return {
+            "state_json": self.hierarchy.diff(persisted),
+            "structure": self.hierarchy.structural_problems(),
+        }
+
+    def _write_state_file(self, session_id: str, data: dict[str, Any]) -> None:
+        from .storage_utils import write_alphabetized_json
+        session_dir = self.sessions_dir / session_id
+        if not session_dir.is_dir():
+            return  # deleted since it was marked for export
+        write_alphabetized_json(session_dir / "state.json", data)
+
+    async def _heal_last_completions(self, session_ids: list[str]) -> int:
+        """Derive last_completion_at from messages.jsonl for legacy sessions (issue #1513).
+
+        Sessions whose log holds no ResultMessage are remembered in a small
+        cache keyed by the log's size and mtime, so unchanged logs are not
+        rescanned on every startup. Returns the number of sessions healed.
+        """
+        cache_file = self.sessions_dir / COMPLETION_HEAL_CACHE_FILE
+        cache = await asyncio.to_thread(_load_completion_heal_cache, cache_file)
+        updated_cache: dict[str, list[int]] = {}
+        healed = 0
+        for session_id in session_ids:
+            messages_file = self.sessions_dir / session_id / "messages.jsonl"
+            try:
+                stat = messages_file.stat()
+            except OSError:
+                continue
+            signature = [stat.st_size, stat.st_mtime_ns]
+            if cache.get(session_id) == signature:
+                updated_cache[session_id] = signature
+                continue
+
+            derived = await asyncio.to_thread(_derive_last_completion_from_jsonl, messages_file)
+            if derived is None:
+                updated_cache[session_id] = signature
+                continue
+
+            async with self._get_session_lock(session_id):
+                session = self._active_sessions.get(session_id)
+                # A live ResultMessage may have set the field meanwhile; it wins.
+                if session is None or session.last_completion_at is not None:
+                    continue
+                session.last_completion_at = derived
+                try:
+                    await self._persist_session_state(session_id)
+                except Exception:
+                    continue
+            healed += 1
+            session_logger.info(f"Derived last_completion_at for session {session_id}: {derived}")
+
+        if updated_cache != cache:
+            await asyncio.to_thread(_save_completion_heal_cache, cache_file, updated_cache)
+        return healed
+
     async def create_session(
         self,
         session_id: str,
@@ -734,10 +952,16 @@ class SessionManager:
         await self._notify_state_change_callbacks(session_id, new_state)
 
     async def _persist_session_state(self, session_id: str):
-        """Persist session state to filesystem (alphabetized JSON)."""
+        """Persist session state to filesystem (alphabetized JSON), or the catalog row."""
         try:
             from .storage_utils import write_alphabetized_json
             session = self._active_sessions[session_id]
+            # Every hierarchy change (spawn, dispose, reparent, cleanup) is persisted
+            self.hierarchy.sync(session)
+            if self._catalog is not None:
+                self._catalog.upsert(session.to_dict())
+                self._export_dirty.add(session_id)
+                return
             session_dir = self.sessions_dir / session_id
             session_dir.mkdir(exist_ok=True)
 
@@ -756,6 +980,10 @@ class SessionManager:
         """
         try:
             from .storage_utils import write_alphabetized_json
+            if self._catalog is not None:
+                # A catalog row update is already a single-row write
+                await self._persist_session_state(session_id)
+                return
             session = self._active_sessions[session_id]
             state_file = self.sessions_dir / session_id / "state.json"
 
@@ -1179,6 +1407,10 @@ class SessionManager:
 
                 # Only remove from memory after successful file deletion
                 del self._active_sessions[session_id]
+                self.hierarchy.remove(session_id)
+                if self._catalog is not None:
+                    self._catalog.delete(session_id)
+                    self._export_dirty.discard(session_id)
 
                 # Remove session lock
                 if session_id in self._session_locks:
@@ -1308,30 +1540,87 @@ class SessionManager:
 
 
 def _derive_last_completion_from_jsonl(path: Path) -> datetime | None:
-    """Scan messages.jsonl backwards for the most recent ResultMessage timestamp (issue #1513)."""
+    """Scan messages.jsonl backwards for the most recent ResultMessage timestamp (issue #1513).
+
+    Reads the file tail-first in fixed-size blocks so the common case (a
+    result near the end) never loads the whole log.
+    """
     try:
-        with open(path, encoding='utf-8') as f:
-            for line in reversed(f.readlines()):
-                line = line.strip()
-                if not line:
-                    continue
-                try:
-                    msg = json.loads(line)
-                except json.JSONDecodeError:
-                    continue
-                if msg.get('type') == 'result':
-                    ts = msg.get('timestamp')
-                    if isinstance(ts, str):
-                        try:
-                            return datetime.fromisoformat(ts)
-                        except ValueError:
-                            return None
-                    elif isinstance(ts, (int, float)):
-                        try:
-                            return datetime.fromtimestamp(ts, tz=UTC)
-                        except (OSError, OverflowError, ValueError):
-                            return None
-                    return None
+        for line in iter_lines_reversed(path):
+            line = line.strip()
+            if not line or b'result' not in line:
+                continue
+            try:
+                msg = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if msg.get('type') == 'result':
+                ts = msg.get('timestamp')
+                if isinstance(ts, str):
+                    try:
+                        return datetime.fromisoformat(ts)
+                    except ValueError:
+                        return None
+                elif isinstance(ts, (int, float)):
+                    try:
+                        return datetime.fromtimestamp(ts, tz=UTC)
+                    except (OSError, OverflowError, ValueError):
+                        return None
+                return None
         return None
     except Exception:
         return None
+
+
+COMPLETION_HEAL_CACHE_FILE = ".completion_heal_cache.json"
+
+
+def _remove_catalog_files(db_path: Path) -> None:
+    for suffix in ("", "-wal", "-shm"):
+        path = db_path.with_name(db_path.name + suffix)
+        if path.exists():
+            try:
+                path.unlink()
+            except OSError as e:
+                logger.warning(f"Failed to remove stale session catalog {path}: {e}")
+
+
+def _read_session_state(session_dir: Path, persist_migration: bool = True) -> dict | None:
+    """Read and migrate one session's state.json (runs in a worker thread at startup).
+
+    With ``persist_migration=False`` the migrated dict is returned without
+    rewriting the file, for read-only callers such as diagnostics.
+    """
+    from .storage_utils import write_alphabetized_json
+    state_file = session_dir / "state.json"
+    try:
+        with open(state_file) as f:
+            data = json.load(f)
+
+        # Issue #1230: promote flat CONFIG_FIELDS → config dict
+        data, changed = _migrate_session_to_config_dict(data)
+        if changed and persist_migration:
+            write_alphabetized_json(state_file, data)
+        return data
+    except Exception as e:
+        logger.error(f"Failed to load session from {session_dir}: {e}")
+        return None
+
+
+def _load_completion_heal_cache(cache_file: Path) -> dict[str, list[int]]:
+    try:
+        with open(cache_file) as f:
+            data = json.load(f)
+        return data if isinstance(data, dict) else {}
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
+def _save_completion_heal_cache(cache_file: Path, cache: dict[str, list[int]]) -> None:
+    try:
+        tmp = cache_file.with_suffix('.tmp')
+        with open(tmp, 'w') as f:
+            json.dump(cache, f)
+        os.replace(tmp, cache_file)
+    except OSError as e:
+        logger.warning(f"Failed to write completion heal cache: {e}")
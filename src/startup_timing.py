@@ -0,0 +1,47 @@
+"""
+Per-phase wall-clock timing of application startup.
+
+``SessionCoordinator.initialize()`` and ``WebUI.initialize()`` wrap each
+startup phase in ``StartupTimings.phase()``; the breakdown is logged once
+startup completes and served via GET /api/system/startup-timing.
+"""
+
+import time
+from contextlib import contextmanager
+
+from .logging_config import get_logger
+
+logger = get_logger('coordinator', category='STARTUP')
+
+
+class StartupTimings:
+    """Ordered record of startup phase durations."""
+
+    def __init__(self):
+        self._started = time.perf_counter()
+        self._phases: dict[str, float] = {}
+        self._completed_at: float | None = None
+
+    @contextmanager
+    def phase(self, name: str):
+        """Time the enclosed block as phase ``name`` (durations accumulate on reuse)."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self._phases[name] = self._phases.get(name, 0.0) + elapsed
+
+    def complete(self) -> None:
+        """Mark startup finished and log the breakdown."""
+        self._completed_at = time.perf_counter()
+        breakdown = ", ".join(f"{name}={ms:.0f}ms" for name, ms in self.to_dict()["phases_ms"].items())
+        logger.info(f"Startup completed in {self.to_dict()['total_ms']:.0f}ms ({breakdown})")
+
+    def to_dict(self) -> dict:
+        end = self._completed_at if self._completed_at is not None else time.perf_counter()
+        return {
+            "completed": self._completed_at is not None,
+            "total_ms": round((end - self._started) * 1000, 1),
+            "phases_ms": {name: round(seconds * 1000, 1) for name, seconds in self._phases.items()},
+        }
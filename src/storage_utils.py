@@ -6,6 +6,7 @@ consistent, diff-friendly JSON output (issue #1230).
 """
 
 import json
+import os
 import shutil
 from datetime import datetime
 from pathlib import Path
@@ -17,6 +18,30 @@ def write_alphabetized_json(path: Path, data: dict, indent: int = 2) -> None:
     path.write_text(payload, encoding="utf-8")
 
 
+def iter_lines_reversed(path: Path, block_size: int = 64 * 1024, end: int | None = None):
+    """Yield the lines of ``path`` (as bytes) from last to first, reading block-wise.
+
+    Only as much of the file as the caller consumes is read, so "find the most
+    recent X" lookups stay cheap on large logs. ``end`` limits the scan to the
+    first ``end`` bytes (default: the whole file).
+    """
+    with open(path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        position = f.tell() if end is None else min(end, f.tell())
+        remainder = b''
+        while position > 0:
+            read_size = min(block_size, position)
+            position -= read_size
+            f.seek(position)
+            chunk = f.read(read_size) + remainder
+            lines = chunk.split(b'\n')
+            # The first piece may be a partial line continued in the previous block
+            remainder = lines.pop(0)
+            yield from reversed(lines)
+        if remainder:
+            yield remainder
+
+
 def _load_safe(path: Path) -> dict:
     """Load JSON from path, returning {} on any error."""
     try:
@@ -0,0 +1,153 @@
+"""Unit tests for the hourly/daily usage rollups (src/analytics/rollups.py)."""
+from __future__ import annotations
+
+import random
+import sqlite3
+
+import pytest
+
+from src.analytics import rollups
+from src.analytics.aggregator import _plan_sources, aggregate_by_time
+from src.analytics.database import AnalyticsDB
+from src.analytics_store import AnalyticsStore
+from src.config_manager import ModelRates, PricingConfig
+
+_SONNET = "claude-sonnet-4-6"
+_HAIKU = "claude-haiku-4-5"
+_PRICING = PricingConfig(
+    rates={
+        _SONNET: ModelRates(input=2.0, output=10.0, cache_write=0.0, cache_read=0.0),
+        _HAIKU: ModelRates(input=1.0, output=5.0, cache_write=0.0, cache_read=0.0),
+    },
+    default_model=_SONNET,
+)
+# 2024-01-15 00:00:00 UTC
+_MIDNIGHT = 1705276800.0
+_HOUR = 3600.0
+_DAY = 86400.0
+
+
+@pytest.fixture
+async def db(tmp_path):
+    d = AnalyticsDB(tmp_path / "analytics.db")
+    await d.initialize()
+    yield d
+    await d.close()
+
+
+async def _insert(db: AnalyticsDB, session_id: str, turn_seq: int, model, input_tokens: int, ts: float):
+    await db.execute_write(
+        """
+        INSERT OR IGNORE INTO turn_usage
+            (session_id, turn_seq, model, input_tokens, output_tokens,
+             cache_write_tokens, cache_read_tokens, sdk_total_cost_usd, ts)
+        VALUES (?, ?, ?, ?, ?, 0, 0, NULL, ?)
+        """,
+        (session_id, turn_seq, model, input_tokens, input_tokens // 2, ts),
+    )
+
+
+async def _raw_buckets(db: AnalyticsDB, group_by: str, since: float, until: float) -> dict:
+    """Reference result: the pre-rollup strftime grouping over turn_usage."""
+    fmt = {"hour": "%Y-%m-%dT%H:00:00", "day": "%Y-%m-%d"}[group_by]
+    rows = await db.execute_read(
+        f"""
+        SELECT CAST(strftime('%s', strftime('{fmt}', ts, 'unixepoch')) AS INTEGER) AS bucket_ts,
+               model, SUM(input_tokens) AS input_tokens, SUM(output_tokens) AS output_tokens
+        FROM turn_usage WHERE ts >= ? AND ts <= ?
+        GROUP BY bucket_ts, model
+        """,
+        (since, until),
+    )
+    return {(r["bucket_ts"], r["model"]): (r["input_tokens"], r["output_tokens"]) for r in rows}
+
+
+def _flatten(buckets: list[dict]) -> dict:
+    return {
+        (b["bucket_ts"], m["model"]): (m["input_tokens"], m["output_tokens"])
+        for b in buckets
+        for m in b["by_model"]
+    }
+
+
+async def test_record_turn_maintains_rollups(db):
+    store = AnalyticsStore(db)
+    await store.record_turn("s1", 1, _SONNET, {"input_tokens": 100}, 0.01)
+    await store.record_turn("s1", 2, _SONNET, {"input_tokens": 50}, None)
+    await store.record_turn("s1", 2, _SONNET, {"input_tokens": 50}, None)  # replay: ignored
+
+    for group_by in rollups.ROLLUP_WIDTHS:
+        rows = await db.execute_read(f"SELECT * FROM {rollups.rollup_table(group_by)}")
+        assert len(rows) == 1
+        assert rows[0]["turn_count"] == 2
+        assert rows[0]["input_tokens"] == 150
+        assert abs(rows[0]["sdk_total_cost_usd"] - 0.01) < 1e-9
+
+    await store.delete_session("s1")
+    assert await db.execute_read(f"SELECT * FROM {rollups.rollup_table('hour')}") == []
+    assert await db.execute_read(f"SELECT * FROM {rollups.rollup_table('day')}") == []
+
+
+async def test_null_model_round_trips(db):
+    await _insert(db, "s1", 1, None, 100, _MIDNIGHT + 10)
+    buckets = await aggregate_by_time(db, _PRICING, "day", _MIDNIGHT, _MIDNIGHT + 2 * _DAY)
+    assert [m["model"] for m in buckets[0]["by_model"]] == [None]
+
+
+@pytest.mark.parametrize("group_by", ["hour", "day"])
+async def test_rollup_reads_match_raw_grouping(db, group_by):
+    rng = random.Random(25)
+    for seq in range(400):
+        ts = _MIDNIGHT + rng.uniform(0, 10 * _DAY)
+        await _insert(db, f"s{seq % 3}", seq, rng.choice([_SONNET, _HAIKU]), rng.randint(1, 1000), ts)
+
+    # Unaligned range: partial day and hour edges come from raw rows
+    since = _MIDNIGHT + 1.5 * _DAY + 1234.5
+    until = _MIDNIGHT + 8 * _DAY + 777.25
+    buckets = await aggregate_by_time(db, _PRICING, group_by, since, until)
+    assert _flatten(buckets) == await _raw_buckets(db, group_by, since, until)
+
+
+async def test_until_is_inclusive(db):
+    await _insert(db, "s1", 1, _SONNET, 100, _MIDNIGHT + _DAY)
+    buckets = await aggregate_by_time(db, _PRICING, "day", _MIDNIGHT, _MIDNIGHT + _DAY)
+    assert sum(b["by_token_type"]["input_tokens"] for b in buckets) == 100
+
+
+def test_plan_uses_coarsest_whole_buckets():
+    since = _MIDNIGHT - 1800.0  # 23:30 the day before
+    until_excl = _MIDNIGHT + 2 * _DAY + _HOUR + 60
+    plan = _plan_sources(since, until_excl, [86400, 3600])
+    assert plan == [
+        (None, since, _MIDNIGHT),
+        (86400, _MIDNIGHT, _MIDNIGHT + 2 * _DAY),
+        (3600, _MIDNIGHT + 2 * _DAY, _MIDNIGHT + 2 * _DAY + _HOUR),
+        (None, _MIDNIGHT + 2 * _DAY + _HOUR, until_excl),
+    ]
+
+
+async def test_backfill_on_initialize(tmp_path):
+    path = tmp_path / "analytics.db"
+    db = AnalyticsDB(path)
+    await db.initialize()
+    await _insert(db, "s1", 1, _SONNET, 100, _MIDNIGHT)
+    await _insert(db, "s1", 2, _SONNET, 200, _MIDNIGHT + _HOUR)
+    await db.close()
+
+    # Simulate a database written before rollups existed
+    conn = sqlite3.connect(path)
+    conn.execute(f"DELETE FROM {rollups.rollup_table('hour')}")
+    conn.execute(f"DELETE FROM {rollups.rollup_table('day')}")
+    conn.commit()
+    conn.close()
+
+    db = AnalyticsDB(path)
+    await db.initialize()
+    try:
+        rows = await db.execute_read(f"SELECT * FROM {rollups.rollup_table('day')}")
+        assert [(r["turn_count"], r["input_tokens"]) for r in rows] == [(2, 300)]
+        hours = await db.execute_read(f"SELECT * FROM {rollups.rollup_table('hour')}")
+        assert len(hours) == 2
+        assert await db.rebuild_rollups() == 2
+    finally:
+        await db.close()
@@ -181,6 +181,20 @@ async def test_delete_project_returns_false_when_not_found(service, mock_coordin
     mock_coordinator.project_manager.delete_project.assert_not_called()
 
 
+@pytest.mark.asyncio
+async def test_delete_project_releases_legion_state(service, mock_coordinator):
+    mock_coordinator.project_manager.get_project.return_value = _make_project()
+    mock_coordinator.project_manager.delete_project.return_value = True
+    scheduler_service = mock_coordinator.legion_system.scheduler_service
+    scheduler_service.forget_legion = AsyncMock()
+
+    result = await service.delete_project("p1")
+
+    assert result["success"] is True
+    scheduler_service.forget_legion.assert_awaited_once_with("p1")
+    mock_coordinator.legion_system.timeline_store.discard.assert_called_once_with("p1")
+
+
 @pytest.mark.asyncio
 async def test_toggle_project_expansion_calls_manager(service, mock_coordinator):
     project = _make_project()
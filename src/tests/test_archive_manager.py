@@ -246,6 +246,30 @@ class TestArchiveManager:
         assert "messages.jsonl" not in result.files_archived
         assert "state.json" not in result.files_archived
 
+    @pytest.mark.asyncio
+    async def test_get_archive_queue_reads_snapshot_and_log(self, mock_system):
+        """Items compacted into queue_snapshot.json are returned with the tail log applied."""
+        from src.queue_manager import QueueManager
+
+        system, temp_path = mock_system
+        session_id = "test-session-1"
+        manager = ArchiveManager(system)
+        archive_dir = manager.archives_dir / session_id / "20240101_120000"
+        archive_dir.mkdir(parents=True)
+
+        queue = QueueManager(compact_after_entries=3)
+        first = await queue.enqueue(session_id, archive_dir, "first")
+        second = await queue.enqueue(session_id, archive_dir, "second")
+        await queue.mark_sent(session_id, archive_dir, first.queue_id)  # compacts
+        await queue.cancel(session_id, archive_dir, second.queue_id)
+        assert (archive_dir / "queue_snapshot.json").exists()
+
+        records = await manager.get_archive_queue(session_id, "20240101_120000")
+
+        assert [(r["content"], r["status"]) for r in records] == [
+            ("first", "sent"), ("second", "cancelled"),
+        ]
+
     @pytest.mark.asyncio
     async def test_get_archive_info_no_archives(self, mock_system):
         """Test get_archive_info when no archives exist."""
@@ -395,6 +395,8 @@ class TestResetCleanupHelpers:
         session_dir.mkdir(parents=True)
         queue_file = session_dir / "queue.jsonl"
         queue_file.write_text('{"id":"q1"}\n')
+        (session_dir / "queue_snapshot.json").write_text('{"log_id":"x","items":[]}')
+        (session_dir / "queue_archive.jsonl").write_text('{"queue_id":"q0"}\n')
 
         mgr = DataStorageManager(session_dir)
         result = await mgr.clear_queue()
@@ -402,6 +404,8 @@ class TestResetCleanupHelpers:
         assert result is True
         assert queue_file.exists()
         assert queue_file.read_bytes() == b""
+        assert not (session_dir / "queue_snapshot.json").exists()
+        assert not (session_dir / "queue_archive.jsonl").exists()
 
     @pytest.mark.asyncio
     async def test_clear_queue_no_file_is_noop(self, tmp_data):
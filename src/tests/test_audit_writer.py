@@ -136,6 +136,28 @@ async def test_comm_hook():
     assert row[4] == "legion1"  # legion_id
 
 
+@pytest.mark.asyncio
+async def test_fan_out_comm_records_recipient_list():
+    import json
+    db = MockDB()
+    writer = AuditWriter(db)
+    writer.start()
+    comm = {
+        "comm_id": "c3",
+        "comm_type": "TASK",
+        "from_minion_id": "m1",
+        "to_minion_ids": ["m2", "m3"],
+        "summary": "rebase",
+        "timestamp": 100.0,
+    }
+    await writer.on_comm("m1", "proj1", "legion1", comm)
+    await asyncio.sleep(0.3)
+    await writer.stop()
+    extra = json.loads(db.rows[0][11])
+    assert extra["to"] == ["m2", "m3"]
+    assert extra["to_name"] == "m2, m3"
+
+
 # ------------------------------------------------------------------
 # Issue #1159: is_processing deduplication tests
 # ------------------------------------------------------------------
@@ -0,0 +1,71 @@
+"""Tests for the capability search index (src/legion/capability_index.py)."""
+
+import pytest
+
+from ..legion.capability_index import CapabilityIndex
+
+
+@pytest.fixture
+def index() -> CapabilityIndex:
+    index = CapabilityIndex()
+    index.set_minion("db", "L1", "Database architecture and schema design", default_score=0.9)
+    index.add_capability("db", "postgresql", 0.9)
+    index.add_capability("db", "database_design", 0.8)
+    index.set_minion("api", "L1", "Python backend development", default_score=0.6)
+    index.add_capability("api", "rest_api", 0.7)
+    index.add_capability("api", "python", 0.6)
+    index.set_minion(
+        "ui", "L2", "Frontend", template_text="Accessibility reviewer wcag", default_score=0.5
+    )
+    index.add_capability("ui", "vue", 0.8)
+    return index
+
+
+def _ids(results) -> list[str]:
+    return [minion_id for minion_id, _, _ in results]
+
+
+class TestCapabilityIndex:
+    def test_substring_matches_like_previous_search(self, index):
+        assert index.search("sql") == [("db", 0.9, "postgresql")]
+        assert index.search("rest_api") == [("api", 0.7, "rest_api")]
+        assert index.search("e_des") == [("db", 0.8, "database_design")]
+
+    def test_one_result_per_minion_with_best_capability(self, index):
+        index.add_capability("api", "python_testing", 0.3)
+        assert index.search("python") == [("api", 0.6, "python")]
+
+    def test_fuzzy_match_tolerates_typos(self, index):
+        assert _ids(index.search("postgress")) == ["db"]
+        assert index.search("zzzz") == []
+
+    def test_role_and_template_fields(self, index):
+        assert index.search("backend") == [("api", 0.6, "role")]
+        assert index.search("wcag") == [("ui", 0.5, "template")]
+
+    def test_relevance_blends_with_expertise(self, index):
+        index.set_minion("generalist", "L1", "Jack of all trades", default_score=0.5)
+        index.add_capability("generalist", "python", 0.9)
+        index.add_capability("api", "python", 0.95)
+
+        results = index.search("python")
+
+        # api also matches on its role, but a close expertise call still decides
+        assert _ids(results) == ["api", "generalist"]
+
+    def test_filters_apply_before_ranking(self, index):
+        assert _ids(index.search("python", allowed={"db", "ui"})) == []
+        assert _ids(index.search("vue", project_id="L1")) == []
+        assert _ids(index.search("vue", project_id="L2")) == ["ui"]
+        assert len(index.search("d", limit=1)) == 1
+
+    def test_zero_expertise_excluded(self, index):
+        index.add_capability("ui", "python", 0.0)
+        assert _ids(index.search("python")) == ["api"]
+
+    def test_remove_minion_drops_postings(self, index):
+        index.remove_minion("db")
+        assert index.search("postgresql") == []
+        assert index.search("database") == []
+        assert "postgresql" not in index._postings
+        assert len(index) == 3
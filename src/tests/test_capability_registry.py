@@ -449,3 +449,20 @@ async def test_full_capability_workflow(legion_coordinator, sample_minion_1, sam
     python_results = await legion_coordinator.search_capability_registry(keyword="python")
     assert len(python_results) == 1
     assert python_results[0][0] == "minion-backend-456"
+
+
+@pytest.mark.asyncio
+async def test_rebuild_indexes_minions_without_capabilities(
+    legion_coordinator, mock_legion_system, sample_minion_1, sample_minion_3
+):
+    """Rebuild indexes every minion for role search; only capable ones enter the registry."""
+    sample_minion_3.capabilities = []
+    mock_legion_system.session_coordinator.session_manager.list_sessions = AsyncMock(
+        return_value=[sample_minion_1, sample_minion_3]
+    )
+
+    await legion_coordinator.rebuild_capability_registry()
+
+    assert set(legion_coordinator.capability_registry) == set(sample_minion_1.capabilities)
+    results = await legion_coordinator.search_capability_registry(keyword="frontend")
+    assert [r[0] for r in results] == ["minion-frontend-789"]
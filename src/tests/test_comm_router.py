@@ -10,6 +10,7 @@ import pytest
 
 from src.legion_system import LegionSystem
 from src.models.legion_models import Comm, CommType
+from src.session_hierarchy import HierarchyGraph
 
 
 @pytest.fixture
@@ -61,6 +62,13 @@ def sample_minion():
     return mock
 
 
+def _hierarchy(sessions) -> HierarchyGraph:
+    graph = HierarchyGraph()
+    for session in sessions:
+        graph.sync(session)
+    return graph
+
+
 class TestVisibleMinions:
     """Test cases for get_visible_minions recursive hierarchy traversal."""
 
@@ -92,6 +100,7 @@ class TestVisibleMinions:
 
         sm = comm_router.system.session_coordinator.session_manager
         sm.get_session_info = AsyncMock(side_effect=lambda sid: session_map.get(sid))
+        sm.hierarchy = _hierarchy(session_map.values())
 
         visible = await comm_router.get_visible_minions("child-id")
         visible_set = set(visible)
@@ -128,6 +137,7 @@ class TestVisibleMinions:
 
         sm = comm_router.system.session_coordinator.session_manager
         sm.get_session_info = AsyncMock(side_effect=lambda sid: session_map.get(sid))
+        sm.hierarchy = _hierarchy(session_map.values())
 
         visible = await comm_router.get_visible_minions("grandparent-id")
         visible_set = set(visible)
@@ -176,6 +186,7 @@ class TestVisibleMinions:
 
         sm = comm_router.system.session_coordinator.session_manager
         sm.get_session_info = AsyncMock(side_effect=lambda sid: session_map.get(sid))
+        sm.hierarchy = _hierarchy(session_map.values())
 
         visible = await comm_router.get_visible_minions("leaf-a-id")
         visible_set = set(visible)
@@ -217,6 +228,7 @@ class TestVisibleMinions:
 
         sm = comm_router.system.session_coordinator.session_manager
         sm.get_session_info = AsyncMock(side_effect=lambda sid: session_map.get(sid))
+        sm.hierarchy = _hierarchy(session_map.values())
 
         visible = await comm_router.get_visible_minions("sibling-a-id")
         visible_set = set(visible)
@@ -229,6 +241,7 @@ class TestVisibleMinions:
         """Non-existent caller should return empty list."""
         sm = comm_router.system.session_coordinator.session_manager
         sm.get_session_info = AsyncMock(return_value=None)
+        sm.hierarchy = HierarchyGraph()
 
         visible = await comm_router.get_visible_minions("nonexistent-id")
         assert visible == []
@@ -454,3 +467,138 @@ class TestCommRouter:
         assert not (tmp_path / "sessions" / "nonexistent-minion").exists(), (
             "No attachment directory should be created for a nonexistent target minion"
         )
+
+
+class TestFanOut:
+    """Test cases for delivering one Comm to several minions."""
+
+    @pytest.fixture
+    def minions(self, comm_router, tmp_path):
+        from src.session_manager import SessionInfo, SessionState
+
+        minions = {}
+        for i in range(5):
+            minion = Mock(spec=SessionInfo)
+            minion.session_id = f"child-{i}"
+            minion.name = f"Child{i}"
+            minion.project_id = "test-legion-456"
+            minion.state = SessionState.ACTIVE
+            minions[minion.session_id] = minion
+
+        coordinator = comm_router.system.session_coordinator
+        coordinator.data_dir = tmp_path
+        coordinator.session_manager.get_session_info = AsyncMock(side_effect=minions.get)
+        coordinator.send_message = AsyncMock(return_value=True)
+        coordinator.register_uploaded_resource = AsyncMock(
+            side_effect=lambda session_id, **kwargs: {"resource_id": f"res-{session_id}"}
+        )
+        coordinator.register_uploaded_file = AsyncMock()
+        return minions
+
+    def _comm(self, recipients, **kwargs) -> Comm:
+        return Comm(
+            comm_id=str(uuid.uuid4()),
+            from_user=True,
+            to_minion_ids=list(recipients),
+            content="Everyone: rebase on main",
+            comm_type=CommType.TASK,
+            **kwargs,
+        )
+
+    @pytest.mark.asyncio
+    async def test_single_timeline_record_and_per_recipient_delivery(self, comm_router, minions):
+        comm = self._comm(minions)
+
+        with patch.object(comm_router, '_append_to_timeline', new=AsyncMock()) as mock_append:
+            deliveries = await comm_router.fan_out_comm(comm)
+
+        mock_append.assert_called_once()
+        assert mock_append.call_args.args[1].to_minion_ids == list(minions)
+        sent_to = {c.kwargs["session_id"] for c in comm_router.system.session_coordinator.send_message.call_args_list}
+        assert sent_to == set(minions)
+        assert all(d["delivered"] and d["latency_ms"] is not None for d in deliveries.values())
+
+    @pytest.mark.asyncio
+    async def test_callers_comm_left_unchanged(self, comm_router, minions):
+        comm = self._comm(["child-0", "ghost", "child-1"])
+
+        with patch.object(comm_router, '_append_to_timeline', new=AsyncMock()) as mock_append:
+            await comm_router.fan_out_comm(comm)
+
+        assert comm.to_minion_ids == ["child-0", "ghost", "child-1"]
+        assert comm.to_minion_name is None
+        record = mock_append.call_args.args[1]
+        assert record.to_minion_ids == ["child-0", "child-1"]
+        assert record.to_minion_name == "Child0, Child1"
+
+    @pytest.mark.asyncio
+    async def test_user_fan_out_persisted_to_each_legion(self, comm_router, minions):
+        minions["child-3"].project_id = "other-legion"
+
+        with patch.object(comm_router, '_append_to_timeline', new=AsyncMock()) as mock_append:
+            await comm_router.fan_out_comm(self._comm(["child-0", "child-3", "child-1"]))
+
+        records = {c.args[0]: c.args[1].to_minion_ids for c in mock_append.call_args_list}
+        assert records == {
+            "test-legion-456": ["child-0", "child-1"],
+            "other-legion": ["child-3"],
+        }
+
+    @pytest.mark.asyncio
+    async def test_bounded_concurrency(self, comm_router, minions):
+        import asyncio
+
+        in_flight = peak = 0
+
+        async def slow_send(**kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return True
+
+        comm_router.system.session_coordinator.send_message = AsyncMock(side_effect=slow_send)
+        comm_router.FANOUT_CONCURRENCY = 2
+
+        with patch.object(comm_router, '_append_to_timeline', new=AsyncMock()):
+            await comm_router.fan_out_comm(self._comm(minions))
+
+        assert peak == 2
+
+    @pytest.mark.asyncio
+    async def test_attachment_written_once_and_linked(self, comm_router, minions, tmp_path):
+        source_file = tmp_path / "plan.md"
+        source_file.write_bytes(b"# plan")
+        comm = self._comm(
+            ["child-0", "child-1", "child-2"],
+            attachments=[{"name": "plan.md", "size": 6, "mime_type": "text/markdown",
+                          "source_path": str(source_file)}],
+        )
+
+        with patch.object(comm_router, '_append_to_timeline', new=AsyncMock()) as mock_append:
+            await comm_router.fan_out_comm(comm)
+
+        paths = [tmp_path / "sessions" / f"child-{i}" / "attachments" / "plan.md" for i in range(3)]
+        assert all(p.read_bytes() == b"# plan" for p in paths)
+        assert len({p.stat().st_ino for p in paths}) == 1  # hard links to one copy
+        # Timeline record carries resolved resource info before persisting
+        assert mock_append.call_args.args[1].attachments[0]["resource_id"] == "res-child-0"
+        # Each recipient's message points at its own copy
+        metadata = {
+            c.kwargs["session_id"]: c.kwargs["metadata"]
+            for c in comm_router.system.session_coordinator.send_message.call_args_list
+        }
+        assert metadata["child-2"]["attachments"][0]["resource_id"] == "res-child-2"
+
+    @pytest.mark.asyncio
+    async def test_missing_recipients_reported(self, comm_router, minions):
+        comm = self._comm(["child-0", "ghost"])
+
+        with patch.object(comm_router, '_append_to_timeline', new=AsyncMock()):
+            result = await comm_router.route_comm(comm)
+            deliveries = await comm_router.fan_out_comm(self._comm(["child-0", "ghost"]))
+
+        assert result is False
+        assert deliveries["ghost"] == {"delivered": False, "latency_ms": None}
+        assert deliveries["child-0"]["delivered"] is True
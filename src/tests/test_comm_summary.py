@@ -0,0 +1,118 @@
+"""Tests for per-participant legion comm summaries (src/legion/comm_summary.py)."""
+
+import json
+import tempfile
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+from ..legion.comm_summary import USER_PARTICIPANT, CommSummaryStore
+from ..legion.legion_coordinator import LegionCoordinator
+
+
+@pytest.fixture
+def system():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        system = MagicMock()
+        system.session_coordinator.data_dir = Path(temp_dir)
+        system.comm_summaries = CommSummaryStore(system)
+        yield system
+
+
+def _timeline(system) -> Path:
+    path = system.session_coordinator.data_dir / "legions" / "L" / "timeline.jsonl"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def _append(system, comm_id, from_id=None, to_id=None, comm_type="task", ts=1.0, from_user=False):
+    comm = {
+        "comm_id": comm_id, "from_minion_id": from_id, "to_minion_id": to_id,
+        "from_user": from_user, "to_user": False, "comm_type": comm_type, "timestamp": ts,
+    }
+    with open(_timeline(system), "a") as f:
+        f.write(json.dumps(comm) + "\n")
+    system.comm_summaries.record("L")
+
+
+class TestCommSummaryStore:
+    def test_cold_rebuild_from_timeline(self, system):
+        _append(system, "1", from_id="a", to_id="b", ts=1.0)
+        _append(system, "2", from_id="b", to_id="a", comm_type="report", ts=2.0)
+        _append(system, "3", from_id="a", to_id="b", ts=3.0)
+        _append(system, "4", to_id="a", from_user=True, ts=4.0)
+
+        summaries = system.comm_summaries.summaries("L")
+
+        a = summaries["a"]
+        assert a.last_outbound["comm_id"] == "3"
+        assert a.last_inbound["comm_id"] == "4"
+        assert a.sent_by_type == {"task": 2}
+        assert a.received_by_type == {"report": 1, "task": 1}
+        assert a.last_activity == 4.0
+        assert summaries[USER_PARTICIPANT].last_outbound["comm_id"] == "4"
+
+    def test_fan_out_comm_counts_for_each_recipient(self, system):
+        comm = {"comm_id": "1", "from_minion_id": "a", "to_minion_ids": ["b", "c"], "comm_type": "task"}
+        with open(_timeline(system), "a") as f:
+            f.write(json.dumps(comm) + "\n")
+
+        summaries = system.comm_summaries.summaries("L")
+
+        assert summaries["a"].sent_by_type == {"task": 1}
+        assert summaries["b"].last_inbound["comm_id"] == "1"
+        assert summaries["c"].received_by_type == {"task": 1}
+
+    def test_record_folds_appends_incrementally(self, system):
+        _append(system, "1", from_id="a", to_id="b")
+        assert system.comm_summaries.get("L", "a").last_outbound["comm_id"] == "1"
+
+        _append(system, "2", from_id="a", to_id="c", ts=0.5)
+
+        summary = system.comm_summaries.get("L", "a")
+        assert summary.last_outbound["comm_id"] == "2"  # file order, not timestamp
+        assert summary.sent_by_type == {"task": 2}
+
+    def test_snapshot_resumes_on_restart(self, system):
+        _append(system, "1", from_id="a", to_id="b")
+        system.comm_summaries.get("L", "a")
+        system.comm_summaries.save_all()
+        _append(system, "2", from_id="a", to_id="b")  # written while "down"
+
+        restarted = CommSummaryStore(system)
+        summary = restarted.get("L", "a")
+
+        assert summary.last_outbound["comm_id"] == "2"
+        assert summary.sent_by_type == {"task": 2}
+
+    def test_rewritten_timeline_triggers_rebuild(self, system):
+        _append(system, "1", from_id="a", to_id="b")
+        _append(system, "2", from_id="a", to_id="b")
+        system.comm_summaries.get("L", "a")
+
+        _timeline(system).write_text(json.dumps({"comm_id": "x", "from_minion_id": "z"}) + "\n")
+
+        summaries = system.comm_summaries.summaries("L")
+        assert set(summaries) == {"z"}
+
+    def test_partial_trailing_line_waits(self, system):
+        _append(system, "1", from_id="a", to_id="b")
+        with open(_timeline(system), "a") as f:
+            f.write('{"comm_id": "2", "from_minion_id": "a"')
+        assert system.comm_summaries.get("L", "a").sent_by_type == {"task": 1}
+
+        with open(_timeline(system), "a") as f:
+            f.write(', "comm_type": "report"}\n')
+        assert system.comm_summaries.get("L", "a").sent_by_type == {"task": 1, "report": 1}
+
+
+async def test_last_outgoing_comm_uses_summaries(system):
+    _append(system, "1", from_id="a", to_id="b")
+    _append(system, "2", to_id="a", from_user=True)
+    coordinator = LegionCoordinator(system)
+
+    assert (await coordinator._get_last_outgoing_comm("L", from_minion_id="a"))["comm_id"] == "1"
+    assert (await coordinator._get_last_outgoing_comm("L", from_user=True))["comm_id"] == "2"
+    assert await coordinator._get_last_outgoing_comm("L", from_minion_id="b") is None
+    assert await coordinator._get_last_outgoing_comm("missing", from_user=True) is None
@@ -0,0 +1,176 @@
+"""Tests for the ring-buffer EventQueue: eviction, batching, delta coalescing."""
+
+import asyncio
+import json
+import time
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from ..event_queue import EventQueue, coalesce_deltas
+
+
+def _delta(text: str, uuid: str = "u1", index: int = 0, delta_type: str = "text_delta") -> dict:
+    field = {"text_delta": "text", "thinking_delta": "thinking"}[delta_type]
+    return {
+        "type": "assistant_delta",
+        "session_id": "s1",
+        "data": {
+            "uuid": uuid,
+            "event": {"type": "content_block_delta", "index": index,
+                      "delta": {"type": delta_type, field: text}},
+            "message_id": "m1",
+            "tool_use_id": None,
+        },
+        "timestamp": text,
+    }
+
+
+class TestRingBuffer:
+    def test_eviction_keeps_cursor_arithmetic(self):
+        q = EventQueue()
+        q.MAX_SIZE = 4
+        for i in range(10):
+            q.append({"i": i})
+
+        events, cursor = q.events_since(7)
+        assert [e["i"] for e in events] == [7, 8, 9]
+        assert cursor == 10
+
+    def test_cursor_ahead_of_queue_returns_nothing(self):
+        q = EventQueue()
+        q.append({"i": 0})
+        assert q.events_since(5) == ([], 1)
+
+    def test_batch_cap_returns_partial_cursor(self):
+        q = EventQueue()
+        q.MAX_BATCH = 3
+        for i in range(7):
+            q.append({"i": i})
+
+        events, cursor = q.events_since(0)
+        assert [e["i"] for e in events] == [0, 1, 2]
+        assert cursor == 3
+
+        events, cursor = q.events_since(cursor)
+        assert [e["i"] for e in events] == [3, 4, 5]
+        events, cursor = q.events_since(cursor)
+        assert [e["i"] for e in events] == [6]
+        assert cursor == 7
+
+    async def test_waiters_wake_once_per_append(self):
+        q = EventQueue()
+        waiter = asyncio.create_task(q.wait_for_events(0, timeout=5.0))
+        await asyncio.sleep(0)
+        assert len(q._waiters) == 1
+        q.append({"type": "x"})
+        await asyncio.wait_for(waiter, timeout=1.0)
+        assert not q._waiters
+
+        # A fresh wait after the head was consumed parks again.
+        start = time.monotonic()
+        await q.wait_for_events(1, timeout=0.1)
+        assert time.monotonic() - start >= 0.09
+
+
+class TestDeltaCoalescing:
+    def test_merges_consecutive_same_block(self):
+        merged = coalesce_deltas([_delta("a"), _delta("b"), _delta("c")])
+        assert len(merged) == 1
+        assert merged[0]["data"]["event"]["delta"]["text"] == "abc"
+        assert merged[0]["timestamp"] == "c"
+
+    def test_does_not_merge_across_blocks_or_types(self):
+        events = [
+            _delta("a", index=0),
+            _delta("b", index=1),
+            _delta("t", index=1, delta_type="thinking_delta"),
+            {"type": "message", "data": {}},
+            _delta("c", index=1),
+        ]
+        assert len(coalesce_deltas(events)) == 5
+
+    def test_buffered_events_not_mutated(self):
+        original = [_delta("a"), _delta("b")]
+        coalesce_deltas(original)
+        assert original[0]["data"]["event"]["delta"]["text"] == "a"
+
+    def test_lagging_reader_gets_coalesced_batch(self):
+        q = EventQueue()
+        q.COALESCE_LAG = 5
+        for ch in "hello world":
+            q.append(_delta(ch))
+
+        events, cursor = q.events_since(0)
+        assert cursor == 11
+        assert len(events) == 1
+        assert events[0]["data"]["event"]["delta"]["text"] == "hello world"
+
+    def test_caught_up_reader_gets_raw_deltas(self):
+        q = EventQueue()
+        for ch in "abc":
+            q.append(_delta(ch))
+
+        events, _ = q.events_since(0)
+        assert len(events) == 3
+
+
+@pytest.mark.slow
+async def test_benchmark_poll_session_delta_stream():
+    """Drive 50 sessions x 200 deltas/sec through /api/poll/session/{id} (run with -m slow -s)."""
+    from fastapi import FastAPI
+    from httpx import ASGITransport, AsyncClient
+
+    from ..routers.poll import build_router
+
+    sessions, rate, duration = 50, 200, 3.0
+    webui = MagicMock()
+    webui.session_queues = {f"s{i}": EventQueue() for i in range(sessions)}
+    webui.coordinator.session_manager.mark_viewed = AsyncMock()
+    app = FastAPI()
+    app.include_router(build_router(webui))
+
+    stop = asyncio.Event()
+    stats = {"requests": 0, "events": 0, "bytes": 0, "appended": 0}
+
+    async def producer():
+        tick = 0.01
+        per_tick = int(rate * tick)
+        while not stop.is_set():
+            for queue in webui.session_queues.values():
+                for _ in range(per_tick):
+                    queue.append(_delta("tok "))
+                    stats["appended"] += 1
+            await asyncio.sleep(tick)
+
+    async def poller(client, sid, slow: bool):
+        cursor = 0
+        while not stop.is_set():
+            resp = await client.get(f"/api/poll/session/{sid}", params={"since": cursor, "timeout": 1})
+            body = resp.json()
+            stats["requests"] += 1
+            stats["events"] += len(body["events"])
+            stats["bytes"] += len(json.dumps(body))
+            cursor = body["next_cursor"]
+            if slow:
+                await asyncio.sleep(0.5)  # a backgrounded tab
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        tasks = [asyncio.create_task(producer())]
+        tasks += [
+            asyncio.create_task(poller(client, sid, slow=(i % 5 == 0)))
+            for i, sid in enumerate(webui.session_queues)
+        ]
+        start = time.perf_counter()
+        await asyncio.sleep(duration)
+        stop.set()
+        await asyncio.gather(*tasks)
+        elapsed = time.perf_counter() - start
+
+    print(
+        f"\n{sessions} sessions x {rate} deltas/s for {elapsed:.1f}s: "
+        f"appended={stats['appended']} requests={stats['requests']} "
+        f"events_delivered={stats['events']} bytes={stats['bytes']}"
+    )
+    assert stats["requests"] > 0
@@ -0,0 +1,286 @@
+"""Tests for the cached, incrementally extended history projection (get_session_messages)."""
+
+import tempfile
+import uuid
+from pathlib import Path
+
+import pytest
+
+from ..history_projection import HistoryProjectionCache
+from ..session_config import SessionConfig
+from ..session_coordinator import SessionCoordinator
+from ..session_manager import SessionState
+
+
+@pytest.fixture
+async def coordinator():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        coordinator = SessionCoordinator(Path(temp_dir))
+        await coordinator.initialize()
+        yield coordinator
+        await coordinator.cleanup()
+
+
+@pytest.fixture
+async def session_id(coordinator):
+    project = await coordinator.project_manager.create_project(
+        name="Test Project", working_directory="/test/project"
+    )
+    return await coordinator.create_session(
+        session_id=str(uuid.uuid4()),
+        project_id=project.project_id,
+        config=SessionConfig(permission_mode="acceptEdits"),
+    )
+
+
+def _text(content: str) -> dict:
+    return {"type": "user", "content": content, "metadata": {}}
+
+
+def _tool_use(tool_use_id: str) -> dict:
+    return {
+        "type": "assistant",
+        "content": "",
+        "metadata": {
+            "has_tool_uses": True,
+            "tool_uses": [{"id": tool_use_id, "name": "Read", "input": {"file_path": "/x"}}],
+        },
+    }
+
+
+def _tool_result(tool_use_id: str) -> dict:
+    return {
+        "type": "user",
+        "content": "",
+        "metadata": {
+            "has_tool_results": True,
+            "tool_results": [{"tool_use_id": tool_use_id, "content": "ok"}],
+        },
+    }
+
+
+async def _uncached(coordinator, session_id, **kwargs) -> dict:
+    saved = coordinator._history_projection
+    coordinator._history_projection = HistoryProjectionCache()
+    try:
+        return await coordinator.get_session_messages(session_id, **kwargs)
+    finally:
+        coordinator._history_projection = saved
+
+
+class TestHistoryProjection:
+    async def test_repeat_request_is_hit(self, coordinator, session_id):
+        storage = coordinator._storage_managers[session_id]
+        for i in range(3):
+            await storage.append_message(_text(f"m{i}"))
+
+        first = await coordinator.get_session_messages(session_id, limit=100, offset=0)
+        second = await coordinator.get_session_messages(session_id, limit=100, offset=0)
+
+        assert second == first
+        stats = coordinator.get_history_projection_stats()
+        assert (stats["misses"], stats["hits"]) == (1, 1)
+        assert stats["lines_folded"] == 3
+
+    async def test_appends_extend_fold_incrementally(self, coordinator, session_id):
+        storage = coordinator._storage_managers[session_id]
+        await storage.append_message(_tool_use("t1"))
+        await coordinator.get_session_messages(session_id, limit=100, offset=0)
+
+        await storage.append_message(_text("between"))
+        await storage.append_message(_tool_result("t1"))
+        result = await coordinator.get_session_messages(session_id, limit=100, offset=0)
+
+        stats = coordinator.get_history_projection_stats()
+        assert stats["extends"] == 1
+        assert stats["lines_folded"] == 3
+        assert result == await _uncached(coordinator, session_id, limit=100, offset=0)
+        statuses = [m["status"] for m in result["messages"] if m.get("type") == "tool_call"]
+        assert statuses == ["pending", "completed"]
+
+    async def test_full_page_stops_growing(self, coordinator, session_id):
+        storage = coordinator._storage_managers[session_id]
+        for i in range(3):
+            await storage.append_message(_text(f"m{i}"))
+        await coordinator.get_session_messages(session_id, limit=2, offset=0)
+
+        await storage.append_message(_text("m3"))
+        result = await coordinator.get_session_messages(session_id, limit=2, offset=0)
+
+        assert [m["content"] for m in result["messages"]] == ["m0", "m1"]
+        assert result["has_more"] is True
+        assert coordinator.get_history_projection_stats()["hits"] == 1
+
+    async def test_clear_messages_invalidates(self, coordinator, session_id):
+        storage = coordinator._storage_managers[session_id]
+        await storage.append_message(_text("old"))
+        await coordinator.get_session_messages(session_id, limit=100, offset=0)
+
+        await storage.clear_messages()
+        await storage.append_message(_text("new"))
+        result = await coordinator.get_session_messages(session_id, limit=100, offset=0)
+
+        assert [m["content"] for m in result["messages"]] == ["new"]
+        assert coordinator.get_history_projection_stats()["invalidations"] == 1
+
+    async def test_interrupted_tools_not_baked_into_cache(self, coordinator, session_id):
+        storage = coordinator._storage_managers[session_id]
+        await storage.append_message(_tool_use("t1"))
+        await coordinator.session_manager.update_session_state(session_id, SessionState.TERMINATED)
+
+        stopped = await coordinator.get_session_messages(session_id, limit=100, offset=0)
+        assert stopped["messages"][-1]["status"] == "interrupted"
+
+        await storage.append_message(_tool_result("t1"))
+        resumed = await coordinator.get_session_messages(session_id, limit=100, offset=0)
+        statuses = [m["status"] for m in resumed["messages"] if m.get("type") == "tool_call"]
+        assert statuses == ["pending", "completed"]
+
+    async def test_malformed_line_in_extended_page_not_refolded(self, coordinator, session_id):
+        storage = coordinator._storage_managers[session_id]
+        await storage.append_message(_text("m0"))
+        await storage.append_message(_text("m1"))
+        await coordinator.get_session_messages(session_id, limit=100, offset=0)
+
+        # A torn write lands between two complete appends
+        storage.messages_writer.flush()
+        with open(storage.messages_file, "ab") as f:
+            f.write(b'{"type": "user", "cont\n')
+        await storage.append_message(_text("m2"))
+        await storage.append_message(_text("m3"))
+
+        extended = await coordinator.get_session_messages(session_id, limit=100, offset=0)
+        again = await coordinator.get_session_messages(session_id, limit=100, offset=0)
+
+        assert [m["content"] for m in extended["messages"]] == ["m0", "m1", "m2", "m3"]
+        assert again == extended
+        assert extended["total_count"] == 5
+        assert extended["has_more"] is False
+        stats = coordinator.get_history_projection_stats()
+        assert (stats["extends"], stats["hits"]) == (1, 1)
+
+    async def test_negative_offset_bypasses_cache(self, coordinator, session_id):
+        storage = coordinator._storage_managers[session_id]
+        for i in range(4):
+            await storage.append_message(_text(f"m{i}"))
+
+        result = await coordinator.get_session_messages(session_id, limit=2, offset=-2)
+
+        assert [m["content"] for m in result["messages"]] == ["m2", "m3"]
+        stats = coordinator.get_history_projection_stats()
+        assert stats["misses"] == stats["hits"] == 0
+
+
+def _with_id(message: dict, message_id: str) -> dict:
+    return {**message, "message_id": message_id}
+
+
+class TestCursorPages:
+    async def test_default_page_is_tail(self, coordinator, session_id):
+        storage = coordinator._storage_managers[session_id]
+        for i in range(10):
+            await storage.append_message(_with_id(_text(f"m{i}"), f"id{i}"))
+
+        meta, messages = await coordinator.get_session_messages_page(session_id, limit=3)
+
+        assert [m["content"] for m in messages] == ["m7", "m8", "m9"]
+        assert meta["before"] == "id7" and meta["after"] == "id9"
+        assert meta["has_more_before"] is True and meta["has_more_after"] is False
+
+    async def test_walk_backwards_and_forwards(self, coordinator, session_id):
+        storage = coordinator._storage_managers[session_id]
+        for i in range(5):
+            await storage.append_message(_with_id(_text(f"m{i}"), f"id{i}"))
+
+        meta, messages = await coordinator.get_session_messages_page(
+            session_id, before="id3", limit=2
+        )
+        assert [m["content"] for m in messages] == ["m1", "m2"]
+
+        meta, messages = await coordinator.get_session_messages_page(
+            session_id, after=meta["after"], limit=10
+        )
+        assert [m["content"] for m in messages] == ["m3", "m4"]
+        assert meta["has_more_after"] is False
+
+    async def test_lines_without_id_get_positional_cursor(self, coordinator, session_id):
+        import json
+
+        storage = coordinator._storage_managers[session_id]
+        # Legacy lines predate append-time message_id assignment
+        with open(storage.messages_file, "a") as f:
+            for i in range(4):
+                f.write(json.dumps(_text(f"m{i}")) + "\n")
+
+        meta, _ = await coordinator.get_session_messages_page(session_id, limit=2)
+        assert meta["before"] == "@2"
+
+        _, messages = await coordinator.get_session_messages_page(
+            session_id, before=meta["before"], limit=2
+        )
+        assert [m["content"] for m in messages] == ["m0", "m1"]
+
+    async def test_malformed_last_line_gets_positional_after_cursor(self, coordinator, session_id):
+        storage = coordinator._storage_managers[session_id]
+        for i in range(3):
+            await storage.append_message(_with_id(_text(f"m{i}"), f"id{i}"))
+        storage.messages_writer.flush()
+        with open(storage.messages_file, "ab") as f:
+            f.write(b'{"type": "user", "cont\n')
+
+        meta, messages = await coordinator.get_session_messages_page(session_id, limit=10)
+        assert [m["content"] for m in messages] == ["m0", "m1", "m2"]
+        assert (meta["end"], meta["after"]) == (4, "@3")
+        assert meta["has_more_after"] is False
+
+        meta, messages = await coordinator.get_session_messages_page(session_id, after=meta["after"])
+        assert messages == []
+        assert meta["has_more_after"] is False
+
+    async def test_no_storage_is_empty_page(self, coordinator):
+        meta, messages = await coordinator.get_session_messages_page("not-loaded")
+        assert messages == []
+        assert meta["total_count"] == 0 and meta["has_more_before"] is False
+
+    async def test_unknown_cursor_raises(self, coordinator, session_id):
+        with pytest.raises(ValueError):
+            await coordinator.get_session_messages_page(session_id, before="missing")
+
+    async def test_find_message_line_scans_blocks(self, coordinator, session_id):
+        storage = coordinator._storage_managers[session_id]
+        for i in range(50):
+            await storage.append_message(_with_id(_text(f"m{i}"), f"id{i}"))
+
+        assert await storage.find_message_line("id3", block_size=7) == 3
+        assert await storage.find_message_line("id49", block_size=7) == 49
+        assert await storage.find_message_line("nope", block_size=7) is None
+
+
+async def test_stream_endpoint_emits_ndjson():
+    import json
+    from unittest.mock import AsyncMock, MagicMock
+
+    from fastapi import FastAPI
+    from httpx import ASGITransport, AsyncClient
+
+    from ..routers.sessions import build_router
+
+    webui = MagicMock()
+    webui.service.get_session_exists = AsyncMock(return_value=True)
+    webui.coordinator.get_session_messages_page = AsyncMock(
+        return_value=({"type": "page", "before": "a", "after": "b"}, [{"content": "x"}])
+    )
+    webui.session_queues = {}
+    app = FastAPI()
+    app.include_router(build_router(webui))
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://t") as client:
+        resp = await client.get("/api/sessions/s1/messages/stream", params={"before": "b"})
+
+    assert resp.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in resp.text.splitlines()]
+    assert lines[0]["type"] == "page"
+    assert lines[1] == {"content": "x"}
+    webui.coordinator.get_session_messages_page.assert_awaited_once_with(
+        "s1", before="b", after=None, limit=50
+    )
@@ -0,0 +1,181 @@
+"""Tests for the messages.jsonl sidecar offset index."""
+
+import json
+import time
+
+import pytest
+
+from ..data_storage import DataStorageManager
+from ..message_index import ENTRY_SIZE, MessageOffsetIndex
+
+
+def _write_lines(path, records):
+    with open(path, "w", encoding="utf-8") as f:
+        for rec in records:
+            f.write(json.dumps(rec) + "\n")
+
+
+@pytest.fixture
+async def storage(tmp_path):
+    manager = DataStorageManager(tmp_path / "session")
+    await manager.initialize()
+    return manager
+
+
+class TestMessageOffsetIndex:
+    def test_rebuilds_when_missing(self, tmp_path):
+        log = tmp_path / "messages.jsonl"
+        _write_lines(log, [{"n": i} for i in range(5)])
+        index = MessageOffsetIndex(log)
+
+        assert index.count() == 5
+        assert index.index_file.stat().st_size == 5 * ENTRY_SIZE
+        assert [json.loads(line)["n"] for line in index.read_lines(1, 3)] == [1, 2]
+
+    def test_blank_lines_folded_into_next_record(self, tmp_path):
+        log = tmp_path / "messages.jsonl"
+        log.write_text('{"n": 0}\n\n\n{"n": 1}\n', encoding="utf-8")
+        index = MessageOffsetIndex(log)
+
+        assert index.count() == 2
+        assert [json.loads(line)["n"] for line in index.read_lines(1, 2)] == [1]
+
+    def test_partial_trailing_line_not_indexed(self, tmp_path):
+        log = tmp_path / "messages.jsonl"
+        log.write_text('{"n": 0}\n{"n": 1', encoding="utf-8")
+        index = MessageOffsetIndex(log)
+
+        assert index.count() == 1
+
+    def test_catches_up_on_external_append(self, tmp_path):
+        log = tmp_path / "messages.jsonl"
+        _write_lines(log, [{"n": 0}])
+        index = MessageOffsetIndex(log)
+        assert index.count() == 1
+
+        with open(log, "a", encoding="utf-8") as f:
+            f.write('{"n": 1}\n{"n": 2}\n')
+
+        assert index.count() == 3
+        assert json.loads(index.read_lines(2, 3)[0])["n"] == 2
+
+    def test_rebuilds_after_truncation(self, tmp_path):
+        log = tmp_path / "messages.jsonl"
+        _write_lines(log, [{"n": i} for i in range(10)])
+        index = MessageOffsetIndex(log)
+        assert index.count() == 10
+
+        _write_lines(log, [{"n": 99}])
+
+        assert index.count() == 1
+        assert json.loads(index.read_lines(0, 1)[0])["n"] == 99
+
+    def test_persisted_index_reused_by_new_instance(self, tmp_path):
+        log = tmp_path / "messages.jsonl"
+        _write_lines(log, [{"n": i} for i in range(4)])
+        MessageOffsetIndex(log).count()
+
+        reopened = MessageOffsetIndex(log)
+        assert reopened.count() == 4
+        assert json.loads(reopened.read_lines(3, 4)[0])["n"] == 3
+
+    def test_corrupt_index_size_triggers_rebuild(self, tmp_path):
+        log = tmp_path / "messages.jsonl"
+        _write_lines(log, [{"n": i} for i in range(3)])
+        (tmp_path / "messages.idx").write_bytes(b"\x01\x02\x03")
+
+        assert MessageOffsetIndex(log).count() == 3
+
+    @pytest.mark.parametrize(
+        "offset,limit,expected",
+        [
+            (0, None, (0, 10)),
+            (2, 3, (2, 5)),
+            (8, 5, (8, 10)),
+            (-3, None, (7, 10)),
+            (-3, 2, (7, 9)),
+            (-50, 5, (0, 5)),
+            (50, 5, (10, 10)),
+        ],
+    )
+    def test_resolve(self, tmp_path, offset, limit, expected):
+        log = tmp_path / "messages.jsonl"
+        _write_lines(log, [{"n": i} for i in range(10)])
+        assert MessageOffsetIndex(log).resolve(offset, limit) == expected
+
+
+class TestDataStorageIndexIntegration:
+    async def test_append_maintains_index(self, storage):
+        for i in range(5):
+            await storage.append_message({"n": i})
+
+        assert storage.messages_index.index_file.stat().st_size == 5 * ENTRY_SIZE
+        assert await storage.get_message_count() == 5
+
+    async def test_negative_offset_reads_tail(self, storage):
+        for i in range(10):
+            await storage.append_message({"n": i})
+
+        tail = await storage.read_messages(limit=3, offset=-3)
+        assert [m["n"] for m in tail] == [7, 8, 9]
+
+    async def test_clear_messages_resets_index(self, storage):
+        for i in range(3):
+            await storage.append_message({"n": i})
+        await storage.clear_messages()
+
+        assert await storage.get_message_count() == 0
+        await storage.append_message({"n": 42})
+        assert [m["n"] for m in await storage.read_messages()] == [42]
+
+    async def test_legacy_session_without_index(self, storage):
+        _write_lines(storage.messages_file, [{"n": i} for i in range(6)])
+
+        page = await storage.read_messages(limit=2, offset=2)
+        assert [m["n"] for m in page] == [2, 3]
+        assert await storage.get_message_count() == 6
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize("line_count", [1_000, 100_000, 1_000_000])
+def test_benchmark_indexed_page_read(tmp_path, line_count):
+    """Compare full-file readlines paging with indexed seeks (run with -m slow -s)."""
+    log = tmp_path / "messages.jsonl"
+    payload = "x" * 200
+    with open(log, "w", encoding="utf-8") as f:
+        for i in range(line_count):
+            f.write(json.dumps({"n": i, "content": payload}) + "\n")
+
+    offset, limit = line_count // 2, 50
+
+    t0 = time.perf_counter()
+    with open(log, encoding="utf-8") as f:
+        legacy = [json.loads(line) for line in f.readlines()[offset:offset + limit]]
+    legacy_read = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    with open(log, encoding="utf-8") as f:
+        legacy_count = sum(1 for line in f if line.strip())
+    legacy_count_time = time.perf_counter() - t0
+
+    index = MessageOffsetIndex(log)
+    t0 = time.perf_counter()
+    index.count()
+    build = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    start, stop = index.resolve(offset, limit)
+    indexed = [json.loads(line) for line in index.read_lines(start, stop)]
+    indexed_read = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    indexed_count = index.count()
+    indexed_count_time = time.perf_counter() - t0
+
+    assert indexed == legacy
+    assert indexed_count == legacy_count == line_count
+    print(
+        f"\n{line_count:>9} lines: page legacy={legacy_read * 1000:.2f}ms "
+        f"indexed={indexed_read * 1000:.2f}ms | count legacy={legacy_count_time * 1000:.2f}ms "
+        f"indexed={indexed_count_time * 1000:.3f}ms | one-off build={build * 1000:.2f}ms"
+    )
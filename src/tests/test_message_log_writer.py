@@ -0,0 +1,207 @@
+"""Tests for the buffered messages.jsonl append writer."""
+
+import asyncio
+import json
+
+import pytest
+
+from ..config_manager import MessageLogConfig
+from ..data_storage import DataStorageManager
+from ..message_index import MessageOffsetIndex
+from ..message_log_writer import MessageFlushPolicy, MessageLogWriter
+
+BUFFERED = MessageFlushPolicy(
+    flush_bytes=1 << 20, flush_interval_ms=20, fsync_on_result=True, idle_close_seconds=30
+)
+
+
+def _line(n: int) -> bytes:
+    return (json.dumps({"n": n}) + "\n").encode()
+
+
+class _FlakyHandle:
+    """Append handle that writes at most ``chunk`` bytes per call and can fail after
+    ``fail_after`` bytes."""
+
+    def __init__(self, handle, chunk: int, fail_after: int | None = None):
+        self._handle = handle
+        self._chunk = chunk
+        self._budget = fail_after
+
+    def write(self, data) -> int:
+        if self._budget is not None and self._budget <= 0:
+            raise OSError(28, "No space left on device")
+        size = self._chunk if self._budget is None else min(self._chunk, self._budget)
+        written = self._handle.write(data[:size])
+        if self._budget is not None:
+            self._budget -= written
+        return written
+
+    def __getattr__(self, name):
+        return getattr(self._handle, name)
+
+
+def _flaky(writer: MessageLogWriter, **kwargs) -> None:
+    real_open = writer._open
+
+    def _open():
+        handle = real_open()
+        return handle if isinstance(handle, _FlakyHandle) else _FlakyHandle(handle, **kwargs)
+
+    writer._open = _open
+
+
+@pytest.fixture
+async def buffered_storage(tmp_path):
+    manager = DataStorageManager(tmp_path / "session", BUFFERED)
+    await manager.initialize()
+    yield manager
+    await manager.close()
+
+
+class TestMessageFlushPolicy:
+    def test_defaults_come_from_config(self):
+        assert MessageFlushPolicy() == MessageFlushPolicy.from_config(MessageLogConfig())
+        custom = MessageLogConfig(flush_bytes=1, idle_close_seconds=5)
+        assert MessageFlushPolicy.from_config(custom).idle_close_seconds == 5
+
+
+class TestMessageLogWriter:
+    async def test_write_through_default(self, tmp_path):
+        log = tmp_path / "messages.jsonl"
+        writer = MessageLogWriter(log)
+
+        writer.write(_line(0))
+
+        assert log.read_bytes() == _line(0)
+        assert writer.pending_count == 0
+        assert writer._handle is None
+
+    async def test_buffered_until_interval(self, tmp_path):
+        log = tmp_path / "messages.jsonl"
+        log.touch()
+        writer = MessageLogWriter(log, policy=BUFFERED)
+
+        for i in range(3):
+            writer.write(_line(i))
+        assert log.read_bytes() == b""
+        assert writer.pending_count == 3
+
+        await asyncio.sleep(0.1)
+        assert log.read_bytes() == b"".join(_line(i) for i in range(3))
+        await writer.close()
+
+    async def test_flush_on_size(self, tmp_path):
+        log = tmp_path / "messages.jsonl"
+        policy = MessageFlushPolicy(flush_bytes=len(_line(0)) * 2, flush_interval_ms=10_000)
+        writer = MessageLogWriter(log, policy=policy)
+
+        writer.write(_line(0))
+        assert not log.exists() or log.read_bytes() == b""
+        writer.write(_line(1))
+        assert log.read_bytes() == _line(0) + _line(1)
+        await writer.close()
+
+    async def test_durable_write_flushes_immediately(self, tmp_path):
+        log = tmp_path / "messages.jsonl"
+        writer = MessageLogWriter(log, policy=BUFFERED)
+
+        writer.write(_line(0))
+        writer.write(_line(1), durable=True)
+
+        assert log.read_bytes() == _line(0) + _line(1)
+        await writer.aflush()
+        await writer.close()
+
+    async def test_discard_drops_pending(self, tmp_path):
+        log = tmp_path / "messages.jsonl"
+        log.touch()
+        writer = MessageLogWriter(log, policy=BUFFERED)
+
+        writer.write(_line(0))
+        await writer.discard()
+        await asyncio.sleep(0.05)
+
+        assert log.read_bytes() == b""
+
+    async def test_short_writes_are_completed(self, tmp_path):
+        log = tmp_path / "messages.jsonl"
+        index = MessageOffsetIndex(log)
+        writer = MessageLogWriter(log, index, policy=BUFFERED)
+        _flaky(writer, chunk=5)
+
+        for i in range(3):
+            writer.write(_line(i))
+        writer.flush()
+
+        assert log.read_bytes() == b"".join(_line(i) for i in range(3))
+        assert index.read_lines(1, 3) == [_line(1).strip(), _line(2).strip()]
+        await writer.close()
+
+    async def test_failed_write_keeps_unwritten_records(self, tmp_path):
+        log = tmp_path / "messages.jsonl"
+        index = MessageOffsetIndex(log)
+        writer = MessageLogWriter(log, index, policy=BUFFERED)
+        _flaky(writer, chunk=4, fail_after=len(_line(0)) + 3)
+
+        for i in range(3):
+            writer.write(_line(i))
+        with pytest.raises(OSError):
+            writer.flush()
+
+        # The torn second record is cut off; it and the third are still queued
+        assert log.read_bytes() == _line(0)
+        assert writer.pending_count == 2
+        assert index.count() == 1
+
+        writer._open = MessageLogWriter._open.__get__(writer)
+        writer.flush()
+        assert log.read_bytes() == b"".join(_line(i) for i in range(3))
+        assert index.count() == 3
+        await writer.close()
+
+
+class TestBufferedDataStorage:
+    async def test_reads_see_buffered_messages(self, buffered_storage):
+        for i in range(5):
+            await buffered_storage.append_message({"n": i})
+
+        assert await buffered_storage.get_message_count() == 5
+        assert [m["n"] for m in await buffered_storage.read_messages()] == list(range(5))
+
+    async def test_index_tracks_batched_flush(self, buffered_storage):
+        for i in range(4):
+            await buffered_storage.append_message({"n": i})
+        await buffered_storage.flush()
+
+        page = await buffered_storage.read_messages(limit=2, offset=-2)
+        assert [m["n"] for m in page] == [2, 3]
+
+    async def test_on_append_hooks_fire_in_order(self, buffered_storage):
+        seen = []
+
+        async def hook(_session_id, _project_id, message):
+            seen.append(message["n"])
+
+        buffered_storage.on_append.append(hook)
+        for i in range(5):
+            await buffered_storage.append_message({"n": i})
+
+        assert seen == list(range(5))
+
+    async def test_close_flushes_pending(self, tmp_path):
+        manager = DataStorageManager(tmp_path / "session", BUFFERED)
+        await manager.initialize()
+        await manager.append_message({"n": 1})
+
+        await manager.close()
+
+        lines = manager.messages_file.read_text().splitlines()
+        assert [json.loads(line)["n"] for line in lines] == [1]
+
+    async def test_clear_messages_discards_buffer(self, buffered_storage):
+        await buffered_storage.append_message({"n": 1})
+        await buffered_storage.clear_messages()
+        await buffered_storage.append_message({"n": 2})
+
+        assert [m["n"] for m in await buffered_storage.read_messages()] == [2]
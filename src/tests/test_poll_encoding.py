@@ -0,0 +1,178 @@
+"""Tests for tool_call patch encoding and gzip poll responses."""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from ..event_queue import EventQueue
+from ..poll_encoding import accepts_gzip, make_tool_call_patch, payload_stats, tool_call_data
+from ..routers.poll import build_router
+
+
+def _tool_call(status: str, envelope: str = "tool_call", **extra) -> dict:
+    data = {
+        "tool_use_id": "t1",
+        "session_id": "s1",
+        "name": "Read",
+        "input": {"file_path": "/big"},
+        "status": status,
+        **extra,
+    }
+    if envelope == "message":
+        return {"type": "message", "session_id": "s1", "data": {**data, "type": "tool_call"}}
+    return {"type": "tool_call", "session_id": "s1", "data": data}
+
+
+class TestToolCallPatch:
+    def test_detects_both_envelopes(self):
+        assert tool_call_data(_tool_call("pending"))["tool_use_id"] == "t1"
+        assert tool_call_data(_tool_call("pending", envelope="message"))["tool_use_id"] == "t1"
+        assert tool_call_data({"type": "message", "data": {"type": "assistant"}}) is None
+
+    def test_patch_contains_only_changes(self):
+        before = _tool_call("running", permission={"x": 1})
+        after = _tool_call("completed", result="x" * 5000)
+        patch, saved = make_tool_call_patch(after, before["data"], after["data"])
+
+        assert patch["type"] == "tool_call_patch"
+        assert patch["data"] == {
+            "tool_use_id": "t1",
+            "set": {"status": "completed", "result": "x" * 5000},
+            "unset": ["permission"],
+        }
+        assert saved > 0
+
+
+class TestAcceptEncoding:
+    @pytest.mark.parametrize("header, expected", [
+        ("gzip", True),
+        ("br, GZIP;q=0.5", True),
+        ("*", True),
+        ("", False),
+        ("identity", False),
+        ("gzip;q=0", False),
+        ("gzip; q=0.000", False),
+        ("gzip;q=0, *", False),
+        ("*;q=0", False),
+        ("br, *;q=0.1", True),
+        ("gzip;q=abc", False),
+    ])
+    def test_q_values(self, header, expected):
+        assert accepts_gzip(header) is expected
+
+
+class TestQueuePatches:
+    def test_opt_in_only(self):
+        q = EventQueue()
+        q.append(_tool_call("pending"))
+        q.append(_tool_call("running"))
+
+        events, _ = q.events_since(1)
+        assert events[0]["type"] == "tool_call"
+        events, _ = q.events_since(1, patch=True)
+        assert events[0]["type"] == "tool_call_patch"
+        assert events[0]["data"]["set"] == {"status": "running"}
+
+    def test_base_in_same_batch_is_patched(self):
+        q = EventQueue()
+        q.append(_tool_call("pending"))
+        q.append(_tool_call("running"))
+
+        events, _ = q.events_since(0, patch=True)
+        assert [e["type"] for e in events] == ["tool_call", "tool_call_patch"]
+
+    def test_evicted_base_falls_back_to_full_event(self):
+        q = EventQueue()
+        q.MAX_SIZE = 3
+        q.append(_tool_call("pending"))
+        q.append({"type": "other"})
+        q.append(_tool_call("running"))
+
+        # Reader at 1 already holds the pending event: the patch is safe.
+        events, _ = q.events_since(1, patch=True)
+        assert events[-1]["type"] == "tool_call_patch"
+
+        q.append(_tool_call("completed"))
+        q.append({"type": "other"})
+        # Base (running, cursor 3) is evicted before anyone asked for this patch
+        q.append({"type": "other"})
+        events, _ = q.events_since(0, patch=True)
+        assert [e["type"] for e in events] == ["tool_call", "other", "other"]
+
+    def test_patches_built_lazily_and_memoized(self):
+        q = EventQueue()
+        q.append(_tool_call("pending"))
+        q.append(_tool_call("running"))
+        assert q._tool_call_patches == {}
+
+        first, _ = q.events_since(1, patch=True)
+        again, _ = q.events_since(1, patch=True)
+        assert first[0] is again[0]
+
+    def test_mixed_envelopes_share_base(self):
+        q = EventQueue()
+        q.append(_tool_call("pending", envelope="message"))
+        q.append(_tool_call("awaiting_permission"))
+
+        events, _ = q.events_since(1, patch=True)
+        assert events[0]["data"]["set"] == {"status": "awaiting_permission"}
+        assert events[0]["data"]["unset"] == ["type"]
+
+
+@pytest.fixture
+def webui():
+    webui = MagicMock()
+    webui.ui_queue = EventQueue()
+    webui.session_queues = {"s1": EventQueue()}
+    webui.coordinator.session_manager.mark_viewed = AsyncMock()
+    return webui
+
+
+@pytest.fixture
+def app(webui):
+    app = FastAPI()
+    app.include_router(build_router(webui))
+    return app
+
+
+class TestPollResponses:
+    async def test_large_response_gzipped_when_accepted(self, app, webui):
+        webui.session_queues["s1"].append(_tool_call("completed", result="y" * 10_000))
+        before = payload_stats.gzip_bytes_in
+
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://t") as client:
+            resp = await client.get(
+                "/api/poll/session/s1", params={"timeout": 0},
+                headers={"Accept-Encoding": "gzip"},
+            )
+        assert resp.headers["content-encoding"] == "gzip"
+        assert resp.json()["events"][0]["data"]["result"] == "y" * 10_000
+        assert payload_stats.gzip_bytes_in > before
+
+    async def test_identity_when_gzip_not_accepted(self, app, webui):
+        webui.session_queues["s1"].append(_tool_call("completed", result="y" * 10_000))
+
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://t") as client:
+            resp = await client.get(
+                "/api/poll/session/s1", params={"timeout": 0},
+                headers={"Accept-Encoding": "identity"},
+            )
+        assert "content-encoding" not in resp.headers
+        assert len(resp.content) > 10_000
+
+    async def test_patch_param_and_stats(self, app, webui):
+        queue = webui.session_queues["s1"]
+        queue.append(_tool_call("pending", input={"content": "z" * 4000}))
+        queue.append(_tool_call("completed", input={"content": "z" * 4000}))
+
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://t") as client:
+            resp = await client.get(
+                "/api/poll/session/s1", params={"since": 1, "timeout": 0, "patch": 1}
+            )
+            stats = (await client.get("/api/poll/stats")).json()
+
+        assert resp.json()["events"][0]["type"] == "tool_call_patch"
+        assert stats["patch_bytes_saved"] >= 4000
+        assert "gzip_bytes_saved" in stats
@@ -0,0 +1,114 @@
+"""Tests for the multiplexed /api/poll/multi endpoint and EventQueue.wait_for_any."""
+
+import asyncio
+import time
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from ..event_queue import EventQueue, wait_for_any
+from ..routers.poll import build_router
+
+
+@pytest.fixture
+def webui():
+    webui = MagicMock()
+    webui.ui_queue = EventQueue()
+    webui.session_queues = {"s1": EventQueue(), "s2": EventQueue()}
+    webui.service.get_session_exists = AsyncMock(side_effect=lambda sid: sid in ("s1", "s2", "s3"))
+    webui.coordinator.session_manager.mark_viewed = AsyncMock()
+    return webui
+
+
+@pytest.fixture
+async def client(webui):
+    app = FastAPI()
+    app.include_router(build_router(webui))
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as c:
+        yield c
+
+
+class TestWaitForAny:
+    async def test_returns_immediately_when_any_queue_ahead(self):
+        a, b = EventQueue(), EventQueue()
+        b.append({"x": 1})
+        start = time.monotonic()
+        await wait_for_any([(a, 0), (b, 0)], timeout=5.0)
+        assert time.monotonic() - start < 0.5
+
+    async def test_wakes_on_append_to_any_queue_and_unregisters(self):
+        queues = [EventQueue() for _ in range(30)]
+        waiter = asyncio.create_task(wait_for_any([(q, 0) for q in queues], timeout=5.0))
+        await asyncio.sleep(0)
+        assert all(len(q._waiters) == 1 for q in queues)
+
+        queues[17].append({"x": 1})
+        await asyncio.wait_for(waiter, timeout=1.0)
+
+        assert all(not q._waiters for q in queues)
+
+    async def test_timeout_unregisters(self):
+        q = EventQueue()
+        await wait_for_any([(q, 0)], timeout=0.01)
+        assert not q._waiters
+
+
+class TestPollMulti:
+    async def test_returns_events_for_all_watched_queues(self, client, webui):
+        webui.ui_queue.append({"type": "ui"})
+        webui.session_queues["s2"].append({"type": "s2"})
+
+        resp = await client.post("/api/poll/multi", json={"ui": 0, "sessions": {"s1": 0, "s2": 0}})
+        body = resp.json()
+
+        assert resp.status_code == 200
+        caught_up = {"has_more": False}
+        assert body["ui"] == {"events": [{"type": "ui"}], "next_cursor": 1, **caught_up}
+        assert body["sessions"]["s1"] == {"events": [], "next_cursor": 0, **caught_up}
+        assert body["sessions"]["s2"] == {"events": [{"type": "s2"}], "next_cursor": 1, **caught_up}
+        assert body["missing"] == []
+
+    async def test_parks_until_any_session_appends(self, client, webui):
+        async def later():
+            await asyncio.sleep(0.05)
+            webui.session_queues["s1"].append({"type": "late"})
+
+        task = asyncio.create_task(later())
+        resp = await client.post("/api/poll/multi", json={"sessions": {"s1": 0, "s2": 0}, "timeout": 5})
+        await task
+
+        body = resp.json()
+        assert body["ui"] is None
+        assert body["sessions"]["s1"]["events"] == [{"type": "late"}]
+
+    async def test_unknown_sessions_reported_and_new_queues_created(self, client, webui):
+        resp = await client.post(
+            "/api/poll/multi", json={"sessions": {"s3": 0, "nope": 0}, "timeout": 0}
+        )
+        body = resp.json()
+
+        assert body["missing"] == ["nope"]
+        assert "s3" in body["sessions"]
+        assert "s3" in webui.session_queues
+
+    async def test_marks_polled_sessions_viewed(self, client, webui):
+        await client.post("/api/poll/multi", json={"sessions": {"s1": 0, "s2": 0}, "timeout": 0})
+
+        viewed = {c.args[0] for c in webui.coordinator.session_manager.mark_viewed.await_args_list}
+        assert viewed == {"s1", "s2"}
+
+    async def test_has_more_when_batch_is_capped(self, client, webui):
+        queue = webui.session_queues["s1"]
+        queue.MAX_BATCH = 2
+        for i in range(3):
+            queue.append({"i": i})
+
+        first = (await client.get("/api/poll/session/s1", params={"since": 0})).json()
+        assert (first["next_cursor"], first["has_more"]) == (2, True)
+        rest = (await client.get("/api/poll/session/s1", params={"since": 2})).json()
+        assert (rest["events"], rest["has_more"]) == ([{"i": 2}], False)
+
+        multi = (await client.post("/api/poll/multi", json={"sessions": {"s1": 0}})).json()
+        assert multi["sessions"]["s1"]["has_more"] is True
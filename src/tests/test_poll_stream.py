@@ -0,0 +1,176 @@
+"""Tests for the SSE / WebSocket push transports in routers/poll.py."""
+
+import json
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
+
+from ..event_queue import EventQueue
+from ..routers import poll
+from ..routers.poll import _resume_cursor, _sse_frame, _stream_batches, build_router
+
+
+def _make_webui(auth_token: str | None = None) -> MagicMock:
+    webui = MagicMock()
+    webui.ui_queue = EventQueue()
+    webui.session_queues = {}
+    webui.service.get_session_exists = AsyncMock(side_effect=lambda sid: sid == "s1")
+    webui.coordinator.session_manager.mark_viewed = AsyncMock()
+    webui.auth_enabled = auth_token is not None
+    webui.auth_token = auth_token
+    return webui
+
+
+def _endpoint(router, path: str):
+    return next(r.endpoint for r in router.routes if r.path == path)
+
+
+def _request(last_event_id: str | None = None, polls_before_disconnect: int = 1) -> MagicMock:
+    request = MagicMock()
+    request.headers = {"last-event-id": last_event_id} if last_event_id else {}
+    request.is_disconnected = AsyncMock(
+        side_effect=[False] * polls_before_disconnect + [True] * 10
+    )
+    return request
+
+
+def _parse_sse(chunks: list[str]) -> list[dict]:
+    messages = []
+    for chunk in chunks:
+        fields = dict(
+            line.split(": ", 1) for line in chunk.strip().splitlines() if not line.startswith(":")
+        )
+        if "data" in fields:
+            messages.append({"id": int(fields["id"]), "body": json.loads(fields["data"])})
+    return messages
+
+
+async def _drain(response) -> list[str]:
+    return [chunk async for chunk in response.body_iterator]
+
+
+class TestStreamBatches:
+    async def test_yields_batches_and_advances_cursor(self, monkeypatch):
+        monkeypatch.setattr(poll, "STREAM_HEARTBEAT_SECONDS", 0.01)
+        q = EventQueue()
+        for i in range(3):
+            q.append({"i": i})
+        disconnected = AsyncMock(side_effect=[False, False, True])
+
+        batches = [b async for b in _stream_batches(q, 1, disconnected)]
+
+        assert batches == [([{"i": 1}, {"i": 2}], 3), None]
+
+    async def test_idle_interval_yields_heartbeat(self, monkeypatch):
+        monkeypatch.setattr(poll, "STREAM_HEARTBEAT_SECONDS", 0.01)
+        q = EventQueue()
+        disconnected = AsyncMock(side_effect=[False, True])
+
+        batches = [b async for b in _stream_batches(q, 0, disconnected)]
+
+        assert batches == [None]
+
+    async def test_before_wait_runs_each_iteration(self, monkeypatch):
+        monkeypatch.setattr(poll, "STREAM_HEARTBEAT_SECONDS", 0.01)
+        hook = AsyncMock()
+        disconnected = AsyncMock(side_effect=[False, False, True])
+
+        _ = [b async for b in _stream_batches(EventQueue(), 0, disconnected, hook)]
+
+        assert hook.await_count == 2
+
+
+class TestSseHelpers:
+    def test_frame_carries_cursor_as_id(self):
+        frame = _sse_frame([{"a": 1}], 7)
+        assert frame.startswith("id: 7\n")
+        assert frame.endswith("\n\n")
+        assert _parse_sse([frame]) == [{"id": 7, "body": {"events": [{"a": 1}], "next_cursor": 7}}]
+
+    def test_last_event_id_overrides_since(self):
+        assert _resume_cursor(_request(last_event_id="42"), since=3) == 42
+        assert _resume_cursor(_request(last_event_id="bogus"), since=3) == 3
+        assert _resume_cursor(_request(), since=3) == 3
+
+
+class TestSseEndpoints:
+    async def test_ui_stream_delivers_pending_events(self):
+        webui = _make_webui()
+        webui.ui_queue.append({"type": "x"})
+        router = build_router(webui)
+
+        response = await _endpoint(router, "/api/stream/ui")(_request(), since=0)
+        assert response.media_type == "text/event-stream"
+        messages = _parse_sse(await _drain(response))
+
+        assert messages == [{"id": 1, "body": {"events": [{"type": "x"}], "next_cursor": 1}}]
+
+    async def test_session_stream_resumes_from_last_event_id(self):
+        webui = _make_webui()
+        router = build_router(webui)
+        stream = _endpoint(router, "/api/stream/session/{session_id}")
+
+        await stream(_request(polls_before_disconnect=0), session_id="s1", since=0)
+        queue = webui.session_queues["s1"]
+        for i in range(4):
+            queue.append({"i": i})
+
+        response = await stream(_request(last_event_id="2"), session_id="s1", since=0)
+        messages = _parse_sse(await _drain(response))
+
+        assert messages[0]["body"]["events"] == [{"i": 2}, {"i": 3}]
+        webui.coordinator.session_manager.mark_viewed.assert_awaited_with("s1")
+
+    async def test_session_stream_unknown_session_404(self):
+        from fastapi import HTTPException
+
+        router = build_router(_make_webui())
+        with pytest.raises(HTTPException) as exc:
+            await _endpoint(router, "/api/stream/session/{session_id}")(
+                _request(), session_id="missing", since=0
+            )
+        assert exc.value.status_code == 404
+
+
+class TestWebSocket:
+    def _client(self, webui) -> TestClient:
+        app = FastAPI()
+        app.include_router(build_router(webui))
+        return TestClient(app)
+
+    def test_session_ws_receives_events(self):
+        webui = _make_webui()
+        webui.session_queues["s1"] = EventQueue()
+        webui.session_queues["s1"].append({"i": 0})
+
+        with self._client(webui).websocket_connect("/ws/session/s1?since=0") as ws:
+            body = ws.receive_json()
+
+        assert body == {"events": [{"i": 0}], "next_cursor": 1}
+
+    def test_ws_rejects_bad_token(self):
+        webui = _make_webui(auth_token="secret")
+        client = self._client(webui)
+
+        with pytest.raises(WebSocketDisconnect) as exc:
+            with client.websocket_connect("/ws/ui?token=wrong") as ws:
+                ws.receive_json()
+        assert exc.value.code == 4401
+
+    def test_ws_accepts_good_token(self):
+        webui = _make_webui(auth_token="secret")
+        webui.ui_queue.append({"type": "x"})
+
+        with self._client(webui).websocket_connect("/ws/ui?token=secret") as ws:
+            assert ws.receive_json()["next_cursor"] == 1
+
+    def test_unknown_session_closed(self):
+        client = self._client(_make_webui())
+        with pytest.raises(WebSocketDisconnect) as exc:
+            with client.websocket_connect("/ws/session/missing") as ws:
+                ws.receive_json()
+        assert exc.value.code == 4404
+
@@ -399,7 +399,7 @@ def test_addon_access_log_credential_name_not_value(tmp_path):
     f.logger = MagicMock()
 
     log_file = tmp_path / "access.log"
-    f._log_file = log_file.open("a", buffering=1)
+    f._log_file = addon_mod._LogWriter(log_file)
 
     flow = _flow("api.github.com")
     flow.response = MagicMock()
@@ -408,7 +408,6 @@ def test_addon_access_log_credential_name_not_value(tmp_path):
 
     real_secret = "ghp_super_secret_real_token"
     f._write_access_log(flow, allowed=True, credential_used="github_token")
-    f._log_file.flush()
     f._log_file.close()
 
     log_content = log_file.read_text()
@@ -1,68 +1,13 @@
 """Tests for proxy log parsing in session_coordinator.
 
 Issue #1102: Verifies HTTP access.log JSON parsing, CoreDNS dns.log parsing,
-and the tail-read helper with line limits.
+and the newest-entries limit.
 """
 
 import json
 
 import pytest
 
-from ..session_coordinator import _count_file_lines, _tail_read_lines
-
-# ==================== _tail_read_lines ====================
-
-
-class TestTailReadLines:
-    def test_returns_last_n_lines(self, tmp_path):
-        log_file = tmp_path / "test.log"
-        lines = [f"line{i}\n" for i in range(500)]
-        log_file.write_text("".join(lines))
-
-        result = _tail_read_lines(log_file, 200)
-        assert len(result) == 200
-        # Last line should be line499
-        assert result[-1].strip() == "line499"
-        # First returned line should be line300
-        assert result[0].strip() == "line300"
-
-    def test_returns_all_lines_when_fewer_than_limit(self, tmp_path):
-        log_file = tmp_path / "test.log"
-        log_file.write_text("a\nb\nc\n")
-
-        result = _tail_read_lines(log_file, 200)
-        assert len(result) == 3
-
-    def test_empty_file_returns_empty_list(self, tmp_path):
-        log_file = tmp_path / "test.log"
-        log_file.write_text("")
-
-        result = _tail_read_lines(log_file, 200)
-        assert result == []
-
-    def test_nonexistent_file_returns_empty_list(self, tmp_path):
-        result = _tail_read_lines(tmp_path / "missing.log", 200)
-        assert result == []
-
-
-# ==================== _count_file_lines ====================
-
-
-class TestCountFileLines:
-    def test_counts_lines(self, tmp_path):
-        log_file = tmp_path / "test.log"
-        log_file.write_text("a\nb\nc\n")
-        assert _count_file_lines(log_file) == 3
-
-    def test_empty_file_returns_zero(self, tmp_path):
-        log_file = tmp_path / "test.log"
-        log_file.write_text("")
-        assert _count_file_lines(log_file) == 0
-
-    def test_nonexistent_file_returns_zero(self, tmp_path):
-        assert _count_file_lines(tmp_path / "missing.log") == 0
-
-
 # ==================== HTTP log parsing ====================
 
 
@@ -128,7 +73,7 @@ class TestHttpLogParsing:
     @pytest.mark.asyncio
     async def test_missing_log_file_returns_empty(self, coordinator, proxy_dir, session_id):
         result = await coordinator.get_proxy_logs(session_id, log_type="http", limit=200)
-        assert result == {"entries": [], "total_lines": 0, "log_type": "http"}
+        assert result == {"entries": [], "total_lines": 0, "log_type": "http", "next_cursor": None}
 
     @pytest.mark.asyncio
     async def test_limit_applied(self, coordinator, proxy_dir, session_id):
@@ -221,7 +166,7 @@ class TestDnsLogParsing:
     @pytest.mark.asyncio
     async def test_missing_dns_log_returns_empty(self, coordinator, proxy_dir, session_id):
         result = await coordinator.get_proxy_logs(session_id, log_type="dns", limit=200)
-        assert result == {"entries": [], "total_lines": 0, "log_type": "dns"}
+        assert result == {"entries": [], "total_lines": 0, "log_type": "dns", "next_cursor": None}
 
 
 # ==================== SOCKS5 log parsing ====================
@@ -278,7 +223,7 @@ class TestSocks5LogParsing:
     @pytest.mark.asyncio
     async def test_missing_socks5_log_returns_empty(self, coordinator, proxy_dir, session_id):
         result = await coordinator.get_proxy_logs(session_id, log_type="socks5", limit=200)
-        assert result == {"entries": [], "total_lines": 0, "log_type": "socks5"}
+        assert result == {"entries": [], "total_lines": 0, "log_type": "socks5", "next_cursor": None}
 
     @pytest.mark.asyncio
     async def test_malformed_lines_skipped(self, coordinator, proxy_dir, session_id):
@@ -304,4 +249,4 @@ class TestSocks5LogParsing:
         )
         # An unknown type falls through to the dns branch, which won't find dns.log
         result = await coordinator.get_proxy_logs(session_id, log_type="unknown", limit=200)
-        assert result == {"entries": [], "total_lines": 0, "log_type": "unknown"}
+        assert result == {"entries": [], "total_lines": 0, "log_type": "unknown", "next_cursor": None}
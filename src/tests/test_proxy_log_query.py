@@ -0,0 +1,256 @@
+"""Tests for the proxy log query engine (src/proxy_log_query.py).
+
+Covers block summaries and pruning, filters per log type, cursor pagination
+across rotated segments, incremental indexing of a growing live file, and the
+proxy-logs endpoint's parameter handling.
+"""
+
+import json
+import os
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from .. import proxy_log_query
+from ..proxy_log_query import (
+    ProxyLogFilter,
+    ProxyLogIndex,
+    parse_log_ts,
+    query_proxy_log,
+)
+
+
+def _http(n: int, **overrides) -> dict:
+    entry = {
+        "ts": f"2026-04-30T12:{n // 60:02d}:{n % 60:02d}+0000",
+        "session_id": "s1",
+        "scheme": "https",
+        "host": f"host{n % 5}.example.com",
+        "port": 443,
+        "method": "GET",
+        "path": f"/{n}",
+        "status": 200,
+        "bytes": n,
+        "allowed": True,
+        "credential_used": None,
+        "routed_via_litellm": False,
+    }
+    entry["original_host"] = entry["host"]
+    entry.update(overrides)
+    return entry
+
+
+def _write(path, entries, mode="w"):
+    with open(path, mode) as f:
+        for entry in entries:
+            f.write(json.dumps(entry) + "\n")
+
+
+def _paths(result):
+    return [entry["path"] for entry in result["entries"]]
+
+
+@pytest.fixture
+def index():
+    return ProxyLogIndex()
+
+
+@pytest.fixture
+def small_blocks(monkeypatch):
+    """Force many blocks so pruning and cross-block paging are exercised."""
+    monkeypatch.setattr(proxy_log_query, "BLOCK_BYTES", 1024)
+
+
+class TestParseLogTs:
+    def test_formats(self):
+        assert parse_log_ts(1713600000) == 1713600000.0
+        assert parse_log_ts("1713600000.5") == 1713600000.5
+        assert parse_log_ts("2026-04-30T12:00:00+0000") == parse_log_ts("2026-04-30T12:00:00Z")
+        assert parse_log_ts("2026-04-30T12:00:00") == parse_log_ts("2026-04-30T12:00:00+00:00")
+
+    def test_invalid(self):
+        assert parse_log_ts("yesterday") is None
+        assert parse_log_ts(None) is None
+
+
+class TestQuery:
+    def test_newest_page_in_chronological_order(self, tmp_path, index, small_blocks):
+        _write(tmp_path / "access.log", [_http(n) for n in range(100)])
+
+        result = query_proxy_log(tmp_path, "http", limit=5, index=index)
+
+        assert _paths(result) == ["/95", "/96", "/97", "/98", "/99"]
+        assert result["total_lines"] == 100
+        assert result["next_cursor"]
+
+    def test_cursor_pages_cover_everything_once(self, tmp_path, index, small_blocks):
+        _write(tmp_path / "access.log", [_http(n) for n in range(100)])
+
+        seen, cursor = [], None
+        while True:
+            result = query_proxy_log(tmp_path, "http", limit=7, cursor=cursor, index=index)
+            seen = _paths(result) + seen
+            cursor = result["next_cursor"]
+            if cursor is None:
+                break
+        assert seen == [f"/{n}" for n in range(100)]
+
+    def test_filters(self, tmp_path, index, small_blocks):
+        entries = [_http(n) for n in range(100)]
+        entries[10] = _http(10, status=403, allowed=False, host="evil.test", original_host="evil.test")
+        entries[20] = _http(20, credential_used="gh-token", status=201)
+        entries[30] = _http(30, status=502)
+        _write(tmp_path / "access.log", entries)
+
+        def paths(**kwargs):
+            return _paths(query_proxy_log(tmp_path, "http", filters=ProxyLogFilter(**kwargs), index=index))
+
+        assert paths(denied_only=True) == ["/10"]
+        assert paths(host="EVIL") == ["/10"]
+        assert paths(credential="gh-token") == ["/20"]
+        assert paths(status="5xx") == ["/30"]
+        assert paths(status="201") == ["/20"]
+        assert len(paths(host="host1.example.com")) == 20
+
+    def test_time_range(self, tmp_path, index, small_blocks):
+        _write(tmp_path / "access.log", [_http(n) for n in range(100)])
+        since = parse_log_ts("2026-04-30T12:00:40+0000")
+        until = parse_log_ts("2026-04-30T12:00:44+0000")
+
+        result = query_proxy_log(
+            tmp_path, "http", filters=ProxyLogFilter(since=since, until=until), index=index
+        )
+        assert _paths(result) == ["/40", "/41", "/42", "/43", "/44"]
+        assert result["next_cursor"] is None
+
+    def test_pruned_blocks_are_not_read(self, tmp_path, index, small_blocks, monkeypatch):
+        entries = [_http(n) for n in range(200)]
+        entries[150] = _http(150, allowed=False, status=403)
+        _write(tmp_path / "access.log", entries)
+
+        parsed = []
+        real_parse = proxy_log_query.parse_entry
+        monkeypatch.setattr(
+            proxy_log_query, "parse_entry", lambda t, line: parsed.append(line) or real_parse(t, line)
+        )
+        result = query_proxy_log(tmp_path, "http", filters=ProxyLogFilter(denied_only=True), index=index)
+
+        assert _paths(result) == ["/150"]
+        assert len(parsed) < 20
+
+    def test_socks5_and_dns_filters(self, tmp_path, index):
+        _write(tmp_path / "socks5.log", [
+            {"ts": "2026-04-30T12:00:00+0000", "host": "github.com", "port": 22, "allowed": True, "reason": "ok"},
+            {"ts": "2026-04-30T12:00:01+0000", "host": "1.2.3.4", "port": 22, "allowed": False, "reason": "ip_literal"},
+        ])
+        (tmp_path / "dns.log").write_text(
+            '[INFO] 10.0.0.2:1 - 1 "A IN api.github.com. udp 128 false 4096" NOERROR qr,rd,ra 73 0.02s\n'
+            '[INFO] 10.0.0.2:1 - 2 "A IN blocked.example.com. udp 128 false 4096" REFUSED qr,rd 0 0.001s\n'
+            '[INFO] 10.0.0.2:1 - 3 "A IN nope.example. udp 128 false 4096" NXDOMAIN qr,rd 0 0.001s\n'
+        )
+
+        socks = query_proxy_log(tmp_path, "socks5", filters=ProxyLogFilter(denied_only=True), index=index)
+        assert [e["host"] for e in socks["entries"]] == ["1.2.3.4"]
+        socks = query_proxy_log(tmp_path, "socks5", filters=ProxyLogFilter(status="ok"), index=index)
+        assert [e["host"] for e in socks["entries"]] == ["github.com"]
+
+        dns = query_proxy_log(tmp_path, "dns", filters=ProxyLogFilter(denied_only=True), index=index)
+        assert [e["hostname"] for e in dns["entries"]] == ["blocked.example.com"]
+        dns = query_proxy_log(tmp_path, "dns", filters=ProxyLogFilter(status="nxdomain"), index=index)
+        assert [e["hostname"] for e in dns["entries"]] == ["nope.example"]
+
+    def test_invalid_cursor_raises(self, tmp_path, index):
+        _write(tmp_path / "access.log", [_http(0)])
+        with pytest.raises(ValueError):
+            query_proxy_log(tmp_path, "http", cursor="garbage", index=index)
+
+
+class TestRotationAndGrowth:
+    def test_segments_are_read_after_live_file(self, tmp_path, index):
+        _write(tmp_path / "access.log.2", [_http(n) for n in range(0, 10)])
+        _write(tmp_path / "access.log.1", [_http(n) for n in range(10, 20)])
+        _write(tmp_path / "access.log", [_http(n) for n in range(20, 25)])
+        (tmp_path / "access.log.index.json").write_text("{}")
+
+        result = query_proxy_log(tmp_path, "http", limit=8, index=index)
+        assert _paths(result) == [f"/{n}" for n in range(17, 25)]
+        assert result["total_lines"] == 25
+
+        result = query_proxy_log(tmp_path, "http", limit=100, cursor=result["next_cursor"], index=index)
+        assert _paths(result) == [f"/{n}" for n in range(0, 17)]
+        assert result["next_cursor"] is None
+
+    def test_cursor_survives_rotation(self, tmp_path, index):
+        live = tmp_path / "access.log"
+        _write(live, [_http(n) for n in range(10)])
+        first = query_proxy_log(tmp_path, "http", limit=4, index=index)
+        assert _paths(first) == ["/6", "/7", "/8", "/9"]
+
+        # The proxy rotates and keeps writing before the next page is requested
+        os.replace(live, tmp_path / "access.log.1")
+        _write(live, [_http(n) for n in range(10, 15)])
+
+        result = query_proxy_log(tmp_path, "http", limit=100, cursor=first["next_cursor"], index=index)
+        assert _paths(result) == [f"/{n}" for n in range(6)]
+
+    def test_growing_file_is_indexed_incrementally(self, tmp_path, index):
+        live = tmp_path / "access.log"
+        _write(live, [_http(n) for n in range(10)])
+        assert query_proxy_log(tmp_path, "http", index=index)["total_lines"] == 10
+
+        _write(live, [_http(n) for n in range(10, 15)], mode="a")
+        with open(live, "a") as f:
+            f.write('{"ts": "partial')  # line still being written
+        result = query_proxy_log(tmp_path, "http", limit=1, index=index)
+        assert _paths(result) == ["/14"]
+        assert result["total_lines"] == 15
+
+    def test_truncated_file_is_reindexed(self, tmp_path, index):
+        live = tmp_path / "access.log"
+        _write(live, [_http(n) for n in range(10)])
+        query_proxy_log(tmp_path, "http", index=index)
+
+        _write(live, [_http(n) for n in range(100, 102)])
+        result = query_proxy_log(tmp_path, "http", index=index)
+        assert _paths(result) == ["/100", "/101"]
+        assert result["total_lines"] == 2
+
+
+class TestProxyLogsEndpoint:
+    @pytest.fixture
+    def client(self):
+        from fastapi import FastAPI
+        from fastapi.testclient import TestClient
+
+        from ..routers import session_runtime
+
+        webui = MagicMock()
+        webui.service.get_session_exists = AsyncMock(return_value=True)
+        webui.coordinator.get_proxy_logs = AsyncMock(return_value={"entries": []})
+        app = FastAPI()
+        app.include_router(session_runtime.build_router(webui))
+        return TestClient(app), webui
+
+    def test_filters_forwarded(self, client):
+        test_client, webui = client
+        response = test_client.get(
+            "/api/sessions/s1/proxy-logs",
+            params={"host": "github", "denied_only": "true", "since": "2026-04-30T12:00:00Z", "cursor": "1:2"},
+        )
+        assert response.status_code == 200
+        kwargs = webui.coordinator.get_proxy_logs.call_args.kwargs
+        assert kwargs["cursor"] == "1:2"
+        assert kwargs["filters"] == ProxyLogFilter(
+            host="github", denied_only=True, since=parse_log_ts("2026-04-30T12:00:00Z")
+        )
+
+    def test_invalid_timestamp_rejected(self, client):
+        test_client, _ = client
+        response = test_client.get("/api/sessions/s1/proxy-logs", params={"since": "yesterday"})
+        assert response.status_code == 400
+
+    def test_bad_cursor_is_400(self, client):
+        test_client, webui = client
+        webui.coordinator.get_proxy_logs.side_effect = ValueError("Invalid proxy log cursor")
+        response = test_client.get("/api/sessions/s1/proxy-logs", params={"cursor": "x"})
+        assert response.status_code == 400
@@ -0,0 +1,113 @@
+"""
+Tests for the proxy addon's background log writer and streamed byte counts.
+
+Covers:
+  - _LogWriter: batched writes land in order; close() flushes the queue
+  - Size-based rotation: <name>.N segments shift, index file describes them
+  - Bounded queue: overflow is dropped and counted instead of blocking
+  - responseheaders(): streamed responses are counted chunk by chunk, so the
+    access log reports their size without reading flow.response.content
+"""
+
+import json
+from unittest.mock import MagicMock
+
+import pytest
+
+from .test_proxy_addon_1400 import PH, VALUE, _b, _flow, _install_mitmproxy_stubs, _make_addon
+
+
+def _addon_mod():
+    _install_mitmproxy_stubs()
+    from src.docker.proxy import addon as addon_mod
+    return addon_mod
+
+
+def _entry(n: int) -> dict:
+    return {"ts": f"2026-01-01T00:00:{n:02d}+0000", "host": "api.example.com", "n": n}
+
+
+class TestLogWriter:
+    def test_entries_written_in_order_and_flushed_on_close(self, tmp_path):
+        writer = _addon_mod()._LogWriter(tmp_path / "access.log")
+        for n in range(50):
+            writer.write(_entry(n))
+        writer.close()
+
+        lines = (tmp_path / "access.log").read_text().splitlines()
+        assert [json.loads(line)["n"] for line in lines] == list(range(50))
+
+    def test_rotation_shifts_segments_and_writes_index(self, tmp_path):
+        addon_mod = _addon_mod()
+        # Restart the writer between groups so each group is flushed (and rotated) on its own
+        for group in range(5):
+            writer = addon_mod._LogWriter(tmp_path / "access.log", max_bytes=200, backups=2)
+            for n in range(group * 4, group * 4 + 4):
+                writer.write(_entry(n))
+            writer.close()
+
+        assert not (tmp_path / "access.log.3").exists()
+        index = json.loads((tmp_path / "access.log.index.json").read_text())
+        names = [segment["name"] for segment in index["segments"]]
+        assert names == ["access.log.1", "access.log.2"]
+        for segment in index["segments"]:
+            content = (tmp_path / segment["name"]).read_bytes()
+            assert segment["lines"] == content.count(b"\n")
+            assert segment["bytes"] == len(content)
+            first, last = content.splitlines()[0], content.splitlines()[-1]
+            assert segment["first_ts"] == json.loads(first)["ts"]
+            assert segment["last_ts"] == json.loads(last)["ts"]
+
+        # Newest entries are in the live file, oldest kept in the highest segment
+        live = [json.loads(line)["n"] for line in (tmp_path / "access.log").read_text().splitlines()]
+        newest_segment = json.loads((tmp_path / "access.log.1").read_text().splitlines()[-1])["n"]
+        assert not live or live[0] > newest_segment
+
+    def test_full_queue_drops_instead_of_blocking(self, tmp_path):
+        addon_mod = _addon_mod()
+        writer = addon_mod._LogWriter.__new__(addon_mod._LogWriter)
+        writer.dropped = 0
+        writer._queue = addon_mod.queue.Queue(maxsize=2)
+        for n in range(5):
+            writer.write(_entry(n))
+        assert writer.dropped == 3
+
+
+class TestStreamedByteCounts:
+    def test_scrubbed_stream_counted_without_buffering(self):
+        addon = _make_addon([{
+            "placeholder": PH, "name": "tok", "type": "generic",
+            "value": VALUE, "target_hosts": [],
+        }])
+        f = _flow(host="api.anthropic.com", response_headers={"content-type": "text/event-stream"})
+        addon.responseheaders(f)
+
+        chunks = [b"data: " + VALUE.encode() + b"\n\n", b"data: done\n\n", b""]
+        out = b"".join(_b(f.response.stream(chunk)) for chunk in chunks)
+        assert VALUE.encode() not in out
+        assert f.metadata["stream_bytes"] == sum(len(c) for c in chunks)
+
+        addon._log_file = MagicMock()
+        f.response.content = None
+        addon._write_access_log(f, allowed=True)
+        assert addon._log_file.write.call_args[0][0]["bytes"] == f.metadata["stream_bytes"]
+
+    def test_pass_through_stream_counted(self):
+        """mitmproxy's stream_large_bodies sets stream=True; it is wrapped, not replaced."""
+        addon = _make_addon([])
+        f = _flow(host="api.anthropic.com", response_headers={"content-type": "application/zip"})
+        f.response.stream = True
+        addon.responseheaders(f)
+
+        assert f.response.stream(b"x" * 1000) == b"x" * 1000
+        assert f.response.stream(b"") == b""
+        assert f.metadata["stream_bytes"] == 1000
+
+    @pytest.mark.parametrize("stream", [None, False])
+    def test_buffered_response_uses_body_length(self, stream):
+        addon = _make_addon([])
+        f = _flow(host="api.anthropic.com", response_content=b"abc")
+        f.response.stream = stream
+        addon.responseheaders(f)
+        assert "stream_bytes" not in f.metadata
+        assert _addon_mod()._response_bytes(f) == 3
@@ -351,3 +351,77 @@ class TestClearHistory:
         queue_ids = {i.queue_id for i in items}
         assert new_item.queue_id in queue_ids
         assert old_item.queue_id not in queue_ids
+
+
+class TestQueueManagerCompaction:
+    """Snapshot + tail log compaction."""
+
+    @pytest.mark.asyncio
+    async def test_compaction_bounds_log_and_preserves_state(self, temp_session):
+        sid, sdir = temp_session
+        mgr1 = QueueManager(compact_after_entries=20, keep_history=5)
+        for n in range(30):
+            item = await mgr1.enqueue(sid, sdir, f"msg {n}")
+            await mgr1.mark_sent(sid, sdir, item.queue_id)
+        pending = await mgr1.enqueue(sid, sdir, "still pending")
+
+        log_lines = (sdir / "queue.jsonl").read_text().strip().split('\n')
+        assert len(log_lines) < 20
+        assert json.loads(log_lines[0])["type"] == "log_start"
+
+        mgr2 = QueueManager(compact_after_entries=20, keep_history=5)
+        items = await mgr2.load_queue(sid, sdir)
+        assert [i.queue_id for i in items] == [i.queue_id for i in mgr1.get_queue(sid)]
+        assert mgr2.peek_next(sid).queue_id == pending.queue_id
+        sent = [i for i in items if i.status == "sent"]
+        assert 5 <= len(sent) < 30
+
+        archived = [json.loads(line) for line in (sdir / "queue_archive.jsonl").read_text().splitlines()]
+        assert len(archived) + len(sent) == 30
+        assert archived[0]["content"] == "msg 0"
+        assert {a["status"] for a in archived} == {"sent"}
+
+    @pytest.mark.asyncio
+    async def test_legacy_log_compacted_on_load(self, temp_session):
+        sid, sdir = temp_session
+        mgr1 = QueueManager()
+        for n in range(10):
+            await mgr1.enqueue(sid, sdir, f"msg {n}")
+
+        mgr2 = QueueManager(compact_after_entries=5)
+        items = await mgr2.load_queue(sid, sdir)
+        assert len(items) == 10
+        assert (sdir / "queue_snapshot.json").exists()
+        assert len((sdir / "queue.jsonl").read_text().strip().split('\n')) == 1
+
+        mgr3 = QueueManager()
+        assert [i.content for i in await mgr3.load_queue(sid, sdir)] == [f"msg {n}" for n in range(10)]
+
+    @pytest.mark.asyncio
+    async def test_stale_log_after_interrupted_compaction_is_skipped(self, temp_session):
+        """A snapshot written without its log swap must not replay the old log on top."""
+        sid, sdir = temp_session
+        mgr1 = QueueManager()
+        item = await mgr1.enqueue(sid, sdir, "once")
+        await mgr1.mark_sent(sid, sdir, item.queue_id)
+        old_log = (sdir / "queue.jsonl").read_text()
+        mgr1.compact(sid, sdir)
+        (sdir / "queue.jsonl").write_text(old_log)  # simulate crash before os.replace(log)
+
+        mgr2 = QueueManager()
+        items = await mgr2.load_queue(sid, sdir)
+        assert len(items) == 1
+        assert items[0].status == "sent"
+
+    @pytest.mark.asyncio
+    async def test_requeue_position_survives_reload(self, temp_session):
+        sid, sdir = temp_session
+        mgr1 = QueueManager()
+        first = await mgr1.enqueue(sid, sdir, "first")
+        await mgr1.enqueue(sid, sdir, "second")
+        await mgr1.mark_failed(sid, sdir, first.queue_id, "boom")
+        retry = await mgr1.requeue(sid, sdir, first.queue_id)
+
+        mgr2 = QueueManager()
+        await mgr2.load_queue(sid, sdir)
+        assert mgr2.peek_next(sid).queue_id == retry.queue_id
@@ -245,3 +245,83 @@ class TestQueueProcessorBroadcast:
             assert callback.called
             calls = [c for c in callback.call_args_list if c[0][1] == "sent"]
             assert len(calls) >= 1
+
+
+class TestQueueProcessorWakeups:
+    """Waits are driven by notifications rather than one-second polls."""
+
+    @pytest.mark.asyncio
+    async def test_idle_wait_ends_on_state_change(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            sdir = Path(tmp)
+            info = _make_session_info(
+                is_processing=True,
+                queue_config={"min_wait_seconds": 0, "min_idle_seconds": 0},
+            )
+            coord = _make_coordinator(info, sdir)
+            coord.legion_system = None
+            proc = QueueProcessor(coord)
+            await coord.queue_manager.enqueue("s1", sdir, "first", reset_session=False)
+            await coord.queue_manager.enqueue("s1", sdir, "second", reset_session=False)
+
+            async def _send(session_id, content):
+                info.is_processing = True
+                return True
+
+            coord.send_message = AsyncMock(side_effect=_send)
+            info.is_processing = False
+            proc.ensure_running("s1")
+            await asyncio.sleep(0.05)
+            assert coord.send_message.call_count == 1
+
+            # Processing ends: the notification releases the next item immediately
+            info.is_processing = False
+            await proc.on_session_state_change("s1", SessionState.ACTIVE, False)
+            await asyncio.sleep(0.05)
+            assert coord.send_message.call_count == 2
+            proc.stop("s1")
+
+    @pytest.mark.asyncio
+    async def test_activity_during_debounce_restarts_timer(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            sdir = Path(tmp)
+            info = _make_session_info()
+            coord = _make_coordinator(info, sdir)
+            coord.legion_system = None
+            proc = QueueProcessor(coord)
+            proc._wakeups["s1"] = asyncio.Event()
+
+            waiter = asyncio.create_task(proc._wait_for_idle("s1", "q1", 0.2))
+            await asyncio.sleep(0.1)
+            info.is_processing = True
+            proc.notify("s1")
+            await asyncio.sleep(0.05)
+            info.is_processing = False
+            proc.notify("s1")
+            await asyncio.sleep(0.15)
+            assert not waiter.done()  # debounce restarted when processing ended
+
+            assert await asyncio.wait_for(waiter, 1) is True
+
+    @pytest.mark.asyncio
+    async def test_resume_wakes_paused_processor(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            sdir = Path(tmp)
+            info = _make_session_info(
+                queue_paused=True,
+                queue_config={"min_wait_seconds": 0, "min_idle_seconds": 0},
+            )
+            coord = _make_coordinator(info, sdir)
+            coord.legion_system = None
+            proc = QueueProcessor(coord)
+            await coord.queue_manager.enqueue("s1", sdir, "held", reset_session=False)
+
+            proc.ensure_running("s1")
+            await asyncio.sleep(0.05)
+            coord.send_message.assert_not_called()
+
+            info.queue_paused = False
+            proc.ensure_running("s1")
+            await asyncio.sleep(0.05)
+            coord.send_message.assert_called_once_with("s1", "held")
+            proc.stop("s1")
@@ -5,7 +5,7 @@ def test_route_count_unchanged():
     from src.web_server import create_app
     app = create_app()
     api_routes = [r for r in app.routes if hasattr(r, "methods")]
-    assert len(api_routes) == 153, (
-        f"Expected 153 routes (+1 usage from #1125, +1 edit-history from #1128, +3 audit from #1127, +1 analytics from #1132, -2 legacy images from #1261, +1 oauth import-as-secret from #1381, -1 cancel-schedule from #1416, +1 reparent-minion from #1422, +1 session-routing from #1427-phase3, +6 provider-catalog from #1427-phase4, +1 queue-history from #1502, +1 session-links from #1530, +1 mark-unread from #1597, +1 unaccounted pre-existing delta, +1 model live-switch from #1673, +1 add-directory from #1675, +5 kanban-groups from #1722, +1 background-agents from #1746, +2 git-branches/git-commits from #1760), got {len(api_routes)}. "
+    assert len(api_routes) == 162, (
+        f"Expected 162 routes (+1 usage from #1125, +1 edit-history from #1128, +3 audit from #1127, +1 analytics from #1132, -2 legacy images from #1261, +1 oauth import-as-secret from #1381, -1 cancel-schedule from #1416, +1 reparent-minion from #1422, +1 session-routing from #1427-phase3, +6 provider-catalog from #1427-phase4, +1 queue-history from #1502, +1 session-links from #1530, +1 mark-unread from #1597, +1 unaccounted pre-existing delta, +1 model live-switch from #1673, +1 add-directory from #1675, +5 kanban-groups from #1722, +1 background-agents from #1746, +2 git-branches/git-commits from #1760, +2 SSE push streams /api/stream/ui + /api/stream/session, +1 multiplexed /api/poll/multi, +1 /api/poll/stats, +1 history-projection-stats, +1 messages/stream NDJSON history, +1 startup-timing, +1 hierarchy-check, +1 schedule-queue), got {len(api_routes)}. "
         "A route was added or removed."
     )
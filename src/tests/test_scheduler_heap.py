@@ -0,0 +1,116 @@
+"""
+Tests for SchedulerService's due-time heap: exact wakeups, wake-on-change,
+stale entry handling and fire delay metrics.
+"""
+
+import asyncio
+from datetime import UTC, datetime
+from unittest.mock import AsyncMock
+
+import pytest
+
+from src.legion.scheduler_service import SchedulerService
+from src.models.schedule_models import ScheduleExecution, ScheduleMetrics
+
+from .test_scheduler_service import _make_system
+
+
+@pytest.fixture
+def svc(tmp_path):
+    svc = SchedulerService(_make_system(data_dir=tmp_path))
+    svc._record_execution = AsyncMock()
+    svc._broadcast_execution_event = AsyncMock()
+    svc._broadcast_schedule_event = AsyncMock()
+    return svc
+
+
+def _now() -> float:
+    return datetime.now(UTC).timestamp()
+
+
+async def _schedule_in(svc, seconds: float, name: str = "job"):
+    schedule = await svc.create_schedule(
+        legion_id="leg-1", name=name, cron_expression="0 0 1 1 *", prompt="p", minion_id="sess-1"
+    )
+    schedule.next_run = _now() + seconds
+    await svc._persist_schedules("leg-1")
+    return schedule
+
+
+def _enqueued(svc) -> list[str]:
+    calls = svc.system.session_coordinator.enqueue_message.call_args_list
+    return [c.kwargs["metadata"]["schedule_id"] for c in calls]
+
+
+@pytest.mark.asyncio
+async def test_sleeps_until_earliest_due_schedule(svc):
+    soon = await _schedule_in(svc, 0.1, "soon")
+    await _schedule_in(svc, 3600, "later")
+
+    await svc.start()
+    try:
+        await asyncio.sleep(0.02)
+        assert 0 < svc._sleep_seconds() <= 0.1
+        await asyncio.sleep(0.25)
+    finally:
+        await svc.stop()
+
+    assert _enqueued(svc) == [soon.schedule_id]
+    assert soon.next_run > _now() + 60  # rescheduled from its cron expression
+
+
+@pytest.mark.asyncio
+async def test_change_wakes_sleeping_loop(svc):
+    schedule = await _schedule_in(svc, 3600)
+    await svc.start()
+    try:
+        await asyncio.sleep(0.02)
+        schedule.next_run = _now() + 0.05
+        await svc._persist_schedules("leg-1")
+        await asyncio.sleep(0.2)
+    finally:
+        await svc.stop()
+
+    assert _enqueued(svc) == [schedule.schedule_id]
+
+
+@pytest.mark.asyncio
+async def test_paused_and_deleted_entries_are_skipped(svc):
+    paused = await _schedule_in(svc, -1, "paused")
+    deleted = await _schedule_in(svc, -1, "deleted")
+    changed = await _schedule_in(svc, -1, "changed")
+    await svc.pause_schedule(paused.schedule_id)
+    await svc.delete_schedule(deleted.schedule_id)
+    changed.next_run = _now() + 3600  # not persisted: re-queued when popped
+
+    await svc._fire_due(_now())
+
+    assert _enqueued(svc) == []
+    assert svc._queued == {changed.schedule_id: changed.next_run}
+
+
+@pytest.mark.asyncio
+async def test_tick_rescans_schedules_added_directly(svc):
+    schedule = await _schedule_in(svc, -1)
+    svc._queued.clear()
+    svc._heap.clear()
+
+    await svc._tick()
+    await asyncio.gather(*svc._fire_tasks)
+
+    assert _enqueued(svc) == [schedule.schedule_id]
+
+
+def test_fire_delay_metrics():
+    metrics = ScheduleMetrics(schedule_id="s")
+    for scheduled, actual, trigger in [(100.0, 100.5, "cron"), (200.0, 201.5, "cron"), (300.0, 350.0, "manual")]:
+        metrics.record_fire_delay(ScheduleExecution(
+            execution_id="e", schedule_id="s", scheduled_time=scheduled, actual_time=actual,
+            status="queued", minion_state="active", trigger=trigger,
+        ))
+
+    assert metrics.cron_fires == 2
+    assert metrics.last_fire_delay == 1.5
+    assert metrics.avg_fire_delay == 1.0
+    assert metrics.max_fire_delay == 1.5
+    assert ScheduleMetrics.from_dict(metrics.to_dict()).avg_fire_delay == 1.0
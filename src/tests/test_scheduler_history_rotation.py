@@ -1,8 +1,8 @@
 """
 Tests for schedule history rotation (issue #1372).
 
-Covers: rotation algorithm, metric seeding, race conditions, API surface,
-disabled rotator, archive snapshot.
+Covers: rotation algorithm, legacy history migration, race conditions, API
+surface, disabled rotator, archive snapshot.
 """
 
 from __future__ import annotations
@@ -19,6 +19,7 @@ import pytest
 
 from src.config_manager import HistoryRetentionConfig
 from src.legion.history_rotator import HistoryRotator
+from src.legion.schedule_history_store import ScheduleHistoryStore
 from src.legion.scheduler_service import SchedulerService
 from src.models.schedule_models import (
     Schedule,
@@ -65,9 +66,20 @@ def _make_system(tmp_path: Path):
     system.session_coordinator = coordinator
     # history_rotator not yet attached — tests set it explicitly when needed
     system.history_rotator = None
+    system.scheduler_service = SchedulerService(system)
     return system
 
 
+def _store(system: Any, legion_id: str) -> ScheduleHistoryStore:
+    return system.scheduler_service.history_store(legion_id)
+
+
+def _append_all(system: Any, legion_id: str, executions: list[ScheduleExecution]) -> None:
+    store = _store(system, legion_id)
+    for execution in executions:
+        store.append(execution)
+
+
 def _make_scheduler(system: Any) -> SchedulerService:
     scheduler = SchedulerService(system)
     return scheduler
@@ -119,14 +131,14 @@ class TestIsErrorStatus:
 class TestMetricsSurviveRotation:
     @pytest.mark.asyncio
     async def test_metrics_survive_rotation(self, tmp_path):
-        """Pre-populated metrics are unchanged after rotation prunes the raw log."""
+        """Pre-populated metrics are unchanged after rotation prunes the raw history."""
         system = _make_system(tmp_path)
         legion_id = "leg-1"
         schedule_id = "sched-1"
         legion_dir = tmp_path / "legions" / legion_id
         legion_dir.mkdir(parents=True)
 
-        # Pre-populate metrics with known values
+        # Pre-populate legacy metrics with known values
         pre_metrics = ScheduleMetrics(
             schedule_id=schedule_id,
             total_runs=1000,
@@ -145,15 +157,14 @@ class TestMetricsSurviveRotation:
         rotator = _make_rotator(system, max_entries=50, max_age_days=1, enabled=True)
         await rotator.rotate_legion(legion_id)
 
-        # Metrics must be unchanged
-        saved = json.loads(metrics_file.read_text())
-        assert saved[schedule_id]["total_runs"] == 1000
-        assert saved[schedule_id]["total_errors"] == 42
-        assert saved[schedule_id]["consecutive_errors"] == 3
+        # Rollups must be unchanged
+        saved = _store(system, legion_id).rollups()[schedule_id]
+        assert saved.total_runs == 1000
+        assert saved.total_errors == 42
+        assert saved.consecutive_errors == 3
 
         # History pruned to 50 entries
-        lines = [ln for ln in (legion_dir / "schedule_history.jsonl").read_text().splitlines() if ln.strip()]
-        assert len(lines) == 50
+        assert _store(system, legion_id).count() == 50
 
 
 # ---------------------------------------------------------------------------
@@ -167,8 +178,6 @@ class TestRetainRecentN:
         """max_entries=50 retains the 50 newest entries."""
         system = _make_system(tmp_path)
         legion_id = "leg-2"
-        legion_dir = tmp_path / "legions" / legion_id
-        legion_dir.mkdir(parents=True)
 
         now = time.time()
         two_days = 2 * 86400
@@ -176,18 +185,14 @@ class TestRetainRecentN:
         entries = [
             _make_execution(actual_time=now - two_days - (200 - i)) for i in range(200)
         ]
-        _write_history(legion_dir / "schedule_history.jsonl", entries)
+        _append_all(system, legion_id, entries)
 
         rotator = _make_rotator(system, max_entries=50, max_age_days=1, enabled=True)
         await rotator.rotate_legion(legion_id)
 
-        lines = [ln for ln in (legion_dir / "schedule_history.jsonl").read_text().splitlines() if ln.strip()]
-        assert len(lines) == 50
-
         # The retained entries should be the 50 most recent
-        retained_ids = {json.loads(ln)["execution_id"] for ln in lines}
-        expected_ids = {e.execution_id for e in entries[-50:]}
-        assert retained_ids == expected_ids
+        retained = _store(system, legion_id).history(limit=1000)
+        assert {e.execution_id for e in retained} == {e.execution_id for e in entries[-50:]}
 
 
 # ---------------------------------------------------------------------------
@@ -201,27 +206,22 @@ class TestRetainByAge:
         """max_age_days=30 retains only entries within the last 30 days."""
         system = _make_system(tmp_path)
         legion_id = "leg-3"
-        legion_dir = tmp_path / "legions" / legion_id
-        legion_dir.mkdir(parents=True)
 
         now = time.time()
         day = 86400
         # 100 recent (< 30 days) + 100 old (> 30 days)
         recent = [_make_execution(actual_time=now - 10 * day) for _ in range(100)]
         old = [_make_execution(actual_time=now - 45 * day) for _ in range(100)]
-        _write_history(legion_dir / "schedule_history.jsonl", old + recent)
+        _append_all(system, legion_id, old + recent)
 
         # max_entries=100 keeps the 100 most recent; age window (30 days) keeps only "recent"
-        # OR semantics: keep_ids = by_age | by_count = recent_100 | recent_100 = recent_100
+        # OR semantics: keep = by_age | by_count = recent_100 | recent_100 = recent_100
         rotator = _make_rotator(system, max_entries=100, max_age_days=30, enabled=True)
         await rotator.rotate_legion(legion_id)
 
-        lines = [ln for ln in (legion_dir / "schedule_history.jsonl").read_text().splitlines() if ln.strip()]
-        assert len(lines) == 100
-
-        for line in lines:
-            data = json.loads(line)
-            assert data["actual_time"] >= now - 30 * day - 1
+        retained = _store(system, legion_id).history(limit=1000)
+        assert len(retained) == 100
+        assert all(e.actual_time >= now - 30 * day - 1 for e in retained)
 
 
 # ---------------------------------------------------------------------------
@@ -235,8 +235,6 @@ class TestRetainUnion:
         """An older entry within the age window is kept even when count window is smaller."""
         system = _make_system(tmp_path)
         legion_id = "leg-4"
-        legion_dir = tmp_path / "legions" / legion_id
-        legion_dir.mkdir(parents=True)
 
         now = time.time()
         day = 86400
@@ -244,26 +242,25 @@ class TestRetainUnion:
         old_recent = _make_execution(actual_time=now - 10 * day)
         # 1000 very recent entries (should dominate count window)
         new_entries = [_make_execution(actual_time=now - i) for i in range(1000)]
-        _write_history(legion_dir / "schedule_history.jsonl", [old_recent] + new_entries)
+        _append_all(system, legion_id, [old_recent] + new_entries)
 
         rotator = _make_rotator(system, max_entries=50, max_age_days=30, enabled=True)
         await rotator.rotate_legion(legion_id)
 
-        lines = [ln for ln in (legion_dir / "schedule_history.jsonl").read_text().splitlines() if ln.strip()]
-        ids = {json.loads(ln)["execution_id"] for ln in lines}
+        ids = {e.execution_id for e in _store(system, legion_id).history(limit=2000)}
         # old_recent is within age window → must be kept (OR semantics)
         assert old_recent.execution_id in ids
 
 
 # ---------------------------------------------------------------------------
-# test_seed_from_existing_history
+# test_migrate_legacy_history
 # ---------------------------------------------------------------------------
 
 
-class TestSeedFromExistingHistory:
+class TestMigrateLegacyHistory:
     @pytest.mark.asyncio
-    async def test_seed_metrics_from_history(self, tmp_path):
-        """_seed_metrics_from_history builds correct metrics from a 5000-line log."""
+    async def test_rollups_built_from_legacy_history(self, tmp_path):
+        """A legion with only schedule_history.jsonl gets rollups built from its 5000 lines."""
         system = _make_system(tmp_path)
         legion_id = "leg-5"
         legion_dir = tmp_path / "legions" / legion_id
@@ -287,23 +284,65 @@ class TestSeedFromExistingHistory:
             )
         _write_history(legion_dir / "schedule_history.jsonl", entries)
 
-        scheduler = _make_scheduler(system)
-        await scheduler._seed_metrics_from_history(legion_id)
-
-        cache = scheduler._metrics_cache.get(legion_id, {})
-        assert schedule_id in cache
-        m = cache[schedule_id]
+        scheduler = system.scheduler_service
+        m = await scheduler.get_schedule_metrics(legion_id, schedule_id)
         assert m.total_runs == n_success + n_error
         assert m.total_errors == n_error
-        # Last entry processed was an error (added last), so consecutive_errors >= 1
-        # (exact value depends on insertion order; just confirm > 0)
-        assert m.total_errors > 0
+        assert m.consecutive_errors == n_error  # errors were appended last
+        assert m.recent_outcomes == ["error"] * 10
+
+        # Legacy file retired; history and rollups readable from a fresh store
+        assert not (legion_dir / "schedule_history.jsonl").exists()
+        assert (legion_dir / "schedule_history.jsonl.migrated").exists()
+        reopened = ScheduleHistoryStore(legion_dir)
+        reopened.open()
+        assert reopened.count() == n_success + n_error
+        assert reopened.rollups()[schedule_id].total_runs == n_success + n_error
+        assert reopened.history(schedule_id, limit=1)[0].execution_id == entries[-1].execution_id
+        reopened.close()
+
+    def test_windows_seeded_when_metrics_file_exists(self, tmp_path):
+        """schedule_metrics.json predates the recent windows; they come from the history rows."""
+        legion_dir = tmp_path / "leg-6"
+        entries = []
+        for i in range(1, 21):
+            execution = _make_execution(status="error" if i == 20 else "completed", actual_time=i)
+            execution.duration_ms = i * 10
+            entries.append(execution)
+        _write_history(legion_dir / "schedule_history.jsonl", entries)
+        legacy = {"schedule_id": "sched-1", "total_runs": 500, "total_errors": 7}
+        (legion_dir / "schedule_metrics.json").write_text(json.dumps({"sched-1": legacy}))
+
+        store = ScheduleHistoryStore(legion_dir)
+        store.open()
+        m = store.rollups()["sched-1"]
+        store.close()
+
+        assert (m.total_runs, m.total_errors) == (500, 7)  # lifetime totals kept from the file
+        assert m.recent_outcomes == ["completed"] * 9 + ["error"]
+        assert len(m.recent_durations_ms) == 20
+        assert (m.p50_duration_ms, m.p95_duration_ms) == (100, 190)
+
+    def test_interrupted_migration_is_not_reimported(self, tmp_path):
+        """A crash after the import commits but before the renames must not import twice."""
+        legion_dir = tmp_path / "leg-7"
+        _write_history(
+            legion_dir / "schedule_history.jsonl",
+            [_make_execution(status="completed", actual_time=i) for i in range(5)],
+        )
+        store = ScheduleHistoryStore(legion_dir)
+        store.open()
+        store.close()
+        migrated = legion_dir / "schedule_history.jsonl.migrated"
+        migrated.rename(legion_dir / "schedule_history.jsonl")
 
-        # Metrics file written
-        metrics_file = legion_dir / "schedule_metrics.json"
-        assert metrics_file.exists()
-        raw = json.loads(metrics_file.read_text())
-        assert raw[schedule_id]["total_runs"] == n_success + n_error
+        reopened = ScheduleHistoryStore(legion_dir)
+        reopened.open()
+        assert reopened.count() == 5
+        assert reopened.rollups()["sched-1"].total_runs == 5
+        reopened.close()
+        assert migrated.exists()
+        assert not (legion_dir / "schedule_history.jsonl").exists()
 
 
 # ---------------------------------------------------------------------------
@@ -314,17 +353,10 @@ class TestSeedFromExistingHistory:
 class TestRotationDoesNotBlockTicks:
     @pytest.mark.asyncio
     async def test_rotation_uses_to_thread(self, tmp_path):
-        """rotate_legion delegates sync work to asyncio.to_thread, not blocking the loop."""
+        """rotate_legion delegates the range delete to asyncio.to_thread, not blocking the loop."""
         system = _make_system(tmp_path)
         legion_id = "leg-6"
-        legion_dir = tmp_path / "legions" / legion_id
-        legion_dir.mkdir(parents=True)
-
-        # 50 000-line synthetic file
-        history_file = legion_dir / "schedule_history.jsonl"
-        ex = _make_execution()
-        line = json.dumps(ex.to_dict()) + "\n"
-        history_file.write_text(line * 50_000)
+        _append_all(system, legion_id, [_make_execution() for _ in range(600)])
 
         rotator = _make_rotator(system, max_entries=500, max_age_days=30, enabled=True)
 
@@ -340,6 +372,16 @@ class TestRotationDoesNotBlockTicks:
 
         assert "_rotate_sync" in thread_calls, "rotation must use asyncio.to_thread"
 
+    @pytest.mark.asyncio
+    async def test_legion_without_history_is_skipped(self, tmp_path):
+        system = _make_system(tmp_path)
+        (tmp_path / "legions" / "leg-empty").mkdir(parents=True)
+        rotator = _make_rotator(system, enabled=True)
+
+        await rotator.rotate_legion("leg-empty")
+
+        assert not (tmp_path / "legions" / "leg-empty" / "schedule_history.db").exists()
+
 
 # ---------------------------------------------------------------------------
 # test_append_during_rotation
@@ -348,22 +390,19 @@ class TestRotationDoesNotBlockTicks:
 
 class TestAppendDuringRotation:
     @pytest.mark.asyncio
-    async def test_lock_serialises_append_and_rotation(self, tmp_path):
-        """Append acquires the same per-legion lock as rotation — no interleaving."""
+    async def test_append_while_rotation_runs_in_thread(self, tmp_path):
+        """Appends made while a prune runs in a worker thread are kept."""
         system = _make_system(tmp_path)
         legion_id = "leg-7"
-        legion_dir = tmp_path / "legions" / legion_id
-        legion_dir.mkdir(parents=True)
-
-        history_file = legion_dir / "schedule_history.jsonl"
         two_days = 2 * 86400
-        entries = [_make_execution(actual_time=time.time() - two_days - i) for i in range(200)]
-        _write_history(history_file, entries)
+        _append_all(
+            system, legion_id, [_make_execution(actual_time=time.time() - two_days - i) for i in range(200)]
+        )
 
         rotator = _make_rotator(system, max_entries=50, max_age_days=1, enabled=True)
         system.history_rotator = rotator
 
-        scheduler = _make_scheduler(system)
+        scheduler = system.scheduler_service
         new_execution = _make_execution(actual_time=time.time())
 
         rotation_started = asyncio.Event()
@@ -371,31 +410,77 @@ class TestAppendDuringRotation:
 
         original_rotate_sync = rotator._rotate_sync
 
-        def slow_rotate(lid):
+        def slow_rotate(store):
             # Signal that we're inside _rotate_sync (must use captured loop — no event loop in threads)
             loop.call_soon_threadsafe(rotation_started.set)
             import time as _t
             _t.sleep(0.1)
-            return original_rotate_sync(lid)
+            return original_rotate_sync(store)
 
         with patch.object(rotator, "_rotate_sync", side_effect=slow_rotate):
             rotate_task = asyncio.create_task(rotator.rotate_legion(legion_id))
-
-            # Wait for rotation to start (it holds the lock now)
             await asyncio.wait_for(rotation_started.wait(), timeout=5.0)
-
-            # Append while rotation is mid-flight — this blocks until rotation releases lock
-            append_task = asyncio.create_task(
-                scheduler._append_execution(legion_id, new_execution)
-            )
-
+            await scheduler._append_execution(legion_id, new_execution)
             await rotate_task
-            await append_task
 
-        # After both complete, the new entry must be in the file
-        lines = [ln for ln in history_file.read_text().splitlines() if ln.strip()]
-        ids = {json.loads(ln)["execution_id"] for ln in lines}
+        ids = {e.execution_id for e in _store(system, legion_id).history(limit=1000)}
         assert new_execution.execution_id in ids
+        assert len(ids) == 50  # the append landed first and counts toward the newest 50
+
+
+    @pytest.mark.asyncio
+    async def test_open_and_append_run_off_the_event_loop(self, tmp_path):
+        """The first open (legacy import) and each append run in worker threads."""
+        import threading
+
+        system = _make_system(tmp_path)
+        legion_id = "leg-8"
+        _write_history(tmp_path / "legions" / legion_id / "schedule_history.jsonl", [_make_execution()])
+        threads = []
+        original_open = ScheduleHistoryStore.open
+        original_append = ScheduleHistoryStore.append
+
+        def spy_open(store):
+            threads.append(threading.current_thread())
+            original_open(store)
+
+        def spy_append(store, *args):
+            threads.append(threading.current_thread())
+            original_append(store, *args)
+
+        with patch.object(ScheduleHistoryStore, "open", spy_open), \
+                patch.object(ScheduleHistoryStore, "append", spy_append):
+            await system.scheduler_service._append_execution(legion_id, _make_execution())
+
+        assert len(threads) == 2
+        assert threading.main_thread() not in threads
+        assert _store(system, legion_id).count() == 2
+
+
+class TestStoreLifecycle:
+    @pytest.mark.asyncio
+    async def test_stop_closes_history_stores(self, tmp_path):
+        system = _make_system(tmp_path)
+        scheduler = system.scheduler_service
+        store = _store(system, "leg-9")
+
+        await scheduler.stop()
+
+        assert store._conn is None
+        assert scheduler._history_stores == {}
+
+    @pytest.mark.asyncio
+    async def test_forget_legion_evicts_store_and_rollups(self, tmp_path):
+        system = _make_system(tmp_path)
+        scheduler = system.scheduler_service
+        kept, forgotten = _store(system, "leg-keep"), _store(system, "leg-gone")
+        await scheduler._load_metrics("leg-gone")
+
+        await scheduler.forget_legion("leg-gone")
+
+        assert forgotten._conn is None and kept._conn is not None
+        assert set(scheduler._history_stores) == {"leg-keep"}
+        assert "leg-gone" not in scheduler._metrics_cache
 
 
 # ---------------------------------------------------------------------------
@@ -525,3 +610,25 @@ class TestUpdateMetricsRetrySkipped:
 
         cache = scheduler._metrics_cache.get(legion_id, {})
         assert "s-1" not in cache  # no entry created for retry
+
+
+# ---------------------------------------------------------------------------
+# test_rollup_windows
+# ---------------------------------------------------------------------------
+
+
+class TestRollupWindows:
+    def test_recent_outcomes_and_duration_percentiles(self):
+        metrics = ScheduleMetrics(schedule_id="s")
+        for i in range(1, 101):
+            execution = _make_execution(schedule_id="s", status="error" if i % 10 == 0 else "completed")
+            execution.duration_ms = i
+            metrics.record(execution)
+
+        assert metrics.total_runs == 100
+        assert metrics.success_rate == 0.9
+        assert len(metrics.recent_outcomes) == 10
+        assert metrics.recent_outcomes[-1] == "error"
+        assert (metrics.p50_duration_ms, metrics.p95_duration_ms) == (50, 95)
+        restored = ScheduleMetrics.from_dict(metrics.to_dict())
+        assert restored.recent_durations_ms == metrics.recent_durations_ms
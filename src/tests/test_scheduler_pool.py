@@ -0,0 +1,283 @@
+"""
+Tests for SchedulerService's execution pool: concurrency caps, priority and
+per-legion fairness, queue visibility and late fire policies.
+"""
+
+import asyncio
+from datetime import UTC, datetime
+from unittest.mock import AsyncMock
+
+import pytest
+
+from src.config_manager import SchedulerConfig
+from src.legion.scheduler_service import SchedulerService
+from src.models.schedule_models import get_next_run
+
+from .test_scheduler_service import _make_system
+
+
+def _now() -> float:
+    return datetime.now(UTC).timestamp()
+
+
+def _make_pool(tmp_path, **limits) -> SchedulerService:
+    svc = SchedulerService(_make_system(data_dir=tmp_path), SchedulerConfig(**limits))
+    svc._broadcast_execution_event = AsyncMock()
+    svc._broadcast_schedule_event = AsyncMock()
+    return svc
+
+
+async def _due(svc, name, legion_id="leg-1", seconds_late=0.0, **fields):
+    schedule = await svc.create_schedule(
+        legion_id=legion_id, name=name, cron_expression="*/5 * * * *", prompt="p",
+        minion_id="sess-1", **fields,
+    )
+    schedule.next_run = _now() - seconds_late
+    return schedule
+
+
+def _gate_fires(svc) -> tuple[list[str], asyncio.Event]:
+    """Replace the fire path with one that records its start and waits for the gate."""
+    started: list[str] = []
+    gate = asyncio.Event()
+
+    async def fire(schedule, now, trigger="cron", scheduled_time=None):
+        started.append(schedule.name)
+        await gate.wait()
+        schedule.next_run = now + 3600
+
+    svc._fire_schedule = fire
+    return started, gate
+
+
+async def _settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+@pytest.mark.asyncio
+async def test_global_and_per_legion_caps(tmp_path):
+    svc = _make_pool(tmp_path, max_concurrent_fires=3, max_concurrent_fires_per_legion=2)
+    started, gate = _gate_fires(svc)
+    for legion_id in ("leg-a", "leg-b"):
+        for i in range(3):
+            svc._dispatch(await _due(svc, f"{legion_id}-{i}", legion_id=legion_id))
+    await _settle()
+
+    assert len(started) == 3
+    assert svc._running_in("leg-a") == 2 and svc._running_in("leg-b") == 1
+    snapshot = svc.queued_fires("leg-a")
+    assert [f["name"] for f in snapshot["running"]] == ["leg-a-0", "leg-a-1"]
+    assert [f["name"] for f in snapshot["queued"]] == ["leg-a-2"]
+    assert snapshot["running_total"] == 3
+
+    gate.set()
+    while svc._fire_tasks:
+        await asyncio.gather(*svc._fire_tasks)
+    assert len(started) == 6
+    assert svc._fires == {} and svc._pending == {}
+
+
+@pytest.mark.asyncio
+async def test_priority_within_legion_and_turns_between_legions(tmp_path):
+    svc = _make_pool(tmp_path, max_concurrent_fires=1, max_concurrent_fires_per_legion=0)
+    started, gate = _gate_fires(svc)
+    blocker = await _due(svc, "blocker", legion_id="leg-c")
+    svc._dispatch(blocker)
+    await _settle()
+    for name, priority in [("a-low", 0), ("a-high", 5), ("a-mid", 1)]:
+        svc._dispatch(await _due(svc, name, legion_id="leg-a", priority=priority))
+    svc._dispatch(await _due(svc, "b-only", legion_id="leg-b"))
+
+    # One slot: each completion hands it to the next legion in turn
+    for _ in range(5):
+        await _settle()
+        gate.set()
+        await _settle()
+        gate.clear()
+
+    assert started == ["blocker", "a-high", "b-only", "a-mid", "a-low"]
+
+
+@pytest.mark.asyncio
+async def test_one_outstanding_fire_per_schedule(tmp_path):
+    svc = _make_pool(tmp_path, max_concurrent_fires=1)
+    _, gate = _gate_fires(svc)
+    await _due(svc, "busy")
+    waiting = await _due(svc, "waiting")
+    await svc._tick()
+
+    # A queued fire keeps its schedule out of the due-time heap, even across a resync
+    svc._rebuild_queue()
+    assert waiting.schedule_id not in svc._queued
+    assert [f["name"] for f in svc.queued_fires("leg-1")["queued"]] == ["waiting"]
+
+    gate.set()
+    await asyncio.gather(*svc._fire_tasks)
+    await asyncio.gather(*svc._fire_tasks)
+    assert svc._queued[waiting.schedule_id] == waiting.next_run
+
+
+@pytest.mark.asyncio
+async def test_late_fire_skipped(tmp_path):
+    svc = _make_pool(tmp_path, max_lateness_seconds=60)
+    schedule = await _due(svc, "late", seconds_late=600, late_policy="skip")
+    scheduled_time = schedule.next_run
+
+    svc._dispatch(schedule)
+    await asyncio.gather(*svc._fire_tasks)
+
+    svc.system.session_coordinator.enqueue_message.assert_not_called()
+    assert schedule.fire_count == 0
+    assert schedule.next_run > _now()
+    [execution] = await svc.get_schedule_history("leg-1", schedule.schedule_id)
+    assert execution.status == "skipped"
+    assert execution.scheduled_time == scheduled_time
+    metrics = await svc.get_schedule_metrics("leg-1", schedule.schedule_id)
+    assert metrics.skipped_fires == 1 and metrics.total_runs == 0
+
+
+@pytest.mark.asyncio
+async def test_late_fire_coalesced_records_lateness(tmp_path):
+    svc = _make_pool(tmp_path, max_lateness_seconds=60)
+    late = await _due(svc, "late", seconds_late=600)
+    on_time = await _due(svc, "on-time")
+
+    svc._dispatch(late)
+    svc._dispatch(on_time)
+    await asyncio.gather(*svc._fire_tasks)
+
+    assert svc.system.session_coordinator.enqueue_message.call_count == 2
+    [late_run] = await svc.get_schedule_history("leg-1", late.schedule_id)
+    assert late_run.status == "queued"
+    assert late_run.late_action == "coalesce"
+    assert late_run.lateness_seconds >= 600
+    assert late.next_run > _now()  # missed windows merged into this run
+    [on_time_run] = await svc.get_schedule_history("leg-1", on_time.schedule_id)
+    assert on_time_run.late_action is None
+    assert on_time_run.lateness_seconds < 60
+
+
+@pytest.mark.asyncio
+async def test_late_fire_run_late_catches_up(tmp_path):
+    svc = _make_pool(tmp_path, max_lateness_seconds=60)
+    schedule = await _due(svc, "late", seconds_late=1800, late_policy="run_late")
+    scheduled_time = schedule.next_run
+
+    svc._dispatch(schedule)
+    await asyncio.gather(*svc._fire_tasks)
+
+    [execution] = await svc.get_schedule_history("leg-1", schedule.schedule_id)
+    assert execution.late_action == "run_late"
+    # Next window after the missed slot, which is already due again
+    assert schedule.next_run == get_next_run("*/5 * * * *", base_time=scheduled_time)
+    assert svc._queued[schedule.schedule_id] == schedule.next_run
+
+
+@pytest.mark.asyncio
+async def test_execution_records_dispatched_window(tmp_path):
+    svc = _make_pool(tmp_path)
+    schedule = await _due(svc, "edited", seconds_late=5)
+    scheduled_time = schedule.next_run
+
+    async def session_info(session_id):
+        schedule.next_run = _now() + 3600  # edited while the fire was in flight
+        return None
+
+    svc.system.session_coordinator.session_manager.get_session_info = AsyncMock(
+        side_effect=session_info
+    )
+    svc._dispatch(schedule)
+    await asyncio.gather(*svc._fire_tasks)
+
+    [execution] = await svc.get_schedule_history("leg-1", schedule.schedule_id)
+    assert execution.scheduled_time == scheduled_time
+
+
+@pytest.mark.asyncio
+async def test_ephemeral_fire_holds_slot_until_agent_finishes(tmp_path):
+    svc = _make_pool(tmp_path, max_concurrent_fires=1)
+    finished = asyncio.Event()
+    started = []
+
+    async def fire(schedule, now, trigger="cron", scheduled_time=None):
+        started.append(schedule.name)
+        schedule.next_run = now + 3600
+        if schedule.name == "ephemeral":
+            svc._ephemeral_monitors[schedule.schedule_id] = asyncio.create_task(finished.wait())
+
+    svc._fire_schedule = fire
+    svc._dispatch(await _due(svc, "ephemeral"))
+    svc._dispatch(await _due(svc, "next"))
+    await _settle()
+
+    assert started == ["ephemeral"]
+    [running] = svc.queued_fires("leg-1")["running"]
+    assert running["waiting_on_agent"] is True
+
+    finished.set()
+    await _settle()
+    await asyncio.gather(*svc._fire_tasks)
+    assert started == ["ephemeral", "next"]
+
+
+@pytest.mark.asyncio
+async def test_invalid_late_policy_rejected(tmp_path):
+    svc = _make_pool(tmp_path)
+    with pytest.raises(ValueError, match="late_policy"):
+        await _due(svc, "bad", late_policy="later")
+    schedule = await _due(svc, "ok")
+    with pytest.raises(ValueError, match="late_policy"):
+        await svc.update_schedule(schedule.schedule_id, late_policy="never")
+    updated = await svc.update_schedule(schedule.schedule_id, late_policy="skip", priority=3)
+    assert (updated.late_policy, updated.priority) == ("skip", 3)
+
+
+@pytest.mark.asyncio
+async def test_ephemeral_timeout_releases_slot_without_archiving(tmp_path):
+    svc = _make_pool(tmp_path, max_concurrent_fires=1)
+    finished = asyncio.Event()
+    started, monitors = [], []
+
+    async def fire(schedule, now, trigger="cron", scheduled_time=None):
+        started.append(schedule.name)
+        schedule.next_run = now + 3600
+        if schedule.name == "ephemeral":
+            monitors.append(asyncio.create_task(finished.wait()))
+            svc._ephemeral_monitors[schedule.schedule_id] = monitors[0]
+
+    svc._fire_schedule = fire
+    svc._dispatch(await _due(svc, "ephemeral", timeout_seconds=0.05))
+    await _settle()
+    svc._dispatch(await _due(svc, "next"))
+
+    while svc._fire_tasks:
+        await asyncio.wait_for(asyncio.gather(*svc._fire_tasks), timeout=1)
+
+    # The slot moved on, but the agent's run is still being monitored
+    assert started == ["ephemeral", "next"]
+    assert not monitors[0].done()
+    finished.set()
+    await monitors[0]
+
+
+@pytest.mark.asyncio
+async def test_stop_cancels_fires_and_monitors(tmp_path):
+    svc = _make_pool(tmp_path, max_concurrent_fires=1)
+    started, _ = _gate_fires(svc)
+    running = await _due(svc, "running")
+    svc._dispatch(running)
+    svc._dispatch(await _due(svc, "queued"))
+    monitor = asyncio.create_task(
+        svc._monitor_ephemeral_session(running.schedule_id, "agent-1", "leg-1")
+    )
+    svc._monitor_tasks.add(monitor)
+    archive = svc.system.session_coordinator.archive_and_clear_session = AsyncMock()
+    await _settle()
+
+    await svc.stop()
+
+    assert started == ["running"]
+    assert monitor.done() and not svc._fire_tasks
+    assert svc._fires == {} and svc._pending == {}
+    archive.assert_not_called()
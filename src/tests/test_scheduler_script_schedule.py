@@ -263,7 +263,9 @@ async def test_existing_prompt_schedule_path_unchanged():
     await svc._tick.__func__(svc)  # Can't easily call _tick without setup; test dispatch directly
     # Direct delegation test
     await svc._fire_schedule(schedule, now)
-    svc._fire_permanent_schedule.assert_awaited_once_with(schedule, now, trigger="cron")
+    svc._fire_permanent_schedule.assert_awaited_once_with(
+        schedule, now, trigger="cron", scheduled_time=None
+    )
 
 
 # ---------------------------------------------------------------------------
@@ -337,7 +339,7 @@ async def test_script_run_does_not_block_tick_loop(tmp_session_dir):
 
     fired = []
 
-    async def _slow_script(schedule, target_id, now, trigger="cron"):
+    async def _slow_script(schedule, target_id, now, trigger="cron", scheduled_time=None):
         await asyncio.sleep(0.05)
         fired.append(schedule.schedule_id)
 
@@ -372,7 +374,7 @@ async def test_concurrent_fire_skipped_when_inflight(tmp_session_dir):
 
     fire_calls = []
 
-    async def _fire(schedule, target_id, now, trigger="cron"):
+    async def _fire(schedule, target_id, now, trigger="cron", scheduled_time=None):
         fire_calls.append(schedule.schedule_id)
 
     svc._fire_script_with_cleanup = _fire
@@ -418,6 +420,23 @@ def test_has_inflight_scripts_returns_false_after_cleanup():
     assert svc.has_inflight_scripts("sess-1") is False
 
 
+@pytest.mark.asyncio
+async def test_last_script_completion_notifies_queue_processor():
+    system = _make_system()
+    svc = SchedulerService(system)
+    svc._fire_script_schedule = AsyncMock()
+    schedule = _make_schedule()
+    svc._inflight_scripts_by_session["sess-1"] = {schedule.schedule_id, "other"}
+
+    await svc._fire_script_with_cleanup(schedule, "sess-1", 1000.0)
+    system.session_coordinator.queue_processor.notify.assert_not_called()
+
+    svc._inflight_scripts_by_session["sess-1"].discard("other")
+    svc._inflight_scripts_by_session["sess-1"].add(schedule.schedule_id)
+    await svc._fire_script_with_cleanup(schedule, "sess-1", 1000.0)
+    system.session_coordinator.queue_processor.notify.assert_called_once_with("sess-1")
+
+
 # ---------------------------------------------------------------------------
 # 13. Script always enqueues immediately — no pre-enqueue guard
 # ---------------------------------------------------------------------------
@@ -486,11 +505,17 @@ async def test_queue_processor_idle_wait_pauses_while_scripts_inflight():
 
     proc = QueueProcessor(coordinator)
 
-    completed = await proc._wait_for_idle("sess-1", "q-1", min_idle_seconds=0.0)
+    waiter = asyncio.create_task(proc._wait_for_idle("sess-1", "q-1", min_idle_seconds=0.0))
+    # The scheduler notifies the processor as each script finishes
+    for _ in range(2):
+        await asyncio.sleep(0.01)
+        assert not waiter.done()
+        proc.notify("sess-1")
+    completed = await asyncio.wait_for(waiter, 1)
 
     assert completed is True
-    # must have polled at least 3 times (twice inflight, once clear+idle)
-    assert call_count >= 3
+    # must have checked 3 times (twice inflight, once clear+idle)
+    assert call_count == 3
 
 
 # ---------------------------------------------------------------------------
@@ -0,0 +1,147 @@
+"""Tests for the SQLite-backed session catalog (session_catalog.enabled)."""
+
+import json
+import tempfile
+from datetime import UTC, datetime
+from pathlib import Path
+
+import pytest
+
+from ..session_catalog import SessionCatalog
+from ..session_config import SessionConfig
+from ..session_manager import SessionManager
+
+
+@pytest.fixture
+def data_dir():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        yield Path(temp_dir)
+
+
+async def _manager(data_dir: Path, catalog: bool = True) -> SessionManager:
+    manager = SessionManager(data_dir, catalog_enabled=catalog, export_interval_seconds=3600)
+    await manager.initialize()
+    return manager
+
+
+async def _create(manager: SessionManager, session_id: str, **kwargs) -> None:
+    await manager.create_session(session_id, SessionConfig(working_directory="/tmp"), **kwargs)
+
+
+def _state_file(data_dir: Path, session_id: str) -> dict:
+    return json.loads((data_dir / "sessions" / session_id / "state.json").read_text())
+
+
+class TestCatalogStore:
+    def test_load_order_and_delete(self, data_dir):
+        catalog = SessionCatalog(data_dir / "sessions.db")
+        catalog.open()
+        now = datetime.now(UTC).isoformat()
+        for sid, project, parent, order in [
+            ("a", "p1", None, 2), ("b", "p1", "a", 1), ("c", "p2", None, None),
+        ]:
+            catalog.upsert({
+                "session_id": sid, "project_id": project, "parent_overseer_id": parent,
+                "state": "created", "order": order, "created_at": now, "updated_at": now,
+            })
+
+        assert [d["session_id"] for d in catalog.load_all()] == ["b", "a", "c"]
+        indexes = catalog._conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index' AND name LIKE 'idx_%'"
+        ).fetchall()
+        assert indexes == []
+        catalog.delete("a")
+        assert catalog.session_ids() == {"b", "c"}
+        catalog.close()
+
+
+class TestCatalogSessionManager:
+    async def test_state_changes_write_row_not_state_json(self, data_dir):
+        manager = await _manager(data_dir)
+        await _create(manager, "s1", project_id="p1")
+        await manager.export_state_json()
+        before = (data_dir / "sessions" / "s1" / "state.json").stat().st_mtime_ns
+
+        await manager.update_session_name("s1", "Renamed")
+
+        assert (data_dir / "sessions" / "s1" / "state.json").stat().st_mtime_ns == before
+        assert _state_file(data_dir, "s1")["name"] != "Renamed"
+        assert await manager.export_state_json() == 1
+        assert _state_file(data_dir, "s1")["name"] == "Renamed"
+        await manager.cancel_background_tasks()
+
+    async def test_restart_loads_from_catalog(self, data_dir):
+        manager = await _manager(data_dir)
+        await _create(manager, "s1", project_id="p1")
+        await manager.update_session_name("s1", "Persisted")
+        await manager.cancel_background_tasks()
+
+        # Catalog is authoritative; a stale state.json is not consulted
+        state = _state_file(data_dir, "s1")
+        state["name"] = "stale"
+        (data_dir / "sessions" / "s1" / "state.json").write_text(json.dumps(state))
+
+        reloaded = await _manager(data_dir)
+        assert (await reloaded.get_session_info("s1")).name == "Persisted"
+        await reloaded.cancel_background_tasks()
+
+    async def test_first_start_imports_existing_state_json(self, data_dir):
+        legacy = await _manager(data_dir, catalog=False)
+        await _create(legacy, "s1", project_id="p1")
+        await _create(legacy, "s2", project_id="p2")
+
+        manager = await _manager(data_dir)
+
+        assert manager._catalog.session_ids() == {"s1", "s2"}
+        assert (await manager.get_session_info("s2")).project_id == "p2"
+        await manager.cancel_background_tasks()
+
+    async def test_reconciles_with_sessions_directory(self, data_dir):
+        manager = await _manager(data_dir)
+        await _create(manager, "s1")
+        await _create(manager, "gone")
+        await manager.cancel_background_tasks()
+
+        import shutil
+        shutil.rmtree(data_dir / "sessions" / "gone")
+        legacy = await _manager(data_dir / "other", catalog=False)
+        await _create(legacy, "restored")
+        shutil.copytree(data_dir / "other" / "sessions" / "restored", data_dir / "sessions" / "restored")
+
+        reloaded = await _manager(data_dir)
+        assert {s.session_id for s in await reloaded.list_sessions()} == {"s1", "restored"}
+        assert reloaded._catalog.session_ids() == {"s1", "restored"}
+        await reloaded.cancel_background_tasks()
+
+    async def test_delete_removes_row(self, data_dir):
+        manager = await _manager(data_dir)
+        await _create(manager, "s1")
+        await manager.delete_session("s1")
+
+        assert manager._catalog.session_ids() == set()
+        assert await manager.export_state_json() == 0
+        assert not (data_dir / "sessions" / "s1").exists()
+        await manager.cancel_background_tasks()
+
+    async def test_disabling_drops_catalog(self, data_dir):
+        manager = await _manager(data_dir)
+        await _create(manager, "s1")
+        await manager.cancel_background_tasks()
+
+        await _manager(data_dir, catalog=False)
+
+        assert not (data_dir / SessionCatalog.FILENAME).exists()
+
+    async def test_disabling_exports_unflushed_state(self, data_dir):
+        manager = await _manager(data_dir)
+        await _create(manager, "s1")
+        await manager.export_state_json()
+        await manager.update_session_name("s1", "Renamed")
+        # Crash: the interval export never ran and the catalog was not closed
+        manager._export_task.cancel()
+
+        reloaded = await _manager(data_dir, catalog=False)
+
+        assert _state_file(data_dir, "s1")["name"] == "Renamed"
+        assert (await reloaded.get_session_info("s1")).name == "Renamed"
+        assert not (data_dir / SessionCatalog.FILENAME).exists()
@@ -0,0 +1,166 @@
+"""Tests for the in-memory minion hierarchy graph kept by SessionManager."""
+
+import json
+import tempfile
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from ..session_config import SessionConfig
+from ..session_hierarchy import HierarchyGraph
+from ..session_manager import SessionManager
+
+
+def _node(session_id, parent=None, children=()):
+    return SimpleNamespace(
+        session_id=session_id, parent_overseer_id=parent, child_minion_ids=list(children)
+    )
+
+
+@pytest.fixture
+def graph() -> HierarchyGraph:
+    #   root
+    #   ├── a ── a1
+    #   └── b ── b1
+    graph = HierarchyGraph()
+    for node in [
+        _node("root", children=["a", "b"]),
+        _node("a", "root", ["a1"]),
+        _node("b", "root", ["b1"]),
+        _node("a1", "a"),
+        _node("b1", "b"),
+    ]:
+        graph.sync(node)
+    return graph
+
+
+class TestHierarchyGraph:
+    def test_ancestors_and_descendants(self, graph):
+        assert graph.ancestors("a1") == ("a", "root")
+        assert graph.descendants("root") == ("a", "a1", "b", "b1")
+        assert graph.subtree_size("root") == 4
+        assert graph.subtree_size("a1") == 0
+
+    def test_visibility(self, graph):
+        assert graph.visible_from("a1") == {"a1", "a", "root"}
+        assert graph.visible_from("a") == {"a", "root", "a1", "b"}
+        assert graph.visible_from("missing") == set()
+
+    def test_reparent_invalidates_cached_chains(self, graph):
+        assert graph.ancestors("b1") == ("b", "root")
+        graph.sync(_node("b1", "a"))
+        graph.sync(_node("a", "root", ["a1", "b1"]))
+        graph.sync(_node("b", "root", []))
+
+        assert graph.ancestors("b1") == ("a", "root")
+        assert graph.subtree_size("a") == 2
+        assert graph.structural_problems() == []
+
+    def test_changes_drop_only_affected_cache_entries(self, graph):
+        graph.descendants("root")
+        graph.descendants("b")
+        graph.ancestors("a1")
+        graph.ancestors("b1")
+
+        graph.sync(_node("a2", "a"))
+        graph.sync(_node("a", "root", ["a1", "a2"]))
+
+        assert set(graph._descendants) == {"b"}
+        assert set(graph._ancestors) == {"a1", "b1"}
+        assert graph.descendants("root") == ("a", "a1", "a2", "b", "b1")
+        assert graph.ancestors("a2") == ("a", "root")
+
+    def test_listed_child_counted_once_it_exists(self, graph):
+        graph.sync(_node("b", "root", ["b1", "late"]))
+        assert graph.descendants("root") == ("a", "a1", "b", "b1")
+
+        graph.sync(_node("late", "b"))
+        assert graph.descendants("root") == ("a", "a1", "b", "b1", "late")
+
+        graph.remove("late")
+        assert graph.descendants("b") == ("b1",)
+        assert graph.ancestors("b1") == ("b", "root")
+
+    def test_missing_children_are_skipped(self, graph):
+        graph.remove("a1")
+        assert graph.descendants("a") == ()
+        # Listed-but-gone children stay visible, as with the recursive walk
+        assert "a1" in graph.visible_from("a")
+
+    def test_cycle_safe(self):
+        graph = HierarchyGraph()
+        graph.sync(_node("x", "y", ["y"]))
+        graph.sync(_node("y", "x", ["x"]))
+        assert graph.ancestors("x") == ("y",)
+        assert graph.descendants("x") == ("y",)
+
+    def test_diff_and_structural_problems(self, graph):
+        assert graph.diff([_node("root", children=["a", "b"])])[0].startswith("a:")
+        graph.sync(_node("b1", "a"))
+        assert "b1: parent a does not list it as a child" in graph.structural_problems()
+
+
+class TestSessionManagerHierarchy:
+    @pytest.fixture
+    async def manager(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            manager = SessionManager(Path(temp_dir))
+            await manager.initialize()
+            yield manager
+
+    async def _spawn(self, manager, session_id, parent=None):
+        await manager.create_session(
+            session_id, SessionConfig(working_directory="/tmp"), parent_overseer_id=parent
+        )
+        if parent:
+            info = await manager.get_session_info(parent)
+            await manager.update_session(parent, child_minion_ids=[*info.child_minion_ids, session_id])
+
+    async def test_graph_follows_persisted_changes(self, manager):
+        await self._spawn(manager, "root")
+        await self._spawn(manager, "child", parent="root")
+        await self._spawn(manager, "grandchild", parent="child")
+
+        assert manager.hierarchy.descendants("root") == ("child", "grandchild")
+        assert manager.hierarchy.visible_from("grandchild") == {"grandchild", "child", "root"}
+
+        await manager.delete_session("grandchild")
+        assert manager.hierarchy.subtree_size("root") == 1
+
+    async def test_graph_rebuilt_on_load(self, manager):
+        await self._spawn(manager, "root")
+        await self._spawn(manager, "child", parent="root")
+
+        reloaded = SessionManager(manager.data_dir)
+        await reloaded.initialize()
+
+        assert reloaded.hierarchy.descendants("root") == ("child",)
+
+    async def test_consistency_check_against_state_json(self, manager):
+        await self._spawn(manager, "root")
+        await self._spawn(manager, "child", parent="root")
+        assert await manager.check_hierarchy_consistency() == {"state_json": [], "structure": []}
+
+        state_file = manager.sessions_dir / "child" / "state.json"
+        data = json.loads(state_file.read_text())
+        data["parent_overseer_id"] = "someone-else"
+        state_file.write_text(json.dumps(data))
+
+        problems = await manager.check_hierarchy_consistency()
+        assert problems["state_json"] == [
+            "child: parent 'root' in graph, 'someone-else' in session state"
+        ]
+
+    async def test_consistency_check_does_not_rewrite_state_json(self, manager):
+        await self._spawn(manager, "root")
+        state_file = manager.sessions_dir / "root" / "state.json"
+        data = json.loads(state_file.read_text())
+        # Pre-#1230 layout: config fields at the top level, migrated on read
+        data.update(data.pop("config"))
+        state_file.write_text(json.dumps(data))
+        before = state_file.read_bytes()
+
+        await manager.check_hierarchy_consistency()
+
+        assert state_file.read_bytes() == before
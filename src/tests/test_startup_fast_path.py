@@ -0,0 +1,159 @@
+"""Tests for parallel session loading, deferred completion healing and startup timing."""
+
+import json
+import tempfile
+from datetime import UTC, datetime
+from pathlib import Path
+
+import pytest
+
+from ..session_manager import (
+    COMPLETION_HEAL_CACHE_FILE,
+    SessionManager,
+    SessionState,
+    _derive_last_completion_from_jsonl,
+)
+from ..startup_timing import StartupTimings
+from ..storage_utils import iter_lines_reversed
+
+
+def _write_session(sessions_dir: Path, session_id: str, messages: list[dict] | None = None, **state):
+    session_dir = sessions_dir / session_id
+    session_dir.mkdir(parents=True)
+    data = {
+        "session_id": session_id,
+        "state": "active",
+        "created_at": datetime.now(UTC).isoformat(),
+        "updated_at": datetime.now(UTC).isoformat(),
+        **state,
+    }
+    (session_dir / "state.json").write_text(json.dumps(data))
+    if messages is not None:
+        with open(session_dir / "messages.jsonl", "w") as f:
+            for message in messages:
+                f.write(json.dumps(message) + "\n")
+
+
+@pytest.fixture
+def data_dir():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        yield Path(temp_dir)
+
+
+async def _load(data_dir: Path) -> SessionManager:
+    manager = SessionManager(data_dir)
+    await manager.initialize()
+    if manager._completion_heal_task is not None:
+        await manager._completion_heal_task
+    return manager
+
+
+class TestParallelLoad:
+    async def test_loads_all_sessions_and_resets_state(self, data_dir):
+        sessions_dir = data_dir / "sessions"
+        for i in range(5):
+            _write_session(sessions_dir, f"s{i}", is_processing=True)
+        (sessions_dir / "broken").mkdir()
+        (sessions_dir / "broken" / "state.json").write_text("{not json")
+
+        manager = await _load(data_dir)
+
+        sessions = {s.session_id: s for s in await manager.list_sessions()}
+        assert set(sessions) == {f"s{i}" for i in range(5)}
+        assert all(s.state == SessionState.CREATED for s in sessions.values())
+        assert not any(s.is_processing for s in sessions.values())
+
+
+class TestCompletionHeal:
+    async def test_heal_runs_after_load(self, data_dir):
+        _write_session(data_dir / "sessions", "s1", messages=[
+            {"type": "result", "timestamp": "2026-01-02T03:04:05+00:00"},
+            {"type": "user", "content": "later"},
+        ])
+
+        manager = await _load(data_dir)
+
+        session = await manager.get_session_info("s1")
+        assert session.last_completion_at == datetime(2026, 1, 2, 3, 4, 5, tzinfo=UTC)
+        persisted = json.loads((data_dir / "sessions" / "s1" / "state.json").read_text())
+        assert persisted["last_completion_at"] is not None
+
+    async def test_live_completion_wins_over_heal(self, data_dir):
+        _write_session(data_dir / "sessions", "s1", messages=[
+            {"type": "result", "timestamp": "2026-01-02T03:04:05+00:00"},
+        ])
+        manager = SessionManager(data_dir)
+        await manager.initialize()
+        live = datetime(2026, 5, 1, tzinfo=UTC)
+        manager._active_sessions["s1"].last_completion_at = live
+
+        await manager._completion_heal_task
+
+        assert (await manager.get_session_info("s1")).last_completion_at == live
+
+    async def test_sessions_without_result_are_cached(self, data_dir, monkeypatch):
+        sessions_dir = data_dir / "sessions"
+        _write_session(sessions_dir, "s1", messages=[{"type": "user", "content": "hi"}])
+        await _load(data_dir)
+        assert "s1" in json.loads((sessions_dir / COMPLETION_HEAL_CACHE_FILE).read_text())
+
+        from .. import session_manager as sm
+        calls = []
+        monkeypatch.setattr(
+            sm, "_derive_last_completion_from_jsonl", lambda path: calls.append(path)
+        )
+        await _load(data_dir)
+        assert calls == []
+
+        # An appended log changes the signature and is rescanned
+        with open(sessions_dir / "s1" / "messages.jsonl", "a") as f:
+            f.write(json.dumps({"type": "result", "timestamp": 1700000000}) + "\n")
+        await _load(data_dir)
+        assert len(calls) == 1
+
+
+class TestReverseScan:
+    def test_iter_lines_reversed_across_blocks(self, data_dir):
+        path = data_dir / "log.jsonl"
+        lines = [f"line-{i}" * (i + 1) for i in range(20)]
+        path.write_text("\n".join(lines) + "\n")
+
+        got = [line.decode() for line in iter_lines_reversed(path, block_size=7) if line]
+
+        assert got == list(reversed(lines))
+
+    def test_derive_returns_latest_result(self, data_dir):
+        path = data_dir / "messages.jsonl"
+        with open(path, "w") as f:
+            f.write(json.dumps({"type": "result", "timestamp": "2026-01-01T00:00:00+00:00"}) + "\n")
+            f.write(json.dumps({"type": "result", "timestamp": "2026-02-01T00:00:00+00:00"}) + "\n")
+            f.write(json.dumps({"type": "assistant", "content": "result"}) + "\n")
+
+        assert _derive_last_completion_from_jsonl(path) == datetime(2026, 2, 1, tzinfo=UTC)
+
+    def test_derive_missing_file(self, data_dir):
+        assert _derive_last_completion_from_jsonl(data_dir / "nope.jsonl") is None
+
+
+class TestStartupTimings:
+    def test_phases_accumulate_and_complete(self):
+        timings = StartupTimings()
+        with timings.phase("sessions"):
+            pass
+        with timings.phase("sessions"):
+            pass
+        with timings.phase("mcp"):
+            pass
+        timings.complete()
+
+        data = timings.to_dict()
+        assert data["completed"] is True
+        assert list(data["phases_ms"]) == ["sessions", "mcp"]
+        assert data["total_ms"] >= 0
+
+    def test_phase_recorded_on_error(self):
+        timings = StartupTimings()
+        with pytest.raises(RuntimeError), timings.phase("analytics"):
+            raise RuntimeError("boom")
+        assert "analytics" in timings.to_dict()["phases_ms"]
+
@@ -0,0 +1,113 @@
+"""Tests for the indexed legion timeline store (src/legion/timeline_store.py)."""
+
+import json
+import tempfile
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+from ..legion.timeline_store import TimelineStore
+
+
+@pytest.fixture
+def store():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        system = MagicMock()
+        system.session_coordinator.data_dir = Path(temp_dir)
+        yield TimelineStore(system)
+
+
+def _comm(comm_id: str, ts, from_id=None, to_id=None, comm_type="task") -> dict:
+    return {
+        "comm_id": comm_id,
+        "timestamp": ts,
+        "from_minion_id": from_id,
+        "to_minion_id": to_id,
+        "comm_type": comm_type,
+        "content": f"body {comm_id}",
+    }
+
+
+def _ids(page: dict) -> list[str]:
+    return [c["comm_id"] for c in page["comms"]]
+
+
+def _reference(path: Path, limit: int, offset: int) -> list[str]:
+    """The previous full-scan implementation: sort newest-first, dedup, slice."""
+    comms = [json.loads(line) for line in path.read_text().splitlines() if line.strip()]
+    comms.sort(key=lambda c: c["timestamp"], reverse=True)
+    seen, unique = set(), []
+    for comm in comms:
+        if comm["comm_id"] not in seen:
+            seen.add(comm["comm_id"])
+            unique.append(comm["comm_id"])
+    return unique[offset:offset + limit]
+
+
+class TestTimelineStore:
+    def test_pages_match_full_scan(self, store):
+        # Out-of-order timestamps and a duplicate (sender + receiver copy)
+        for comm_id, ts in [("a", 3.0), ("b", 1.0), ("c", 5.0), ("a", 3.0), ("d", 2.0), ("e", 5.0)]:
+            store.append("L", _comm(comm_id, ts))
+        path = store.timeline_path("L")
+
+        for offset, limit in [(0, 10), (0, 2), (2, 2), (4, 3), (9, 2)]:
+            page = store.query("L", limit=limit, offset=offset)
+            assert _ids(page) == _reference(path, limit, offset)
+        assert store.query("L")["total"] == 5
+
+    def test_iso_timestamps_normalized(self, store):
+        store.append("L", _comm("old", "2026-01-01T00:00:00+00:00"))
+        store.append("L", _comm("new", 1893456000.0))
+
+        page = store.query("L")
+
+        assert _ids(page) == ["new", "old"]
+        assert isinstance(page["comms"][1]["timestamp"], float)
+
+    def test_minion_and_type_filters(self, store):
+        store.append("L", _comm("1", 1.0, from_id="m1", to_id="m2"))
+        store.append("L", _comm("2", 2.0, from_id="m2", to_id="m3", comm_type="report"))
+        store.append("L", _comm("3", 3.0, from_id="m3", to_id="m1", comm_type="report"))
+
+        assert _ids(store.query("L", minion_id="m1")) == ["3", "1"]
+        assert _ids(store.query("L", comm_type="report")) == ["3", "2"]
+        assert _ids(store.query("L", minion_id="m2", comm_type="report")) == ["2"]
+        assert store.query("L", minion_id="nobody")["total"] == 0
+
+    def test_fan_out_comm_indexed_under_every_recipient(self, store):
+        comm = _comm("1", 1.0, from_id="boss")
+        comm["to_minion_ids"] = ["m1", "m2"]
+        store.append("L", comm)
+
+        assert _ids(store.query("L", minion_id="m2")) == ["1"]
+        assert _ids(store.query("L", minion_id="boss", comm_type="task")) == ["1"]
+
+    def test_since_cursor_returns_only_new_comms(self, store):
+        store.append("L", _comm("1", 1.0))
+        cursor = store.query("L")["cursor"]
+
+        store.append("L", _comm("2", 0.5))  # late arrival with an older timestamp
+        store.append("L", _comm("3", 4.0))
+        delta = store.query("L", since_cursor=cursor)
+
+        assert _ids(delta) == ["3", "2"]
+        assert store.query("L", since_cursor=delta["cursor"])["comms"] == []
+
+    def test_external_appends_and_rewrites_are_picked_up(self, store):
+        store.append("L", _comm("1", 1.0))
+        store.query("L")
+        path = store.timeline_path("L")
+
+        with open(path, "a") as f:
+            f.write(json.dumps(_comm("2", 2.0)) + "\n")
+            f.write('{"comm_id": "partial"')  # no newline yet
+        assert _ids(store.query("L")) == ["2", "1"]
+
+        path.write_text(json.dumps(_comm("x", 9.0)) + "\n")
+        assert _ids(store.query("L")) == ["x"]
+
+    def test_missing_timeline_is_empty(self, store):
+        page = store.query("nope")
+        assert page["comms"] == [] and page["total"] == 0 and page["cursor"] == -1
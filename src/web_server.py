@@ -670,31 +670,35 @@ class ClaudeWebUI:
     async def initialize(self):
         """Initialize the WebUI application"""
         from .config_manager import load_config
+        timings = self.coordinator.startup_timings
         await self.coordinator.initialize()
 
-        try:
-            await self.litellm_proxy_manager.start()
-        except Exception:
-            logger.exception(
-                "LiteLLM proxy failed to start — catalog-selected sessions will be unavailable; "
-                "native sessions continue normally"
-            )
-
-        # Issue #1789: start custom OAuth callback routes/listeners for already-configured
-        # MCP servers (path-only dynamic routes + dedicated custom-port listeners).
-        existing_mcp_configs = await self.coordinator.mcp_config_manager.list_configs()
-        for mcp_cfg in existing_mcp_configs:
+        with timings.phase("litellm_proxy"):
             try:
-                await self._sync_oauth_callback_for_config(mcp_cfg)
+                await self.litellm_proxy_manager.start()
             except Exception:
                 logger.exception(
-                    f"Failed to start OAuth callback routing for MCP config {mcp_cfg.id} — "
-                    "custom-callback OAuth will be unavailable for it until fixed"
+                    "LiteLLM proxy failed to start — catalog-selected sessions will be unavailable; "
+                    "native sessions continue normally"
                 )
 
+        # Issue #1789: start custom OAuth callback routes/listeners for already-configured
+        # MCP servers (path-only dynamic routes + dedicated custom-port listeners).
+        with timings.phase("mcp_oauth_callbacks"):
+            existing_mcp_configs = await self.coordinator.mcp_config_manager.list_configs()
+            for mcp_cfg in existing_mcp_configs:
+                try:
+                    await self._sync_oauth_callback_for_config(mcp_cfg)
+                except Exception:
+                    logger.exception(
+                        f"Failed to start OAuth callback routing for MCP config {mcp_cfg.id} — "
+                        "custom-callback OAuth will be unavailable for it until fixed"
+                    )
+
         config = load_config(self.config_file) if self.config_file else load_config()
         if config.features.skill_sync_enabled:
-            await self.skill_manager.sync()
+            with timings.phase("skills"):
+                await self.skill_manager.sync()
         else:
             logger.info("Skill syncing disabled by config")
 
@@ -729,7 +733,8 @@ class ClaudeWebUI:
         startup_config = load_config(self.config_file) if self.config_file else load_config()
         if startup_config.proxy.proxy_image:
             from .docker_utils import check_proxy_image_available
-            image_ok = await check_proxy_image_available(startup_config.proxy.proxy_image)
+            with timings.phase("proxy_image_check"):
+                image_ok = await check_proxy_image_available(startup_config.proxy.proxy_image)
             if image_ok:
                 _startup_logger.info(f"Default proxy image '{startup_config.proxy.proxy_image}' available.")
             else:
@@ -747,7 +752,8 @@ class ClaudeWebUI:
 
         # Issue #1127: Initialize audit subsystem
         try:
-            await self._analytics_db.initialize()
+            with timings.phase("analytics"):
+                await self._analytics_db.initialize()
             self.coordinator.set_audit_writer(self._audit_writer)
             self.coordinator.set_analytics_store(self.analytics_store)
             self.coordinator.session_manager.add_state_change_callback(
@@ -763,6 +769,7 @@ class ClaudeWebUI:
             self._audit_writer = AuditWriter(None)
             self.audit_writer = self._audit_writer
 
+        timings.complete()
         logger.info("Claude Code WebUI initialized")
 
     def _setup_routes(self):